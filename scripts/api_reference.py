@@ -0,0 +1,802 @@
+"""
+Generate the API endpoint reference from the route handlers.
+
+Scans every `app/api/**/route.ts` and extracts, per exported HTTP method:
+the auth guard (guardAdmin, PIN JWT, Auth.js session, signed URL), the
+rateLimit() keys and options, query/body/form parameters, the SQL it runs,
+the Response.json() shapes with their status codes, and the audit actions
+it writes. The result is emitted as markdown in the layout of
+docs/06_API_Data_Reference.md §2–4, and optionally pushed through
+`md_to_docx`.
+
+Parsing uses a small TypeScript scanner (strings, template literals,
+comments and regex literals are masked so brackets can be matched on the
+code alone) rather than a full parser. Per-file results are cached by
+content hash, so only edited routes are re-parsed; an unchanged tree
+rebuilds in a few milliseconds. `--check` lists endpoints that are in
+the code but missing from the hand-written reference, and vice versa.
+Against the current tree it reports four:
+
+    GET    /api/admin/photos/[id]         in code, not documented
+    POST   /api/admin/photos/[id]/edit    in code, not documented
+    PATCH  /api/admin/sessions/[id]       in code, not documented
+    DELETE /api/admin/sessions/[id]       documented, not in code
+
+(the last two are one endpoint documented under the wrong method).
+
+The scanner is shared with schema_reference.py and sql_index_coverage.py.
+
+Run:  python scripts/api_reference.py [--out docs/06_API_Endpoints_Generated.md] [--docx] [--check]
+Requires: pip install python-docx  (only for --docx)
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+from ratelimit_model import (
+    DEFAULT_LOCKOUT_MS, DEFAULT_MAX_ATTEMPTS, DEFAULT_WINDOW_MS,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+DOCS = ROOT / "docs"
+API_DIR = ROOT / "app" / "api"
+OUT = DOCS / "06_API_Endpoints_Generated.md"
+REFERENCE_MD = DOCS / "06_API_Data_Reference.md"
+CACHE = Path(__file__).resolve().parent / ".api_reference_cache.json"
+
+# Any change to the extractor invalidates every cached entry
+PARSER_KEY = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+SQL_START = re.compile(
+    r"\s*(SELECT|INSERT|UPDATE|DELETE|MERGE|WITH|IF|EXEC|CREATE|ALTER|DROP)\b",
+    re.IGNORECASE)
+AUDIT_ACTION = re.compile(r"^[a-z_]+\.(?:[a-z_]+|\$\{\w+\})$")
+AUDIT_INSERT = re.compile(
+    r"INSERT\s+INTO\s+admin_audit_log\b.*?VALUES\s*\([^,]*,[^,]*,\s*"
+    r"'([a-z_]+\.[a-z_]+)'", re.IGNORECASE | re.DOTALL)
+
+# Longer runs of helper SQL (the migration list) are summarised, not listed
+MAX_MODULE_SQL = 5
+
+# (marker in handler code, description) — first match wins
+AUTH_GUARDS = [
+    ("guardAdmin(", "Admin (`guardAdmin`: Entra ID session or admin token)"),
+    ("requireAdmin(", "Admin (`requireAdmin`)"),
+    ("verifyToken(", "PIN session JWT (`Authorization: Bearer`)"),
+    ("await auth()", "Auth.js session"),
+    ("verifyImageSignature(", "Signed URL (`exp`, `sig`)"),
+]
+
+SECTIONS = [
+    ("/api/auth", "Authentication Endpoints"),
+    ("/api/photos", "Photo Endpoints (Field Team)"),
+    ("/api/admin", "Admin Endpoints"),
+    ("", "Other Endpoints"),
+]
+
+# Characters after which a '/' starts a regex literal rather than division
+_REGEX_PREFIX = set("(,=:[!&|?{};+-*%<>~^")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "0": "\0"}
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  TYPESCRIPT SCANNER
+# ══════════════════════════════════════════════════════════════════════
+
+class TsSource:
+    """TypeScript source with comments and literals masked out.
+
+    ``code`` has the same length and line breaks as ``text``, but the
+    contents of comments, string/template/regex literals are blanked, so
+    brackets, keywords and calls can be matched with plain regexes.
+    ``literals`` maps each string literal's start offset to
+    ``(end, quote, value)``; template values keep their ``${...}``.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.literals = {}
+        self.comments = []
+        self._line_starts = None
+        out = list(text)
+        i, n = 0, len(text)
+        prev = ""                       # last significant code character
+        while i < n:
+            c = text[i]
+            if c == "/" and text.startswith("//", i):
+                end = text.find("\n", i)
+                end = n if end < 0 else end
+                self.comments.append((i, end, text[i + 2:end].strip()))
+                self._blank(out, i, end)
+                i = end
+                continue
+            if c == "/" and text.startswith("/*", i):
+                end = text.find("*/", i + 2)
+                end = n if end < 0 else end + 2
+                self.comments.append((i, end, text[i:end]))
+                self._blank(out, i, end)
+                i = end
+                continue
+            if c in "'\"`":
+                end = (self._skip_template(i) if c == "`"
+                       else self._skip_string(i))
+                raw = text[i + 1:end - 1]
+                value = raw if c == "`" else self._unescape(raw)
+                self.literals[i] = (end, c, value)
+                self._blank(out, i + 1, end - 1)
+                i, prev = end, c
+                continue
+            if c == "/" and (prev in _REGEX_PREFIX or not prev or re.search(
+                    r"\b(return|typeof)\s*$", text[max(0, i - 16):i])):
+                end = self._skip_regex(i)
+                self._blank(out, i + 1, end - 1)
+                i, prev = end, "/"
+                continue
+            if not c.isspace():
+                prev = c
+            i += 1
+        self.code = "".join(out)
+
+    @staticmethod
+    def _blank(out, start, end):
+        for k in range(start, end):
+            if out[k] != "\n":
+                out[k] = " "
+
+    @staticmethod
+    def _unescape(raw):
+        return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)),
+                      raw)
+
+    def _skip_string(self, i):
+        quote, text = self.text[i], self.text
+        i += 1
+        while i < len(text) and text[i] != quote and text[i] != "\n":
+            i += 2 if text[i] == "\\" else 1
+        return i + 1
+
+    def _skip_template(self, i):
+        text = self.text
+        i += 1
+        while i < len(text):
+            c = text[i]
+            if c == "\\":
+                i += 2
+            elif c == "`":
+                return i + 1
+            elif text.startswith("${", i):
+                i = self._skip_expression(i + 2)
+            else:
+                i += 1
+        return i
+
+    def _skip_expression(self, i):
+        """Skip a ``${...}`` body, honouring nested literals and braces."""
+        text, depth = self.text, 1
+        while i < len(text):
+            c = text[i]
+            if c in "'\"":
+                i = self._skip_string(i)
+                continue
+            if c == "`":
+                i = self._skip_template(i)
+                continue
+            if c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+        return i
+
+    def _skip_regex(self, i):
+        text, in_class = self.text, False
+        i += 1
+        while i < len(text) and text[i] != "\n":
+            c = text[i]
+            if c == "\\":
+                i += 2
+                continue
+            if c == "[":
+                in_class = True
+            elif c == "]":
+                in_class = False
+            elif c == "/" and not in_class:
+                i += 1
+                while i < len(text) and text[i].isalpha():
+                    i += 1
+                return i
+            i += 1
+        return i
+
+    def line_of(self, pos):
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in
+                                       re.finditer("\n", self.text)]
+        lo, hi = 0, len(self._line_starts)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self._line_starts[mid] <= pos:
+                lo = mid
+            else:
+                hi = mid
+        return lo + 1
+
+    def match(self, pos):
+        """Offset of the bracket closing the one at ``pos``."""
+        opening = self.code[pos]
+        closing = {"(": ")", "{": "}", "[": "]"}[opening]
+        depth = 0
+        for k in range(pos, len(self.code)):
+            c = self.code[k]
+            if c == opening:
+                depth += 1
+            elif c == closing:
+                depth -= 1
+                if depth == 0:
+                    return k
+        raise ValueError(f"unbalanced {opening!r} at line {self.line_of(pos)}")
+
+    def split_args(self, start, end):
+        """Top-level comma-separated ``(start, end)`` spans in [start, end)."""
+        spans, depth, begin = [], 0, start
+        for k in range(start, end):
+            c = self.code[k]
+            if c in "([{":
+                depth += 1
+            elif c in ")]}":
+                depth -= 1
+            elif c == "," and depth == 0:
+                spans.append((begin, k))
+                begin = k + 1
+        if self.code[begin:end].strip():
+            spans.append((begin, end))
+        return spans
+
+    def call_args(self, open_paren):
+        """Argument spans of the call whose '(' is at ``open_paren``."""
+        return self.split_args(open_paren + 1, self.match(open_paren))
+
+    def literal(self, start, end):
+        """Value of the span if it is exactly one string literal, else None."""
+        while start < end and self.code[start].isspace():
+            start += 1
+        lit = self.literals.get(start)
+        if lit and not self.code[lit[0]:end].strip():
+            return lit[2]
+        return None
+
+    def literals_in(self, start, end):
+        return [(pos, lit) for pos, lit in self.literals.items()
+                if start <= pos < end]
+
+    def source(self, start, end):
+        return self.text[start:end].strip()
+
+    def leading_comment(self, pos):
+        """A comment that ends right before ``pos`` (blank lines allowed)."""
+        for start, end, body in reversed(self.comments):
+            if end <= pos:
+                if self.code[end:pos].strip():
+                    return None
+                body = re.sub(r"^/\*\*?|\*/$", "", body)
+                lines = [re.sub(r"^\s*\*\s?", "", ln).strip()
+                         for ln in body.splitlines()]
+                return " ".join(ln for ln in lines if ln)
+        return None
+
+
+def object_entries(src, start, end):
+    """``[(key, value_span)]`` of an object literal spanning {start..end}."""
+    entries = []
+    for a, b in src.split_args(start + 1, end):
+        part = src.code[a:b]
+        stripped = part.strip()
+        if stripped.startswith("..."):
+            entries.append(("..." + src.source(a, b)[3:].strip(), None))
+            continue
+        colon = _top_level_colon(part)
+        if colon is None:
+            entries.append((src.source(a, b), None))
+            continue
+        key_span = (a, a + colon)
+        key = src.literal(*key_span) or src.source(*key_span)
+        entries.append((key, (a + colon + 1, b)))
+    return entries
+
+
+def _top_level_colon(part):
+    depth = 0
+    for k, c in enumerate(part):
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+        elif c == ":" and depth == 0:
+            return k
+    return None
+
+
+def format_sql(value):
+    """Dedent a SQL literal for display."""
+    lines = value.strip("\n").splitlines()
+    if not lines:
+        return ""
+    first, rest = lines[0].strip(), textwrap.dedent("\n".join(lines[1:]))
+    return "\n".join(filter(None, [first, rest.rstrip()]))
+
+
+def is_sql(value):
+    return bool(SQL_START.match(value)) and len(value.split()) > 2
+
+
+def route_path(route_file, api_dir=API_DIR):
+    rel = route_file.parent.relative_to(api_dir.parent)
+    return "/" + rel.as_posix()
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  ROUTE EXTRACTION
+# ══════════════════════════════════════════════════════════════════════
+
+def _product(expr):
+    """Evaluate ``60 * 60 * 1000``-style option values; None if not that."""
+    factors = expr.split("*")
+    if all(re.fullmatch(r"\s*\d+(?:_\d+)*\s*", f) for f in factors):
+        return math.prod(int(f.replace("_", "")) for f in factors)
+    return None
+
+
+def _key_template(value):
+    return re.sub(r"\$\{\s*([^}]*?)\s*\}", r"{\1}", value)
+
+
+def _resolve_identifier(src, name, before, start):
+    """Last ``const|let name = '<literal>'`` between ``start`` and ``before``."""
+    found = None
+    for m in re.finditer(rf"\b(?:const|let)\s+{re.escape(name)}\s*=\s*",
+                         src.code[start:before]):
+        found = src.literal(start + m.end(), before)
+        if found is None:
+            lit_start = start + m.end()
+            lit = src.literals.get(lit_start)
+            found = lit[2] if lit else None
+    return found
+
+
+def extract_rate_limits(src, start, end):
+    limits = []
+    for m in re.finditer(r"\brateLimit\s*\(", src.code[start:end]):
+        paren = start + m.end() - 1
+        args = src.call_args(paren)
+        if not args:
+            continue
+        key = src.literal(*args[0])
+        if key is None:
+            name = src.source(*args[0])
+            key = _resolve_identifier(src, name, paren, start) or name
+        options = {"max_attempts": None, "window_ms": None, "lockout_ms": None}
+        if len(args) > 1 and src.code[args[1][0]:args[1][1]].strip().startswith("{"):
+            brace = src.code.index("{", args[1][0])
+            for opt, span in object_entries(src, brace, src.match(brace)):
+                field = {"maxAttempts": "max_attempts", "windowMs": "window_ms",
+                         "lockoutMs": "lockout_ms"}.get(opt)
+                if field and span:
+                    options[field] = _product(src.code[span[0]:span[1]])
+        limits.append({"key": _key_template(key), **options,
+                       "line": src.line_of(paren)})
+    return limits
+
+
+def extract_params(src, start, end):
+    code = src.code[start:end]
+    query, body, form = [], [], []
+
+    def literal_args(pattern, target):
+        for m in re.finditer(pattern, code):
+            lit = src.literals.get(start + m.end())
+            value = lit[2] if lit else None
+            if value and value not in target:
+                target.append(value)
+
+    literal_args(r"searchParams\.get\(\s*", query)
+    literal_args(r"formData\.get(?:All)?\(\s*", form)
+
+    for m in re.finditer(
+            r"\b(?:const|let)\s*(\{)[^=]*?\}\s*=\s*"
+            r"(?:\(?\s*await\s+req\.json\(\)|body\b)", code):
+        brace = start + m.start(1)
+        for key, _ in object_entries(src, brace, src.match(brace)):
+            name = key.split(":")[0].split("=")[0].strip()
+            if name and not name.startswith("...") and name not in body:
+                body.append(name)
+    if re.search(r"\b(?:const|let)\s+body\s*=\s*\(?\s*await\s+req\.json\(\)",
+                 code):
+        for m in re.finditer(r"\bbody\.(\w+)", code):
+            if m.group(1) not in body and not m.group(1).startswith("_"):
+                body.append(m.group(1))
+    return query, body, form
+
+
+def _shape(src, span):
+    """Compact description of a response body expression."""
+    a, b = span
+    text = src.code[a:b].strip()
+    if not text.startswith("{"):
+        lit = src.literal(a, b)
+        if lit is not None:
+            return repr(lit)
+        return re.sub(r"\s+", " ", src.source(a, b))[:60]
+    brace = src.code.index("{", a)
+    parts = []
+    for key, value_span in object_entries(src, brace, src.match(brace)):
+        if value_span is None:
+            parts.append(key)
+            continue
+        lit = src.literal(*value_span)
+        if lit is not None and key in ("error", "message", "status"):
+            parts.append(f"{key}: {lit!r}")
+        else:
+            parts.append(key)
+    return "{ " + ", ".join(parts) + " }" if parts else "{}"
+
+
+def extract_responses(src, start, end):
+    responses = []
+    for m in re.finditer(r"\b(?:NextResponse|Response)\.json\s*\(|"
+                         r"\bnew\s+(?:NextResponse|Response)\s*\(",
+                         src.code[start:end]):
+        paren = start + m.end() - 1
+        args = src.call_args(paren)
+        shape = _shape(src, args[0]) if args else "(empty)"
+        status = 200
+        if len(args) > 1:
+            init = src.text[args[1][0]:args[1][1]]
+            found = re.search(r"\bstatus\s*:\s*(\d{3})", init)
+            if found:
+                status = int(found.group(1))
+            elif re.search(r"\bstatus\b", init):
+                status = "varies"
+        entry = {"status": status, "body": shape,
+                 "line": src.line_of(paren)}
+        if not any(r["status"] == status and r["body"] == shape
+                   for r in responses):
+            responses.append(entry)
+    return sorted(responses, key=lambda r: (str(r["status"]), r["line"]))
+
+
+def extract_sql(src, start, end):
+    statements, fragments = [], []
+    for pos, (lit_end, quote, value) in sorted(src.literals_in(start, end)):
+        if is_sql(value):
+            statements.append({"sql": format_sql(value),
+                               "line": src.line_of(pos)})
+    for m in re.finditer(r"\.push\s*\(", src.code[start:end]):
+        paren = start + m.end() - 1
+        for a, b in src.call_args(paren):
+            value = src.literal(a, b)
+            if value and "@" in value and not is_sql(value):
+                fragments.append(value)
+    return statements, fragments
+
+
+def extract_audit(src, start, end):
+    actions = []
+    code = src.code[start:end]
+    for m in re.finditer(r"\bwriteAuditLog\s*\(", code):
+        args = src.call_args(start + m.end() - 1)
+        if len(args) > 2:
+            value = src.literal(*args[2])
+            if value:
+                actions.append(value)
+    for m in re.finditer(r"\baction\s*:\s*", code):
+        lit = src.literals.get(start + m.end())
+        if lit and AUDIT_ACTION.match(lit[2]):
+            actions.append(lit[2])
+    # Direct INSERTs with the action inline as the third value
+    for _, (_, _, value) in sorted(src.literals_in(start, end)):
+        m = AUDIT_INSERT.search(value)
+        if m:
+            actions.append(m.group(1))
+    return list(dict.fromkeys(_key_template(a) for a in actions))
+
+
+def extract_handler(src, method, start, end, decl):
+    auth = next((desc for marker, desc in AUTH_GUARDS
+                 if marker in src.code[start:end]), "None (public)")
+    query, body, form = extract_params(src, start, end)
+    statements, fragments = extract_sql(src, start, end)
+    return {
+        "method": method,
+        "line": src.line_of(decl),
+        "summary": src.leading_comment(decl) or "",
+        "auth": auth,
+        "rate_limits": extract_rate_limits(src, start, end),
+        "query_params": query,
+        "body_fields": body,
+        "form_fields": form,
+        "sql": statements,
+        "sql_fragments": fragments,
+        "responses": extract_responses(src, start, end),
+        "audit_actions": extract_audit(src, start, end),
+    }
+
+
+def iter_handlers(src):
+    """``(method, decl, body_start, body_end)`` for each exported handler."""
+    for m in re.finditer(
+            r"\bexport\s+(?:async\s+)?function\s+(" + "|".join(HTTP_METHODS)
+            + r")\s*\(", src.code):
+        params_end = src.match(m.end() - 1)
+        body_start = src.code.index("{", params_end)
+        yield m.group(1), m.start(), body_start, src.match(body_start)
+
+
+def parse_route(text, rel_path, path):
+    """Everything the reference needs from one route.ts source."""
+    src = TsSource(text)
+    handlers, covered = [], []
+    for method, decl, body_start, body_end in iter_handlers(src):
+        handlers.append(extract_handler(src, method, body_start, body_end,
+                                        decl))
+        covered.append((decl, body_end))
+
+    delegated = []
+    for m in re.finditer(r"\bexport\s+const\s*\{([^}]*)\}\s*=\s*(\w+)",
+                         src.code):
+        for name in m.group(1).split(","):
+            name = name.split(":")[0].strip()
+            if name in HTTP_METHODS:
+                delegated.append({"method": name, "delegate": m.group(2),
+                                  "line": src.line_of(m.start())})
+
+    config = {m.group(1): m.group(2) for m in re.finditer(
+        r"\bexport\s+const\s+(runtime|dynamic|revalidate|maxDuration)\s*=\s*"
+        r"['\"]?([\w-]+)", src.text)}
+
+    # SQL in module-level helpers (outside any exported handler)
+    module_sql = []
+    for pos, (_, _, value) in sorted(src.literals.items()):
+        if is_sql(value) and not any(a <= pos < b for a, b in covered):
+            module_sql.append({"sql": format_sql(value),
+                               "line": src.line_of(pos)})
+    return {"file": rel_path, "path": path, "handlers": handlers,
+            "delegated": delegated, "config": config,
+            "module_sql": module_sql}
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  CACHE
+# ══════════════════════════════════════════════════════════════════════
+
+def load_cache(path, parser_key=PARSER_KEY):
+    """Cached ``{rel_path: {"sha256", ...}}`` entries, or {} if stale."""
+    try:
+        cache = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache.get("files", {}) if cache.get("parser") == parser_key else {}
+
+
+def save_cache(path, entries, parser_key=PARSER_KEY):
+    path = Path(path)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"parser": parser_key, "files": entries}),
+                   encoding="utf-8")
+    tmp.replace(path)
+
+
+def scan_routes(api_dir=API_DIR, cache_path=CACHE):
+    """Parse every route.ts, reusing cached results for unchanged files.
+
+    Returns ``(routes, stats)``; stats counts ``parsed`` and ``cached``.
+    """
+    api_dir = Path(api_dir)
+    cached = load_cache(cache_path) if cache_path else {}
+    entries, routes = {}, []
+    stats = {"parsed": 0, "cached": 0}
+    for route_file in sorted(api_dir.rglob("route.ts")):
+        rel = route_file.relative_to(api_dir.parent.parent).as_posix()
+        data = route_file.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        hit = cached.get(rel)
+        if hit and hit["sha256"] == digest:
+            result = hit["route"]
+            stats["cached"] += 1
+        else:
+            result = parse_route(data.decode("utf-8"), rel,
+                                 route_path(route_file, api_dir))
+            stats["parsed"] += 1
+        entries[rel] = {"sha256": digest, "route": result}
+        routes.append(result)
+    if cache_path and (stats["parsed"] or set(entries) != set(cached)):
+        save_cache(cache_path, entries)
+    return routes, stats
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  MARKDOWN
+# ══════════════════════════════════════════════════════════════════════
+
+def fmt_ms(ms):
+    for unit, size in (("h", 3600000), ("min", 60000), ("s", 1000)):
+        if ms >= size and ms % size == 0:
+            return f"{ms // size} {unit}"
+    return f"{ms} ms"
+
+
+def describe_limit(limit):
+    max_attempts = limit["max_attempts"] or DEFAULT_MAX_ATTEMPTS
+    window = limit["window_ms"] or DEFAULT_WINDOW_MS
+    lockout = limit["lockout_ms"] or DEFAULT_LOCKOUT_MS
+    defaulted = " (default)" if limit["lockout_ms"] is None else ""
+    return (f"`{limit['key']}` — {max_attempts} per {fmt_ms(window)}, "
+            f"{fmt_ms(lockout)} lockout{defaulted}")
+
+
+def _cell(value):
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def endpoint_md(route, handler, number):
+    lines = [f"### {number} {handler['method']} {route['path']}", ""]
+    if handler.get("summary"):
+        lines += [handler["summary"], ""]
+    lines += [f"Source: `{route['file']}` (line {handler['line']})", ""]
+    if "delegate" in handler:
+        lines += [f"Delegated to `{handler['delegate']}`.", ""]
+        return lines
+
+    rows = [("Auth", handler["auth"])]
+    for limit in handler["rate_limits"]:
+        rows.append(("Rate limit", describe_limit(limit)))
+    if handler["audit_actions"]:
+        rows.append(("Audit actions", ", ".join(
+            f"`{a}`" for a in handler["audit_actions"])))
+    lines += ["| Property | Value |", "|---|---|"]
+    lines += [f"| {k} | {_cell(v)} |" for k, v in rows]
+    lines.append("")
+
+    path_params = re.findall(r"\[(?:\.\.\.)?(\w+)\]", route["path"])
+    params = ([(p, "Path") for p in path_params]
+              + [(p, "Query") for p in handler["query_params"]]
+              + [(p, "JSON body") for p in handler["body_fields"]]
+              + [(p, "Form field") for p in handler["form_fields"]])
+    if params:
+        lines += ["**Parameters:**", "", "| Parameter | In |", "|---|---|"]
+        lines += [f"| `{name}` | {where} |" for name, where in params]
+        lines.append("")
+
+    if handler["responses"]:
+        lines += ["**Responses:**", "", "| Status | Body |", "|---|---|"]
+        lines += [f"| {r['status']} | `{_cell(r['body'])}` |"
+                  for r in handler["responses"]]
+        lines.append("")
+
+    if handler["sql"] or handler["sql_fragments"]:
+        lines += ["**SQL:**", ""]
+        for stmt in handler["sql"]:
+            lines += ["```sql", stmt["sql"], "```", ""]
+        if handler["sql_fragments"]:
+            lines.append("Dynamic WHERE fragments: " + ", ".join(
+                f"`{_cell(f)}`" for f in handler["sql_fragments"]))
+            lines.append("")
+    return lines
+
+
+def render_markdown(routes):
+    endpoints = sum(len(r["handlers"]) + len(r["delegated"]) for r in routes)
+    lines = [
+        "# API Endpoint Reference",
+        "",
+        "**ASPR Photo Repository Application**",
+        "",
+        f"Generated from {len(routes)} route handlers under `app/api/` "
+        f"({endpoints} endpoints) by `scripts/api_reference.py`. "
+        "Do not edit by hand.",
+        "",
+        "---",
+        "",
+    ]
+    section_no = 0
+    placed = set()
+    for prefix, title in SECTIONS:
+        members = sorted((r for r in routes if r["path"].startswith(prefix)
+                          and r["file"] not in placed),
+                         key=lambda r: r["path"])
+        if not members:
+            continue
+        placed.update(r["file"] for r in members)
+        section_no += 1
+        lines += [f"## {section_no}. {title}", ""]
+        n = 0
+        for route in members:
+            handlers = sorted(route["handlers"] + route["delegated"],
+                              key=lambda h: HTTP_METHODS.index(h["method"]))
+            for handler in handlers:
+                n += 1
+                lines += endpoint_md(route, handler, f"{section_no}.{n}")
+            module_sql = route["module_sql"]
+            if len(module_sql) > MAX_MODULE_SQL:
+                lines += [f"`{route['file']}` also defines {len(module_sql)} "
+                          f"module-level SQL statements (lines "
+                          f"{module_sql[0]['line']}–{module_sql[-1]['line']}).",
+                          ""]
+            elif module_sql:
+                lines += [f"Module-level SQL in `{route['file']}`:", ""]
+                for stmt in module_sql:
+                    lines += ["```sql", stmt["sql"], "```", ""]
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def documented_endpoints(md_path=REFERENCE_MD):
+    """``{(method, path)}`` from '### n.n METHOD[/METHOD] /api/...' headings."""
+    found = set()
+    for m in re.finditer(r"^###\s+[\d.]+\s+([A-Z/]+)\s+(/api/\S+)",
+                         md_path.read_text(encoding="utf-8"), re.MULTILINE):
+        for method in m.group(1).split("/"):
+            found.add((method, m.group(2)))
+    return found
+
+
+def check_drift(routes, md_path=REFERENCE_MD):
+    code = {(h["method"], r["path"]) for r in routes
+            for h in r["handlers"] + r["delegated"]}
+    documented = documented_endpoints(md_path)
+    return sorted(code - documented), sorted(documented - code)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate the API endpoint reference from route.ts files")
+    parser.add_argument("--out", default=str(OUT), help="markdown output path")
+    parser.add_argument("--cache", default=str(CACHE),
+                        help="per-file parse cache ('' to disable)")
+    parser.add_argument("--docx", action="store_true",
+                        help="also render the markdown through md_to_docx")
+    parser.add_argument("--check", action="store_true",
+                        help=f"compare against {REFERENCE_MD.name} headings")
+    parser.add_argument("--json", help="also write the extracted data as JSON")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    routes, stats = scan_routes(API_DIR, args.cache or None)
+    markdown = render_markdown(routes)
+    out = Path(args.out)
+    if not out.exists() or out.read_text(encoding="utf-8") != markdown:
+        out.write_text(markdown, encoding="utf-8")
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"  [OK] {out.name}: {len(routes)} routes "
+          f"({stats['parsed']} parsed, {stats['cached']} cached) in {ms:.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(routes, indent=2),
+                                   encoding="utf-8")
+        print(f"  [OK] {Path(args.json).name}")
+    if args.docx:
+        from generate_all_docx import md_to_docx
+        md_to_docx(out, "API Endpoint Reference",
+                   "Generated from app/api route handlers",
+                   out.with_suffix(".docx").name)
+    if args.check:
+        undocumented, stale = check_drift(routes)
+        for method, path in undocumented:
+            print(f"  [DRIFT] not in {REFERENCE_MD.name}: {method} {path}")
+        for method, path in stale:
+            print(f"  [DRIFT] documented but not in code: {method} {path}")
+        if undocumented or stale:
+            sys.exit(1)
+        print(f"  [OK] {REFERENCE_MD.name} lists every endpoint")
+
+
+if __name__ == "__main__":
+    main()
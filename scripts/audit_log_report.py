@@ -0,0 +1,429 @@
+"""
+Generate the periodic admin_audit_log review report (DOCX).
+
+Streams a CSV or JSONL export of `admin_audit_log` once and keeps only
+fixed-size aggregates: per-administrator and per-action counters, an
+hour-of-day profile, an hourly time series, HyperLogLog sketches for
+distinct IPs and PIN sessions, and Space-Saving top-k counters for the
+noisiest source IPs and PIN sessions. Memory depends on the number of
+administrators, actions and days covered — never on the number of rows —
+so exports of tens of millions of rows are fine.
+
+Anomaly flags raised for review (thresholds below):
+  * administrators deleting or downloading unusually many photos in a day
+  * destructive or download actions outside business hours
+  * administrators seen from many distinct IPs
+  * source IPs with repeated authentication failures / rate limiting
+  * hours whose event volume spikes far above the typical hour
+
+Export query:
+
+    SELECT id, entity_type, entity_id, action, performed_by, ip_address,
+           details, created_at
+    FROM admin_audit_log
+    WHERE created_at >= @from AND created_at < @to
+
+Run:  python scripts/generate_all_docx.py --report audit --input audit.csv
+Requires: pip install python-docx
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import median
+
+from docx.shared import Pt
+
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_para, setup_doc, styled_table,
+)
+from generate_incident_report import normalize_rows, read_export
+
+OUT = DOCS / "ASPR_Photos_Audit_Log_Review.docx"
+
+FIELDS = ("created_at", "performed_by", "action", "entity_type", "ip_address",
+          "details")
+FIELD_ALIASES = {"ip": "ip_address", "timestamp": "created_at",
+                 "user": "performed_by"}
+
+# created_at is GETUTCDATE(); hour-of-day views use this offset
+REVIEW_TZ_OFFSET_HOURS = -5          # US Eastern (standard time)
+BUSINESS_HOURS = (7, 19)             # local [start, end)
+DAILY_DELETE_THRESHOLD = 100         # photos deleted by one admin in a day
+DAILY_DOWNLOAD_THRESHOLD = 1_000     # photos downloaded by one admin in a day
+ADMIN_IP_THRESHOLD = 10              # distinct IPs for one admin
+AUTH_FAILURE_THRESHOLD = 20          # failures / rate limits from one IP
+SPIKE_MIN_EVENTS = 50
+SPIKE_MADS = 6                       # median absolute deviations
+
+HLL_PRECISION = 12                   # 4 KB per sketch, ~1.6% error
+TOP_K = 256
+MAX_FLAG_ROWS = 200
+
+DELETE_ACTIONS = {"photo.deleted", "bulk.delete"}
+DESTRUCTIVE_ACTIONS = DELETE_ACTIONS | {"session.revoked"}
+DOWNLOAD_ACTIONS = {"bulk.download"}
+EDIT_ACTIONS = {"photo.edited", "photo.metadata_updated", "bulk.status",
+                "bulk.tag", "bulk.untag", "tag.created"}
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SKETCHES
+# ══════════════════════════════════════════════════════════════════════
+
+class HyperLogLog:
+    """Distinct-count sketch with 2**p one-byte registers."""
+
+    def __init__(self, p=HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, value):
+        x = int.from_bytes(hashlib.blake2b(value.encode("utf-8"),
+                                           digest_size=8).digest(), "big")
+        rest_bits = 64 - self.p
+        rest = x & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        idx = x >> rest_bits
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)   # linear counting
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in O(k) memory (Metwally et al.).
+
+    Each monitored item's count overestimates its true count by at most
+    its recorded error.
+    """
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self.counts = {}
+        self.errors = {}
+        self._heap = []   # (count, item), possibly stale; one per item
+
+    def add(self, item, n=1):
+        if item in self.counts:
+            self.counts[item] += n
+            return
+        if len(self.counts) < self.k:
+            self.counts[item] = n
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (n, item))
+            return
+        # Evict the current minimum, refreshing stale heap entries first
+        while True:
+            count, victim = self._heap[0]
+            current = self.counts[victim]
+            if current == count:
+                break
+            heapq.heapreplace(self._heap, (current, victim))
+        heapq.heappop(self._heap)
+        del self.counts[victim], self.errors[victim]
+        self.counts[item] = count + n
+        self.errors[item] = count
+        heapq.heappush(self._heap, (count + n, item))
+
+    def top(self, n):
+        """``[(item, count, error)]`` for the ``n`` largest counts."""
+        items = heapq.nlargest(n, self.counts.items(), key=lambda kv: kv[1])
+        return [(item, count, self.errors[item]) for item, count in items]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SINGLE-PASS AGGREGATION
+# ══════════════════════════════════════════════════════════════════════
+
+def principal_kind(performed_by):
+    if performed_by.startswith("pin:"):
+        return "pin"
+    if performed_by in ("", "anonymous", "unknown"):
+        return "anonymous"
+    return "admin"
+
+
+def is_auth_failure(action):
+    return action.endswith("auth_failure") or action.endswith("rate_limited")
+
+
+def photo_count(action, details):
+    """Photos touched by one event (bulk events carry photoCount)."""
+    if not action.startswith("bulk.") or not details:
+        return 1
+    try:
+        return int(json.loads(details).get("photoCount") or 0)
+    except (ValueError, TypeError, AttributeError):
+        return 0
+
+
+def local_hour(hour_key):
+    """(weekday, hour) in review time for a 'YYYY-MM-DDTHH' UTC key."""
+    t = datetime.strptime(hour_key, "%Y-%m-%dT%H") + timedelta(
+        hours=REVIEW_TZ_OFFSET_HOURS)
+    return t.weekday(), t.hour
+
+
+def is_business_hour(hour_key):
+    weekday, hour = local_hour(hour_key)
+    return weekday < 5 and BUSINESS_HOURS[0] <= hour < BUSINESS_HOURS[1]
+
+
+class AdminStats:
+    __slots__ = ("events", "edits", "deleted", "downloaded", "off_hours",
+                 "ips", "last", "per_day")
+
+    def __init__(self):
+        self.events = self.edits = self.deleted = self.downloaded = 0
+        self.off_hours = 0
+        self.ips = HyperLogLog(10)
+        self.last = ""
+        self.per_day = {}   # day -> [deleted, downloaded]
+
+
+class AuditStats:
+    def __init__(self):
+        self.rows = 0
+        self.first = self.last = ""
+        self.actions = Counter()
+        self.action_principals = {}
+        self.kinds = Counter()
+        self.admins = {}
+        self.hourly = Counter()          # 'YYYY-MM-DDTHH' (UTC) -> events
+        self.hourly_failures = Counter()
+        self.ips = HyperLogLog()
+        self.pin_sessions = HyperLogLog()
+        self.failing_ips = SpaceSaving()
+        self.busy_sessions = SpaceSaving()
+        self.failures = 0
+        self._business = {}
+
+    def business_hour(self, hour_key):
+        if hour_key not in self._business:
+            self._business[hour_key] = is_business_hour(hour_key)
+        return self._business[hour_key]
+
+    def add(self, row):
+        created, who, action, _, ip, details = row
+        self.rows += 1
+        when = created.replace(" ", "T")
+        hour_key = when[:13]
+        if len(hour_key) == 13:
+            self.hourly[hour_key] += 1
+            if not self.first or when < self.first:
+                self.first = when
+            if when > self.last:
+                self.last = when
+
+        self.actions[action] += 1
+        if action not in self.action_principals:
+            self.action_principals[action] = HyperLogLog(10)
+        self.action_principals[action].add(who)
+        if ip:
+            self.ips.add(ip)
+
+        kind = principal_kind(who)
+        self.kinds[kind] += 1
+        if is_auth_failure(action):
+            self.failures += 1
+            self.failing_ips.add(ip or "unknown")
+            if len(hour_key) == 13:
+                self.hourly_failures[hour_key] += 1
+
+        if kind == "pin":
+            self.pin_sessions.add(who)
+            self.busy_sessions.add(who)
+        elif kind == "admin":
+            self._add_admin(who, action, ip, details, when, hour_key)
+
+    def _add_admin(self, who, action, ip, details, when, hour_key):
+        admin = self.admins.get(who)
+        if admin is None:
+            admin = self.admins[who] = AdminStats()
+        admin.events += 1
+        if ip:
+            admin.ips.add(ip)
+        if when > admin.last:
+            admin.last = when
+        if action in EDIT_ACTIONS:
+            admin.edits += 1
+        if action not in DESTRUCTIVE_ACTIONS and action not in DOWNLOAD_ACTIONS:
+            return
+        deleted = photo_count(action, details) if action in DELETE_ACTIONS else 0
+        downloaded = (photo_count(action, details)
+                      if action in DOWNLOAD_ACTIONS else 0)
+        admin.deleted += deleted
+        admin.downloaded += downloaded
+        if len(hour_key) == 13:
+            if not self.business_hour(hour_key):
+                admin.off_hours += 1
+            day = admin.per_day.setdefault(hour_key[:10], [0, 0])
+            day[0] += deleted
+            day[1] += downloaded
+
+
+def analyze(rows):
+    stats = AuditStats()
+    for row in rows:
+        stats.add(row)
+    return stats
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  ANOMALY FLAGS
+# ══════════════════════════════════════════════════════════════════════
+
+def find_anomalies(stats):
+    """``[(severity, subject, finding, detail)]``, most severe first."""
+    flags = []
+    for who, a in stats.admins.items():
+        for day, (deleted, downloaded) in sorted(a.per_day.items()):
+            if deleted >= DAILY_DELETE_THRESHOLD:
+                flags.append(("High", who, "Mass deletion",
+                              f"{deleted:,} photos deleted on {day}"))
+            if downloaded >= DAILY_DOWNLOAD_THRESHOLD:
+                flags.append(("High", who, "Bulk download volume",
+                              f"{downloaded:,} photos downloaded on {day}"))
+        if a.off_hours:
+            flags.append(("Medium", who, "Off-hours destructive/download",
+                          f"{a.off_hours:,} events outside "
+                          f"{BUSINESS_HOURS[0]:02d}:00–{BUSINESS_HOURS[1]:02d}:00 "
+                          f"weekdays"))
+        ips = a.ips.count()
+        if ips >= ADMIN_IP_THRESHOLD:
+            flags.append(("Medium", who, "Many source IPs",
+                          f"~{ips:,} distinct IPs"))
+
+    for ip, count, error in stats.failing_ips.top(TOP_K):
+        if count - error >= AUTH_FAILURE_THRESHOLD:
+            flags.append(("High" if count >= 5 * AUTH_FAILURE_THRESHOLD
+                          else "Medium", ip, "Repeated auth failures",
+                          f"{count - error:,}+ failures or rate limits"))
+
+    counts = list(stats.hourly.values())
+    if counts:
+        mid = median(counts)
+        mad = median(abs(c - mid) for c in counts) or 1
+        limit = max(SPIKE_MIN_EVENTS, mid + SPIKE_MADS * mad)
+        for hour_key, count in sorted(stats.hourly.items()):
+            if count >= limit:
+                flags.append(("Low", f"{hour_key.replace('T', ' ')}:00 UTC",
+                              "Hourly volume spike",
+                              f"{count:,} events (typical {mid:,.0f})"))
+
+    order = {"High": 0, "Medium": 1, "Low": 2}
+    return sorted(flags, key=lambda f: (order[f[0]], f[1]))
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  REPORT
+# ══════════════════════════════════════════════════════════════════════
+
+def fmt_when(value):
+    return value.replace("T", " ")[:16] if value else "—"
+
+
+def build_audit_report(input_path, out_path=None):
+    """Write the audit log review for an export; return its path."""
+    out_path = Path(out_path) if out_path else OUT
+    stats = analyze(normalize_rows(read_export(input_path), FIELDS,
+                                   FIELD_ALIASES))
+    flags = find_anomalies(stats)
+    print(f"  Audit log: {stats.rows:,} events, {len(stats.admins):,} "
+          f"administrators, {len(flags):,} flags")
+
+    doc = setup_doc("Audit Log Review",
+                    f"{fmt_when(stats.first)} to {fmt_when(stats.last)} UTC")
+    tz = f"UTC{REVIEW_TZ_OFFSET_HOURS:+d}"
+
+    add_heading_styled(doc, "1. Summary", level=2)
+    add_para(doc, f"Source export: {Path(input_path).name}", italic=True,
+             size=Pt(9))
+    severities = Counter(f[0] for f in flags)
+    styled_table(doc, ["Measure", "Value"], [
+        ["Events", f"{stats.rows:,}"],
+        ["Period (UTC)", f"{fmt_when(stats.first)} to {fmt_when(stats.last)}"],
+        ["Administrator events", f"{stats.kinds['admin']:,} from "
+                                 f"{len(stats.admins):,} administrators"],
+        ["PIN session events", f"{stats.kinds['pin']:,} from "
+                               f"~{stats.pin_sessions.count():,} sessions"],
+        ["Anonymous events", f"{stats.kinds['anonymous']:,}"],
+        ["Auth failures / rate limits", f"{stats.failures:,}"],
+        ["Distinct source IPs", f"~{stats.ips.count():,}"],
+        ["Flags", f"{severities['High']} high, {severities['Medium']} medium, "
+                  f"{severities['Low']} low"],
+    ], col_widths=[40, 60])
+
+    add_heading_styled(doc, "2. Findings", level=2)
+    if flags:
+        if len(flags) > MAX_FLAG_ROWS:
+            add_para(doc, f"First {MAX_FLAG_ROWS} of {len(flags):,} flags.",
+                     italic=True, size=Pt(9))
+        styled_table(doc, ["Severity", "Subject", "Finding", "Detail"],
+                     [list(f) for f in flags[:MAX_FLAG_ROWS]],
+                     col_widths=[12, 30, 25, 33])
+    else:
+        add_para(doc, "No anomalies met the review thresholds.", italic=True)
+
+    add_heading_styled(doc, "3. Activity by Administrator", level=2)
+    styled_table(doc, ["Administrator", "Events", "Edits", "Deleted",
+                       "Downloaded", "Off-hours", "IPs", "Last Seen"], [
+        [who, f"{a.events:,}", f"{a.edits:,}", f"{a.deleted:,}",
+         f"{a.downloaded:,}", f"{a.off_hours:,}", f"~{a.ips.count():,}",
+         fmt_when(a.last)]
+        for who, a in sorted(stats.admins.items(),
+                             key=lambda kv: -kv[1].events)
+    ], col_widths=[28, 10, 9, 10, 11, 10, 7, 15])
+
+    add_heading_styled(doc, "4. Activity by Action", level=2)
+    styled_table(doc, ["Action", "Events", "Share", "Principals"], [
+        [action, f"{n:,}", f"{n / stats.rows:.1%}",
+         f"~{stats.action_principals[action].count():,}"]
+        for action, n in stats.actions.most_common()
+    ], col_widths=[40, 20, 20, 20])
+
+    add_heading_styled(doc, f"5. Activity by Hour of Day ({tz})", level=2)
+    by_hour, fail_by_hour = Counter(), Counter()
+    for hour_key, n in stats.hourly.items():
+        by_hour[local_hour(hour_key)[1]] += n
+    for hour_key, n in stats.hourly_failures.items():
+        fail_by_hour[local_hour(hour_key)[1]] += n
+    peak = max(by_hour.values(), default=0) or 1
+    styled_table(doc, ["Hour", "Events", "Auth Failures", "Volume"], [
+        [f"{h:02d}:00", f"{by_hour[h]:,}", f"{fail_by_hour[h]:,}",
+         "█" * round(20 * by_hour[h] / peak)]
+        for h in range(24)
+    ], col_widths=[14, 18, 18, 50])
+
+    add_heading_styled(doc, "6. Top Sources", level=2)
+    add_para(doc, "Counts from Space-Saving sketches are upper bounds; the "
+                  "± column is the largest possible overcount.",
+             italic=True, size=Pt(9))
+    styled_table(doc, ["Source IP", "Failures / Rate Limits", "±"], [
+        [ip, f"{count:,}", f"{error:,}"]
+        for ip, count, error in stats.failing_ips.top(15)
+    ], col_widths=[40, 40, 20])
+    styled_table(doc, ["PIN Session", "Events", "±"], [
+        [who, f"{count:,}", f"{error:,}"]
+        for who, count, error in stats.busy_sessions.top(15)
+    ], col_widths=[50, 30, 20])
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    doc.save(str(out_path))
+    size_kb = os.path.getsize(out_path) / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:,.1f} KB)")
+    return out_path
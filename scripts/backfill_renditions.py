@@ -0,0 +1,304 @@
+"""
+Backfill missing photo renditions in a local blob-storage mirror.
+
+Walks a local copy of the `aspr-photos` container and, for every
+`{photo_id}/original` lacking any of `renditions/{photo_id}/thumb_sm.webp`,
+`thumb_md.webp` or `web.webp`, generates them with the same specs as
+`POST /api/admin/photos/upload` (see RENDITIONS). Each original is decoded
+once per run and every missing variant is derived from that decode, with
+one photo per task in a process pool sized to the CPU count.
+
+Each generated variant is appended to a JSONL manifest whose rows match the
+`photo_renditions` columns, ready to load with OPENJSON / BULK INSERT.
+The worker appends a rendition's row before moving the finished file into
+place, and a run starts by dropping rows whose file never landed, so an
+interrupted run can simply be restarted: already-present files are skipped
+and every rendition on disk that the backfill wrote keeps exactly one row.
+
+Like the upload route (sharp without .rotate()), EXIF orientation is not
+applied, so backfilled renditions match the ones the app produces.
+
+Run:  python scripts/backfill_renditions.py BLOB_MIRROR [--manifest rows.jsonl]
+Requires: pip install pillow
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+# Mirrors RENDITIONS in app/api/admin/photos/upload/route.ts
+# (variant, width, height, fit, quality); height None = width-bound only.
+RENDITIONS = [
+    ("thumb_sm", 200, 150, "cover", 75),
+    ("thumb_md", 400, 300, "inside", 80),
+    ("web", 1200, None, "inside", 85),
+]
+
+RENDITION_DIR = "renditions"
+ORIGINAL_NAME = "original"
+INFLIGHT_PER_WORKER = 4
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  BLOB MIRROR LAYOUT
+# ══════════════════════════════════════════════════════════════════════
+
+def rendition_blob_path(photo_id, variant):
+    """Same as getRenditionBlobPath() in lib/blobHelpers.ts."""
+    return f"{RENDITION_DIR}/{photo_id}/{variant}.webp"
+
+
+def iter_originals(mirror):
+    """Yield photo ids that have a ``{id}/original`` blob in the mirror."""
+    with os.scandir(mirror) as entries:
+        for entry in entries:
+            if (entry.is_dir() and entry.name != RENDITION_DIR
+                    and os.path.isfile(os.path.join(entry.path, ORIGINAL_NAME))):
+                yield entry.name
+
+
+def missing_variants(mirror, photo_id):
+    return [spec for spec in RENDITIONS
+            if not (mirror / rendition_blob_path(photo_id, spec[0])).exists()]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  RENDERING (worker process)
+# ══════════════════════════════════════════════════════════════════════
+
+def resize_like_sharp(img, width, height, fit, resample=Image.LANCZOS):
+    """Approximate sharp.resize(w, h, {fit, withoutEnlargement: true}).
+
+    sharp's default kernel is lanczos3; ``resample`` lets the encoding
+    sweep compare others.
+    """
+    if fit == "cover":
+        if img.width < width or img.height < height:
+            return img.copy()
+        return ImageOps.fit(img, (width, height), resample)
+    out = img.copy()
+    out.thumbnail((width, height or img.height), resample)
+    return out
+
+
+def encode_webp(img, quality):
+    if img.mode not in ("RGB", "RGBA"):
+        has_alpha = img.mode in ("LA", "PA") or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    out = io.BytesIO()
+    img.save(out, "WEBP", quality=quality, method=4)
+    return out.getvalue(), img.width, img.height
+
+
+def append_row(manifest_path, row):
+    """Append one manifest line with a single O_APPEND write.
+
+    Lines are far below the size at which appends from several worker
+    processes could interleave.
+    """
+    fd = os.open(manifest_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, (json.dumps(row) + "\n").encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def render_photo(mirror, photo_id, specs, manifest_path):
+    """Create the missing renditions of one photo from a single decode.
+
+    Each row is appended to the manifest before its file is moved into
+    place. Returns ``(photo_id, manifest_rows, error)``.
+    """
+    rows = []
+    try:
+        with Image.open(mirror / photo_id / ORIGINAL_NAME) as img:
+            if img.format == "JPEG":
+                # The largest rendition is 1200px wide; let libjpeg decode
+                # at a reduced scale that still covers it.
+                img.draft("RGB", (1200, 1200 * img.height // max(img.width, 1)))
+            img.load()
+            # Smaller variants come from the web-sized image when it is
+            # large enough, which is much cheaper than resizing the original.
+            base = resize_like_sharp(img, 1200, None, "inside")
+
+            for variant, width, height, fit, quality in specs:
+                source = base if variant == "web" or (
+                    base.width >= width and base.height >= (height or 0)) else img
+                data, w, h = encode_webp(
+                    resize_like_sharp(source, width, height, fit), quality)
+
+                blob_path = rendition_blob_path(photo_id, variant)
+                target = mirror / blob_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(target.name + ".partial")
+                tmp.write_bytes(data)
+
+                row = {
+                    "photo_id": photo_id,
+                    "variant_type": variant,
+                    "blob_path": blob_path,
+                    "width": w,
+                    "height": h,
+                    "file_size": len(data),
+                    "mime_type": "image/webp",
+                }
+                append_row(manifest_path, row)
+                os.replace(tmp, target)
+                rows.append(row)
+    except (OSError, ValueError) as e:
+        return photo_id, rows, str(e)
+    return photo_id, rows, None
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  MANIFEST RECOVERY
+# ══════════════════════════════════════════════════════════════════════
+
+def prune_manifest(mirror, manifest_path):
+    """Drop manifest rows whose rendition is not on disk; return the count.
+
+    A run killed between a worker's row append and its rename leaves a row
+    for a file that never landed (or a torn last line). That variant is
+    still missing, so it will be rendered again and get a fresh row.
+    """
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        return 0
+    tmp = manifest_path.with_name(manifest_path.name + ".partial")
+    dropped = 0
+    with open(manifest_path, encoding="utf-8") as src, \
+            open(tmp, "w", encoding="utf-8") as dst:
+        for line in src:
+            try:
+                row = json.loads(line)
+                present = (mirror / row["blob_path"]).exists()
+            except (ValueError, KeyError, TypeError):
+                present = False
+            if present and line.endswith("\n"):
+                dst.write(line)
+            else:
+                dropped += 1
+    if dropped:
+        os.replace(tmp, manifest_path)
+    else:
+        tmp.unlink()
+    return dropped
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  DRIVER
+# ══════════════════════════════════════════════════════════════════════
+
+def backfill(mirror, manifest_path, workers=None, limit=None, dry_run=False):
+    """Generate missing renditions under ``mirror``; return summary counts."""
+    mirror = Path(mirror)
+    workers = workers or os.cpu_count() or 1
+    stats = {"scanned": 0, "complete": 0, "photos": 0, "renditions": 0,
+             "errors": 0, "pruned": 0}
+    t0 = time.perf_counter()
+
+    def todo():
+        for photo_id in iter_originals(mirror):
+            stats["scanned"] += 1
+            specs = missing_variants(mirror, photo_id)
+            if not specs:
+                stats["complete"] += 1
+                continue
+            yield photo_id, specs
+
+    if dry_run:
+        for n, (photo_id, specs) in enumerate(todo(), start=1):
+            if limit and n > limit:
+                break
+            stats["photos"] += 1
+            stats["renditions"] += len(specs)
+        return stats
+
+    stats["pruned"] = prune_manifest(mirror, manifest_path)
+    if stats["pruned"]:
+        print(f"  Dropped {stats['pruned']:,} manifest rows with no file "
+              f"(interrupted run)")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        submitted = 0
+
+        def drain():
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                photo_id, rows, error = future.result()
+                # Renditions written before a failure are on disk and in
+                # the manifest, so they count; the photo itself does not.
+                stats["renditions"] += len(rows)
+                if error:
+                    stats["errors"] += 1
+                    print(f"  [ERR] {photo_id}: {error}")
+                else:
+                    stats["photos"] += 1
+                processed = stats["photos"] + stats["errors"]
+                if processed % 1000 == 0:
+                    rate = processed / (time.perf_counter() - t0)
+                    print(f"  ... {processed:,} photos ({rate:,.1f}/s)")
+
+        for photo_id, specs in todo():
+            if limit and submitted >= limit:
+                break
+            pending.add(pool.submit(render_photo, mirror, photo_id, specs,
+                                     manifest_path))
+            submitted += 1
+            if len(pending) >= workers * INFLIGHT_PER_WORKER:
+                drain()
+        while pending:
+            drain()
+
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate missing photo renditions in a local blob mirror")
+    parser.add_argument("mirror", help="local copy of the aspr-photos container")
+    parser.add_argument("--manifest", default="rendition_manifest.jsonl",
+                        help="JSONL of photo_renditions rows (appended)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="process at most N photos this run")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only count what is missing")
+    args = parser.parse_args()
+
+    if not Path(args.mirror).is_dir():
+        parser.error(f"{args.mirror} is not a directory")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Rendition Backfill")
+    print("=" * 60)
+    stats = backfill(args.mirror, args.manifest, workers=args.workers,
+                     limit=args.limit, dry_run=args.dry_run)
+    print()
+    print(f"  Originals scanned:  {stats['scanned']:,}")
+    print(f"  Already complete:   {stats['complete']:,}")
+    verb = "To backfill" if args.dry_run else "Backfilled"
+    print(f"  {verb}:{' ' * (19 - len(verb))}{stats['photos']:,} photos, "
+          f"{stats['renditions']:,} renditions")
+    if not args.dry_run:
+        print(f"  Errors:             {stats['errors']:,}")
+        processed = stats["photos"] + stats["errors"]
+        rate = processed / stats["seconds"] if stats["seconds"] else 0
+        print(f"  Elapsed:            {stats['seconds']:.1f} s "
+              f"({rate:,.1f} photos/s)")
+        print(f"  Manifest:           {args.manifest}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""
+Bulk-upload a directory of field photos through the PIN upload API.
+
+Authenticates once with `POST /api/auth/validate-pin`, then uploads every
+JPEG/PNG/WebP under the directory to `POST /api/photos/upload` from a few
+concurrent workers sharing one keep-alive connection pool, with the same
+form fields the upload page sends (notes, incidentId, latitude, longitude,
+locationName). Files are streamed from disk, not read into memory.
+
+Every file is hashed (SHA-256, on a thread pool) before anything is sent:
+files whose content was already uploaded — earlier in this run or in a
+previous one — are skipped. Results are appended to a JSONL journal in the
+photo directory, so an interrupted run can simply be started again.
+
+The upload route allows 50 uploads per hour per client IP and answers a
+429 without Retry-After, then locks the IP out for 15 minutes. The
+uploader therefore paces itself to the same fixed window (--max-per-hour)
+and, on a 429, waits out the lockout and the rest of the window before
+trying again; a Retry-After header is honoured when one is sent in
+seconds (an HTTP-date falls back to that same pause). A 429 never uses up
+one of a file's attempts. At the
+default limit a 5,000-photo backlog needs about 100 hours, so ask an
+administrator to raise the limit for large backlogs and pass the new value.
+
+Run:  python scripts/bulk_upload.py PHOTO_DIR --base-url https://HOST --pin 123456 --incident-id HU-2026-001
+Requires: pip install aiohttp
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+
+PIN_PATH = "/api/auth/validate-pin"
+UPLOAD_PATH = "/api/photos/upload"
+
+# validation.validateFile in lib/security.ts
+CONTENT_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+                 ".png": "image/png", ".webp": "image/webp"}
+MAX_FILE_BYTES = 50 * 1024 * 1024
+INCIDENT_ID_RE = re.compile(r"^[a-zA-Z0-9\-_]{1,50}$")
+UNSAFE_NAME_CHARS = re.compile(r"[^\w\s\-.]", re.ASCII)
+
+JOURNAL_NAME = ".aspr_upload_journal.jsonl"
+UPLOAD_WINDOW_S = 60 * 60     # upload:{ip} limiter window
+LOCKOUT_S = 15 * 60           # rateLimit() default lockout
+WINDOW_MARGIN_S = 5
+TOKEN_REFRESH_S = 23 * 60 * 60  # JWTs from validate-pin expire after 24h
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_S = 2.0
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  FILES & JOURNAL
+# ══════════════════════════════════════════════════════════════════════
+
+def find_files(root):
+    """Uploadable image files under ``root``, sorted by relative path."""
+    root = Path(root)
+    return sorted(p for p in root.rglob("*")
+                  if p.is_file() and p.suffix.lower() in CONTENT_TYPES
+                  and not p.name.startswith("."))
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hash_files(paths, workers=8):
+    """``[(path, sha256, size)]`` for ``paths``, hashed on a thread pool."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = pool.map(sha256_file, paths)
+        return [(p, d, p.stat().st_size) for p, d in zip(paths, digests)]
+
+
+def upload_file_name(path):
+    """File name the upload route's filename check will accept."""
+    return UNSAFE_NAME_CHARS.sub("_", path.name)
+
+
+class Journal:
+    """Append-only JSONL record of upload outcomes, keyed by SHA-256.
+
+    Only "uploaded" entries make a file skippable; "rejected" and
+    "failed" entries are informational and are retried on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.uploaded = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+                    if entry.get("status") == "uploaded":
+                        self.uploaded[entry["sha256"]] = entry
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def record(self, entry):
+        entry["at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if entry["status"] == "uploaded":
+            self.uploaded[entry["sha256"]] = entry
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  AUTH & PACING
+# ══════════════════════════════════════════════════════════════════════
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"rate limited (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+class AuthError(Exception):
+    """validate-pin gave no usable token (e.g. an HTML error page)."""
+
+
+def parse_retry_after(value):
+    """Retry-After in whole seconds, or None when absent or an HTTP-date."""
+    try:
+        seconds = int(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds >= 0 else None
+
+
+class PinSession:
+    """JWT from validate-pin, renewed before it expires or when rejected."""
+
+    def __init__(self, base_url, pin):
+        self.base_url = base_url
+        self.pin = pin
+        self.token = None
+        self.team_name = None
+        self._issued = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, http):
+        async with self._lock:
+            if self.token and time.monotonic() - self._issued < TOKEN_REFRESH_S:
+                return self.token
+            while True:
+                async with http.post(self.base_url + PIN_PATH,
+                                     json={"pin": self.pin}) as resp:
+                    try:
+                        body = await resp.json(content_type=None)
+                    except ValueError:
+                        body = None
+                    if resp.status == 429:
+                        wait_s = parse_retry_after(
+                            resp.headers.get("Retry-After"))
+                        if wait_s is None:
+                            wait_s = LOCKOUT_S
+                        print(f"  [WAIT] PIN attempts rate limited; "
+                              f"retrying in {wait_s} s")
+                        await asyncio.sleep(wait_s)
+                        continue
+                    if not isinstance(body, dict):
+                        raise AuthError(f"validate-pin returned HTTP "
+                                        f"{resp.status} without a JSON body")
+                    if resp.status != 200:
+                        raise SystemExit(f"  [ERR] PIN rejected: "
+                                         f"{body.get('error', resp.status)}")
+                    if not body.get("token"):
+                        raise AuthError("validate-pin returned no token")
+                self.token = body["token"]
+                self.team_name = body.get("teamName")
+                self._issued = time.monotonic()
+                return self.token
+
+    def invalidate(self, token):
+        if self.token == token:
+            self.token = None
+
+
+class UploadPacer:
+    """Client-side copy of the upload:{ip} fixed window.
+
+    The server's window starts with the first upload and allows
+    ``per_hour`` uploads; the pacer counts the uploads it starts the same
+    way and sleeps until the window has rolled over instead of drawing a
+    429 and a 15-minute lockout. ``per_hour=0`` disables pacing.
+    """
+
+    def __init__(self, per_hour):
+        self.per_hour = per_hour
+        self.window_end = 0.0
+        self.count = 0
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                if not self.per_hour:
+                    return
+                if now > self.window_end:
+                    self.window_end = now + UPLOAD_WINDOW_S + WINDOW_MARGIN_S
+                    self.count = 0
+                if self.count < self.per_hour:
+                    self.count += 1
+                    return
+                wait_s = self.window_end - now
+                print(f"  [WAIT] {self.per_hour} uploads this hour; next window "
+                      f"in {wait_s / 60:.0f} min")
+                await asyncio.sleep(wait_s)
+
+    def rate_limited(self, retry_after):
+        """Pause every worker after a 429."""
+        now = time.monotonic()
+        if retry_after is not None:
+            until = now + retry_after
+        else:
+            # No Retry-After: sit out the lockout, and the rest of the
+            # window too, since one more upload inside it locks again.
+            until = now + LOCKOUT_S
+            if self.per_hour:
+                until = max(until, self.window_end)
+            else:
+                until = max(until, now + UPLOAD_WINDOW_S)
+        if until > self.paused_until:
+            self.paused_until = until
+            print(f"  [WAIT] Upload rate limited; pausing "
+                  f"{(until - now) / 60:.0f} min")
+        self.window_end = 0.0
+        self.count = 0
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  UPLOADER
+# ══════════════════════════════════════════════════════════════════════
+
+class BulkUploader:
+    def __init__(self, base_url, pin, fields, journal, workers=4,
+                 max_per_hour=50, timeout=600):
+        self.base_url = base_url.rstrip("/")
+        self.auth = PinSession(self.base_url, pin)
+        self.fields = fields
+        self.journal = journal
+        self.workers = workers
+        self.pacer = UploadPacer(max_per_hour)
+        self.timeout = timeout
+        self.stats = Counter()
+        self.bytes_sent = 0
+
+    async def post_file(self, http, token, path):
+        """One upload attempt; return ``(status, body, retry_after)``."""
+        with open(path, "rb") as f:
+            form = aiohttp.FormData()
+            form.add_field("photo", f, filename=upload_file_name(path),
+                           content_type=CONTENT_TYPES[path.suffix.lower()])
+            for name, value in self.fields.items():
+                if value not in (None, ""):
+                    form.add_field(name, str(value))
+            async with http.post(self.base_url + UPLOAD_PATH, data=form,
+                                 headers={"Authorization": f"Bearer {token}"}
+                                 ) as resp:
+                try:
+                    body = await resp.json(content_type=None)
+                except ValueError:
+                    body = {}
+                return (resp.status, body,
+                        parse_retry_after(resp.headers.get("Retry-After")))
+
+    async def upload_one(self, http, path, rel, digest, size):
+        entry = {"file": rel, "sha256": digest, "size": size}
+        attempt = 0
+        while True:
+            await self.pacer.acquire()
+            token = None
+            try:
+                token = await self.auth.get(http)
+                status, body, retry_after = await self.post_file(
+                    http, token, path)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status, body, retry_after = None, {"error": type(e).__name__}, None
+            except AuthError as e:
+                status, body, retry_after = None, {"error": str(e)}, None
+
+            if status == 200:
+                self.bytes_sent += size
+                self.journal.record({**entry, "status": "uploaded",
+                                     "photoId": body.get("photoId")})
+                return "uploaded"
+            if status == 429:
+                self.pacer.rate_limited(retry_after)
+                continue  # does not count against the attempts
+            if status == 401:
+                self.auth.invalidate(token)
+            elif status == 400:
+                # Validation failure: retrying the same file cannot help
+                self.journal.record({**entry, "status": "rejected",
+                                     "error": body.get("error")})
+                print(f"  [ERR] {rel}: {body.get('error')}")
+                return "rejected"
+            attempt += 1
+            if attempt >= MAX_ATTEMPTS:
+                break
+            await asyncio.sleep(BACKOFF_BASE_S * 2 ** (attempt - 1)
+                                * random.uniform(0.5, 1.5))
+
+        self.journal.record({**entry, "status": "failed",
+                             "error": body.get("error") or status})
+        print(f"  [ERR] {rel}: gave up after {MAX_ATTEMPTS} attempts "
+              f"({body.get('error') or status})")
+        return "failed"
+
+    async def run(self, items, root):
+        queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+        total = len(items)
+        t0 = time.perf_counter()
+
+        async def worker():
+            while True:
+                try:
+                    path, digest, size = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                rel = path.relative_to(root).as_posix()
+                outcome = await self.upload_one(http, path, rel, digest, size)
+                self.stats[outcome] += 1
+                done = sum(self.stats.values())
+                if outcome == "uploaded" and (done % 25 == 0 or done == total):
+                    rate = self.bytes_sent / 1048576 / (time.perf_counter() - t0)
+                    print(f"  ... {done:,}/{total:,} files ({rate:,.1f} MB/s)")
+
+        connector = aiohttp.TCPConnector(limit=self.workers, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=timeout) as http:
+            await asyncio.gather(*(worker() for _ in range(self.workers)))
+        self.stats["seconds"] = time.perf_counter() - t0
+
+
+def plan_uploads(root, journal, hash_workers=8):
+    """Hash every file and drop those already uploaded or repeated.
+
+    Returns ``(items, counts)`` with items as ``(path, sha256, size)``.
+    """
+    counts = Counter()
+    items = []
+    seen = set()
+    for path, digest, size in hash_files(find_files(root), hash_workers):
+        if size > MAX_FILE_BYTES or size == 0:
+            counts["too_large" if size else "empty"] += 1
+            print(f"  [SKIP] {path.name}: {size / 1048576:.1f} MB "
+                  f"(limit {MAX_FILE_BYTES // 1048576} MB)" if size
+                  else f"  [SKIP] {path.name}: empty file")
+        elif digest in journal.uploaded:
+            counts["already_uploaded"] += 1
+        elif digest in seen:
+            counts["duplicate"] += 1
+        else:
+            seen.add(digest)
+            items.append((path, digest, size))
+    return items, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Upload a directory of photos with an upload PIN")
+    parser.add_argument("photo_dir")
+    parser.add_argument("--base-url", required=True,
+                        help="site root, e.g. https://photos.example.gov")
+    parser.add_argument("--pin", required=True, help="6-digit upload PIN")
+    parser.add_argument("--incident-id", help="e.g. HU-2026-001")
+    parser.add_argument("--notes")
+    parser.add_argument("--latitude", type=float)
+    parser.add_argument("--longitude", type=float)
+    parser.add_argument("--location-name")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="concurrent uploads")
+    parser.add_argument("--max-per-hour", type=int, default=50,
+                        help="client-side pacing to the server's upload "
+                             "limit (0 = no pacing)")
+    parser.add_argument("--journal", help=f"default: PHOTO_DIR/{JOURNAL_NAME}")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="hash and list what would be uploaded")
+    args = parser.parse_args()
+
+    root = Path(args.photo_dir)
+    if not root.is_dir():
+        parser.error(f"{args.photo_dir} is not a directory")
+    if not re.fullmatch(r"\d{6}", args.pin):
+        parser.error("PIN must be exactly 6 digits")
+    if args.incident_id and not INCIDENT_ID_RE.match(args.incident_id):
+        parser.error("incident ID: up to 50 letters, digits, '-' or '_'")
+    if (args.latitude is None) != (args.longitude is None):
+        parser.error("--latitude and --longitude go together")
+    if args.notes and len(args.notes) > 1000:
+        parser.error("notes must be under 1000 characters")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Bulk Upload")
+    print("=" * 60)
+    journal_path = Path(args.journal) if args.journal else root / JOURNAL_NAME
+    with Journal(journal_path) as journal:
+        items, counts = plan_uploads(root, journal)
+        total_mb = sum(size for _, _, size in items) / 1048576
+        print(f"  To upload: {len(items):,} files ({total_mb:,.1f} MB); "
+              f"already uploaded: {counts['already_uploaded']:,}; "
+              f"duplicates: {counts['duplicate']:,}")
+        if args.max_per_hour and len(items) > args.max_per_hour:
+            print(f"  Paced to {args.max_per_hour}/hour: about "
+                  f"{len(items) / args.max_per_hour:,.1f} hours")
+        if args.dry_run or not items:
+            print("=" * 60)
+            return
+
+        fields = {
+            "notes": args.notes,
+            "incidentId": args.incident_id,
+            "latitude": args.latitude,
+            "longitude": args.longitude,
+            "locationName": args.location_name,
+        }
+        uploader = BulkUploader(args.base_url, args.pin, fields, journal,
+                                workers=args.workers,
+                                max_per_hour=args.max_per_hour)
+        try:
+            asyncio.run(uploader.run(items, root))
+        except KeyboardInterrupt:
+            print("\n  Interrupted — run again to resume")
+        stats = uploader.stats
+
+    print()
+    print(f"  Uploaded:  {stats['uploaded']:,} files "
+          f"({uploader.bytes_sent / 1048576:,.1f} MB)")
+    print(f"  Rejected:  {stats['rejected']:,}")
+    print(f"  Failed:    {stats['failed']:,} (retried on the next run)")
+    if stats["seconds"]:
+        print(f"  Elapsed:   {stats['seconds']:,.1f} s")
+    print(f"  Journal:   {journal_path}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
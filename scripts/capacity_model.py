@@ -0,0 +1,546 @@
+"""
+Capacity plan for blob storage, SQL and CDN egress.
+
+Projects 12–36 months of growth with a vectorized NumPy Monte Carlo:
+
+  uploads   a steady baseline (Poisson, growing yearly) plus incident
+            surges — incidents arrive by a hurricane-season calendar,
+            each brings a lognormal number of photos spread over the
+            following weeks; scenarios scale incident rate and size
+  blob      originals drawn from the export's file-size distribution
+            (capped at the §8 upload limit) plus every rendition in the
+            §8 rendition set of docs/06_API_Data_Reference.md, sized by
+            pixels x WebP bytes-per-pixel
+  SQL       rows per photo for each table, with row and index bytes
+            estimated from the column types and indexes in the schema
+            (Deployment Guide base DDL + migration route, as the query
+            benchmark builds it)
+  CDN       rendition views per photo, decaying with the photo's age,
+            over the growing catalogue
+
+A photos export (CSV/JSONL with file_size, created_at, incident_id)
+calibrates file sizes, the baseline rate and incident sizes; without
+one the defaults below are used. Results are P10/P50/P90 bands per
+scenario, written as a DOCX section (charts + tables) that other reports
+can include with `add_capacity_section`.
+
+Run:  python scripts/capacity_model.py [--export photos.csv] [--months 36]
+      python scripts/generate_all_docx.py --report capacity --input photos.csv
+Requires: pip install numpy pillow python-docx
+"""
+
+import argparse
+import json
+import math
+import re
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+from docx.shared import Pt
+
+from backfill_renditions import RENDITIONS
+from charts import line_chart_png
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_image, add_para, setup_doc, styled_table,
+)
+from generate_incident_report import normalize_rows, read_export
+from schema_reference import REFERENCE_MD, table_indexes
+from sqlite_workload_bench import bench_schema
+
+OUT = DOCS / "ASPR_Photos_Capacity_Plan.docx"
+
+RUNS = 4000
+MONTHS = 36
+PERCENTILES = (10, 50, 90)
+HORIZONS = (12, 24, 36)
+
+# Upload defaults (used when there is no export, or it is too short)
+BASELINE_PER_MONTH = 1500          # photos outside incident surges
+BASELINE_GROWTH = 0.20             # per year
+INCIDENTS_PER_YEAR = 6
+INCIDENT_MEDIAN_PHOTOS = 8000
+INCIDENT_SIGMA = 1.0               # lognormal sigma of photos per incident
+INCIDENT_SPREAD = (0.6, 0.3, 0.1)  # share of an incident's photos by month
+ORIGINAL_MEDIAN_MB = 3.5
+ORIGINAL_SIGMA = 0.6
+MIN_EXPORT_MONTHS = 6
+# Relative incident likelihood by calendar month (Atlantic season Jun–Nov)
+SEASON = np.array([0.3, 0.3, 0.4, 0.5, 0.6, 1.4, 1.8, 2.6, 3.0, 1.8, 1.0, 0.3])
+SCENARIOS = {
+    # name -> (incident rate multiplier, incident size multiplier)
+    "expected": (1.0, 1.0),
+    "active season": (1.5, 1.3),
+    "severe": (2.0, 2.0),
+}
+
+# Renditions
+WEBP_BYTES_PER_PIXEL = 0.15
+WEB_ASPECT = 0.75                  # height/width for the width-bound variant
+LEGACY_THUMBNAIL = (400, 300)      # `{id}/thumbnail` from PIN uploads
+PIN_UPLOAD_SHARE = 0.6             # PIN uploads write the legacy thumbnail
+                                   # only; admin uploads write renditions
+
+# SQL: rows per photo by table (upload_sessions/batches amortized)
+ROWS_PER_PHOTO = {
+    "photos": 1.0, "photo_renditions": 3 * (1 - PIN_UPLOAD_SHARE),
+    "photo_exif": 0.8, "photo_tags": 1.6, "photo_edits": 0.05,
+    "admin_audit_log": 0.3, "upload_sessions": 1 / 60,
+    "upload_batches": 1 / 200,
+}
+ROW_OVERHEAD = 11                  # row header, null bitmap, offsets
+INDEX_ROW_OVERHEAD = 9
+PAGE_FILL = 0.8                    # average page density after splits
+NVARCHAR_FILL = 0.3                # share of declared length used
+NVARCHAR_MAX_BYTES = 400
+FILTERED_INDEX_SHARE = 0.7         # rows passing a filtered index
+TYPE_BYTES = {
+    "UNIQUEIDENTIFIER": 16, "BIGINT": 8, "INT": 4, "SMALLINT": 2,
+    "TINYINT": 1, "BIT": 1, "FLOAT": 8, "REAL": 4, "DATETIME": 8,
+    "DATETIME2": 8, "DATE": 3, "DECIMAL": 9,
+}
+
+# CDN: views per photo in its first month, by rendition
+VIEWS_FIRST_MONTH = {"thumb_sm": 25.0, "thumb_md": 4.0, "web": 2.0}
+VIEW_DECAY = 0.35                  # month-on-month
+VIEW_FLOOR = 0.02                  # long-tail views/month of older photos
+
+SECTION8 = re.compile(r"^\|\s*(.+?)\s*\|\s*(.+?)\s*\|\s*$")
+DIMENSIONS = re.compile(r"(\d+)\s*x\s*(\d+)\s*px")
+WIDTH_ONLY = re.compile(r"(\d+)\s*px")
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  INPUTS
+# ══════════════════════════════════════════════════════════════════════
+
+def system_limits(md_path=REFERENCE_MD):
+    """Rendition set and upload limit from §8 System Limits.
+
+    Returns ``({variant: (width, height)}, max_upload_bytes)``; variants
+    are matched to RENDITIONS by their documented dimensions.
+    """
+    renditions = {v: (w, h or round(w * WEB_ASPECT))
+                  for v, w, h, _, _ in RENDITIONS}
+    max_upload = 50 * 1024 * 1024
+    try:
+        text = Path(md_path).read_text(encoding="utf-8")
+    except OSError:
+        return renditions, max_upload
+    section = text.split("## 8.", 1)[-1].split("\n## ", 1)[0]
+    by_width = {w: v for v, w, _, _, _ in RENDITIONS}
+    for line in section.splitlines():
+        m = SECTION8.match(line)
+        if not m:
+            continue
+        name, value = m.group(1).lower(), m.group(2)
+        if name == "max upload file size":
+            mb = re.match(r"(\d+)\s*MB", value)
+            if mb:
+                max_upload = int(mb.group(1)) * 1024 * 1024
+            continue
+        dims = DIMENSIONS.search(value)
+        width = WIDTH_ONLY.search(value)
+        if dims:
+            w, h = int(dims.group(1)), int(dims.group(2))
+        elif width and "width" in name:
+            w = int(width.group(1))
+            h = round(w * WEB_ASPECT)
+        else:
+            continue
+        if w in by_width:
+            renditions[by_width[w]] = (w, h)
+    return renditions, max_upload
+
+
+def calibrate(export_path, max_upload):
+    """Upload parameters, from a photos export where it has enough data."""
+    params = {
+        "source": "defaults",
+        "baseline_per_month": BASELINE_PER_MONTH,
+        "incidents_per_year": INCIDENTS_PER_YEAR,
+        "incident_mu": math.log(INCIDENT_MEDIAN_PHOTOS),
+        "incident_sigma": INCIDENT_SIGMA,
+        "existing_photos": 0,
+        "existing_original_bytes": 0,
+    }
+    rng = np.random.default_rng(0)
+    sizes = np.minimum(rng.lognormal(math.log(ORIGINAL_MEDIAN_MB * 1048576),
+                                     ORIGINAL_SIGMA, 100_000), max_upload)
+    if export_path:
+        file_sizes, months, incidents = [], {}, {}
+        for size, created, incident in normalize_rows(
+                read_export(export_path),
+                ("file_size", "created_at", "incident_id"), {}):
+            if size.isdigit():
+                file_sizes.append(min(int(size), max_upload))
+            month = created[:7]
+            if re.match(r"\d{4}-\d{2}$", month):
+                months.setdefault(month, [0, 0])
+                months[month][0 if incident else 1] += 1
+            if incident:
+                incidents[incident] = incidents.get(incident, 0) + 1
+        params["source"] = Path(export_path).name
+        params["existing_photos"] = sum(sum(v) for v in months.values()) or \
+            len(file_sizes)
+        if file_sizes:
+            sizes = np.asarray(file_sizes, dtype=np.float64)
+            params["existing_original_bytes"] = float(sizes.sum())
+        if len(months) >= MIN_EXPORT_MONTHS:
+            params["baseline_per_month"] = float(np.median(
+                [v[1] for v in months.values()]))
+            params["incidents_per_year"] = len(incidents) * 12 / len(months)
+        if len(incidents) >= 3:
+            logs = np.log(list(incidents.values()))
+            params["incident_mu"] = float(logs.mean())
+            params["incident_sigma"] = float(max(logs.std(), 0.3))
+    params["original_mean"] = float(sizes.mean())
+    params["original_std"] = float(sizes.std())
+    params["original_p50"] = float(np.median(sizes))
+    params["original_p95"] = float(np.percentile(sizes, 95))
+    return params
+
+
+def column_bytes(sql_type):
+    t = sql_type.upper().replace(" ", "")
+    m = re.match(r"(N?)(VAR)?CHAR\((\w+)\)", t)
+    if m:
+        width = 2 if m.group(1) else 1
+        if m.group(3) == "MAX":
+            return NVARCHAR_MAX_BYTES
+        n = int(m.group(3))
+        return width * (n if not m.group(2) else max(1, n * NVARCHAR_FILL)) + 2
+    return TYPE_BYTES.get(re.match(r"\w+", t).group(0), 8)
+
+
+def table_sizes(schema):
+    """``{table: (row_bytes, [(index, entry_bytes, share)])}`` estimates."""
+    out = {}
+    for name in ROWS_PER_PHOTO:
+        table = schema["tables"].get(name)
+        if not table:
+            continue
+        widths = {c["name"].lower(): column_bytes(c["type"])
+                  for c in table["columns"]}
+        row = sum(widths.values()) + ROW_OVERHEAD
+        indexes = table_indexes(schema, name)
+        clustering = [k for k, _ in indexes[0]["keys"]] \
+            if indexes and indexes[0].get("primary") else []
+        entries = []
+        for ix in indexes:
+            if ix.get("primary"):
+                continue                    # the clustered index is the table
+            cols = {k.lower() for k, _ in ix["keys"]} | \
+                {c.lower() for c in ix["include"]} | \
+                {c.lower() for c in clustering}
+            entry = sum(widths.get(c, 8) for c in cols) + INDEX_ROW_OVERHEAD
+            share = FILTERED_INDEX_SHARE if ix["filter"] else 1.0
+            entries.append((ix["name"], entry, share))
+        out[name] = (row, entries)
+    return out
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  MONTE CARLO
+# ══════════════════════════════════════════════════════════════════════
+
+def month_labels(start, months):
+    year, month = start
+    labels = []
+    for k in range(months):
+        y, m = divmod(month - 1 + k, 12)
+        labels.append(f"{year + y}-{m + 1:02d}")
+    return labels
+
+
+def simulate_uploads(params, scenario, start, months, runs, rng):
+    """New photos per run and month, shape ``(runs, months)``."""
+    rate_mult, size_mult = SCENARIOS[scenario]
+    calendar = (start[1] - 1 + np.arange(months)) % 12
+    season = SEASON / SEASON.mean()
+    growth = (1 + BASELINE_GROWTH) ** (np.arange(months) / 12)
+    base = rng.poisson(params["baseline_per_month"] * growth, (runs, months))
+
+    lam = params["incidents_per_year"] / 12 * rate_mult * season[calendar]
+    counts = rng.poisson(lam, (runs, months))
+    sizes = rng.lognormal(params["incident_mu"] + math.log(size_mult),
+                          params["incident_sigma"], counts.sum())
+    surge = np.zeros(runs * months)
+    np.add.at(surge, np.repeat(np.arange(runs * months), counts.ravel()),
+              sizes)
+    surge = surge.reshape(runs, months)
+    spread = np.zeros_like(surge)
+    for lag, share in enumerate(INCIDENT_SPREAD):
+        spread[:, lag:] += share * surge[:, :months - lag]
+    return base + np.round(spread)
+
+
+def project(params, renditions, tables, scenario, start, months, runs, rng):
+    """Monthly arrays ``(runs, months)`` for one scenario."""
+    new = simulate_uploads(params, scenario, start, months, runs, rng)
+
+    # Originals: sum of n file sizes ~ normal by the central limit theorem
+    z = rng.standard_normal(new.shape)
+    originals = np.maximum(new * params["original_mean"]
+                           + np.sqrt(new) * params["original_std"] * z, 0)
+    # Same split as ROWS_PER_PHOTO["photo_renditions"]
+    per_photo = (1 - PIN_UPLOAD_SHARE) * sum(w * h for w, h
+                                             in renditions.values()) + \
+        PIN_UPLOAD_SHARE * LEGACY_THUMBNAIL[0] * LEGACY_THUMBNAIL[1]
+    blob_new = originals + new * per_photo * WEBP_BYTES_PER_PIXEL
+    existing_blob = params["existing_original_bytes"] + \
+        params["existing_photos"] * per_photo * WEBP_BYTES_PER_PIXEL
+    blob = existing_blob + np.cumsum(blob_new, axis=1)
+
+    photos = params["existing_photos"] + np.cumsum(new, axis=1)
+    sql_tables = {}
+    for name, (row, entries) in tables.items():
+        rows = photos * ROWS_PER_PHOTO[name]
+        data = rows * row / PAGE_FILL
+        index = rows * sum(e * s for _, e, s in entries) / PAGE_FILL
+        sql_tables[name] = (data, index)
+    sql = sum(d + i for d, i in sql_tables.values())
+
+    # CDN: each monthly cohort's views decay with age, down to a floor
+    ages = np.arange(months)
+    decay = np.maximum(VIEW_DECAY ** ages, VIEW_FLOOR)
+    # Same admin/PIN split as per_photo: PIN uploads have no renditions,
+    # so each of their views is served the legacy thumbnail
+    admin_views = sum(VIEWS_FIRST_MONTH.get(v, 0) * w * h
+                      for v, (w, h) in renditions.items())
+    pin_views = sum(VIEWS_FIRST_MONTH.get(v, 0) for v in renditions) * \
+        LEGACY_THUMBNAIL[0] * LEGACY_THUMBNAIL[1]
+    view_bytes = ((1 - PIN_UPLOAD_SHARE) * admin_views
+                  + PIN_UPLOAD_SHARE * pin_views) * WEBP_BYTES_PER_PIXEL
+    cohort = np.zeros_like(new)
+    for lag in range(months):
+        cohort[:, lag:] += decay[lag] * new[:, :months - lag]
+    egress = (cohort + params["existing_photos"] * VIEW_FLOOR) * view_bytes
+
+    return {"uploads": new, "photos": photos, "blob": blob, "sql": sql,
+            "sql_tables": sql_tables, "egress": egress}
+
+
+def bands(values):
+    """P10/P50/P90 over runs as three lists."""
+    return [p.tolist() for p in np.percentile(values, PERCENTILES, axis=0)]
+
+
+def build_plan(export_path=None, months=MONTHS, runs=RUNS, start=None,
+               seed=1):
+    if not 12 <= months <= 36:
+        raise ValueError("months must be between 12 and 36")
+    today = date.today()
+    start = start or ((today.year + today.month // 12), today.month % 12 + 1)
+    renditions, max_upload = system_limits()
+    params = calibrate(export_path, max_upload)
+    tables = table_sizes(bench_schema())
+    rng = np.random.default_rng(seed)
+    plan = {"params": params, "renditions": renditions, "tables": tables,
+            "max_upload": max_upload, "runs": runs,
+            "months": month_labels(start, months), "scenarios": {}}
+    for scenario in SCENARIOS:
+        p = project(params, renditions, tables, scenario, start, months,
+                    runs, rng)
+        plan["scenarios"][scenario] = {
+            "uploads": bands(p["uploads"]),
+            "photos": bands(p["photos"]),
+            "blob": bands(p["blob"]),
+            "sql": bands(p["sql"]),
+            "egress": bands(p["egress"]),
+            "peak_uploads": np.percentile(p["uploads"].max(axis=1),
+                                          PERCENTILES).tolist(),
+            "peak_egress": np.percentile(p["egress"].max(axis=1),
+                                         PERCENTILES).tolist(),
+            "sql_tables": {name: (float(np.median(d[:, -1])),
+                                  float(np.median(i[:, -1])))
+                           for name, (d, i) in p["sql_tables"].items()},
+        }
+    return plan
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  REPORT
+# ══════════════════════════════════════════════════════════════════════
+
+def tb(v):
+    """TB, falling back to GB below 1 TB so small figures don't read 0.00."""
+    if abs(v) < 1024 ** 4:
+        return gb(v)
+    return f"{v / 1024 ** 4:,.2f} TB"
+
+
+def gb(v):
+    return f"{v / 1024 ** 3:,.1f} GB"
+
+
+def byte_unit(plan, key):
+    """``(label, scale)`` for charting ``key``: TB, or GB if it stays below."""
+    top = max(max(s[key][2]) for s in plan["scenarios"].values())
+    return ("TB", 1024 ** 4) if top >= 1024 ** 4 else ("GB", 1024 ** 3)
+
+
+def fan_chart(plan, key, title, y_label, scale):
+    xs = list(range(1, len(plan["months"]) + 1))
+    series, fans = [], []
+    for scenario, s in plan["scenarios"].items():
+        lo, mid, hi = (np.asarray(b) / scale for b in s[key])
+        series.append((f"{scenario} (P50)", xs, mid.tolist()))
+        fans.append(("", xs, lo.tolist(), hi.tolist()))
+    return line_chart_png(series, title, f"Month (1 = {plan['months'][0]})",
+                          y_label, y_min=0, markers=False, bands=fans)
+
+
+def add_capacity_section(doc, plan, heading="Capacity Plan", level=2):
+    """Assumptions, projections and charts for ``plan`` in a document."""
+    params = plan["params"]
+    months = plan["months"]
+    add_heading_styled(doc, heading, level=level)
+    add_para(doc, f"{plan['runs']:,} Monte Carlo runs per scenario over "
+                  f"{len(months)} months ({months[0]} to {months[-1]}). "
+                  "Ranges are P10–P90; single figures are P50.", size=Pt(9))
+
+    styled_table(doc, ["Assumption", "Value"], [
+        ["Calibration", params["source"]],
+        ["Existing photos", f"{params['existing_photos']:,}"],
+        ["Baseline uploads", f"{params['baseline_per_month']:,.0f}/month, "
+                             f"+{BASELINE_GROWTH:.0%}/year"],
+        ["Incidents", f"{params['incidents_per_year']:.1f}/year, peaking "
+                      "Aug–Sep"],
+        ["Photos per incident", f"median {math.exp(params['incident_mu']):,.0f}"
+                                f" (lognormal sigma "
+                                f"{params['incident_sigma']:.2f})"],
+        ["Original size", f"median {params['original_p50'] / 1048576:.1f} MB,"
+                          f" P95 {params['original_p95'] / 1048576:.1f} MB, "
+                          f"cap {plan['max_upload'] // 1048576} MB"],
+        ["Renditions", ", ".join(f"{v} {w}x{h}" for v, (w, h)
+                                 in plan["renditions"].items())
+         + f" at {WEBP_BYTES_PER_PIXEL} B/px WebP for admin uploads "
+           f"({1 - PIN_UPLOAD_SHARE:.0%}); PIN uploads "
+           f"({PIN_UPLOAD_SHARE:.0%}) store one {LEGACY_THUMBNAIL[0]}x"
+           f"{LEGACY_THUMBNAIL[1]} thumbnail"],
+        ["CDN views", ", ".join(f"{v} {n:g}" for v, n
+                                in VIEWS_FIRST_MONTH.items())
+         + f" per photo in month 1, x{VIEW_DECAY} monthly; PIN uploads "
+           "serve the legacy thumbnail for every view"],
+        ["Scenarios", "; ".join(f"{name}: incidents x{r:g}, size x{s:g}"
+                                for name, (r, s) in SCENARIOS.items())],
+    ], col_widths=[25, 75])
+
+    add_para(doc, "Projection at horizon", bold=True, size=Pt(10))
+    rows = []
+    for scenario, s in plan["scenarios"].items():
+        for h in HORIZONS:
+            if h > len(months):
+                continue
+            k = h - 1
+            rows.append([scenario, f"{h} mo",
+                         f"{s['photos'][1][k]:,.0f}",
+                         f"{tb(s['blob'][1][k])} ({tb(s['blob'][0][k])}–"
+                         f"{tb(s['blob'][2][k])})",
+                         f"{gb(s['sql'][1][k])} ({gb(s['sql'][2][k])} P90)",
+                         f"{tb(s['egress'][1][k])}/mo"])
+    styled_table(doc, ["Scenario", "Horizon", "Photos", "Blob Storage",
+                       "SQL Data + Index", "CDN Egress"], rows,
+                 col_widths=[15, 9, 13, 27, 21, 15])
+
+    add_para(doc, "Surge peaks (worst month in the horizon)", bold=True,
+             size=Pt(10))
+    styled_table(doc, ["Scenario", "Uploads P50", "Uploads P90",
+                       "Egress P50", "Egress P90"],
+                 [[scenario, f"{s['peak_uploads'][1]:,.0f}",
+                   f"{s['peak_uploads'][2]:,.0f}",
+                   tb(s["peak_egress"][1]), tb(s["peak_egress"][2])]
+                  for scenario, s in plan["scenarios"].items()],
+                 col_widths=[24, 19, 19, 19, 19])
+
+    expected = next(iter(plan["scenarios"].values()))
+    add_para(doc, f"SQL by table at {months[-1]} "
+                  f"({next(iter(plan['scenarios']))}, P50)", bold=True,
+             size=Pt(10))
+    styled_table(doc, ["Table", "Rows/Photo", "Row Bytes", "Indexes",
+                       "Data", "Index"],
+                 [[name, f"{ROWS_PER_PHOTO[name]:.3g}", f"{row:,.0f}",
+                   f"{len(entries)}", gb(expected["sql_tables"][name][0]),
+                   gb(expected["sql_tables"][name][1])]
+                  for name, (row, entries) in plan["tables"].items()],
+                 col_widths=[22, 14, 14, 12, 19, 19])
+    add_para(doc, "Row and index sizes are estimates from declared column "
+                  f"types (variable-length columns {NVARCHAR_FILL:.0%} full, "
+                  f"pages {PAGE_FILL:.0%} full); check them against "
+                  "sys.dm_db_partition_stats once the tables are populated.",
+             italic=True, size=Pt(9))
+
+    add_image(doc, fan_chart(plan, "blob", "Blob storage",
+                             *byte_unit(plan, "blob")),
+              alt="Projected blob storage by scenario")
+    add_image(doc, fan_chart(plan, "uploads", "Uploads per month", "Photos",
+                             1), alt="Projected monthly uploads by scenario")
+    add_image(doc, fan_chart(plan, "egress", "CDN egress per month",
+                             *byte_unit(plan, "egress")),
+              alt="Projected monthly CDN egress by scenario")
+    add_image(doc, fan_chart(plan, "sql", "SQL data + index", "GB",
+                             1024 ** 3), alt="Projected SQL size by scenario")
+
+
+def write_report(plan, out_path=OUT):
+    doc = setup_doc("Capacity Plan",
+                    f"Blob, SQL and CDN growth — {len(plan['months'])} months")
+    add_capacity_section(doc, plan, "1. Capacity Plan")
+    out_path = Path(out_path)
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+    return out_path
+
+
+def build_capacity_report(input_path=None, out_path=None):
+    """Capacity plan DOCX calibrated from a photos export; return its path."""
+    plan = build_plan(input_path)
+    return write_report(plan, Path(out_path) if out_path else OUT)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Project blob, SQL and CDN capacity")
+    parser.add_argument("--export", help="CSV/JSONL photos export "
+                                         "(file_size, created_at, incident_id)")
+    parser.add_argument("--months", type=int, default=MONTHS,
+                        help="horizon, 12-36")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--start", help="first projected month, YYYY-MM "
+                                        "(default: next month)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the bands here")
+    parser.add_argument("--out", default=str(OUT), help="output DOCX path")
+    args = parser.parse_args()
+
+    if not 12 <= args.months <= 36:
+        parser.error("--months must be between 12 and 36")
+    start = None
+    if args.start:
+        m = re.match(r"(\d{4})-(\d{2})$", args.start)
+        if not m or not 1 <= int(m.group(2)) <= 12:
+            parser.error("--start must be YYYY-MM")
+        start = (int(m.group(1)), int(m.group(2)))
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Capacity Plan")
+    print("=" * 60)
+    plan = build_plan(args.export, args.months, args.runs, start, args.seed)
+    for scenario, s in plan["scenarios"].items():
+        print(f"  {scenario:<14} {plan['months'][-1]}: blob "
+              f"{tb(s['blob'][1][-1])} (P90 {tb(s['blob'][2][-1])}), SQL "
+              f"{gb(s['sql'][1][-1])}, peak egress "
+              f"{tb(s['peak_egress'][1])}/mo")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({k: v for k, v in plan.items() if k != "tables"}, f,
+                      indent=2)
+        print(f"  [OK] {args.json}")
+    write_report(plan, args.out)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+"""
+CDN cache-efficiency simulation for the signed image URLs.
+
+`signImageUrl()` (lib/auth.ts) mints `/api/photos/{id}/image?type=...&
+exp=...&sig=...` with `exp = now + 86400` to the second, every time a
+list or detail response is built. Front Door caches the proxy's
+responses for `s-maxage=604800`, but keys them on the full URL, so two
+viewers of the same gallery page — or one viewer reloading it — get
+different URLs and the edge cache only helps within the same second.
+
+This replays image requests against a model of the edge (a byte-bounded
+LRU per POP with the route's s-maxage TTL) and of each browser's cache
+(max-age=3600, keyed by URL), under alternative signing schemes:
+
+  per-request   exp = mint time + ttl (what the app does today)
+  bucket-1h/6h/24h  exp rounded up to the next bucket boundary, so all
+                URLs minted in a bucket are identical; links stay valid
+                for at least ttl and at most ttl + bucket
+  stable-key    the edge ignores exp/sig in its cache key — an upper
+                bound, since cached copies would then be served without
+                checking the signature
+
+For each scheme and edge cache size it reports edge and browser hit
+ratios, origin egress (blob bytes streamed through the proxy) and a
+latency estimate.
+
+Traffic is either synthetic — gallery/admin page views with Zipf page
+popularity, 50 thumbnails per page and some originals opened — or an
+access log (CSV/JSONL with time, URL or photo_id/type, client). Logged
+requests have already passed the browser cache, so replaying a log
+models only the edge; the URL's exp gives back its mint time.
+
+Run:  python scripts/cdn_cache_sim.py [--days 3] [--cache-gb 0.25,1,5,20]
+      python scripts/cdn_cache_sim.py --log frontdoor_access.jsonl
+Requires: pip install numpy pillow python-docx
+"""
+
+import argparse
+import json
+import math
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from docx.shared import Pt
+
+from charts import line_chart_png
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_image, add_para, setup_doc, styled_table,
+)
+from generate_incident_report import normalize_rows, read_export
+
+OUT = DOCS / "ASPR_Photos_CDN_Cache_Simulation.docx"
+
+URL_TTL_S = 86400              # signImageUrl default ttlSeconds
+EDGE_TTL_S = 604800            # s-maxage on /api/photos/[id]/image
+BROWSER_TTL_S = 3600           # max-age
+SCHEMES = {
+    # name -> exp bucket in seconds (1: per second; None: not in the key)
+    "per-request": 1,
+    "bucket-1h": 3600,
+    "bucket-6h": 6 * 3600,
+    "bucket-24h": 86400,
+    "stable-key": None,
+}
+DEFAULT_CACHE_GB = [0.25, 1, 5, 20]
+
+# Synthetic traffic
+PAGE_SIZE = 50                 # thumbnails per gallery/admin page
+THUMB_KB = 35                  # `{id}/thumbnail` (WebP)
+ORIGINAL_MB = 3.5              # median original
+PAGE_ZIPF = 1.1
+ORIGINAL_OPEN_SHARE = 0.15     # page views that open one original
+REVISIT_SHARE = 0.35           # page views that are a reload/revisit
+CLIENTS = 400
+
+# Latency model (ms)
+EDGE_MS = 25
+ORIGIN_MS = 180                # Front Door → App Service → Blob first byte
+ORIGIN_MBPS = 200
+
+LOG_FIELDS = ("time", "url", "photo_id", "type", "client", "bytes")
+LOG_ALIASES = {
+    "timestamp": "time", "timegenerated": "time", "requesturi": "url",
+    "request_uri": "url", "id": "photo_id", "variant": "type",
+    "clientip": "client", "client_ip": "client", "user": "client",
+    "responsebytes": "bytes", "response_bytes": "bytes",
+}
+IMAGE_URL = re.compile(r"/api/photos/([^/?]+)/image\?([^\s#]*)")
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  TRAFFIC
+# ══════════════════════════════════════════════════════════════════════
+
+def synthetic_requests(args, rng):
+    """``(times, clients, photos, originals, mint_times)`` arrays.
+
+    Each page view mints one URL per thumbnail on the page (plus one
+    original for some views) at the view time; the browser fetches them
+    straight away.
+    """
+    seconds = args.days * 86400
+    n_views = int(args.views_per_hour * args.days * 24)
+    n_pages = max(1, args.photos // PAGE_SIZE)
+    # Diurnal load: views are denser during the working day
+    candidates = rng.uniform(0, seconds, n_views * 2)
+    day_frac = (candidates % 86400) / 86400
+    keep = rng.random(len(candidates)) < 0.1 + 0.9 * np.sin(np.pi * day_frac) ** 2
+    view_t = np.sort(rng.choice(candidates[keep], min(n_views, keep.sum()),
+                                replace=False))
+    n_views = len(view_t)
+    weights = 1 / np.arange(1, n_pages + 1) ** PAGE_ZIPF
+    page = rng.choice(n_pages, n_views, p=weights / weights.sum())
+    client = rng.integers(0, CLIENTS, n_views)
+
+    # Revisits: the same client reloads a page it saw a little earlier
+    revisit = np.flatnonzero(rng.random(n_views) < REVISIT_SHARE)
+    source = np.maximum(revisit - rng.integers(1, 50, len(revisit)), 0)
+    page[revisit] = page[source]
+    client[revisit] = client[source]
+
+    thumbs_t = np.repeat(view_t, PAGE_SIZE)
+    thumbs_photo = (np.repeat(page, PAGE_SIZE) * PAGE_SIZE
+                    + np.tile(np.arange(PAGE_SIZE), n_views))
+    opens = np.flatnonzero(rng.random(n_views) < ORIGINAL_OPEN_SHARE)
+    open_photo = page[opens] * PAGE_SIZE + rng.integers(0, PAGE_SIZE,
+                                                        len(opens))
+    times = np.concatenate([thumbs_t, view_t[opens] + 5])
+    order = np.argsort(times, kind="stable")
+    return {
+        "time": times[order],
+        "client": np.concatenate([np.repeat(client, PAGE_SIZE),
+                                  client[opens]])[order],
+        "photo": np.concatenate([thumbs_photo, open_photo])[order],
+        "original": np.concatenate([np.zeros(len(thumbs_t), bool),
+                                    np.ones(len(opens), bool)])[order],
+        "mint": np.floor(np.concatenate([thumbs_t, view_t[opens]]))[order],
+        "browser": True,
+    }
+
+
+def parse_time(value):
+    try:
+        return float(value)
+    except ValueError:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+
+
+def log_requests(path):
+    """The same arrays from an access log of image requests."""
+    rows = []
+    ids = {}
+    sizes = {}
+    for time_s, url, photo_id, kind, client, size in normalize_rows(
+            read_export(path), LOG_FIELDS, LOG_ALIASES):
+        exp = None
+        m = IMAGE_URL.search(url)
+        if m:
+            photo_id = m.group(1)
+            query = dict(p.partition("=")[::2] for p in m.group(2).split("&"))
+            kind = query.get("type", kind)
+            exp = query.get("exp")
+        if not photo_id or not time_s:
+            continue
+        t = parse_time(time_s)
+        # Under today's scheme exp = mint + ttl, so the log recovers mint
+        mint = float(exp) - URL_TTL_S if exp else math.floor(t)
+        key = photo_id.lower()
+        photo = ids.setdefault(key, len(ids))
+        if size.isdigit():
+            sizes[photo, kind != "thumbnail"] = int(size)
+        # The route serves the original for any type other than thumbnail
+        rows.append((t, client, photo, kind != "thumbnail", mint))
+    if not rows:
+        raise SystemExit(f"no image requests found in {path}")
+    rows.sort()
+    t, client, photo, original, mint = zip(*rows)
+    clients = {c: n for n, c in enumerate(sorted(set(client)))}
+    t0 = t[0]
+    return {
+        "time": np.asarray(t) - t0,
+        "client": np.asarray([clients[c] for c in client]),
+        "photo": np.asarray(photo),
+        "original": np.asarray(original),
+        "mint": np.asarray(mint) - math.floor(t0),
+        "browser": False,
+        "sizes": sizes,
+    }
+
+
+def object_sizes(n_photos, rng, logged=None):
+    """Bytes per (photo, original?) as two arrays."""
+    thumbs = rng.lognormal(math.log(THUMB_KB * 1024), 0.3, n_photos)
+    originals = rng.lognormal(math.log(ORIGINAL_MB * 1048576), 0.5, n_photos)
+    for (photo, original), size in (logged or {}).items():
+        (originals if original else thumbs)[photo] = size
+    return thumbs.astype(np.int64), originals.astype(np.int64)
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  CACHE MODELS
+# ══════════════════════════════════════════════════════════════════════
+
+class EdgeCache:
+    """Byte-bounded LRU whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, capacity_bytes, ttl=EDGE_TTL_S):
+        self.capacity = capacity_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()     # key -> (size, expires)
+        self.used = 0
+
+    def get(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        if now >= entry[1]:
+            del self.entries[key]
+            self.used -= entry[0]
+            return False
+        self.entries.move_to_end(key)
+        return True
+
+    def put(self, key, size, now):
+        if size > self.capacity:
+            return
+        self.entries[key] = (size, now + self.ttl)
+        self.used += size
+        while self.used > self.capacity:
+            _, (old_size, _) = self.entries.popitem(last=False)
+            self.used -= old_size
+
+
+def cache_key(bucket, photo, original, mint):
+    """What the edge keys on: the URL, i.e. id, type and exp."""
+    if bucket is None:
+        return photo, original
+    exp = mint + URL_TTL_S
+    if bucket > 1:
+        exp = math.ceil(exp / bucket) * bucket
+    return photo, original, exp
+
+
+def simulate(requests, sizes, scheme, capacity_bytes, pops=1):
+    bucket = SCHEMES[scheme]
+    thumbs, originals = sizes
+    edges = [EdgeCache(capacity_bytes) for _ in range(pops)]
+    browsers = {}
+    n = len(requests["time"])
+    latency = np.empty(n)
+    stats = {"requests": n, "browser_hits": 0, "edge_hits": 0,
+             "edge_requests": 0, "origin_bytes": 0, "edge_bytes": 0}
+    use_browser = requests["browser"]
+    for k, (t, client, photo, original, mint) in enumerate(zip(
+            requests["time"].tolist(), requests["client"].tolist(),
+            requests["photo"].tolist(), requests["original"].tolist(),
+            requests["mint"].tolist())):
+        key = cache_key(bucket, photo, original, mint)
+        if use_browser:
+            # Browsers always key on the full URL (exp included)
+            url = key if bucket is not None else cache_key(1, photo,
+                                                           original, mint)
+            cached = browsers.setdefault(client, {})
+            if cached.get(url, -1) > t:
+                stats["browser_hits"] += 1
+                latency[k] = 0.0
+                continue
+            cached[url] = t + BROWSER_TTL_S
+        size = int(originals[photo] if original else thumbs[photo])
+        stats["edge_requests"] += 1
+        stats["edge_bytes"] += size
+        edge = edges[client % pops]
+        if edge.get(key, t):
+            stats["edge_hits"] += 1
+            latency[k] = EDGE_MS
+        else:
+            edge.put(key, size, t)
+            stats["origin_bytes"] += size
+            latency[k] = EDGE_MS + ORIGIN_MS + size * 8 / (ORIGIN_MBPS * 1e3)
+    stats["edge_hit_pct"] = 100 * stats["edge_hits"] / max(
+        stats["edge_requests"], 1)
+    stats["browser_hit_pct"] = 100 * stats["browser_hits"] / max(n, 1)
+    fetched = latency[latency > 0] if use_browser else latency
+    stats["p50_ms"] = float(np.percentile(fetched, 50)) if len(fetched) else 0
+    stats["p95_ms"] = float(np.percentile(fetched, 95)) if len(fetched) else 0
+    stats["max_url_life_h"] = (URL_TTL_S + (bucket or 0)) / 3600 \
+        if bucket != 1 else URL_TTL_S / 3600
+    return stats
+
+
+def sweep(requests, sizes, args):
+    results = {}
+    for scheme in args.schemes:
+        for gb in args.cache_gb:
+            s = simulate(requests, sizes, scheme, int(gb * 1073741824),
+                         args.pops)
+            results[scheme, gb] = s
+            print(f"  {scheme:<12} {gb:>6g} GB  edge hit "
+                  f"{s['edge_hit_pct']:5.1f}%  browser hit "
+                  f"{s['browser_hit_pct']:5.1f}%  origin "
+                  f"{s['origin_bytes'] / 1073741824:8.2f} GB  p95 "
+                  f"{s['p95_ms']:6.0f} ms")
+    return results
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  REPORT
+# ══════════════════════════════════════════════════════════════════════
+
+def write_report(results, requests, args, out_path=OUT):
+    n = len(requests["time"])
+    span_h = float(requests["time"][-1] - requests["time"][0]) / 3600 \
+        if n else 0
+    source = Path(args.log).name if args.log else \
+        f"synthetic, {args.days:g} days"
+    doc = setup_doc("CDN Cache Simulation",
+                    f"Signed image URLs — {source}")
+
+    add_heading_styled(doc, "1. Workload", level=2)
+    add_para(doc, "Edge: byte-bounded LRU per POP with the image route's "
+                  f"s-maxage ({EDGE_TTL_S // 86400} days). Browsers cache by "
+                  f"URL for {BROWSER_TTL_S // 60} minutes. signImageUrl "
+                  f"links are valid for {URL_TTL_S // 3600} hours.",
+             size=Pt(9))
+    originals = int(requests["original"].sum())
+    rows = [["Image requests", f"{n:,} over {span_h:,.1f} h"],
+            ["Thumbnails / originals", f"{n - originals:,} / {originals:,}"],
+            ["Distinct photos", f"{len(np.unique(requests['photo'])):,}"],
+            ["Edge POPs", f"{args.pops}"]]
+    if not args.log:
+        rows += [["Page views", f"{args.views_per_hour:g} per hour, "
+                                f"{PAGE_SIZE} thumbnails each, Zipf "
+                                f"s={PAGE_ZIPF} over pages"],
+                 ["Revisits", f"{REVISIT_SHARE:.0%} of views reload a "
+                              "recent page"]]
+    else:
+        rows.append(["Browser cache", "not modelled (log is edge-side)"])
+    styled_table(doc, ["Item", "Value"], rows, col_widths=[35, 65])
+
+    add_heading_styled(doc, "2. Results", level=2)
+    base = {gb: results.get(("per-request", gb)) for gb in args.cache_gb}
+    table = []
+    for scheme in args.schemes:
+        for gb in args.cache_gb:
+            s = results[scheme, gb]
+            saved = ""
+            if base[gb] and base[gb]["origin_bytes"]:
+                saved = f"{100 * (1 - s['origin_bytes'] / base[gb]['origin_bytes']):.0f}%"
+            table.append([scheme, f"{gb:g} GB", f"{s['edge_hit_pct']:.1f}%",
+                          f"{s['browser_hit_pct']:.1f}%",
+                          f"{s['origin_bytes'] / 1073741824:,.2f} GB",
+                          saved or "—", f"{s['p50_ms']:,.0f} / "
+                                        f"{s['p95_ms']:,.0f}",
+                          f"{s['max_url_life_h']:g} h"])
+    styled_table(doc, ["Scheme", "Edge Cache", "Edge Hit", "Browser Hit",
+                       "Origin Egress", "Saved", "p50 / p95 ms",
+                       "Link Life"], table,
+                 col_widths=[15, 11, 11, 12, 14, 9, 15, 13])
+    add_para(doc, "Saved is origin egress relative to per-request signing at "
+                  "the same cache size. Link life is the longest a minted "
+                  "URL stays valid; stable-key serves cached copies without "
+                  "checking the signature and is shown only as a bound.",
+             italic=True, size=Pt(9))
+
+    add_heading_styled(doc, "3. Charts", level=2)
+    if len(args.cache_gb) > 1:
+        series = [(scheme, args.cache_gb,
+                   [results[scheme, gb]["edge_hit_pct"] for gb in args.cache_gb])
+                  for scheme in args.schemes]
+        add_image(doc, line_chart_png(series, "Edge hit ratio by cache size",
+                                      "Edge cache (GB)", "Hit ratio (%)",
+                                      x_log=True, y_min=0),
+                  alt="Edge hit ratio by cache size")
+    series = [(scheme, args.cache_gb,
+               [results[scheme, gb]["origin_bytes"] / 1073741824
+                for gb in args.cache_gb]) for scheme in args.schemes]
+    add_image(doc, line_chart_png(series, "Origin egress by cache size",
+                                  "Edge cache (GB)", "Origin egress (GB)",
+                                  x_log=len(args.cache_gb) > 1, y_min=0),
+              alt="Origin egress by cache size")
+
+    out_path = Path(out_path)
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate Front Door caching of signed image URLs")
+    parser.add_argument("--log", help="access log (CSV/JSONL) to replay "
+                                      "instead of synthetic traffic")
+    parser.add_argument("--days", type=float, default=3.0)
+    parser.add_argument("--views-per-hour", type=float, default=300.0,
+                        help="gallery/admin page views per hour")
+    parser.add_argument("--photos", type=int, default=100_000,
+                        help="photos in the synthetic catalogue")
+    parser.add_argument("--cache-gb", default=",".join(
+        map(str, DEFAULT_CACHE_GB)), help="comma-separated edge cache sizes")
+    parser.add_argument("--pops", type=int, default=1,
+                        help="edge POPs (clients are spread over them)")
+    parser.add_argument("--schemes", default=",".join(SCHEMES),
+                        help="comma-separated signing schemes")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--json", help="also write the results here")
+    parser.add_argument("--out", default=str(OUT), help="output DOCX path")
+    args = parser.parse_args()
+
+    args.cache_gb = sorted({float(v) for v in args.cache_gb.split(",")})
+    args.schemes = [s.strip() for s in args.schemes.split(",")]
+    unknown = set(args.schemes) - set(SCHEMES)
+    if unknown:
+        parser.error(f"unknown schemes: {', '.join(sorted(unknown))}")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — CDN Cache Simulation")
+    print("=" * 60)
+    rng = np.random.default_rng(args.seed)
+    if args.log:
+        requests = log_requests(args.log)
+        n_photos = int(requests["photo"].max()) + 1
+    else:
+        requests = synthetic_requests(args, rng)
+        n_photos = args.photos
+    sizes = object_sizes(n_photos, rng, requests.get("sizes"))
+    print(f"  {len(requests['time']):,} image requests, "
+          f"{len(np.unique(requests['photo'])):,} photos")
+    results = sweep(requests, sizes, args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({f"{s}/{gb:g}": r for (s, gb), r in results.items()}, f,
+                      indent=2)
+        print(f"  [OK] {args.json}")
+    write_report(results, requests, args, args.out)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
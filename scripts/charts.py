@@ -0,0 +1,160 @@
+"""
+Static PNG charts for the generated reports.
+
+Draws line and scatter charts with Pillow alone (no plotting library is
+needed offline), in the report palette, sized for `add_image` in a
+python-docx document. Series are ``(label, xs, ys)``; the axes get
+rounded tick steps and an optional log scale on x.
+
+Used by the simulators and planners that render results to DOCX.
+"""
+
+import io
+import math
+
+from PIL import Image, ImageDraw, ImageFont
+
+CHART_SIZE = (1600, 900)
+CHART_BG = (255, 255, 255)
+CHART_GRID = (220, 220, 220)
+CHART_AXIS = (153, 153, 153)    # MUTED
+CHART_TEXT = (6, 46, 97)        # BLUE_DARK
+SERIES_COLORS = [
+    (21, 81, 151),              # BLUE_PRIMARY
+    (170, 100, 4),              # GOLD
+    (153, 0, 0),                # RED
+    (46, 125, 50),
+    (106, 27, 154),
+    (0, 131, 143),
+    (93, 64, 55),
+]
+MARGIN = (150, 90, 60, 120)     # left, top, right, bottom
+
+
+def nice_step(span, ticks=6):
+    """A 1/2/5 x 10^k step giving about ``ticks`` intervals over ``span``."""
+    if span <= 0:
+        return 1
+    raw = span / ticks
+    power = 10 ** math.floor(math.log10(raw))
+    for m in (1, 2, 5, 10):
+        if raw <= m * power:
+            return m * power
+    return 10 * power
+
+
+def fmt_tick(v):
+    if abs(v) >= 1e6:
+        return f"{v / 1e6:g}M"
+    if abs(v) >= 1e4:
+        return f"{v / 1e3:g}k"
+    return f"{v:,.6g}"
+
+
+def line_chart_png(series, title="", x_label="", y_label="",
+                   size=CHART_SIZE, x_log=False, y_min=None, markers=True,
+                   lines=True, bands=()):
+    """Chart of ``series`` as PNG bytes.
+
+    ``bands`` are ``(label, xs, lows, highs)`` shaded ranges drawn under
+    the lines (e.g. a percentile fan). ``lines=False`` gives a scatter.
+    """
+    width, height = size
+    left, top, right, bottom = MARGIN
+    xs_all = [x for _, xs, _ in series for x in xs] + \
+        [x for _, xs, _, _ in bands for x in xs]
+    ys_all = [y for _, _, ys in series for y in ys] + \
+        [y for _, _, lo, hi in bands for y in (*lo, *hi)]
+    if not xs_all:
+        xs_all, ys_all = [0, 1], [0, 1]
+
+    def tx(x):
+        return math.log10(x) if x_log else x
+
+    x0, x1 = min(map(tx, xs_all)), max(map(tx, xs_all))
+    if x1 == x0:
+        x0, x1 = x0 - 1, x1 + 1
+    y0 = min(ys_all) if y_min is None else y_min
+    y1 = max(ys_all)
+    if y1 == y0:
+        y1 = y0 + 1
+    y_step = nice_step(y1 - y0)
+    y0 = math.floor(y0 / y_step) * y_step
+    y1 = math.ceil(y1 / y_step) * y_step
+
+    def px(x, y):
+        return (left + (tx(x) - x0) / (x1 - x0) * (width - left - right),
+                top + (y1 - y) / (y1 - y0) * (height - top - bottom))
+
+    img = Image.new("RGB", size, CHART_BG)
+    draw = ImageDraw.Draw(img, "RGBA")
+    font = ImageFont.load_default(size=22)
+    small = ImageFont.load_default(size=18)
+
+    # Grid and ticks
+    y = y0
+    while y <= y1 + y_step / 2:
+        _, py = px(10 ** x0 if x_log else x0, y)
+        draw.line([(left, py), (width - right, py)], fill=CHART_GRID)
+        draw.text((left - 10, py), fmt_tick(y), fill=CHART_AXIS, font=small,
+                  anchor="rm")
+        y += y_step
+    if x_log:
+        x_ticks = [10 ** k for k in range(math.floor(x0), math.ceil(x1) + 1)]
+    else:
+        step = nice_step(x1 - x0)
+        x_ticks = [math.ceil(x0 / step) * step + k * step
+                   for k in range(int((x1 - x0) / step) + 2)]
+    for x in x_ticks:
+        if not x0 - 1e-9 <= tx(x) <= x1 + 1e-9:
+            continue
+        pxx, _ = px(x, y0)
+        draw.line([(pxx, top), (pxx, height - bottom)], fill=CHART_GRID)
+        draw.text((pxx, height - bottom + 10), fmt_tick(x), fill=CHART_AXIS,
+                  font=small, anchor="mt")
+    draw.rectangle([left, top, width - right, height - bottom],
+                   outline=CHART_AXIS, width=2)
+
+    # Bands, then series
+    for k, (_, xs, lows, highs) in enumerate(bands):
+        color = SERIES_COLORS[k % len(SERIES_COLORS)]
+        outline = [px(x, y) for x, y in zip(xs, highs)] + \
+                  [px(x, y) for x, y in reversed(list(zip(xs, lows)))]
+        if len(outline) >= 3:
+            draw.polygon(outline, fill=color + (50,))
+    for k, (_, xs, ys) in enumerate(series):
+        color = SERIES_COLORS[k % len(SERIES_COLORS)]
+        points = [px(x, y) for x, y in zip(xs, ys)]
+        if lines and len(points) > 1:
+            draw.line(points, fill=color, width=4, joint="curve")
+        if markers:
+            for cx, cy in points:
+                draw.ellipse([cx - 6, cy - 6, cx + 6, cy + 6], fill=color)
+
+    # Labels and legend
+    if title:
+        draw.text((width / 2, top / 2), title, fill=CHART_TEXT, font=font,
+                  anchor="mm")
+    if x_label:
+        draw.text(((left + width - right) / 2, height - 30), x_label,
+                  fill=CHART_TEXT, font=font, anchor="mm")
+    if y_label:
+        label = Image.new("RGBA", (height, 40), CHART_BG + (0,))
+        ImageDraw.Draw(label).text((height / 2, 20), y_label,
+                                   fill=CHART_TEXT, font=font, anchor="mm")
+        img.paste(label.rotate(90, expand=True), (10, 0),
+                  label.rotate(90, expand=True))
+    entries = [label for label, _, _ in series] + \
+        [label for label, _, _, _ in bands if label]
+    lx, ly = left + 20, top + 15
+    for k, label in enumerate(entries):
+        color = SERIES_COLORS[(k if k < len(series) else k - len(series))
+                              % len(SERIES_COLORS)]
+        draw.rectangle([lx, ly + k * 30, lx + 24, ly + k * 30 + 18],
+                       fill=color if k < len(series) else color + (80,))
+        draw.text((lx + 34, ly + k * 30 + 9), label, fill=CHART_TEXT,
+                  font=small, anchor="lm")
+
+    out = io.BytesIO()
+    img.save(out, "PNG", optimize=True)
+    return out.getvalue()
@@ -0,0 +1,420 @@
+"""
+Extract EXIF and GPS metadata from originals without decoding pixels.
+
+The PIN upload route stores only make, model, orientation, date and
+software in `photo_exif`, and gets them from `sharp().metadata()`, which
+decodes the image. This backfills the full row for existing originals
+(the same fields `extractExif()` in app/api/admin/photos/upload/route.ts
+maps from exifr) by memory-mapping each file and walking only the JPEG
+APP1 segment and its TIFF IFDs (IFD0, Exif and GPS). Only the pages
+holding the header are read from disk.
+
+Sources are `{photo_id}/original` blobs in a local mirror of the
+`aspr-photos` container, or JPEG/TIFF files directly under the given
+directory (photo id = file stem). Files are parsed in batches on a
+process pool and each row is appended to a JSONL file whose keys match
+the `photo_exif` columns; `raw_json` carries the same object the admin
+route stores, including latitude/longitude for `photos`. Files with no
+EXIF block or that fail to parse are recorded in a sidecar next to it
+(`photo_exif.skipped.jsonl` for the default output). Photos already in
+either file are skipped, so an interrupted run can be restarted; delete
+the sidecar to retry the skipped ones.
+
+Values follow the route, not the EXIF spec, where the two differ:
+GPSAltitudeRef is ignored (the route stores GPSAltitude as is), and
+DateTimeOriginal is stored as `new Date(...).toISOString()` of the Date
+exifr revives in the server's time zone (SERVER_TZ, UTC on App Service),
+i.e. the camera's wall-clock time labelled UTC.
+
+Run:  python scripts/exif_extract.py BLOB_MIRROR [--out photo_exif.jsonl]
+Requires: Python 3.9+ (standard library only)
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+ORIGINAL_NAME = "original"
+RENDITION_DIR = "renditions"
+FILE_SUFFIXES = {".jpg", ".jpeg", ".tif", ".tiff"}
+BATCH = 256                        # files per worker task
+MAX_IFD_ENTRIES = 512              # a corrupt count must not run away
+SERVER_TZ = timezone.utc           # time zone exifr revives EXIF dates in
+SKIPPED_SUFFIX = ".skipped.jsonl"
+
+# TIFF field type -> (struct code, size)
+TIFF_TYPES = {
+    1: ("B", 1), 2: ("s", 1), 3: ("H", 2), 4: ("L", 4), 5: ("LL", 8),
+    6: ("b", 1), 7: ("s", 1), 8: ("h", 2), 9: ("l", 4), 10: ("ll", 8),
+    11: ("f", 4), 12: ("d", 8),
+}
+
+# Tags read from each IFD (exifr names, as used by extractExif)
+IFD0_TAGS = {0x010F: "Make", 0x0110: "Model", 0x0112: "Orientation",
+             0x0131: "Software", 0x8769: "ExifIFD", 0x8825: "GPSIFD"}
+EXIF_TAGS = {0x829A: "ExposureTime", 0x829D: "FNumber", 0x8827: "ISO",
+             0x9003: "DateTimeOriginal", 0x9004: "CreateDate",
+             0x9209: "Flash", 0x920A: "FocalLength", 0xA434: "LensModel"}
+GPS_TAGS = {0x0001: "GPSLatitudeRef", 0x0002: "GPSLatitude",
+            0x0003: "GPSLongitudeRef", 0x0004: "GPSLongitude",
+            0x0005: "GPSAltitudeRef", 0x0006: "GPSAltitude"}
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  JPEG / TIFF PARSING (worker process)
+# ══════════════════════════════════════════════════════════════════════
+
+def find_tiff(buf):
+    """Offset of the TIFF header in a JPEG's Exif APP1, or of a TIFF file.
+
+    Walks marker segments from SOI and stops at the first scan, so the
+    compressed image data is never touched.
+    """
+    if buf[:4] in (b"II*\x00", b"MM\x00*"):
+        return 0
+    if buf[:2] != b"\xff\xd8":
+        return None
+    pos, end = 2, len(buf)
+    while pos + 4 <= end:
+        if buf[pos] != 0xFF:
+            return None
+        marker = buf[pos + 1]
+        if marker == 0xFF:                  # fill byte
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            pos += 2                        # markers without a length
+            continue
+        if marker in (0xDA, 0xD9):          # start of scan / end of image
+            return None
+        length = struct.unpack_from(">H", buf, pos + 2)[0]
+        if marker == 0xE1 and buf[pos + 4:pos + 10] == b"Exif\x00\x00":
+            return pos + 10
+        pos += 2 + length
+    return None
+
+
+class TiffReader:
+    """Bounds-checked reader for the IFDs of one TIFF block."""
+
+    def __init__(self, buf, base):
+        self.buf = buf
+        self.base = base
+        order = bytes(buf[base:base + 2])
+        if order not in (b"II", b"MM"):
+            raise ValueError("bad TIFF byte order")
+        self.endian = "<" if order == b"II" else ">"
+        if self.unpack("H", 2)[0] != 42:
+            raise ValueError("bad TIFF magic")
+        self.seen = set()
+
+    def unpack(self, code, offset):
+        start = self.base + offset
+        size = struct.calcsize(self.endian + code)
+        if offset < 0 or start + size > len(self.buf):
+            raise ValueError("offset outside file")
+        return struct.unpack_from(self.endian + code, self.buf, start)
+
+    def first_ifd(self):
+        return self.unpack("L", 4)[0]
+
+    def value(self, typ, count, field):
+        """Decode one entry; ``field`` is the offset of its 4-byte slot."""
+        code, size = TIFF_TYPES[typ]
+        total = size * count
+        offset = field if total <= 4 else self.unpack("L", field)[0]
+        if typ in (2, 7):
+            start = self.base + offset
+            if offset < 0 or start + total > len(self.buf):
+                raise ValueError("offset outside file")
+            raw = bytes(self.buf[start:start + total])
+            if typ == 7:
+                return raw
+            return raw.split(b"\x00", 1)[0].decode("utf-8", "replace").strip()
+        values = []
+        for n in range(min(count, 16)):
+            item = self.unpack(code, offset + n * size)
+            if typ in (5, 10):
+                values.append(item[0] / item[1] if item[1] else None)
+            else:
+                values.append(item[0])
+        return values[0] if count == 1 else values
+
+    def ifd(self, offset, tags):
+        """``{name: value}`` for the wanted ``tags`` of the IFD at ``offset``."""
+        if not offset or offset in self.seen:
+            return {}
+        self.seen.add(offset)
+        count = self.unpack("H", offset)[0]
+        out = {}
+        for n in range(min(count, MAX_IFD_ENTRIES)):
+            entry = offset + 2 + 12 * n
+            tag, typ, num = self.unpack("HHL", entry)
+            name = tags.get(tag)
+            if name is None or typ not in TIFF_TYPES or num == 0:
+                continue
+            try:
+                out[name] = self.value(typ, num, entry + 8)
+            except (ValueError, struct.error):
+                continue
+        return out
+
+
+def read_tags(path):
+    """Raw IFD0 + Exif + GPS tags of one file, or None if it has none."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 8:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            base = find_tiff(buf)
+            if base is None:
+                return None
+            reader = TiffReader(buf, base)
+            tags = reader.ifd(reader.first_ifd(), IFD0_TAGS)
+            tags.update(reader.ifd(tags.pop("ExifIFD", 0), EXIF_TAGS))
+            tags.update(reader.ifd(tags.pop("GPSIFD", 0), GPS_TAGS))
+            return tags
+
+
+def dms_to_degrees(dms, ref):
+    if not isinstance(dms, list) or len(dms) != 3 or None in dms:
+        return None
+    degrees = dms[0] + dms[1] / 60 + dms[2] / 3600
+    return -degrees if ref in ("S", "W") else degrees
+
+
+def exif_date(value):
+    """``2024:09:27 14:03:11`` -> ``2024-09-27T14:03:11.000Z``.
+
+    Same as the route's ``new Date(date).toISOString()``: exifr reads the
+    camera's local time as SERVER_TZ, and the result is given in UTC.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        taken = datetime.strptime(value[:19], "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None                         # "0000:00:00 00:00:00", blanks
+    taken = taken.replace(tzinfo=SERVER_TZ).astimezone(timezone.utc)
+    return taken.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def shutter_speed(exposure):
+    """Same formatting as extractExif(): ``1/250`` or ``2``."""
+    if not exposure:
+        return None
+    if exposure < 1:
+        return f"1/{round(1 / exposure)}"
+    return f"{exposure:g}"
+
+
+def exif_row(photo_id, tags):
+    """The `photo_exif` row, mapped like extractExif() in the admin route."""
+    def text(name):
+        value = tags.get(name)
+        return value if isinstance(value, str) and value else None
+
+    def number(name):
+        value = tags.get(name)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        return value if isinstance(value, (int, float)) and value else None
+
+    flash = number("Flash") if "Flash" in tags else None
+    exif = {
+        "cameraMake": text("Make"),
+        "cameraModel": text("Model"),
+        "lensModel": text("LensModel"),
+        "focalLength": number("FocalLength"),
+        "aperture": number("FNumber"),
+        "shutterSpeed": shutter_speed(number("ExposureTime")),
+        "isoSpeed": number("ISO"),
+        "flashUsed": None if "Flash" not in tags else bool(flash),
+        "orientation": number("Orientation"),
+        "gpsAltitude": number("GPSAltitude"),
+        "dateTakenExif": exif_date(tags.get("DateTimeOriginal"))
+        or exif_date(tags.get("CreateDate")),
+        "software": text("Software"),
+        "latitude": dms_to_degrees(tags.get("GPSLatitude"),
+                                   tags.get("GPSLatitudeRef")) or None,
+        "longitude": dms_to_degrees(tags.get("GPSLongitude"),
+                                    tags.get("GPSLongitudeRef")) or None,
+    }
+    return {
+        "photo_id": photo_id,
+        "camera_make": exif["cameraMake"],
+        "camera_model": exif["cameraModel"],
+        "lens_model": exif["lensModel"],
+        "focal_length": exif["focalLength"],
+        "aperture": exif["aperture"],
+        "shutter_speed": exif["shutterSpeed"],
+        "iso_speed": exif["isoSpeed"],
+        "flash_used": exif["flashUsed"],
+        "orientation": exif["orientation"],
+        "gps_altitude": exif["gpsAltitude"],
+        "date_taken_exif": exif["dateTakenExif"],
+        "software": exif["software"],
+        "raw_json": json.dumps(exif),
+    }
+
+
+def extract_batch(batch):
+    """Rows for ``[(photo_id, path)]``.
+
+    Returns ``(rows, with_gps, no_exif, errors)``; ``no_exif`` lists the
+    photo ids without EXIF, ``errors`` holds ``(photo_id, message)``.
+    """
+    rows, with_gps, no_exif, errors = [], 0, [], []
+    for photo_id, path in batch:
+        try:
+            tags = read_tags(path)
+        except (OSError, ValueError, struct.error) as e:
+            errors.append((photo_id, str(e)))
+            continue
+        if not tags:
+            no_exif.append(photo_id)
+            continue
+        rows.append(exif_row(photo_id, tags))
+        with_gps += "GPSLatitude" in tags
+    return rows, with_gps, no_exif, errors
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  DRIVER
+# ══════════════════════════════════════════════════════════════════════
+
+def iter_sources(root):
+    """Yield ``(photo_id, path)`` for mirror originals and loose files."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                path = os.path.join(entry.path, ORIGINAL_NAME)
+                if entry.name != RENDITION_DIR and os.path.isfile(path):
+                    yield entry.name.lower(), path
+            elif os.path.splitext(entry.name)[1].lower() in FILE_SUFFIXES:
+                yield os.path.splitext(entry.name)[0].lower(), entry.path
+
+
+def skipped_path(out_path):
+    out_path = Path(out_path)
+    return out_path.with_name(out_path.stem + SKIPPED_SUFFIX)
+
+
+def done_ids(*paths):
+    """Photo ids already written to any of ``paths`` by an earlier run."""
+    ids = set()
+    for path in paths:
+        if not Path(path).exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    ids.add(json.loads(line)["photo_id"])
+                except (ValueError, KeyError, TypeError):
+                    continue            # torn last line from a killed run
+    return ids
+
+
+def batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def extract(root, out_path, workers=None, limit=None):
+    """Append `photo_exif` rows for new files under ``root``; return counts."""
+    workers = workers or os.cpu_count() or 1
+    skipped_out = skipped_path(out_path)
+    skip = done_ids(out_path, skipped_out)
+    stats = {"files": 0, "skipped": 0, "rows": 0, "gps": 0, "no_exif": 0,
+             "errors": 0}
+    t0 = time.perf_counter()
+
+    def todo():
+        for photo_id, path in iter_sources(root):
+            if photo_id in skip:
+                stats["skipped"] += 1
+                continue
+            if limit and stats["files"] >= limit:
+                return
+            stats["files"] += 1
+            yield photo_id, path
+
+    with open(out_path, "a", encoding="utf-8") as out, \
+            open(skipped_out, "a", encoding="utf-8") as skipped, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        for rows, with_gps, no_exif, errors in pool.map(
+                extract_batch, batched(todo(), BATCH)):
+            for row in rows:
+                out.write(json.dumps(row) + "\n")
+            for photo_id in no_exif:
+                skipped.write(json.dumps({"photo_id": photo_id,
+                                          "status": "no_exif"}) + "\n")
+            for photo_id, error in errors:
+                skipped.write(json.dumps({"photo_id": photo_id,
+                                          "status": "error",
+                                          "error": error}) + "\n")
+            stats["rows"] += len(rows)
+            stats["gps"] += with_gps
+            stats["no_exif"] += len(no_exif)
+            stats["errors"] += len(errors)
+            for photo_id, error in errors[:5]:
+                print(f"  [ERR] {photo_id}: {error}")
+            done = stats["rows"] + stats["no_exif"] + stats["errors"]
+            if done % 50_000 < BATCH:
+                rate = done / (time.perf_counter() - t0)
+                print(f"  ... {done:,} files ({rate:,.0f}/s)")
+
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract photo_exif rows from image headers")
+    parser.add_argument("source", help="local blob mirror or directory of "
+                                       "JPEG/TIFF files")
+    parser.add_argument("--out", default="photo_exif.jsonl",
+                        help="JSONL of photo_exif rows (appended)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="process at most N files this run")
+    args = parser.parse_args()
+
+    if not Path(args.source).is_dir():
+        parser.error(f"{args.source} is not a directory")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — EXIF Extraction")
+    print("=" * 60)
+    stats = extract(args.source, args.out, workers=args.workers,
+                    limit=args.limit)
+    rate = stats["files"] / stats["seconds"] if stats["seconds"] else 0
+    print()
+    print(f"  Files read:         {stats['files']:,} "
+          f"({stats['skipped']:,} already done)")
+    print(f"  Rows written:       {stats['rows']:,} "
+          f"({stats['gps']:,} with GPS)")
+    print(f"  No EXIF:            {stats['no_exif']:,}")
+    print(f"  Errors:             {stats['errors']:,}")
+    print(f"  Elapsed:            {stats['seconds']:.1f} s "
+          f"({rate:,.0f} files/s)")
+    print(f"  Output:             {args.out}")
+    print(f"  Skipped/errors:     {skipped_path(args.out)}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,49 @@
 Generate all DOCX documents for the ASPR Photo Repository project.
 Reads markdown source files from docs/ and produces branded DOCX output.
 
-Run:  python scripts/generate_all_docx.py
+Run:  python scripts/generate_all_docx.py [--combined | --diff-against DOCX_OR_REF]
+      python scripts/generate_all_docx.py --report {incident,audit,schema,coverage,capacity} --input EXPORT
 Requires: pip install python-docx
+Optional: pip install pillow  (down-samples embedded screenshots)
 """
 
+import argparse
+import hashlib
+import importlib
+import io
 import os
 import re
+import subprocess
+import tempfile
+import threading
+import time
+import zipfile
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from xml.sax.saxutils import escape as xml_escape
 
 from docx import Document
 from docx.shared import Inches, Pt, Cm, RGBColor, Emu
+from docx.enum.section import WD_SECTION
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
+from docx.image.exceptions import (
+    InvalidImageStreamError, UnexpectedEndOfFileError, UnrecognizedImageError,
+)
 from docx.oxml.ns import qn, nsdecls
 from docx.oxml import parse_xml
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+try:
+    from PIL import Image
+except ImportError:  # images are embedded at original size
+    Image = None
 
 ROOT = Path(__file__).resolve().parent.parent
 DOCS = ROOT / "docs"
@@ -122,16 +151,101 @@ def add_para(doc, text, bold=False, italic=False, size=Pt(11),
     return p
 
 
-def add_bullet(doc, text, level=0):
-    p = doc.add_paragraph(style="List Bullet" if level == 0 else "List Bullet 2")
+# ── Lists ──────────────────────────────────────────────────────────────
+# One w:abstractNum per list kind is added to the numbering part and found
+# again by its w:name, so every list in a document (or a --combined
+# package) shares it. Bullets reuse a single w:num; each ordered list gets
+# its own w:num so its numbering restarts.
+
+LIST_LEVELS = 9
+LIST_KINDS = {
+    "bullet": {
+        "name": "aspr-md-bullet",
+        "fmt": ["bullet"] * LIST_LEVELS,
+        "text": ["\u2022", "\u25E6", "\u25AA"] * 3,
+    },
+    "ordered": {
+        "name": "aspr-md-ordered",
+        "fmt": ["decimal", "lowerLetter", "lowerRoman"] * 3,
+        "text": [f"%{n + 1}." for n in range(LIST_LEVELS)],
+    },
+}
+
+
+def _list_abstract_num_id(doc, kind):
+    """Return the abstractNumId for ``kind``, creating it on first use."""
+    numbering = doc.part.numbering_part.element
+    spec = LIST_KINDS[kind]
+    found = numbering.xpath(
+        f'./w:abstractNum[w:name/@w:val="{spec["name"]}"]/@w:abstractNumId')
+    if found:
+        return int(found[0])
+
+    ids = [int(v) for v in numbering.xpath('./w:abstractNum/@w:abstractNumId')]
+    abstract_id = max(ids, default=-1) + 1
+    lvls = "".join(
+        f'<w:lvl w:ilvl="{lvl}">'
+        f'<w:start w:val="1"/>'
+        f'<w:numFmt w:val="{spec["fmt"][lvl]}"/>'
+        f'<w:lvlText w:val="{spec["text"][lvl]}"/>'
+        f'<w:lvlJc w:val="left"/>'
+        f'<w:pPr><w:ind w:left="{360 * (lvl + 1) + 360}" w:hanging="360"/></w:pPr>'
+        f'</w:lvl>'
+        for lvl in range(LIST_LEVELS)
+    )
+    abstract = parse_xml(
+        f'<w:abstractNum {nsdecls("w")} w:abstractNumId="{abstract_id}">'
+        f'<w:multiLevelType w:val="hybridMultilevel"/>'
+        f'<w:name w:val="{spec["name"]}"/>'
+        f'{lvls}</w:abstractNum>'
+    )
+    # Schema order: every w:abstractNum precedes the first w:num
+    first_num = numbering.find(qn("w:num"))
+    if first_num is not None:
+        first_num.addprevious(abstract)
+    else:
+        numbering.append(abstract)
+    return abstract_id
+
+
+def list_num_id(doc, kind, start=None, level=0):
+    """Return a numId for a new list of ``kind``.
+
+    Bullet lists share one w:num. Ordered lists get a fresh w:num whose
+    ``level`` restarts at ``start`` (default 1).
+    """
+    numbering = doc.part.numbering_part.element
+    abstract_id = _list_abstract_num_id(doc, kind)
+
+    if kind == "bullet":
+        for num in numbering.num_lst:
+            if (num.abstractNumId.val == abstract_id
+                    and num.find(qn("w:lvlOverride")) is None):
+                return num.numId
+
+    num = numbering.add_num(abstract_id)
+    if kind == "ordered":
+        num.add_lvlOverride(ilvl=level).add_startOverride(start or 1)
+    return num.numId
+
+
+def add_list_item(doc, text, num_id, level=0):
+    """Add a paragraph attached to list ``num_id`` at nesting ``level``."""
+    p = doc.add_paragraph(style="List Paragraph")
     p.paragraph_format.space_after = Pt(3)
-    p.clear()
+    numPr = p._p.get_or_add_pPr().get_or_add_numPr()
+    numPr.get_or_add_ilvl().val = min(level, LIST_LEVELS - 1)
+    numPr.get_or_add_numId().val = num_id
     run = p.add_run(text)
     run.font.size = Pt(11)
     run.font.name = "Calibri"
     return p
 
 
+def add_bullet(doc, text, level=0):
+    return add_list_item(doc, text, list_num_id(doc, "bullet"), level)
+
+
 def add_toc(doc):
     """Add a Word field-based Table of Contents."""
     add_heading_styled(doc, "Table of Contents", level=1)
@@ -162,26 +276,22 @@ def add_toc(doc):
     run5._r.append(fldChar3)
 
 
-def setup_doc(doc_title, doc_subtitle, version="1.0", date="February 7, 2026",
-              status="Draft"):
-    """Create a new Document with branding, cover page, and TOC."""
-    doc = Document()
-
-    # Base style
+def apply_base_style(doc):
+    """Set the Normal style and page margins shared by every document."""
     style = doc.styles["Normal"]
     style.font.name = "Calibri"
     style.font.size = Pt(11)
     style.paragraph_format.space_after = Pt(6)
 
-    # Margins
     for section in doc.sections:
         section.top_margin = Cm(2.5)
         section.bottom_margin = Cm(2.5)
         section.left_margin = Cm(2.5)
         section.right_margin = Cm(2.5)
 
-    # Header
-    section = doc.sections[0]
+
+def set_section_header(section, doc_title):
+    """Give a section its own running header naming the document."""
     header = section.header
     header.is_linked_to_previous = False
     hp = header.paragraphs[0]
@@ -192,7 +302,8 @@ def setup_doc(doc_title, doc_subtitle, version="1.0", date="February 7, 2026",
     run.font.color.rgb = BLUE_PRIMARY
     run.font.name = "Calibri"
 
-    # Footer
+
+def set_section_footer(section):
     footer = section.footer
     footer.is_linked_to_previous = False
     fp = footer.paragraphs[0]
@@ -202,7 +313,10 @@ def setup_doc(doc_title, doc_subtitle, version="1.0", date="February 7, 2026",
     run.font.color.rgb = BLUE_DARK
     run.font.name = "Calibri"
 
-    # ── Cover Page ──
+
+def add_cover_page(doc, doc_title, doc_subtitle, version="1.0",
+                   date="February 7, 2026", status="Draft"):
+    """Add the branded cover page, ending with a page break."""
     for _ in range(3):
         doc.add_paragraph()
 
@@ -261,6 +375,19 @@ def setup_doc(doc_title, doc_subtitle, version="1.0", date="February 7, 2026",
 
     doc.add_page_break()
 
+
+def setup_doc(doc_title, doc_subtitle, version="1.0", date="February 7, 2026",
+              status="Draft"):
+    """Create a new Document with branding, cover page, and TOC."""
+    doc = Document()
+    apply_base_style(doc)
+
+    section = doc.sections[0]
+    set_section_header(section, doc_title)
+    set_section_footer(section)
+
+    add_cover_page(doc, doc_title, doc_subtitle, version, date, status)
+
     # TOC
     add_toc(doc)
     doc.add_page_break()
@@ -268,6 +395,303 @@ def setup_doc(doc_title, doc_subtitle, version="1.0", date="February 7, 2026",
     return doc
 
 
+def start_doc_section(doc, doc_title):
+    """Open a new-page section with its own header for a bound document.
+
+    The footer stays linked to the previous section, so the whole package
+    shares one footer part.
+    """
+    section = doc.add_section(WD_SECTION.NEW_PAGE)
+    set_section_header(section, doc_title)
+    return section
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  CODE BLOCK HIGHLIGHTING
+# ══════════════════════════════════════════════════════════════════════
+
+CODE_FONT_SIZE = Pt(8.5)
+CODE_DEFAULT_COLOR = RGBColor(0x33, 0x33, 0x33)
+
+# (colour, bold, italic) per token type
+CODE_TOKEN_STYLES = {
+    "keyword":  (BLUE_PRIMARY, True, False),
+    "key":      (BLUE_DARK, False, False),
+    "string":   (GOLD, False, False),
+    "number":   (RED, False, False),
+    "variable": (RGBColor(0x24, 0x77, 0xBD), False, False),
+    "option":   (BLUE_DARK, False, False),
+    "comment":  (RGBColor(0x80, 0x80, 0x80), False, True),
+}
+
+_SQL_KEYWORDS = (
+    "SELECT|FROM|WHERE|AND|OR|NOT|NULL|IS|IN|AS|ON|JOIN|LEFT|RIGHT|INNER|"
+    "OUTER|GROUP|BY|ORDER|ASC|DESC|TOP|OFFSET|FETCH|NEXT|ROWS|ONLY|INSERT|"
+    "INTO|VALUES|UPDATE|SET|DELETE|CREATE|ALTER|DROP|TABLE|INDEX|VIEW|"
+    "UNIQUE|CLUSTERED|NONCLUSTERED|PRIMARY|FOREIGN|KEY|REFERENCES|DEFAULT|"
+    "CONSTRAINT|CASCADE|INCLUDE|IF|EXISTS|BEGIN|END|COUNT|SUM|MAX|MIN|CASE|"
+    "WHEN|THEN|ELSE|DISTINCT|LIKE|BETWEEN|OUTPUT|INSERTED|DELETED|GO|"
+    "NVARCHAR|VARCHAR|INT|BIGINT|BIT|FLOAT|DECIMAL|DATETIME2|DATE|"
+    "UNIQUEIDENTIFIER|IDENTITY|NEWID|GETUTCDATE|SYSUTCDATETIME"
+)
+_BASH_KEYWORDS = (
+    "if|then|else|elif|fi|for|in|do|done|while|case|esac|function|return|"
+    "export|local|echo|exit|set"
+)
+_TS_KEYWORDS = (
+    "const|let|var|function|return|if|else|for|while|import|from|export|"
+    "default|async|await|new|class|extends|interface|type|true|false|null|"
+    "undefined|try|catch|throw"
+)
+
+_DQ_STRING = r'"(?:\\.|[^"\\])*"'
+_SQ_STRING = r"'(?:\\.|[^'\\])*'"
+
+# Ordered (token type, pattern) rules per language; earlier rules win.
+CODE_LEXER_RULES = {
+    "json": [
+        ("key", _DQ_STRING + r'(?=\s*:)'),
+        ("string", _DQ_STRING),
+        ("number", r'-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b'),
+        ("keyword", r'\b(?:true|false|null)\b'),
+    ],
+    "sql": [
+        ("comment", r'--.*$'),
+        ("string", r"N?'(?:''|[^'])*'"),
+        ("variable", r'@\w+'),
+        ("keyword", rf'(?i:\b(?:{_SQL_KEYWORDS})\b)'),
+        ("number", r'\b\d+(?:\.\d+)?\b'),
+    ],
+    "bash": [
+        ("comment", r'(?:^|(?<=\s))#.*$'),
+        ("string", _DQ_STRING + "|" + _SQ_STRING),
+        ("variable", r'\$\{[^}]*\}|\$\w+'),
+        ("option", r'(?<!\S)--?[A-Za-z][\w-]*'),
+        ("keyword", rf'\b(?:{_BASH_KEYWORDS})\b'),
+    ],
+    "ts": [
+        ("comment", r'//.*$'),
+        ("string", _DQ_STRING + "|" + _SQ_STRING + r"|`[^`]*`"),
+        ("keyword", rf'\b(?:{_TS_KEYWORDS})\b'),
+        ("number", r'\b\d+(?:\.\d+)?\b'),
+    ],
+}
+
+CODE_LANG_ALIASES = {
+    "sh": "bash", "shell": "bash", "zsh": "bash", "console": "bash",
+    "js": "ts", "javascript": "ts", "jsx": "ts", "typescript": "ts",
+    "tsx": "ts", "tsql": "sql", "mssql": "sql",
+}
+
+_CODE_LEXERS = {
+    lang: re.compile("|".join(f"(?P<{ttype}{n}>{pattern})"
+                              for n, (ttype, pattern) in enumerate(rules)))
+    for lang, rules in CODE_LEXER_RULES.items()
+}
+
+
+@lru_cache(maxsize=None)
+def code_token_style(token_type):
+    """Resolve a lexer group name (e.g. ``string1``) to a run style."""
+    base = token_type.rstrip("0123456789") if token_type else None
+    return CODE_TOKEN_STYLES.get(base, (CODE_DEFAULT_COLOR, False, False))
+
+
+@lru_cache(maxsize=256)
+def highlight_code(lang, code_text):
+    """Tokenize a code snippet into lines of ``(text, token_type)`` pairs.
+
+    Adjacent pieces with the same token type are merged so each line needs
+    as few runs as possible. Results are cached, so a snippet repeated
+    across documents (or in ``--combined`` mode) is only lexed once.
+    """
+    lang = (lang or "").strip().lower()
+    lexer = _CODE_LEXERS.get(CODE_LANG_ALIASES.get(lang, lang))
+
+    out = []
+    for line in code_text.split("\n"):
+        pieces = []
+        if lexer is None:
+            pieces.append((line, None))
+        else:
+            pos = 0
+            for m in lexer.finditer(line):
+                if m.start() > pos:
+                    pieces.append((line[pos:m.start()], None))
+                pieces.append((m.group(), m.lastgroup))
+                pos = m.end()
+            if pos < len(line):
+                pieces.append((line[pos:], None))
+
+        merged = []
+        for text, ttype in pieces:
+            if merged and code_token_style(merged[-1][1]) == code_token_style(ttype):
+                merged[-1] = (merged[-1][0] + text, merged[-1][1])
+            else:
+                merged.append((text, ttype))
+        out.append(tuple(merged))
+    return tuple(out)
+
+
+def add_code_block(doc, code_lines, lang=None):
+    """Add a fenced code block as styled Consolas runs with line breaks."""
+    p = doc.add_paragraph()
+    p.paragraph_format.space_before = Pt(6)
+    p.paragraph_format.space_after = Pt(6)
+
+    lines = highlight_code(lang, "\n".join(code_lines))
+    for li, pieces in enumerate(lines):
+        run = None
+        for text, ttype in pieces:
+            color, bold, italic = code_token_style(ttype)
+            run = p.add_run(text)
+            run.font.size = CODE_FONT_SIZE
+            run.font.name = "Consolas"
+            run.font.color.rgb = color
+            if bold:
+                run.bold = True
+            if italic:
+                run.italic = True
+        if li < len(lines) - 1:
+            if run is None:
+                run = p.add_run()
+            run.add_break()
+    return p
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  MARKDOWN IMAGES
+# ══════════════════════════════════════════════════════════════════════
+
+IMAGE_LINE_RE = re.compile(r'^!\[([^\]]*)\]\(\s*<?([^)>]+?)>?(?:\s+"[^"]*")?\s*\)$')
+IMAGE_MAX_WIDTH = Inches(6.5)      # usable page width inside 2.5 cm margins
+IMAGE_MAX_PIXELS = 1600            # ~250 dpi at full page width
+
+
+def resolve_md_image(target, base=DOCS):
+    """Resolve an image link target relative to the markdown directory."""
+    target = target.strip()
+    if re.match(r'^[a-z]+://', target, re.IGNORECASE):
+        return None  # remote images are not fetched
+    return (base / target).resolve()
+
+
+def md_image_paths(lines, base=DOCS):
+    """All local image paths referenced by ``![alt](path)`` lines."""
+    paths = []
+    for line in lines:
+        m = IMAGE_LINE_RE.match(line.strip())
+        if m:
+            path = resolve_md_image(m.group(2), base)
+            if path is not None:
+                paths.append(path)
+    return paths
+
+
+def downsample_image(data):
+    """Shrink an image to IMAGE_MAX_PIXELS wide, returning encoded bytes.
+
+    JPEGs stay JPEG; everything else is written as PNG, which also turns
+    formats Word cannot embed (e.g. WebP) into ones it can. Without Pillow
+    the original bytes are returned unchanged.
+    """
+    if Image is None:
+        return data
+
+    with Image.open(io.BytesIO(data)) as img:
+        is_jpeg = img.format == "JPEG"
+        if img.width <= IMAGE_MAX_PIXELS and img.format in ("JPEG", "PNG"):
+            return data
+
+        if is_jpeg:
+            # Let the JPEG decoder skip detail we are about to throw away
+            img.draft("RGB", (IMAGE_MAX_PIXELS, img.height))
+        img.thumbnail((IMAGE_MAX_PIXELS, img.height * IMAGE_MAX_PIXELS),
+                      Image.LANCZOS)
+
+        out = io.BytesIO()
+        if is_jpeg:
+            img.convert("RGB").save(out, "JPEG", quality=85, optimize=True)
+        else:
+            img.save(out, "PNG", optimize=True)
+        return out.getvalue()
+
+
+class ImagePrefetcher:
+    """Read, hash and down-sample markdown images on a thread pool.
+
+    Images are submitted before the document is written so decoding runs
+    ahead of the (single-threaded) DOCX writer. Files with identical
+    content are only down-sampled once; python-docx then stores each
+    distinct image part once per package.
+    """
+
+    def __init__(self, max_workers=None):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or min(8, os.cpu_count() or 1))
+        self._lock = threading.Lock()
+        self._by_path = {}
+        self._by_hash = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def prefetch(self, paths):
+        for path in paths:
+            if path not in self._by_path:
+                self._by_path[path] = self._pool.submit(self._read, path)
+
+    def _read(self, path):
+        data = path.read_bytes()
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            future = self._by_hash.get(digest)
+            if future is None:
+                future = self._pool.submit(downsample_image, data)
+                self._by_hash[digest] = future
+        return future
+
+    def get(self, path):
+        """Embeddable bytes for ``path``, or None if it cannot be read."""
+        self.prefetch([path])
+        try:
+            return self._by_path[path].result().result()
+        except (OSError, ValueError) as e:
+            print(f"  [!] Image {path.name}: {e}")
+            return None
+
+
+def add_image(doc, data, alt="", missing=""):
+    """Add a centred picture (scaled to the page width) with its caption."""
+    if data is None:
+        add_para(doc, f"[Image not available: {missing}]", italic=True,
+                 size=Pt(9), color=RED, align=WD_ALIGN_PARAGRAPH.CENTER)
+        return None
+
+    p = doc.add_paragraph()
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    p.paragraph_format.keep_with_next = bool(alt)
+    try:
+        pic = p.add_run().add_picture(io.BytesIO(data))
+    except (UnrecognizedImageError, InvalidImageStreamError,
+            UnexpectedEndOfFileError) as e:
+        # e.g. WebP/SVG passed through unconverted when Pillow is missing
+        print(f"  [!] Image {missing or alt}: {type(e).__name__}")
+        p._element.getparent().remove(p._element)
+        return add_image(doc, None, alt, missing or alt)
+    if pic.width > IMAGE_MAX_WIDTH:
+        pic.height = int(pic.height * IMAGE_MAX_WIDTH / pic.width)
+        pic.width = IMAGE_MAX_WIDTH
+
+    if alt:
+        add_para(doc, alt, italic=True, size=Pt(9), color=BLUE_PRIMARY,
+                 align=WD_ALIGN_PARAGRAPH.CENTER)
+    return pic
+
+
 # ══════════════════════════════════════════════════════════════════════
 #  MARKDOWN → DOCX CONVERTER
 # ══════════════════════════════════════════════════════════════════════
@@ -287,27 +711,89 @@ def parse_md_table(lines):
     return headers, rows
 
 
-def md_to_docx(md_path, doc_title, doc_subtitle, out_filename):
-    """Convert a markdown file to a branded DOCX document."""
-    md_text = md_path.read_text(encoding='utf-8')
-    lines = md_text.split('\n')
+LIST_ITEM_RE = re.compile(r'^(\s*)([-*+]|(\d+)[.)])\s+(.*)$')
 
-    doc = setup_doc(doc_title, doc_subtitle)
 
-    # Skip the markdown header block (title, metadata table, ---)
-    # Find where the actual content starts (first ## heading)
-    content_start = 0
-    found_first_heading = False
+def parse_md_list(lines, i):
+    """Parse a markdown list block starting at ``lines[i]``.
+
+    Returns ``(items, next_i)`` where items are ``(depth, kind, start,
+    text)``. Depth comes from an indent stack, so 2-, 3- and 4-space
+    nesting all work. Blank lines between items do not end the list.
+    """
+    items = []
+    indents = []
+    while i < len(lines):
+        stripped = lines[i].strip()
+        m = LIST_ITEM_RE.match(lines[i])
+        if not stripped:
+            j = i + 1
+            while j < len(lines) and not lines[j].strip():
+                j += 1
+            if j < len(lines) and LIST_ITEM_RE.match(lines[j]):
+                i = j
+                continue
+            break
+        if not m or (stripped.startswith('- [') and '](#' in stripped):
+            break
+
+        indent = len(m.group(1).expandtabs(4))
+        while indents and indent < indents[-1]:
+            indents.pop()
+        if not indents or indent > indents[-1]:
+            indents.append(indent)
+
+        kind = "ordered" if m.group(3) else "bullet"
+        start = int(m.group(3)) if m.group(3) else None
+        text = m.group(4).strip().replace('**', '')  # Remove bold markers
+        items.append((len(indents) - 1, kind, start, text))
+        i += 1
+    return items, i
+
+
+def add_md_list(doc, items):
+    """Render parsed list items, reusing w:num instances where possible."""
+    open_lists = []  # (kind, numId) per depth
+    for depth, kind, start, text in items:
+        del open_lists[depth + 1:]
+        if depth < len(open_lists) and open_lists[depth][0] != kind:
+            del open_lists[depth:]
+        while len(open_lists) <= depth:
+            open_lists.append(None)
+        if open_lists[depth] is None:
+            open_lists[depth] = (kind, list_num_id(doc, kind, start, depth))
+        add_list_item(doc, text, open_lists[depth][1], depth)
+
+
+def md_content_lines(md_text):
+    """Split markdown into lines, dropping the header block.
+
+    The title, metadata table and markdown TOC before the first ``##``
+    heading are replaced by the generated cover page and Word TOC.
+    """
+    lines = md_text.split('\n')
     for i, line in enumerate(lines):
-        if line.startswith('## ') and not found_first_heading:
+        if line.startswith('## '):
             # Skip "Table of Contents" if present
             if 'table of contents' in line.lower():
                 continue
-            content_start = i
-            found_first_heading = True
-            break
-
-    i = content_start
+            return lines[i:]
+    return lines
+
+
+def parse_md_blocks(lines):
+    """Parse markdown content lines into a list of hashable block tuples.
+
+    Block shapes:
+        ("heading", level, text)
+        ("table", headers, rows)
+        ("code", lang, code_lines)
+        ("list", items)            # items from parse_md_list
+        ("image", alt, target)
+        ("para", text, bold)
+    """
+    blocks = []
+    i = 0
     while i < len(lines):
         line = lines[i]
         stripped = line.strip()
@@ -327,13 +813,13 @@ def md_to_docx(md_path, doc_title, doc_subtitle, out_filename):
             text = stripped[4:].strip()
             if text.startswith('#'):
                 text = text.lstrip('#').strip()
-            add_heading_styled(doc, text, level=3)
+            blocks.append(("heading", 3, text))
             i += 1
             continue
 
         if stripped.startswith('## '):
             text = stripped[3:].strip()
-            add_heading_styled(doc, text, level=2)
+            blocks.append(("heading", 2, text))
             i += 1
             continue
 
@@ -350,11 +836,13 @@ def md_to_docx(md_path, doc_title, doc_subtitle, out_filename):
                 i += 1
             headers, rows = parse_md_table(table_lines)
             if headers and rows:
-                styled_table(doc, headers, rows)
+                blocks.append(("table", tuple(headers),
+                               tuple(tuple(r) for r in rows)))
             continue
 
         # Code block
         if stripped.startswith('```'):
+            lang = stripped[3:].strip()
             code_lines = []
             i += 1
             while i < len(lines) and not lines[i].strip().startswith('```'):
@@ -362,39 +850,82 @@ def md_to_docx(md_path, doc_title, doc_subtitle, out_filename):
                 i += 1
             i += 1  # skip closing ```
 
-            code_text = '\n'.join(code_lines)
-            p = doc.add_paragraph()
-            p.paragraph_format.space_before = Pt(6)
-            p.paragraph_format.space_after = Pt(6)
-            run = p.add_run(code_text)
-            run.font.size = Pt(8.5)
-            run.font.name = "Consolas"
-            run.font.color.rgb = RGBColor(0x33, 0x33, 0x33)
+            blocks.append(("code", lang, tuple(code_lines)))
+            continue
+
+        # Bulleted / numbered list
+        if LIST_ITEM_RE.match(line):
+            items, i = parse_md_list(lines, i)
+            blocks.append(("list", tuple(items)))
             continue
 
-        # Bullet point
-        if stripped.startswith('- ') or stripped.startswith('* '):
-            text = stripped[2:].strip()
-            # Remove bold markers
-            text = text.replace('**', '')
-            level = 1 if line.startswith('  ') else 0
-            add_bullet(doc, text, level=level)
+        # Image
+        m = IMAGE_LINE_RE.match(stripped)
+        if m:
+            blocks.append(("image", m.group(1), m.group(2)))
             i += 1
             continue
 
         # Bold paragraph
         if stripped.startswith('**') and stripped.endswith('**'):
             text = stripped.strip('*').strip()
-            add_para(doc, text, bold=True)
+            blocks.append(("para", text, True))
             i += 1
             continue
 
         # Regular paragraph
         text = stripped.replace('**', '')
         if text:
-            add_para(doc, text)
+            blocks.append(("para", text, False))
         i += 1
 
+    return blocks
+
+
+def render_block(doc, block, images):
+    """Write one parse_md_blocks block to ``doc``."""
+    kind = block[0]
+    if kind == "heading":
+        add_heading_styled(doc, block[2], level=block[1])
+    elif kind == "table":
+        styled_table(doc, block[1], block[2])
+    elif kind == "code":
+        add_code_block(doc, block[2], block[1])
+    elif kind == "list":
+        add_md_list(doc, block[1])
+    elif kind == "image":
+        alt, target = block[1], block[2]
+        path = resolve_md_image(target)
+        add_image(doc, images.get(path) if path else None, alt, target)
+    elif kind == "para":
+        add_para(doc, block[1], bold=block[2])
+
+
+def render_markdown(doc, lines, images=None):
+    """Append markdown content lines to ``doc``.
+
+    ``images`` is an ImagePrefetcher that has already been given this
+    document's image paths; without one, images load on demand.
+    """
+    if images is None:
+        with ImagePrefetcher() as images:
+            return render_markdown(doc, lines, images)
+
+    for block in parse_md_blocks(lines):
+        render_block(doc, block, images)
+
+
+def md_to_docx(md_path, doc_title, doc_subtitle, out_filename):
+    """Convert a markdown file to a branded DOCX document."""
+    md_text = md_path.read_text(encoding='utf-8')
+
+    lines = md_content_lines(md_text)
+
+    with ImagePrefetcher() as images:
+        images.prefetch(md_image_paths(lines))
+        doc = setup_doc(doc_title, doc_subtitle)
+        render_markdown(doc, lines, images)
+
     # Save
     out_path = DOCS / out_filename
     doc.save(str(out_path))
@@ -403,6 +934,562 @@ def md_to_docx(md_path, doc_title, doc_subtitle, out_filename):
     return out_path
 
 
+def md_to_combined_docx(doc_defs, out_filename, doc_title, doc_subtitle):
+    """Render several markdown files into one bound DOCX in a single pass.
+
+    All sources share one styles/numbering part, and python-docx stores
+    each distinct image (e.g. the cover logos) once in the package. Every
+    source starts on a new page in its own section with its own header.
+    """
+    doc = Document()
+    apply_base_style(doc)
+    set_section_header(doc.sections[0], doc_title)
+    set_section_footer(doc.sections[0])
+    add_cover_page(doc, doc_title, doc_subtitle)
+    # No trailing page break: the first section break starts the next page
+    add_toc(doc)
+
+    sources = []
+    for doc_def in doc_defs:
+        md_path = DOCS / doc_def["md"]
+        if not md_path.exists():
+            print(f"  [!] Skipping {doc_def['md']} (not found)")
+            continue
+        lines = md_content_lines(md_path.read_text(encoding='utf-8'))
+        sources.append((doc_def, lines))
+
+    with ImagePrefetcher() as images:
+        # Queue every document's images before writing the first one
+        for _, lines in sources:
+            images.prefetch(md_image_paths(lines))
+
+        for doc_def, lines in sources:
+            start_doc_section(doc, doc_def["title"])
+            add_heading_styled(doc, doc_def["title"], level=1)
+            render_markdown(doc, lines, images)
+            print(f"  [OK] {doc_def['md']}")
+
+    out_path = DOCS / out_filename
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_filename} ({size_kb:.1f} KB, "
+          f"{len(sources)} documents)")
+    return out_path
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  STREAMING OUTPUT  (reports too large to build in memory)
+# ══════════════════════════════════════════════════════════════════════
+
+STREAM_MARKER = "\u2063ASPR-STREAM-BODY\u2063"
+_PH_OPEN, _PH_CLOSE = "\ue000", "\ue001"
+_XMLNS_RE = re.compile(r'\sxmlns:\w+="[^"]*"')
+_XML_INVALID_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _ph(n):
+    """Placeholder text for template slot ``n``."""
+    return f"{_PH_OPEN}{n}{_PH_CLOSE}"
+
+
+def _xml_text(value):
+    return xml_escape(_XML_INVALID_RE.sub("", "" if value is None else str(value)))
+
+
+class StreamingDocx:
+    """Branded DOCX whose body is streamed to disk instead of held in memory.
+
+    The cover page, TOC, styles, headers and footers come from an ordinary
+    python-docx ``doc`` (normally from setup_doc). Content appended through
+    this writer goes straight into word/document.xml in the output zip,
+    using XML templates captured once from add_heading_styled, add_para and
+    styled_table, so formatting matches the in-memory helpers and memory
+    use stays flat however many rows are written. Only headings, plain
+    paragraphs, tables and page breaks can be streamed.
+
+        with StreamingDocx(setup_doc(title, subtitle), out_path) as out:
+            out.heading("Results", level=2)
+            with out.table(["A", "B"]) as rows:
+                for a, b in records:
+                    rows.add([a, b])
+
+    Content can also be written before the writer is entered: between
+    ``begin_part()`` and ``end_part()`` it goes to a temporary spool, and
+    ``insert_part(part)`` copies it into the body later. That lets one pass
+    over the data produce sections whose summary (or cover, via ``doc``)
+    is only known at the end.
+    """
+
+    SPOOL_CHUNK = 1 << 20
+
+    def __init__(self, doc, out_path):
+        self.doc = doc
+        self.out_path = Path(out_path)
+        self._templates = {}
+        self._zip = None
+        self._out = None
+        self._tail = ""
+        self._spool = None
+        self._parts = []
+        self._before_part = None
+
+    # ── templates ──
+
+    def _capture(self, build):
+        """Run ``build`` against the doc and return the XML it appended."""
+        body = self.doc.element.body
+        n_before = len(body)  # new block items go before the final sectPr
+        build()
+        new = list(body)[n_before - 1:-1]
+        xml = "".join(_XMLNS_RE.sub("", etree.tostring(el, encoding="unicode"))
+                      for el in new)
+        for el in new:
+            body.remove(el)
+        return xml
+
+    @staticmethod
+    def _as_format(xml):
+        xml = xml.replace("{", "{{").replace("}", "}}")
+        return re.sub(f"{_PH_OPEN}(\\d+){_PH_CLOSE}", r"{\1}", xml)
+
+    def _template(self, key, build):
+        if key not in self._templates:
+            self._templates[key] = self._as_format(self._capture(build))
+        return self._templates[key]
+
+    # ── output ──
+
+    def __enter__(self):
+        marker = self.doc.add_paragraph(STREAM_MARKER)
+        skeleton = io.BytesIO()
+        self.doc.save(skeleton)
+        marker._p.getparent().remove(marker._p)
+
+        src = zipfile.ZipFile(skeleton)
+        xml = src.read("word/document.xml").decode("utf-8")
+        at = xml.index(STREAM_MARKER)
+        start = max(m.start() for m in re.finditer(r"<w:p[ >]", xml[:at]))
+        end = xml.index("</w:p>", at) + len("</w:p>")
+        self._tail = xml[end:]
+
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(self.out_path, "w", zipfile.ZIP_DEFLATED)
+        for item in src.infolist():
+            if item.filename != "word/document.xml":
+                self._zip.writestr(item, src.read(item.filename))
+        self._out = io.TextIOWrapper(
+            self._zip.open("word/document.xml", "w", force_zip64=True),
+            encoding="utf-8")
+        self._out.write(xml[:start])
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._out.write(self._tail)
+            self._out.close()
+        finally:
+            self._zip.close()
+            self.close_spool()
+        if exc_type is not None:
+            self.out_path.unlink(missing_ok=True)
+
+    # ── spooled parts ──
+
+    def begin_part(self):
+        """Divert output to the spool until end_part(); returns a part id."""
+        if self._spool is None:
+            self._spool = _Spool()
+        self._before_part, self._out = self._out, self._spool
+        self._parts.append([self._spool.tell(), None])
+        return len(self._parts) - 1
+
+    def end_part(self):
+        self._parts[-1][1] = self._spool.tell()
+        self._out, self._before_part = self._before_part, None
+
+    def insert_part(self, part):
+        """Copy a spooled part into the document body."""
+        start, end = self._parts[part]
+        self._out.flush()
+        self._spool.copy(start, end, self._out.buffer, self.SPOOL_CHUNK)
+
+    def close_spool(self):
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+    def write(self, template, *values):
+        self._out.write(template.format(*(_xml_text(v) for v in values)))
+
+    def heading(self, text, level=1):
+        self.write(self._template(
+            ("heading", level),
+            lambda: add_heading_styled(self.doc, _ph(0), level=level)), text)
+
+    def para(self, text, bold=False, italic=False):
+        self.write(self._template(
+            ("para", bold, italic),
+            lambda: add_para(self.doc, _ph(0), bold=bold, italic=italic)), text)
+
+    def page_break(self):
+        self._out.write(self._template(
+            ("page_break",), lambda: self.doc.add_page_break()))
+
+    def table(self, headers, col_widths=None):
+        """Open a streamed styled_table; use as ``with out.table(...) as rows``."""
+        key = ("table", tuple(headers), tuple(col_widths or ()))
+        if key not in self._templates:
+            ncols = len(headers)
+            placeholder_rows = [[_ph(c) for c in range(ncols)]] * 2
+
+            def build():
+                table = styled_table(self.doc, headers, placeholder_rows,
+                                     col_widths)
+                # Repeat the header row on every page of long tables
+                table.rows[0]._tr.get_or_add_trPr().append(
+                    parse_xml(f'<w:tblHeader {nsdecls("w")}/>'))
+
+            xml = self._capture(build)
+            rows = [m.start() for m in re.finditer(r"<w:tr[ >]", xml)]
+            head, even, odd = xml[:rows[1]], xml[rows[1]:rows[2]], xml[rows[2]:]
+            odd, close = odd[:-len("</w:tbl>")], "</w:tbl>"
+            self._templates[key] = tuple(
+                self._as_format(x) for x in (head, even, odd, close))
+        return _StreamingTable(self, *self._templates[key])
+
+
+class _Spool:
+    """Temporary UTF-8 byte store that StreamingDocx can write text to."""
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+
+    def write(self, text):
+        self._file.write(text.encode("utf-8"))
+
+    def tell(self):
+        return self._file.tell()
+
+    def copy(self, start, end, dest, chunk):
+        self._file.seek(start)
+        while start < end:
+            data = self._file.read(min(chunk, end - start))
+            if not data:
+                break
+            dest.write(data)
+            start += len(data)
+        self._file.seek(0, os.SEEK_END)
+
+    def close(self):
+        self._file.close()
+
+
+class _StreamingTable:
+    def __init__(self, out, head, even, odd, close):
+        self._out = out
+        self._head, self._rows, self._close = head, (even, odd), close
+        self.count = 0
+
+    def __enter__(self):
+        self._out.write(self._head)
+        return self
+
+    def __exit__(self, *exc):
+        self._out.write(self._close)
+        # Keep consecutive tables from merging into one
+        self._out.para("")
+
+    def add(self, values):
+        self._out.write(self._rows[self.count % 2], *values)
+        self.count += 1
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  STRUCTURAL DIFF  (--diff-against)
+# ══════════════════════════════════════════════════════════════════════
+# Both versions are flattened into "units" — one per heading, paragraph,
+# list item, code block, image or table — and compared as sequences of
+# interned unit ids with patience diff (unique common units as anchors),
+# falling back to an LCS table inside unanchored gaps.
+
+DIFF_LCS_MAX_CELLS = 250_000  # larger unanchored gaps use SequenceMatcher
+
+
+def md_units(lines):
+    """Flatten parse_md_blocks output into ``(kind, text)`` diff units."""
+    units = []
+    for block in parse_md_blocks(lines):
+        kind = block[0]
+        if kind == "heading":
+            units.append(("heading", block[2]))
+        elif kind == "para":
+            units.append(("para", block[1]))
+        elif kind == "list":
+            units.extend(("item", item[3]) for item in block[1])
+        elif kind == "code":
+            units.append(("code", "\n".join(block[2])))
+        elif kind == "image":
+            units.append(("image", block[1] or block[2]))
+        elif kind == "table":
+            rows = (block[1],) + block[2]
+            units.append(("table", "\n".join(" | ".join(r) for r in rows)))
+    return units
+
+
+def docx_units(doc):
+    """Flatten a python-docx Document into ``(kind, text)`` diff units."""
+    units = []
+    for child in doc.element.body.iterchildren():
+        if child.tag == qn("w:p"):
+            p = Paragraph(child, doc)
+            text = p.text.strip()
+            if not text:
+                continue
+            style = p.style.name if p.style is not None else ""
+            if style.startswith("Heading"):
+                units.append(("heading", text))
+            elif style.startswith("List") or child.xpath("./w:pPr/w:numPr"):
+                units.append(("item", text))
+            else:
+                units.append(("para", text))
+        elif child.tag == qn("w:tbl"):
+            table = Table(child, doc)
+            rows = [" | ".join(c.text.strip() for c in row.cells)
+                    for row in table.rows]
+            units.append(("table", "\n".join(rows)))
+    return units
+
+
+def _lis_pairs(pairs):
+    """Longest run of ``(i, j)`` pairs increasing in j (patience sorting)."""
+    tails, tail_idx, prev = [], [], [None] * len(pairs)
+    for n, (_, j) in enumerate(pairs):
+        k = bisect_left(tails, j)
+        if k == len(tails):
+            tails.append(j)
+            tail_idx.append(n)
+        else:
+            tails[k] = j
+            tail_idx[k] = n
+        prev[n] = tail_idx[k - 1] if k else None
+    out = []
+    n = tail_idx[-1] if tail_idx else None
+    while n is not None:
+        out.append(pairs[n])
+        n = prev[n]
+    return out[::-1]
+
+
+def _lcs_matches(a, b, alo, ahi, blo, bhi, out):
+    n, m = ahi - alo, bhi - blo
+    if n * m > DIFF_LCS_MAX_CELLS:
+        # Too big for an exact table: use difflib's longest-block matcher
+        sm = SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+        for i, j, size in sm.get_matching_blocks():
+            out.extend((alo + i + k, blo + j + k) for k in range(size))
+        return
+    table = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        ai, row, below = a[alo + i], table[i], table[i + 1]
+        for j in range(m - 1, -1, -1):
+            if ai == b[blo + j]:
+                row[j] = below[j + 1] + 1
+            else:
+                row[j] = max(below[j], row[j + 1])
+    i = j = 0
+    while i < n and j < m:
+        if a[alo + i] == b[blo + j]:
+            out.append((alo + i, blo + j))
+            i += 1
+            j += 1
+        elif table[i + 1][j] >= table[i][j + 1]:
+            i += 1
+        else:
+            j += 1
+
+
+def _patience_matches(a, b, alo, ahi, blo, bhi, out):
+    # Common prefix / suffix
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        out.append((alo, blo))
+        alo += 1
+        blo += 1
+    suffix = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        suffix.append((ahi, bhi))
+
+    if alo < ahi and blo < bhi:
+        count_a = Counter(a[alo:ahi])
+        count_b = Counter(b[blo:bhi])
+        pos_b = {b[j]: j for j in range(blo, bhi) if count_b[b[j]] == 1}
+        anchors = _lis_pairs([(i, pos_b[a[i]]) for i in range(alo, ahi)
+                              if count_a[a[i]] == 1 and a[i] in pos_b])
+        if anchors:
+            for i, j in anchors:
+                _patience_matches(a, b, alo, i, blo, j, out)
+                out.append((i, j))
+                alo, blo = i + 1, j + 1
+            _patience_matches(a, b, alo, ahi, blo, bhi, out)
+        else:
+            _lcs_matches(a, b, alo, ahi, blo, bhi, out)
+
+    out.extend(reversed(suffix))
+
+
+def diff_units(old, new):
+    """Return difflib-style opcodes turning unit list ``old`` into ``new``."""
+    ids = {}
+    a = [ids.setdefault(u, len(ids)) for u in old]
+    b = [ids.setdefault(u, len(ids)) for u in new]
+    matches = []
+    _patience_matches(a, b, 0, len(a), 0, len(b), matches)
+
+    opcodes = []
+    i = j = 0
+    for mi, mj in matches + [(len(a), len(b))]:
+        if i < mi and j < mj:
+            opcodes.append(("replace", i, mi, j, mj))
+        elif i < mi:
+            opcodes.append(("delete", i, mi, j, j))
+        elif j < mj:
+            opcodes.append(("insert", i, i, j, mj))
+        if mi < len(a):
+            if opcodes and opcodes[-1][0] == "equal":
+                tag, i1, _, j1, _ = opcodes.pop()
+                opcodes.append(("equal", i1, mi + 1, j1, mj + 1))
+            else:
+                opcodes.append(("equal", mi, mi + 1, mj, mj + 1))
+        i, j = mi + 1, mj + 1
+    return opcodes
+
+
+def diff_hunks(old, new, opcodes):
+    """Group changes as ``(section heading, removed units, added units)``."""
+    hunks = []
+    section = "(start of document)"
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            for kind, text in new[j1:j2]:
+                if kind == "heading":
+                    section = text
+            continue
+        hunks.append((section, old[i1:i2], new[j1:j2]))
+        for kind, text in new[j1:j2]:
+            if kind == "heading":
+                section = text
+    return hunks
+
+
+def _add_redline_unit(doc, unit, change):
+    kind, text = unit
+    p = doc.add_paragraph()
+    p.paragraph_format.space_after = Pt(3)
+    mono = kind in ("code", "table")
+    prefix = "\u2212 " if change == "del" else "+ "
+    run = None
+    for n, line in enumerate(text.split("\n")):
+        if run is not None:
+            run.add_break()
+        run = p.add_run(prefix + line if n == 0 else line)
+        run.font.size = Pt(8.5) if mono else Pt(10.5)
+        run.font.name = "Consolas" if mono else "Calibri"
+        if change == "del":
+            run.font.strike = True
+            run.font.color.rgb = RED
+        else:
+            run.font.underline = True
+            run.font.color.rgb = BLUE_PRIMARY
+        run.bold = kind == "heading"
+    return p
+
+
+def write_redline(doc_def, hunks, against_label):
+    """Write ``<out>_redline.docx`` listing every changed unit."""
+    doc = setup_doc(f"{doc_def['title']} — Redline",
+                    f"Changes since {against_label}")
+    add_heading_styled(doc, "Change Summary", level=2)
+    styled_table(doc, ["Section", "Removed", "Added"],
+                 [[section, len(removed), len(added)]
+                  for section, removed, added in hunks],
+                 col_widths=[70, 15, 15])
+
+    add_heading_styled(doc, "Changes", level=2)
+    for section, removed, added in hunks:
+        add_heading_styled(doc, section, level=3)
+        for unit in removed:
+            _add_redline_unit(doc, unit, "del")
+        for unit in added:
+            _add_redline_unit(doc, unit, "ins")
+
+    out_path = DOCS / doc_def["out"].replace(".docx", "_redline.docx")
+    doc.save(str(out_path))
+    return out_path
+
+
+def git_show(ref, rel_path):
+    """Text of ``rel_path`` at git ``ref``, or None if it does not exist."""
+    result = subprocess.run(
+        ["git", "-C", str(ROOT), "show", f"{ref}:{rel_path}"],
+        capture_output=True, text=True, encoding="utf-8",
+    )
+    return result.stdout if result.returncode == 0 else None
+
+
+def md_to_memory_docx(md_path, doc_title, doc_subtitle):
+    """Build the same Document md_to_docx would, without saving it."""
+    lines = md_content_lines(md_path.read_text(encoding='utf-8'))
+    with ImagePrefetcher() as images:
+        images.prefetch(md_image_paths(lines))
+        doc = setup_doc(doc_title, doc_subtitle)
+        render_markdown(doc, lines, images)
+    return doc
+
+
+def diff_document(doc_def, against):
+    """Diff one DOCUMENTS entry against a previous .docx or a git ref.
+
+    Against a .docx, the current markdown is rendered in memory and both
+    documents are compared paragraph by paragraph. Against a git ref, the
+    two markdown versions are compared through parse_md_blocks directly.
+    Returns the redline path, or None when nothing changed.
+    """
+    md_path = DOCS / doc_def["md"]
+    if against.lower().endswith(".docx"):
+        label = Path(against).name
+        old = docx_units(Document(against))
+        new = docx_units(md_to_memory_docx(
+            md_path, doc_def["title"], doc_def["subtitle"]))
+    else:
+        label = f"git {against}"
+        old_text = git_show(against, md_path.relative_to(ROOT).as_posix())
+        if old_text is None:
+            print(f"  [!] {doc_def['md']} not found at {against}")
+            return None
+        old = md_units(md_content_lines(old_text))
+        new = md_units(md_content_lines(md_path.read_text(encoding='utf-8')))
+
+    t0 = time.perf_counter()
+    hunks = diff_hunks(old, new, diff_units(old, new))
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    removed = sum(len(h[1]) for h in hunks)
+    added = sum(len(h[2]) for h in hunks)
+    print(f"  {doc_def['md']}: {len(hunks)} changed regions, "
+          f"-{removed} +{added} blocks "
+          f"({len(old)} -> {len(new)} blocks diffed in {elapsed_ms:.1f} ms)")
+    for section, rem, add in hunks:
+        print(f"      ~ {section}: -{len(rem)} +{len(add)}")
+
+    if not hunks:
+        return None
+    out_path = write_redline(doc_def, hunks, label)
+    print(f"  [OK] {out_path.name}")
+    return out_path
+
+
 # ══════════════════════════════════════════════════════════════════════
 #  DOCUMENT DEFINITIONS
 # ══════════════════════════════════════════════════════════════════════
@@ -446,12 +1533,77 @@ DOCUMENTS = [
     },
 ]
 
+# Data-driven reports (--report NAME --input EXPORT): name → (module, builder).
+# Builders take (input_path, out_path=None) and return the written path.
+REPORTS = {
+    "incident": ("generate_incident_report", "build_incident_report"),
+    "audit": ("audit_log_report", "build_audit_report"),
+    "schema": ("schema_reference", "build_schema_report"),
+    "coverage": ("sql_index_coverage", "build_coverage_report"),
+    "capacity": ("capacity_model", "build_capacity_report"),
+}
+
+# Bound package of all DOCUMENTS for the ATO submission (--combined)
+COMBINED = {
+    "title": "ATO Documentation Package",
+    "subtitle": "ASPR Photo Repository Application",
+    "out": "00_ASPR_Photos_ATO_Package.docx",
+}
+
 
 # ══════════════════════════════════════════════════════════════════════
 #  MAIN
 # ══════════════════════════════════════════════════════════════════════
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate branded DOCX documents from docs/*.md")
+    parser.add_argument(
+        "--combined", action="store_true",
+        help="bind all documents into one DOCX instead of one file each")
+    parser.add_argument(
+        "--diff-against", metavar="DOCX_OR_REF",
+        help="write a redline and change summary against a previous .docx "
+             "(matched to a document by its NN_ prefix) or a git ref")
+    parser.add_argument(
+        "--report", choices=sorted(REPORTS),
+        help="build a data-driven report from an export instead of docs/")
+    parser.add_argument(
+        "--input", metavar="EXPORT",
+        help="CSV/JSONL export read by --report")
+    parser.add_argument(
+        "--out", metavar="DOCX", help="output path for --report")
+    args = parser.parse_args()
+
+    if args.report:
+        if not args.input:
+            parser.error("--report requires --input")
+        module_name, builder = REPORTS[args.report]
+        module = importlib.import_module(module_name)
+        getattr(module, builder)(args.input, args.out)
+        return
+
+    if args.diff_against:
+        against = args.diff_against
+        if against.lower().endswith(".docx"):
+            prefix = Path(against).name.split("_")[0]
+            doc_defs = [d for d in DOCUMENTS
+                        if d["out"].split("_")[0] == prefix]
+            if not doc_defs:
+                parser.error(f"{Path(against).name} does not start with the "
+                             f"NN_ prefix of any generated document")
+            if not Path(against).exists():
+                parser.error(f"{against} not found")
+        else:
+            doc_defs = DOCUMENTS
+
+        print(f"  Diffing against {against}")
+        print()
+        for doc_def in doc_defs:
+            if (DOCS / doc_def["md"]).exists():
+                diff_document(doc_def, against)
+        return
+
     print("=" * 60)
     print("  ASPR Photo Repository — Document Generation")
     print("=" * 60)
@@ -465,7 +1617,22 @@ if __name__ == "__main__":
     generated = []
     errors = []
 
-    for doc_def in DOCUMENTS:
+    if args.combined:
+        try:
+            generated.append(md_to_combined_docx(
+                DOCUMENTS,
+                COMBINED["out"],
+                COMBINED["title"],
+                COMBINED["subtitle"],
+            ))
+        except Exception as e:
+            print(f"  [ERR] Error generating {COMBINED['out']}: {e}")
+            errors.append(COMBINED["out"])
+        doc_defs = []
+    else:
+        doc_defs = DOCUMENTS
+
+    for doc_def in doc_defs:
         md_path = DOCS / doc_def["md"]
         if not md_path.exists():
             print(f"  [!] Skipping {doc_def['md']} (not found)")
@@ -491,3 +1658,7 @@ if __name__ == "__main__":
     print()
     print("  Done! Open documents in Word and right-click TOC > Update Field")
     print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
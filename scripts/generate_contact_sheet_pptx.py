@@ -0,0 +1,238 @@
+"""
+Generate an incident photo contact-sheet deck (PPTX) for briefings.
+
+Lays photos out in a captioned grid (12 per slide by default) on the same
+dark ASPR slide design as the Executive Summary. The source is a local
+directory of originals or of `thumb_md.webp` renditions (the blob layout
+`renditions/{uuid}/thumb_md.webp`, captioned by photo UUID).
+
+Identical files are found by SHA-1 on a thread pool and laid out once;
+the remaining images are decoded and scaled to the grid cell size in a
+process pool, so full-resolution originals are never embedded.
+
+Run:  python scripts/generate_contact_sheet_pptx.py PHOTO_DIR --title "HU-2026-01"
+Requires: pip install python-pptx pillow
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageOps
+from pptx import Presentation
+from pptx.util import Inches, Pt, Emu
+from pptx.enum.text import PP_ALIGN
+
+from generate_exec_summary_pptx import (
+    ROOT, ASPR_LOGO, GOLD, GOLD_LIGHT, MUTED, WHITE,
+    add_accent_bar, add_dark_bg, add_footer, add_slide_header, add_title_text,
+)
+
+OUT = ROOT / "docs" / "ASPR_Photos_Contact_Sheet.pptx"
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff"}
+RENDITION_NAME = "thumb_md.webp"
+
+# Grid area between the slide header accent bar and the footer
+GRID_LEFT = Inches(0.6)
+GRID_TOP = Inches(1.65)
+GRID_WIDTH = Inches(12.133)
+GRID_HEIGHT = Inches(5.25)
+CELL_GAP = Inches(0.15)
+CAPTION_HEIGHT = Inches(0.28)
+THUMB_DPI = 150          # embedded pixels per inch of cell
+THUMB_QUALITY = 80
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  IMAGE PIPELINE
+# ══════════════════════════════════════════════════════════════════════
+
+def find_photos(source):
+    """Image files under ``source`` as ``[(path, caption)]``.
+
+    Originals are captioned by file name and thumb_md renditions by their
+    photo UUID folder; other rendition variants are skipped.
+    """
+    source = Path(source)
+    photos = []
+    for path in sorted(source.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in IMAGE_EXTS:
+            continue
+        if path.name.startswith("thumb_") or path.stem == "web":
+            # Rendition folder: renditions/{uuid}/thumb_md.webp
+            if path.name != RENDITION_NAME:
+                continue
+            caption = path.parent.name
+        else:
+            caption = path.name
+        photos.append((path, caption))
+    return sorted(photos, key=lambda p: p[1])
+
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def dedupe_photos(photos, workers):
+    """Drop photos whose file content duplicates an earlier one."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = list(pool.map(file_digest, (p for p, _ in photos)))
+    seen = set()
+    unique = []
+    for photo, digest in zip(photos, digests):
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(photo)
+    return unique
+
+
+def make_thumb(args):
+    """Decode and shrink one image to fit ``box_px``; return JPEG bytes.
+
+    Runs in a worker process. Returns ``(jpeg_bytes, width, height)`` or
+    ``(None, 0, 0)`` if the file cannot be decoded.
+    """
+    path, box_px = args
+    try:
+        with Image.open(path) as img:
+            if img.format == "JPEG":
+                # Decode at the nearest 1/2, 1/4 or 1/8 scale directly
+                img.draft("RGB", box_px)
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail(box_px, Image.LANCZOS, reducing_gap=2.0)
+            out = io.BytesIO()
+            img.convert("RGB").save(out, "JPEG", quality=THUMB_QUALITY,
+                                    optimize=True)
+            return out.getvalue(), img.width, img.height
+    except (OSError, ValueError):
+        return None, 0, 0
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  LAYOUT
+# ══════════════════════════════════════════════════════════════════════
+
+def cell_geometry(cols, rows):
+    """(cell width, picture-box height) in EMU for a cols x rows grid."""
+    cell_w = (GRID_WIDTH - CELL_GAP * (cols - 1)) / cols
+    cell_h = (GRID_HEIGHT - CELL_GAP * (rows - 1)) / rows
+    return int(cell_w), int(cell_h - CAPTION_HEIGHT)
+
+
+def add_title_slide(prs, title, subtitle):
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    add_dark_bg(slide)
+    add_accent_bar(slide, top=Inches(0), height=Inches(0.08), color=GOLD)
+    if ASPR_LOGO.exists():
+        slide.shapes.add_picture(str(ASPR_LOGO), Inches(0.8), Inches(0.4),
+                                 height=Inches(1.0))
+    add_title_text(slide, title,
+                   Inches(0.8), Inches(2.4), Inches(11.5), Inches(1.0),
+                   font_size=Pt(44), color=WHITE, bold=True)
+    add_title_text(slide, subtitle,
+                   Inches(0.8), Inches(3.4), Inches(11.5), Inches(0.7),
+                   font_size=Pt(24), color=GOLD_LIGHT, bold=False)
+    add_accent_bar(slide, top=Inches(4.2), height=Inches(0.04), color=GOLD)
+    add_footer(slide)
+
+
+def add_grid_cell(slide, thumb, caption, left, top, cell_w, box_h):
+    data, w, h = thumb
+    if data is not None:
+        scale = min(cell_w / w, box_h / h)
+        pic_w, pic_h = int(w * scale), int(h * scale)
+        slide.shapes.add_picture(io.BytesIO(data),
+                                 Emu(left + (cell_w - pic_w) // 2),
+                                 Emu(top + (box_h - pic_h) // 2),
+                                 Emu(pic_w), Emu(pic_h))
+    else:
+        caption = f"[unreadable] {caption}"
+
+    tx = slide.shapes.add_textbox(Emu(left), Emu(top + box_h),
+                                  Emu(cell_w), CAPTION_HEIGHT)
+    tf = tx.text_frame
+    tf.word_wrap = False
+    p = tf.paragraphs[0]
+    p.text = caption
+    p.font.size = Pt(9)
+    p.font.color.rgb = MUTED
+    p.alignment = PP_ALIGN.CENTER
+
+
+def build_contact_sheet(source, title, out_path=OUT, cols=4, rows=3,
+                        workers=None):
+    """Build the deck for every photo under ``source``; return its path."""
+    t0 = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    photos = find_photos(source)
+    unique = dedupe_photos(photos, workers=min(32, workers * 4))
+    print(f"  Photos: {len(photos):,} found, "
+          f"{len(photos) - len(unique):,} duplicates skipped")
+
+    cell_w, box_h = cell_geometry(cols, rows)
+    box_px = (int(cell_w / Inches(1) * THUMB_DPI),
+              int(box_h / Inches(1) * THUMB_DPI))
+
+    prs = Presentation()
+    prs.slide_width = Inches(13.333)   # Widescreen 16:9
+    prs.slide_height = Inches(7.5)
+    per_slide = cols * rows
+    n_slides = -(-len(unique) // per_slide)
+    add_title_slide(prs, title,
+                    f"Photo Contact Sheet — {len(unique):,} photos")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        thumbs = pool.map(make_thumb, ((p, box_px) for p, _ in unique),
+                          chunksize=8)
+        slide = None
+        for n, ((_, caption), thumb) in enumerate(zip(unique, thumbs)):
+            pos = n % per_slide
+            if pos == 0:
+                slide = prs.slides.add_slide(prs.slide_layouts[6])
+                add_dark_bg(slide)
+                add_slide_header(slide, f"{title} — Sheet "
+                                        f"{n // per_slide + 1} of {n_slides}")
+                add_footer(slide)
+            r, c = divmod(pos, cols)
+            left = GRID_LEFT + c * (cell_w + CELL_GAP)
+            top = GRID_TOP + r * (box_h + CAPTION_HEIGHT + CELL_GAP)
+            add_grid_cell(slide, thumb, caption, left, top, cell_w, box_h)
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    prs.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:,.1f} KB, {len(prs.slides)} "
+          f"slides, {time.perf_counter() - t0:.1f} s)")
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a PPTX contact sheet from a directory of photos")
+    parser.add_argument("source", help="directory of originals or renditions")
+    parser.add_argument("--title", default="Incident Photos")
+    parser.add_argument("--out", default=str(OUT))
+    parser.add_argument("--cols", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="decode processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not Path(args.source).is_dir():
+        parser.error(f"{args.source} is not a directory")
+    build_contact_sheet(args.source, args.title, args.out,
+                        cols=args.cols, rows=args.rows, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
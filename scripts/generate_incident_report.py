@@ -0,0 +1,319 @@
+"""
+Generate the incident after-action photo inventory (DOCX).
+
+Streams a CSV or JSONL export of photos joined with photo_exif and
+photo_tags and lists every photo — ID, incident, GPS, EXIF camera, tags —
+grouped by incident, after a map of where GPS-tagged photos were taken
+with a table of hot spots (geo_summary.py). Rows are sorted externally by
+(incident_id, photo id) and folded in a single merge pass, and the DOCX
+body is streamed to disk, so memory stays bounded for exports of 500k+
+photos.
+
+Export query (one row per photo/tag pair; `tags` may instead hold a
+STRING_AGG list separated by ';' or ','):
+
+    SELECT p.id, p.incident_id, p.file_name, p.latitude, p.longitude,
+           p.date_taken, p.created_at, p.camera_info,
+           e.camera_make, e.camera_model, t.name AS tag_name
+    FROM photos p
+    LEFT JOIN photo_exif e ON e.photo_id = p.id
+    LEFT JOIN photo_tags pt ON pt.photo_id = p.id
+    LEFT JOIN tags t ON t.id = pt.tag_id
+
+Run:  python scripts/generate_all_docx.py --report incident --input export.csv
+Requires: pip install python-docx
+"""
+
+import csv
+import heapq
+import json
+import os
+import tempfile
+from array import array
+from itertools import groupby
+from pathlib import Path
+
+from docx.shared import Pt
+
+from generate_all_docx import (
+    DOCS, StreamingDocx, add_heading_styled, add_para, setup_doc, styled_table,
+)
+from geo_summary import GeoSummary, add_geo_section
+
+OUT = DOCS / "ASPR_Photos_Incident_Report.docx"
+
+# Normalized row layout; every export row becomes a tuple in this order.
+FIELDS = (
+    "incident_id", "id", "file_name", "date_taken", "created_at",
+    "latitude", "longitude", "camera_make", "camera_model", "camera_info",
+    "tag_name",
+)
+FIELD_ALIASES = {
+    "photo_id": "id",
+    "tag": "tag_name",
+    "tags": "tag_name",
+    "name": "tag_name",
+}
+F = {name: n for n, name in enumerate(FIELDS)}
+
+SORT_CHUNK_ROWS = 200_000
+NO_INCIDENT = "(no incident)"
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  EXPORT READING & EXTERNAL SORT
+# ══════════════════════════════════════════════════════════════════════
+
+def read_export(path):
+    """Yield export rows as dicts from a .csv or .jsonl/.ndjson file."""
+    path = Path(path)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if path.suffix.lower() in (".jsonl", ".ndjson", ".json"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def normalize_rows(rows, fields=FIELDS, aliases=FIELD_ALIASES):
+    """Map export dicts onto fixed-order tuples of strings."""
+    index = {name: n for n, name in enumerate(fields)}
+    slots = {}  # raw export key -> position in fields (None: unused column)
+    for row in rows:
+        out = [""] * len(fields)
+        for key, value in row.items():
+            try:
+                n = slots[key]
+            except KeyError:
+                name = key.strip().lower() if key is not None else None
+                n = slots[key] = index.get(aliases.get(name, name))
+            if n is not None and value is not None:
+                out[n] = str(value).strip()
+        yield tuple(out)
+
+
+class SortedRuns:
+    """Externally sorted, re-iterable view of a row stream.
+
+    Inputs up to ``chunk_rows`` are simply sorted in memory. Larger inputs
+    are sorted in chunks of ``chunk_rows``, each spilled to a temporary
+    JSONL run, and iteration k-way merges the runs with heapq. Every
+    iteration re-merges from disk, so several passes cost no extra
+    memory. Use as a context manager to remove the runs afterwards.
+    """
+
+    def __init__(self, rows, key, chunk_rows=SORT_CHUNK_ROWS):
+        self.key = key
+        self.count = 0
+        self._tmp = None
+        self._runs = []
+        self._memory = []
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            self.count += 1
+            if len(chunk) >= chunk_rows:
+                self._spill(chunk)
+                chunk = []
+        if not self._runs:
+            chunk.sort(key=key)
+            self._memory = chunk
+        elif chunk:
+            self._spill(chunk)
+
+    def _spill(self, chunk):
+        if self._tmp is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="aspr-sort-")
+        chunk.sort(key=self.key)
+        path = Path(self._tmp.name) / f"run{len(self._runs):05d}.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for row in chunk:
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write("\n")
+        self._runs.append(path)
+
+    @staticmethod
+    def _read_run(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                yield tuple(json.loads(line))
+
+    def __iter__(self):
+        if not self._runs:
+            return iter(self._memory)
+        return heapq.merge(*(self._read_run(p) for p in self._runs),
+                           key=self.key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+
+def incident_sort_key(row):
+    incident = row[F["incident_id"]]
+    return (incident == "", incident, row[F["id"]])
+
+
+def fold_photos(sorted_rows):
+    """Fold consecutive per-tag rows into one record per photo.
+
+    Yields ``(incident_id, photo_row, tags)`` where tags is a sorted list.
+    """
+    pid = F["id"]
+    for _, group in groupby(sorted_rows, key=lambda r: (r[F["incident_id"]], r[pid])):
+        first = None
+        tags = set()
+        for row in group:
+            if first is None:
+                first = row
+            for tag in row[F["tag_name"]].replace(";", ",").split(","):
+                tag = tag.strip()
+                if tag:
+                    tags.add(tag)
+        yield first[F["incident_id"]], first, sorted(tags)
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  FORMATTING
+# ══════════════════════════════════════════════════════════════════════
+
+def fmt_date(value):
+    """Trim an ISO/SQL timestamp to ``YYYY-MM-DD HH:MM``."""
+    return value.replace("T", " ")[:16] if value else ""
+
+
+def fmt_gps(lat, lon):
+    try:
+        return f"{float(lat):.5f}, {float(lon):.5f}"
+    except ValueError:
+        return ""
+
+
+def fmt_camera(row):
+    make, model = row[F["camera_make"]], row[F["camera_model"]]
+    if make and model.lower().startswith(make.lower()):
+        make = ""
+    return " ".join(x for x in (make, model) if x) or row[F["camera_info"]]
+
+
+def parse_gps(lat, lon):
+    try:
+        return float(lat), float(lon)
+    except ValueError:
+        return None
+
+
+class IncidentStats:
+    __slots__ = ("photos", "with_gps", "tagged", "first", "last")
+
+    def __init__(self):
+        self.photos = self.with_gps = self.tagged = 0
+        self.first = self.last = ""
+
+    def add(self, row, tags):
+        self.photos += 1
+        if parse_gps(row[F["latitude"]], row[F["longitude"]]):
+            self.with_gps += 1
+        if tags:
+            self.tagged += 1
+        when = fmt_date(row[F["date_taken"]] or row[F["created_at"]])
+        if when:
+            self.first = min(self.first, when) if self.first else when
+            self.last = max(self.last, when)
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  REPORT
+# ══════════════════════════════════════════════════════════════════════
+
+PHOTO_HEADERS = ["Photo ID", "File", "Taken", "GPS", "Camera", "Tags"]
+PHOTO_COL_WIDTHS = [24, 20, 14, 16, 12, 14]
+
+
+def build_incident_report(input_path, out_path=None):
+    """Write the incident photo inventory for an export; return its path."""
+    out_path = Path(out_path) if out_path else OUT
+    rows = normalize_rows(read_export(input_path))
+    title = "Incident Photo Inventory"
+
+    with SortedRuns(rows, key=incident_sort_key) as runs:
+        # Single merge pass: each incident's photo table is spooled while
+        # its totals, and the packed coordinates for the location summary,
+        # are gathered; the summary is written ahead of them afterwards.
+        # The cover needs the totals too, so the spool's templates come
+        # from a stand-in document with the same styles.
+        out = StreamingDocx(setup_doc(title, ""), out_path)
+        stats, parts = {}, {}
+        lat, lon, codes = array("d"), array("d"), array("q")
+        try:
+            for incident, photos in groupby(fold_photos(runs),
+                                            key=lambda p: p[0]):
+                s = stats[incident] = IncidentStats()
+                parts[incident] = out.begin_part()
+                with out.table(PHOTO_HEADERS, PHOTO_COL_WIDTHS) as table:
+                    for _, row, tags in photos:
+                        s.add(row, tags)
+                        gps = parse_gps(row[F["latitude"]],
+                                        row[F["longitude"]])
+                        if gps:
+                            lat.append(gps[0])
+                            lon.append(gps[1])
+                            codes.append(len(stats) - 1)
+                        table.add([
+                            row[F["id"]],
+                            row[F["file_name"]],
+                            fmt_date(row[F["date_taken"]] or row[F["created_at"]]),
+                            fmt_gps(row[F["latitude"]], row[F["longitude"]]),
+                            fmt_camera(row),
+                            ", ".join(tags),
+                        ])
+                out.end_part()
+        except BaseException:
+            out.close_spool()
+            raise
+        total = sum(s.photos for s in stats.values())
+        print(f"  Export: {runs.count:,} rows, {total:,} photos, "
+              f"{len(stats):,} incidents")
+
+    doc = out.doc = setup_doc(title,
+                              f"After-Action Report — {len(stats):,} incidents, "
+                              f"{total:,} photos")
+    add_heading_styled(doc, "1. Summary", level=2)
+    add_para(doc, f"Source export: {Path(input_path).name}",
+             italic=True, size=Pt(9))
+    styled_table(doc,
+        ["Incident", "Photos", "With GPS", "Tagged", "First", "Last"],
+        [[incident or NO_INCIDENT, f"{s.photos:,}", f"{s.with_gps:,}",
+          f"{s.tagged:,}", s.first, s.last]
+         for incident, s in stats.items()],
+        col_widths=[28, 12, 12, 12, 18, 18],
+    )
+
+    geo = GeoSummary(lat, lon, codes,
+                     [incident or NO_INCIDENT for incident in stats],
+                     total=total)
+    add_geo_section(doc, geo, "2. Photo Locations")
+
+    with out:
+        out.page_break()
+        out.heading("3. Photo Inventory", level=2)
+        for n, (incident, s) in enumerate(stats.items(), start=1):
+            out.heading(f"3.{n} {incident or NO_INCIDENT}", level=3)
+            out.para(f"{s.photos:,} photos · {s.with_gps:,} with GPS · "
+                     f"{s.tagged:,} tagged · {s.first or '—'} to "
+                     f"{s.last or '—'}")
+            out.insert_part(parts[incident])
+
+    size_kb = os.path.getsize(out_path) / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:,.1f} KB)")
+    return out_path
@@ -0,0 +1,430 @@
+"""
+Geographic summary of GPS-tagged photos for the report generators.
+
+Bins photo coordinates into a fixed lat/lon grid (CELL_DEG, ~1 km) and
+labels each bin with its geohash. Occupied cells holding at least
+--min-cell-photos photos are joined with their 8 neighbours into
+connected components, and every component with at least
+--min-cluster-photos photos is a hot spot. Binning, the component search
+(label propagation over cell adjacency) and the per-cluster statistics are
+all NumPy array operations, so millions of points cost no per-point
+Python work.
+
+The result is drawn as a static PNG map (photo density, cluster circles
+and graticule; no basemap tiles are needed offline) and a per-cluster
+table. `add_geo_section` puts both into a python-docx document —
+generate_incident_report.py uses it — and `add_geo_slides` into a deck
+built with the Executive Summary slide helpers. On its own the script
+summarizes a photos export (id, incident_id, latitude, longitude).
+
+Run:  python scripts/geo_summary.py photos_export.csv [--pptx map.pptx] [--docx map.docx]
+Requires: pip install numpy pillow python-docx python-pptx
+"""
+
+import argparse
+import io
+import math
+from array import array
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from docx.shared import Pt
+
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_image, add_para, setup_doc, styled_table,
+)
+
+OUT = DOCS / "ASPR_Photos_Location_Summary.docx"
+
+CELL_DEG = 0.01               # grid cell size (~1.1 km of latitude)
+MIN_CELL_PHOTOS = 3           # cells sparser than this join no cluster
+MIN_CLUSTER_PHOTOS = 10
+MAX_TABLE_CLUSTERS = 25
+GEOHASH_PRECISION = 6         # ~1.2 x 0.6 km
+GEOHASH_BASE32 = np.frombuffer(b"0123456789bcdefghjkmnpqrstuvwxyz",
+                               dtype=np.uint8)
+EARTH_RADIUS_KM = 6371.0
+
+MAP_SIZE = (1600, 1000)
+MAP_DENSITY_PX = 4            # density raster cell, in map pixels
+MAP_BG = (242, 242, 242)      # LIGHT_GRAY
+MAP_GRID = (200, 200, 200)
+MAP_LABEL = (153, 153, 153)   # MUTED
+MAP_DENSITY = (21, 81, 151)   # BLUE_PRIMARY
+MAP_CLUSTER = (170, 100, 4)   # GOLD
+MAP_TEXT = (6, 46, 97)        # BLUE_DARK
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  AGGREGATION
+# ══════════════════════════════════════════════════════════════════════
+
+def valid_points(lat, lon):
+    """Mask of usable coordinates (finite, in range, not 0,0 "null island")."""
+    return (np.isfinite(lat) & np.isfinite(lon)
+            & (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+            & ~((lat == 0) & (lon == 0)))
+
+
+def geohash_encode(lat, lon, precision=GEOHASH_PRECISION):
+    """Vectorized geohash of coordinate arrays; returns an array of str."""
+    bits = precision * 5
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    lo = np.clip(((lon + 180) / 360 * (1 << lon_bits)).astype(np.int64),
+                 0, (1 << lon_bits) - 1)
+    la = np.clip(((lat + 90) / 180 * (1 << lat_bits)).astype(np.int64),
+                 0, (1 << lat_bits) - 1)
+    code = np.zeros(len(lat), dtype=np.int64)
+    for i in range(bits):
+        # Even bits come from longitude, odd bits from latitude
+        src, width = (lo, lon_bits) if i % 2 == 0 else (la, lat_bits)
+        code = (code << 1) | ((src >> (width - 1 - i // 2)) & 1)
+    shifts = 5 * np.arange(precision - 1, -1, -1)
+    chars = GEOHASH_BASE32[(code[:, None] >> shifts) & 31]
+    return chars.view(f"S{precision}").ravel().astype(str)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1)))
+
+
+def connected_cells(keys, row_width):
+    """Component label per grid cell (sorted int keys), 8-connected."""
+    labels = np.arange(len(keys))
+    src, dst = [], []
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dy or dx:
+                neighbour = keys + dy * row_width + dx
+                pos = np.minimum(np.searchsorted(keys, neighbour), len(keys) - 1)
+                hit = keys[pos] == neighbour
+                src.append(np.nonzero(hit)[0])
+                dst.append(pos[hit])
+    src, dst = np.concatenate(src), np.concatenate(dst)
+    while True:
+        new = labels.copy()
+        np.minimum.at(new, src, labels[dst])
+        new = new[new]  # pointer jumping: converge in O(log diameter) rounds
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+class GeoSummary:
+    """Points, grid cells and hot-spot clusters for one set of photos.
+
+    ``clusters`` is a list of dicts (largest first) with keys rank, photos,
+    lat, lon, geohash, radius_km, cells and incidents ([(name, count)]).
+    ``point_cluster`` gives each valid point's index into clusters, or -1.
+    ``total`` is the photo count to report coverage against (default: the
+    number of coordinates passed in).
+    """
+
+    def __init__(self, lat, lon, incident_codes=None, incident_names=None,
+                 cell_deg=CELL_DEG, min_cell_photos=MIN_CELL_PHOTOS,
+                 min_cluster_photos=MIN_CLUSTER_PHOTOS, total=None):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        ok = valid_points(lat, lon)
+        self.total = total if total is not None else len(lat)
+        self.lat, self.lon = lat[ok], lon[ok]
+        codes = (np.asarray(incident_codes, dtype=np.int64)[ok]
+                 if incident_codes is not None else None)
+        self.cell_deg = cell_deg
+        self.min_cluster_photos = min_cluster_photos
+        self.clusters = []
+        self.point_cluster = np.full(len(self.lat), -1, dtype=np.int64)
+        self.cells = 0
+        if len(self.lat):
+            self._cluster(codes, incident_names or [], min_cell_photos)
+
+    @property
+    def points(self):
+        return len(self.lat)
+
+    def _cluster(self, codes, incident_names, min_cell_photos):
+        # Grid cell per point; +1 padding column so dx=±1 never wraps rows
+        row_width = int(360 / self.cell_deg) + 3
+        ix = np.floor((self.lon + 180) / self.cell_deg).astype(np.int64) + 1
+        iy = np.floor((self.lat + 90) / self.cell_deg).astype(np.int64)
+        keys, cell_of_point, cell_counts = np.unique(
+            iy * row_width + ix, return_inverse=True, return_counts=True)
+        self.cells = len(keys)
+
+        dense = cell_counts >= min_cell_photos
+        if not dense.any():
+            return
+        dense_keys = keys[dense]
+        comp = np.full(len(keys), -1, dtype=np.int64)
+        comp[dense] = connected_cells(dense_keys, row_width)
+        point_comp = comp[cell_of_point]
+
+        clustered = point_comp >= 0
+        comp_ids, point_slot = np.unique(point_comp[clustered],
+                                         return_inverse=True)
+        sizes = np.bincount(point_slot)
+        keep = sizes >= self.min_cluster_photos
+        if not keep.any():
+            return
+        order = np.argsort(-sizes, kind="stable")
+        order = order[keep[order]]
+        rank_of_slot = np.full(len(comp_ids), -1, dtype=np.int64)
+        rank_of_slot[order] = np.arange(len(order))
+
+        ranks = rank_of_slot[point_slot]
+        self.point_cluster[np.nonzero(clustered)[0]] = ranks
+        mask = ranks >= 0
+        r = ranks[mask]
+        lat, lon = self.lat[clustered][mask], self.lon[clustered][mask]
+        n = np.bincount(r, minlength=len(order))
+        c_lat = np.bincount(r, weights=lat) / n
+        c_lon = np.bincount(r, weights=lon) / n
+        radius = np.zeros(len(order))
+        np.maximum.at(radius, r, haversine_km(lat, lon, c_lat[r], c_lon[r]))
+        cell_pairs = np.unique(r * len(keys) + cell_of_point[clustered][mask])
+        n_cells = np.bincount(cell_pairs // len(keys), minlength=len(order))
+        hashes = geohash_encode(c_lat, c_lon)
+
+        top = [[] for _ in range(len(order))]
+        if codes is not None and incident_names:
+            pair = r * len(incident_names) + codes[clustered][mask]
+            pairs, counts = np.unique(pair, return_counts=True)
+            by_count = np.lexsort((-counts, pairs // len(incident_names)))
+            for p in by_count:
+                cluster, code = divmod(int(pairs[p]), len(incident_names))
+                if len(top[cluster]) < 3:
+                    top[cluster].append((incident_names[code], int(counts[p])))
+
+        self.clusters = [{
+            "rank": k + 1,
+            "photos": int(n[k]),
+            "lat": float(c_lat[k]),
+            "lon": float(c_lon[k]),
+            "geohash": str(hashes[k]),
+            "radius_km": float(radius[k]),
+            "cells": int(n_cells[k]),
+            "incidents": top[k],
+        } for k in range(len(order))]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  MAP
+# ══════════════════════════════════════════════════════════════════════
+
+def map_extent(geo):
+    """(lat_min, lat_max, lon_min, lon_max) covering the bulk of points."""
+    lat_lo, lat_hi = np.percentile(geo.lat, [0.5, 99.5])
+    lon_lo, lon_hi = np.percentile(geo.lon, [0.5, 99.5])
+    for c in geo.clusters:
+        lat_lo, lat_hi = min(lat_lo, c["lat"]), max(lat_hi, c["lat"])
+        lon_lo, lon_hi = min(lon_lo, c["lon"]), max(lon_hi, c["lon"])
+    mid_lat, mid_lon = (lat_lo + lat_hi) / 2, (lon_lo + lon_hi) / 2
+    # Equirectangular with longitude scaled by cos(latitude) at the centre
+    lon_scale = max(math.cos(math.radians(mid_lat)), 0.2)
+    aspect = MAP_SIZE[1] / MAP_SIZE[0]
+    half_lat = 0.55 * max(lat_hi - lat_lo,
+                          (lon_hi - lon_lo) * lon_scale * aspect, 0.05)
+    half_lon = half_lat / aspect / lon_scale
+    return (max(mid_lat - half_lat, -90), min(mid_lat + half_lat, 90),
+            mid_lon - half_lon, mid_lon + half_lon)
+
+
+def graticule_step(span):
+    for step in (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 45):
+        if span / step <= 8:
+            return step
+    return 90
+
+
+def render_map_png(geo, size=MAP_SIZE):
+    """Density map of the points with numbered cluster circles (PNG bytes)."""
+    width, height = size
+    lat0, lat1, lon0, lon1 = map_extent(geo)
+
+    def to_px(lat, lon):
+        return ((lon - lon0) / (lon1 - lon0) * width,
+                (lat1 - lat) / (lat1 - lat0) * height)
+
+    # Density raster: log-scaled photo counts blended over the background
+    bins = (width // MAP_DENSITY_PX, height // MAP_DENSITY_PX)
+    counts, _, _ = np.histogram2d(geo.lon, geo.lat, bins=bins,
+                                  range=[[lon0, lon1], [lat0, lat1]])
+    alpha = np.log1p(counts.T[::-1]) / max(np.log1p(counts.max()), 1e-9)
+    alpha = np.where(counts.T[::-1] > 0, 0.25 + 0.75 * alpha, 0)[..., None]
+    rgb = (np.array(MAP_BG) * (1 - alpha) + np.array(MAP_DENSITY) * alpha)
+    img = Image.fromarray(rgb.astype(np.uint8), "RGB").resize(
+        size, Image.NEAREST)
+
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default(size=22)
+    small = ImageFont.load_default(size=16)
+    step = graticule_step(lat1 - lat0)
+    decimals = max(0, -math.floor(math.log10(step)))
+    for v in np.arange(math.ceil(lat0 / step) * step, lat1, step):
+        y = to_px(v, lon0)[1]
+        draw.line([(0, y), (width, y)], fill=MAP_GRID, width=1)
+        draw.text((4, y + 2), f"{v:.{decimals}f}°", fill=MAP_LABEL, font=small)
+    for v in np.arange(math.ceil(lon0 / step) * step, lon1, step):
+        x = to_px(lat0, v)[0]
+        draw.line([(x, 0), (x, height)], fill=MAP_GRID, width=1)
+        draw.text((x + 3, height - 20), f"{v:.{decimals}f}°", fill=MAP_LABEL,
+                  font=small)
+
+    km_per_px = (lat1 - lat0) * 111.32 / height
+    for c in reversed(geo.clusters[:MAX_TABLE_CLUSTERS]):
+        x, y = to_px(c["lat"], c["lon"])
+        rad = max(c["radius_km"] / km_per_px, 14)
+        draw.ellipse([x - rad, y - rad, x + rad, y + rad],
+                     outline=MAP_CLUSTER, width=3)
+        draw.text((x, y), str(c["rank"]), fill=MAP_TEXT, font=font,
+                  anchor="mm", stroke_width=3, stroke_fill=MAP_BG)
+    draw.rectangle([0, 0, width - 1, height - 1], outline=MAP_GRID, width=2)
+
+    out = io.BytesIO()
+    img.save(out, "PNG", optimize=True)
+    return out.getvalue()
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  DOCX / PPTX OUTPUT
+# ══════════════════════════════════════════════════════════════════════
+
+CLUSTER_HEADERS = ["#", "Photos", "Centre", "Geohash", "Radius", "Incidents"]
+
+
+def cluster_rows(geo, limit=MAX_TABLE_CLUSTERS):
+    return [[
+        str(c["rank"]), f"{c['photos']:,}",
+        f"{c['lat']:.4f}, {c['lon']:.4f}", c["geohash"],
+        f"{c['radius_km']:.1f} km",
+        ", ".join(f"{name} ({n:,})" for name, n in c["incidents"]) or "—",
+    ] for c in geo.clusters[:limit]]
+
+
+def coverage_text(geo):
+    clustered = int((geo.point_cluster >= 0).sum())
+    return (f"{geo.points:,} of {geo.total:,} photos have usable GPS "
+            f"coordinates, in {geo.cells:,} grid cells of {geo.cell_deg}°. "
+            f"{len(geo.clusters):,} hot spots (≥ {geo.min_cluster_photos} "
+            f"photos in adjacent dense cells) hold {clustered:,} of them.")
+
+
+def add_geo_section(doc, geo, heading="Photo Locations", level=2):
+    """Map and hot-spot table for ``geo`` in a python-docx document."""
+    add_heading_styled(doc, heading, level=level)
+    if not geo.points:
+        add_para(doc, "No photos have usable GPS coordinates.", italic=True,
+                 size=Pt(9))
+        return
+    add_para(doc, coverage_text(geo), size=Pt(9))
+    add_image(doc, render_map_png(geo),
+              alt="Photo density with numbered hot spots (circle = cluster "
+                  "radius)")
+    if geo.clusters:
+        if len(geo.clusters) > MAX_TABLE_CLUSTERS:
+            add_para(doc, f"Largest {MAX_TABLE_CLUSTERS} of "
+                          f"{len(geo.clusters):,} hot spots.",
+                     italic=True, size=Pt(9))
+        styled_table(doc, CLUSTER_HEADERS, cluster_rows(geo),
+                     col_widths=[6, 11, 22, 13, 12, 36])
+
+
+def add_geo_slides(prs, geo, title="Photo Locations"):
+    """Map slide plus hot-spot table slide on the dark ASPR design."""
+    from pptx.util import Inches, Pt as PptPt
+    from generate_exec_summary_pptx import (
+        add_dark_bg, add_footer, add_slide_header, add_table_slide,
+    )
+
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    add_dark_bg(slide)
+    add_slide_header(slide, title)
+    if geo.points:
+        slide.shapes.add_picture(io.BytesIO(render_map_png(geo)),
+                                 Inches(2.47), Inches(1.6),
+                                 height=Inches(5.25))
+    add_footer(slide)
+
+    if geo.clusters:
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        add_dark_bg(slide)
+        add_table_slide(slide, f"{title} — Hot Spots", CLUSTER_HEADERS,
+                        cluster_rows(geo, limit=10),
+                        col_widths=[5, 10, 20, 12, 11, 42],
+                        font_hdr=PptPt(12), font_row=PptPt(11))
+        add_footer(slide)
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  CLI
+# ══════════════════════════════════════════════════════════════════════
+
+def load_export(path):
+    """Coordinates and incident codes from a photos export."""
+    from generate_incident_report import normalize_rows, parse_gps, read_export
+
+    lat, lon, codes = array("d"), array("d"), array("q")
+    names = {}
+    for incident, la, lo in normalize_rows(
+            read_export(path), ("incident_id", "latitude", "longitude"),
+            {}):
+        # Both must parse before either is kept, or the arrays misalign
+        gps = parse_gps(la, lo)
+        if not gps:
+            continue
+        lat.append(gps[0])
+        lon.append(gps[1])
+        codes.append(names.setdefault(incident or "(no incident)",
+                                      len(names)))
+    return (np.frombuffer(lat), np.frombuffer(lon),
+            np.frombuffer(codes, dtype=np.int64), list(names))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Summarize where GPS-tagged photos were taken")
+    parser.add_argument("export", help="CSV/JSONL photos export "
+                                       "(incident_id, latitude, longitude)")
+    parser.add_argument("--cell-deg", type=float, default=CELL_DEG)
+    parser.add_argument("--min-cell-photos", type=int, default=MIN_CELL_PHOTOS)
+    parser.add_argument("--min-cluster-photos", type=int,
+                        default=MIN_CLUSTER_PHOTOS)
+    parser.add_argument("--docx", default=str(OUT))
+    parser.add_argument("--pptx", help="also write a two-slide PPTX here")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Location Summary")
+    print("=" * 60)
+    lat, lon, codes, names = load_export(args.export)
+    geo = GeoSummary(lat, lon, codes, names, cell_deg=args.cell_deg,
+                     min_cell_photos=args.min_cell_photos,
+                     min_cluster_photos=args.min_cluster_photos)
+    print(f"  {coverage_text(geo)}")
+
+    doc = setup_doc("Photo Location Summary",
+                    f"{geo.points:,} GPS-tagged photos, "
+                    f"{len(geo.clusters):,} hot spots")
+    add_geo_section(doc, geo, "1. Photo Locations")
+    doc.save(args.docx)
+    print(f"  [OK] {Path(args.docx).name}")
+
+    if args.pptx:
+        from pptx import Presentation
+        from pptx.util import Inches
+
+        prs = Presentation()
+        prs.slide_width = Inches(13.333)
+        prs.slide_height = Inches(7.5)
+        add_geo_slides(prs, geo)
+        prs.save(args.pptx)
+        print(f"  [OK] {Path(args.pptx).name}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,626 @@
+"""
+Load-test the field upload path: PIN validation, then photo uploads.
+
+Each virtual field team does what the upload page (app/page.tsx) does:
+`POST /api/auth/validate-pin` with its PIN, then uploads its photos one at
+a time to `POST /api/photos/upload` as multipart form data (photo, notes,
+incidentId, latitude, longitude, locationName) with the returned JWT,
+stopping at the first failed upload. Teams arrive as a Poisson process at
+--rate per second — open loop, so a slow server builds a queue rather than
+slowing the generator down — and at most --concurrency requests are in
+flight at once.
+
+Latencies go into log-bucketed histograms per endpoint, both as service
+time (request sent to response read) and response time (measured from when
+the request was due, so client-side queueing is not hidden). The run
+reports p50/p95/p99, the status mix, 429 rates and throughput, and renders
+them to a branded DOCX with `styled_table`. --trace also writes every
+request (time, team, endpoint, client IP, status) as JSONL, which
+ratelimit_sim.py replays against a scaled-out limiter.
+
+Rate limits key on X-Forwarded-For. By default every team sends its own
+address; --client-ips N spreads teams over N addresses (1 = a whole
+shelter behind one NAT) and --client-ips 0 sends no header at all.
+
+--stub runs against a local stand-in server that answers both endpoints
+with the limiter of lib/rateLimit.ts (ratelimit_model.py) and a simulated
+bcrypt / sharp / blob-write delay, so no database or storage is needed.
+--serve-stub PORT runs that server on its own for other tools.
+
+Run:  python scripts/loadtest_upload.py --stub --teams 40 --photos-per-team 5
+      python scripts/loadtest_upload.py --base-url http://localhost:3000 --pin 123456
+Requires: pip install aiohttp pillow python-docx
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+from docx.shared import Pt
+
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_para, setup_doc, styled_table,
+)
+from ratelimit_model import LIMITS, RateLimiter
+
+OUT = DOCS / "ASPR_Photos_Load_Test.docx"
+
+PIN_PATH = "/api/auth/validate-pin"
+UPLOAD_PATH = "/api/photos/upload"
+ENDPOINTS = {"validate-pin": PIN_PATH, "upload": UPLOAD_PATH}
+
+STUB_PIN = "246810"
+STUB_PIN_MS = 70            # bcrypt.compare at cost 10
+STUB_UPLOAD_BASE_MS = 120   # sharp metadata/thumbnail + three INSERTs
+STUB_UPLOAD_MS_PER_MB = 45  # blob upload of the original
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024   # validation.validateFile MAX_SIZE
+
+SYNTH_PHOTOS = 4
+HIST_GROWTH = 1.05          # histogram bucket width: 5% relative error
+REPORT_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# Field locations used for synthetic GPS fields (lat, lon, name)
+FIELD_SITES = [
+    (29.7604, -95.3698, "Houston, TX 77002"),
+    (30.6954, -88.0399, "Mobile, AL 36602"),
+    (27.9506, -82.4572, "Tampa, FL 33602"),
+    (18.4655, -66.1057, "San Juan, PR 00901"),
+]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  METRICS
+# ══════════════════════════════════════════════════════════════════════
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (milliseconds).
+
+    Buckets grow by HIST_GROWTH, so any percentile is within 5% of the
+    exact value while memory stays constant however long the run is.
+    """
+
+    _LOG = math.log(HIST_GROWTH)
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.buckets[int(math.log(max(ms, 1.0)) / self._LOG)] += 1
+        self.count += 1
+        self.max = max(self.max, ms)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # Upper edge of the bucket, capped at the observed maximum
+                return min(HIST_GROWTH ** (bucket + 1), self.max)
+        return self.max
+
+    def count_below(self, ms):
+        edge = math.log(ms) / self._LOG
+        return sum(n for b, n in self.buckets.items() if b + 1 <= edge)
+
+
+class EndpointStats:
+    __slots__ = ("statuses", "service", "response", "bytes_sent")
+
+    def __init__(self):
+        self.statuses = Counter()
+        self.service = LatencyHistogram()
+        self.response = LatencyHistogram()
+        self.bytes_sent = 0
+
+    @property
+    def requests(self):
+        return sum(self.statuses.values())
+
+    def count(self, predicate):
+        return sum(n for s, n in self.statuses.items() if predicate(s))
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  PAYLOADS
+# ══════════════════════════════════════════════════════════════════════
+
+def synth_jpeg(target_mb, seed):
+    """A noise JPEG of roughly ``target_mb`` MB (noise barely compresses)."""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    # ~0.9 bytes per pixel for RGB noise at quality 90
+    pixels = target_mb * 1024 * 1024 / 0.9
+    width = int(math.sqrt(pixels * 4 / 3))
+    height = width * 3 // 4
+    img = Image.frombytes("RGB", (width, height),
+                          rng.randbytes(width * height * 3))
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+def load_photos(photo_dir, photo_mb):
+    """``[(file_name, bytes)]`` from a directory, or synthetic JPEGs."""
+    if photo_dir:
+        photos = [(p.name, p.read_bytes())
+                  for p in sorted(Path(photo_dir).iterdir())
+                  if p.suffix.lower() in (".jpg", ".jpeg")]
+        if not photos:
+            raise SystemExit(f"No .jpg files in {photo_dir}")
+        return photos
+    return [(f"loadtest_{n}.jpg", synth_jpeg(photo_mb, n))
+            for n in range(SYNTH_PHOTOS)]
+
+
+def upload_form(file_name, data, site, incident_id, rng):
+    lat, lon, name = site
+    form = aiohttp.FormData()
+    form.add_field("photo", data, filename=file_name, content_type="image/jpeg")
+    form.add_field("notes", "Load test upload")
+    form.add_field("incidentId", incident_id)
+    # Jitter within ~1 km of the site, like phones spread across a scene
+    form.add_field("latitude", f"{lat + rng.uniform(-0.01, 0.01):.6f}")
+    form.add_field("longitude", f"{lon + rng.uniform(-0.01, 0.01):.6f}")
+    form.add_field("locationName", name)
+    return form
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  LOAD GENERATOR
+# ══════════════════════════════════════════════════════════════════════
+
+class LoadTest:
+    def __init__(self, base_url, pin, teams, photos_per_team, rate,
+                 concurrency, client_ips, incident_id, photos, timeout=120,
+                 seed=1):
+        self.base_url = base_url.rstrip("/")
+        self.pin = pin
+        self.teams = teams
+        self.photos_per_team = photos_per_team
+        self.rate = rate
+        self.concurrency = concurrency
+        self.client_ips = client_ips
+        self.incident_id = incident_id
+        self.photos = photos
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.stats = {name: EndpointStats() for name in ENDPOINTS}
+        self.teams_done = Counter()
+        self.elapsed = 0.0
+        self.t0 = None
+        # (ms since start, team, endpoint, client IP, status) per request
+        self.trace = []
+
+    def client_ip(self, team):
+        if self.client_ips == 0:
+            return None
+        n = team if self.client_ips is None else team % self.client_ips
+        return f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}"
+
+    async def request(self, http, sem, team, endpoint, headers, make_body):
+        """Send one request; return ``(status, json_body)``."""
+        stats = self.stats[endpoint]
+        due = time.perf_counter()
+        async with sem:
+            body = make_body()
+            start = time.perf_counter()
+            try:
+                async with http.post(self.base_url + ENDPOINTS[endpoint],
+                                     headers=headers, **body) as resp:
+                    try:
+                        payload = await resp.json(content_type=None)
+                    except ValueError:
+                        payload = {}
+                    status = resp.status
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status, payload = f"error:{type(e).__name__}", {}
+            end = time.perf_counter()
+        stats.statuses[status] += 1
+        self.trace.append((round((start - self.t0) * 1000, 1), team, endpoint,
+                           headers.get("X-Forwarded-For"), status))
+        stats.service.add((end - start) * 1000)
+        stats.response.add((end - due) * 1000)
+        return status, payload
+
+    async def field_team(self, http, sem, team):
+        rng = random.Random(self.rng.random())
+        headers = {}
+        ip = self.client_ip(team)
+        if ip:
+            headers["X-Forwarded-For"] = ip
+
+        status, payload = await self.request(
+            http, sem, team, "validate-pin", headers,
+            lambda: {"json": {"pin": self.pin}})
+        if status != 200 or "token" not in payload:
+            self.teams_done["pin_failed"] += 1
+            return
+
+        headers["Authorization"] = f"Bearer {payload['token']}"
+        site = FIELD_SITES[team % len(FIELD_SITES)]
+        for n in range(self.photos_per_team):
+            file_name, data = self.photos[(team + n) % len(self.photos)]
+
+            def body():
+                self.stats["upload"].bytes_sent += len(data)
+                return {"data": upload_form(file_name, data, site,
+                                            self.incident_id, rng)}
+
+            status, _ = await self.request(http, sem, team, "upload", headers,
+                                           body)
+            if status != 200:
+                # The upload page stops the batch at the first failure
+                self.teams_done["upload_failed"] += 1
+                return
+        self.teams_done["completed"] += 1
+
+    async def run(self):
+        sem = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=timeout) as http:
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            self.t0 = time.perf_counter()
+            next_at = t0
+            tasks = []
+            for team in range(self.teams):
+                delay = next_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(
+                    self.field_team(http, sem, team)))
+                next_at += self.rng.expovariate(self.rate)
+            await asyncio.gather(*tasks)
+            self.elapsed = loop.time() - t0
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  LOCAL STUB SERVER
+# ══════════════════════════════════════════════════════════════════════
+
+def stub_app(pin=STUB_PIN, pin_ms=STUB_PIN_MS, upload_ms=STUB_UPLOAD_BASE_MS,
+             ms_per_mb=STUB_UPLOAD_MS_PER_MB):
+    """aiohttp app standing in for the two route handlers."""
+    limiter = RateLimiter()
+    tokens = {}
+
+    def now_ms():
+        return time.monotonic() * 1000
+
+    def client_ip(request):
+        return request.headers.get("X-Forwarded-For") or "unknown"
+
+    async def validate_pin(request):
+        limit = limiter.hit_limit("pin-attempt", client_ip(request), now_ms())
+        if not limit.allowed:
+            return web.json_response(
+                {"error": f"Too many attempts. Try again in "
+                          f"{limit.retry_after} seconds."},
+                status=429, headers={"Retry-After": str(limit.retry_after)})
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"error": "Validation failed"}, status=500)
+        await asyncio.sleep(pin_ms / 1000)
+        if body.get("pin") != pin:
+            return web.json_response(
+                {"error": "Invalid PIN. Please check and try again."},
+                status=401)
+        session_id = str(uuid.uuid4())
+        token = f"stub.{uuid.uuid4().hex}"
+        tokens[token] = session_id
+        return web.json_response(
+            {"sessionId": session_id, "teamName": "Load Test Team",
+             "token": token},
+            headers={"Cache-Control": "no-store"})
+
+    async def upload(request):
+        limit = limiter.hit_limit("upload", client_ip(request), now_ms())
+        if not limit.allowed:
+            return web.json_response({"error": "Upload rate limit exceeded"},
+                                     status=429)
+        token = request.headers.get("Authorization", "").replace("Bearer ", "")
+        if not token:
+            return web.json_response({"error": "Unauthorized"}, status=401)
+        if token not in tokens:
+            return web.json_response({"error": "Invalid token"}, status=401)
+
+        size = 0
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name == "photo":
+                while chunk := await part.read_chunk(1 << 16):
+                    size += len(chunk)
+            else:
+                await part.release()
+        if not size:
+            return web.json_response({"error": "No file provided"}, status=400)
+        if size > MAX_UPLOAD_BYTES:
+            return web.json_response(
+                {"error": "File exceeds 50MB limit"}, status=400)
+
+        await asyncio.sleep((upload_ms + ms_per_mb * size / 1048576) / 1000)
+        return web.json_response({
+            "success": True,
+            "photoId": str(uuid.uuid4()),
+            "size": f"{size / 1024 / 1024:.2f} MB",
+        })
+
+    app = web.Application(client_max_size=MAX_UPLOAD_BYTES + (1 << 20))
+    app.router.add_post(PIN_PATH, validate_pin)
+    app.router.add_post(UPLOAD_PATH, upload)
+    return app
+
+
+async def start_stub(port=0, **kwargs):
+    """Start the stub on localhost; return ``(runner, base_url)``."""
+    runner = web.AppRunner(stub_app(**kwargs), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def serve_stub(port):
+    runner, base_url = await start_stub(port)
+    print(f"  Stub server on {base_url} (PIN {STUB_PIN}); Ctrl+C to stop")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  REPORT
+# ══════════════════════════════════════════════════════════════════════
+
+def fmt_status(status):
+    return str(status).replace("error:", "")
+
+
+def summarize(test):
+    """Plain-dict results (also written by --json)."""
+    out = {"elapsed_s": round(test.elapsed, 3), "teams": dict(test.teams_done),
+           "endpoints": {}}
+    for name, s in test.stats.items():
+        ok = s.count(lambda st: st == 200)
+        out["endpoints"][name] = {
+            "requests": s.requests,
+            "ok": ok,
+            "rate_limited": s.statuses[429],
+            "statuses": {fmt_status(k): v for k, v in s.statuses.items()},
+            "req_per_s": round(s.requests / test.elapsed, 2) if test.elapsed else 0,
+            "ok_per_s": round(ok / test.elapsed, 2) if test.elapsed else 0,
+            "mb_sent": round(s.bytes_sent / 1048576, 1),
+            "service_ms": {f"p{p}": round(s.service.percentile(p), 1)
+                           for p in (50, 95, 99)},
+            "response_ms": {f"p{p}": round(s.response.percentile(p), 1)
+                            for p in (50, 95, 99)},
+            "max_ms": round(s.response.max, 1),
+        }
+    return out
+
+
+def write_trace(test, path):
+    """One JSON object per request, in send order."""
+    with open(path, "w", encoding="utf-8") as f:
+        for t_ms, team, endpoint, ip, status in sorted(test.trace):
+            f.write(json.dumps({"t_ms": t_ms, "team": team,
+                                "endpoint": endpoint, "ip": ip,
+                                "status": fmt_status(status)}) + "\n")
+    print(f"  [OK] {Path(path).name} ({len(test.trace):,} requests)")
+
+
+def write_report(test, target, out_path=OUT):
+    results = summarize(test)
+    doc = setup_doc("Upload Load Test",
+                    f"{target} — {datetime.now():%Y-%m-%d %H:%M}")
+
+    add_heading_styled(doc, "1. Test Configuration", level=2)
+    photo_mb = sum(len(d) for _, d in test.photos) / len(test.photos) / 1048576
+    ips = ("one per team" if test.client_ips is None
+           else "none (no X-Forwarded-For)" if test.client_ips == 0
+           else f"{test.client_ips:,} shared")
+    styled_table(doc, ["Setting", "Value"], [
+        ["Target", target],
+        ["Field teams", f"{test.teams:,} arriving at {test.rate:g}/s (Poisson)"],
+        ["Photos per team", f"{test.photos_per_team:,} "
+                            f"(avg {photo_mb:.1f} MB JPEG)"],
+        ["Max concurrent requests", f"{test.concurrency:,}"],
+        ["Client IPs", ips],
+        ["Incident ID", test.incident_id],
+        ["Elapsed", f"{test.elapsed:.1f} s"],
+    ], col_widths=[35, 65])
+
+    add_heading_styled(doc, "2. Throughput and Status", level=2)
+    rows = []
+    for name, r in results["endpoints"].items():
+        n = r["requests"]
+        other = n - r["ok"] - r["rate_limited"]
+        rows.append([
+            ENDPOINTS[name], f"{n:,}", f"{r['ok']:,}",
+            f"{r['rate_limited']:,}",
+            f"{r['rate_limited'] / n:.1%}" if n else "—",
+            f"{other:,}", f"{r['ok_per_s']:,.1f}/s",
+        ])
+    styled_table(doc, ["Endpoint", "Requests", "200", "429", "429 Rate",
+                       "Other", "Throughput"], rows,
+                 col_widths=[26, 12, 10, 10, 12, 10, 20])
+    up = results["endpoints"]["upload"]
+    teams = results["teams"]
+    add_para(doc, f"Uploaded {up['mb_sent']:,.1f} MB "
+                  f"({up['mb_sent'] / test.elapsed if test.elapsed else 0:,.1f} "
+                  f"MB/s). Teams completed: {teams.get('completed', 0):,}; "
+                  f"stopped at PIN: {teams.get('pin_failed', 0):,}; "
+                  f"stopped at a failed upload: "
+                  f"{teams.get('upload_failed', 0):,}.",
+             size=Pt(9))
+
+    other = sorted({st for r in results["endpoints"].values()
+                    for st in r["statuses"] if st not in ("200", "429")})
+    if other:
+        styled_table(doc, ["Endpoint"] + other, [
+            [ENDPOINTS[name]] + [f"{r['statuses'].get(st, 0):,}"
+                                 for st in other]
+            for name, r in results["endpoints"].items()
+        ])
+
+    add_heading_styled(doc, "3. Latency", level=2)
+    add_para(doc, "Service time runs from sending the request to reading the "
+                  "response. Response time starts when the request was due, "
+                  "so it also counts waiting for a free connection.",
+             italic=True, size=Pt(9))
+    rows = []
+    for name, s in test.stats.items():
+        for label, hist in (("Service", s.service), ("Response", s.response)):
+            rows.append([ENDPOINTS[name], label] + [
+                f"{hist.percentile(p):,.0f}" for p in (50, 95, 99)
+            ] + [f"{hist.max:,.0f}"])
+    styled_table(doc, ["Endpoint", "Measure", "p50 ms", "p95 ms", "p99 ms",
+                       "Max ms"], rows, col_widths=[28, 14, 14, 14, 14, 16])
+
+    add_heading_styled(doc, "4. Response Time Distribution", level=2)
+    edges = REPORT_BUCKETS_MS
+    labels = [f"< {edges[0]:,} ms"] + [
+        f"{lo:,}–{hi:,} ms" for lo, hi in zip(edges, edges[1:])
+    ] + [f"≥ {edges[-1]:,} ms"]
+    rows = []
+    for n, label in enumerate(labels):
+        row = [label]
+        for s in test.stats.values():
+            hist = s.response
+            below_hi = hist.count_below(edges[n]) if n < len(edges) else hist.count
+            below_lo = hist.count_below(edges[n - 1]) if n else 0
+            row.append(f"{below_hi - below_lo:,}")
+        rows.append(row)
+    styled_table(doc, ["Response time"] + [ENDPOINTS[n] for n in ENDPOINTS],
+                 rows, col_widths=[30, 35, 35])
+
+    add_heading_styled(doc, "5. Rate Limits Exercised", level=2)
+    add_para(doc, "Limits applied per X-Forwarded-For address by "
+                  "lib/rateLimit.ts (in-memory, per instance).",
+             italic=True, size=Pt(9))
+    styled_table(doc, ["Endpoint", "Key", "Limit", "Lockout", "Retry-After"], [
+        [PIN_PATH, "pin-attempt:{ip}", "5 per 60 s", "15 min", "Yes"],
+        [UPLOAD_PATH, "upload:{ip}",
+         f"{LIMITS['upload']['max_attempts']} per 1 h",
+         "15 min (default)", "No"],
+    ], col_widths=[30, 22, 16, 18, 14])
+
+    out_path = Path(out_path)
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+    return out_path
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  CLI
+# ══════════════════════════════════════════════════════════════════════
+
+async def run_cli(args, photos):
+    runner = None
+    base_url = args.base_url
+    pin = args.pin
+    if args.stub:
+        runner, base_url = await start_stub()
+        pin = pin or STUB_PIN
+    try:
+        test = LoadTest(base_url, pin, args.teams, args.photos_per_team,
+                        args.rate, args.concurrency, args.client_ips,
+                        args.incident_id, photos, timeout=args.timeout)
+        await test.run()
+    finally:
+        if runner:
+            await runner.cleanup()
+    return test, ("local stub" if args.stub else base_url)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test PIN validation and photo upload")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base-url", help="e.g. http://localhost:3000")
+    target.add_argument("--stub", action="store_true",
+                        help="run against the bundled local stub server")
+    target.add_argument("--serve-stub", type=int, metavar="PORT",
+                        help="only run the stub server on PORT")
+    parser.add_argument("--pin", help=f"upload PIN (stub: {STUB_PIN})")
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--photos-per-team", type=int, default=5)
+    parser.add_argument("--rate", type=float, default=2.0,
+                        help="team arrivals per second")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="max requests in flight")
+    parser.add_argument("--client-ips", type=int, default=None,
+                        help="distinct X-Forwarded-For addresses "
+                             "(default: one per team; 0: send none)")
+    parser.add_argument("--photo-dir", help="upload these JPEGs instead of "
+                                            "synthetic ones")
+    parser.add_argument("--photo-mb", type=float, default=4.0,
+                        help="size of synthetic JPEGs")
+    parser.add_argument("--incident-id",
+                        default=f"LOADTEST-{datetime.now():%Y%m%d}")
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="per-request timeout in seconds")
+    parser.add_argument("--json", help="also write results as JSON here")
+    parser.add_argument("--trace", help="also write every request as JSONL "
+                                        "(input for ratelimit_sim.py)")
+    parser.add_argument("--out", default=str(OUT), help="report DOCX path")
+    args = parser.parse_args()
+
+    if args.serve_stub is not None:
+        try:
+            asyncio.run(serve_stub(args.serve_stub))
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.base_url and not args.pin:
+        parser.error("--pin is required with --base-url")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Upload Load Test")
+    print("=" * 60)
+    photos = load_photos(args.photo_dir, args.photo_mb)
+    print(f"  Payloads: {len(photos)} JPEGs, avg "
+          f"{sum(len(d) for _, d in photos) / len(photos) / 1048576:.1f} MB")
+
+    test, target_name = asyncio.run(run_cli(args, photos))
+    results = summarize(test)
+    for name, r in results["endpoints"].items():
+        print(f"  {ENDPOINTS[name]:<24} {r['requests']:>6,} req  "
+              f"429: {r['rate_limited']:>5,}  "
+              f"p50/p95/p99 {r['response_ms']['p50']:,.0f}/"
+              f"{r['response_ms']['p95']:,.0f}/"
+              f"{r['response_ms']['p99']:,.0f} ms  "
+              f"{r['ok_per_s']:,.1f} ok/s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.trace:
+        write_trace(test, args.trace)
+    write_report(test, target_name, args.out)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
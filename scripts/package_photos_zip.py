@@ -0,0 +1,359 @@
+"""
+Package photo originals from a local blob mirror into one ZIP archive.
+
+Offline counterpart of `POST /api/admin/photos/bulk-download` without its
+100-photo cap: selects photos by an ID list and/or incident IDs and
+streams each `{id}/original` blob into a ZIP64 archive as
+`{incident_id}/{file_name}` (the same fields the route returns). JPEGs
+are already compressed, so entries are stored, not deflated.
+
+Blobs are read on a thread pool a few files ahead of the writer, each
+reader passing 1 MB chunks through a small bounded queue and hashing as it
+reads, so no file is ever held in memory whole and the archive is
+written at disk speed. Alongside the archive come a manifest CSV (also
+stored in the archive as manifest.csv) and an index DOCX built with
+`styled_table`.
+
+Photo metadata (id, incident_id, file_name, file_size) comes from a
+photos export; it is required for --incident and optional with --ids
+(entries are then named `{id}` plus an extension from the blob's bytes).
+
+Run:  python scripts/package_photos_zip.py BLOB_MIRROR OUT.zip --incident HU-2026-001 --export photos.csv
+Requires: pip install python-docx
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from docx.shared import Pt
+
+from generate_all_docx import (
+    StreamingDocx, add_heading_styled, add_para, setup_doc, styled_table,
+)
+from generate_incident_report import normalize_rows, read_export
+
+CHUNK_SIZE = 1 << 20
+QUEUE_CHUNKS = 4                 # per file being read ahead
+PUT_TIMEOUT_S = 0.5              # how often a blocked reader checks cancel
+NO_INCIDENT = "no-incident"
+MANIFEST_NAME = "manifest.csv"
+MANIFEST_FIELDS = ["photo_id", "archive_path", "incident_id", "file_name",
+                   "size", "sha256", "status"]
+EXPORT_FIELDS = ("id", "incident_id", "file_name", "file_size")
+EXPORT_ALIASES = {"photo_id": "id"}
+UNSAFE_PATH_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+MAGIC_EXTENSIONS = [
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+]
+
+_END = object()
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SELECTION
+# ══════════════════════════════════════════════════════════════════════
+
+def read_id_list(path):
+    """Photo IDs from a text file (one per line, '#' comments allowed)."""
+    ids = []
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                ids.append(line.lower())
+    return ids
+
+
+def select_photos(ids=None, incidents=None, export_path=None):
+    """``[(photo_id, incident_id, file_name)]`` in archive order."""
+    wanted = set(ids or ())
+    incidents = set(incidents or ())
+    found = {}
+    if export_path:
+        for photo_id, incident_id, file_name, _ in normalize_rows(
+                read_export(export_path), EXPORT_FIELDS, EXPORT_ALIASES):
+            photo_id = photo_id.lower()
+            if photo_id in wanted or (incidents and incident_id in incidents):
+                found[photo_id] = (photo_id, incident_id, file_name)
+    for photo_id in wanted - found.keys():
+        found[photo_id] = (photo_id, "", "")
+    return sorted(found.values(), key=lambda p: (p[1] or "~", p[2], p[0]))
+
+
+def safe_part(value):
+    return UNSAFE_PATH_CHARS.sub("_", value).strip(". ") or "_"
+
+
+class ArchiveNames:
+    """Unique ``{incident}/{file name}`` archive paths."""
+
+    def __init__(self):
+        self.used = set()
+
+    def name(self, photo_id, incident_id, file_name, head):
+        if not file_name:
+            ext = next((e for magic, e in MAGIC_EXTENSIONS
+                        if head.startswith(magic)), "")
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                ext = ".webp"
+            file_name = photo_id + ext
+        folder = safe_part(incident_id or NO_INCIDENT)
+        path = f"{folder}/{safe_part(file_name)}"
+        if path.lower() in self.used:
+            stem, dot, ext = safe_part(file_name).rpartition(".")
+            if not dot:
+                stem, ext = ext, ""
+            path = f"{folder}/{stem}_{photo_id[:8]}{dot}{ext}"
+        self.used.add(path.lower())
+        return path
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  STREAMING
+# ══════════════════════════════════════════════════════════════════════
+
+class Cancelled(Exception):
+    """The writer gave up; reader threads stop instead of blocking."""
+
+
+def put(chunks, item, cancel):
+    """``chunks.put`` that gives up once ``cancel`` is set."""
+    while True:
+        if cancel.is_set():
+            raise Cancelled
+        try:
+            chunks.put(item, timeout=PUT_TIMEOUT_S)
+            return
+        except queue.Full:
+            continue
+
+
+def read_blob(path, chunks, cancel):
+    """Reader thread: feed ``path`` into ``chunks`` and hash it.
+
+    Puts byte chunks, then ``_END``, then ``(size, sha256)``. If the blob
+    cannot be opened or a read fails part-way, an OSError is put instead
+    of ``_END`` and nothing follows it. Returns early once ``cancel`` is
+    set, so a writer that failed is not left waiting on the pool.
+    """
+    h = hashlib.sha256()
+    size = 0
+    try:
+        try:
+            with open(path, "rb") as f:
+                while block := f.read(CHUNK_SIZE):
+                    h.update(block)
+                    size += len(block)
+                    put(chunks, block, cancel)
+        except OSError as e:
+            put(chunks, e, cancel)
+            return
+        put(chunks, _END, cancel)
+        put(chunks, (size, h.hexdigest()), cancel)
+    except Cancelled:
+        return
+
+
+def package(mirror, photos, out_path, manifest_path, workers=8):
+    """Write the archive and manifest; return ``(entries, stats)``."""
+    mirror = Path(mirror)
+    names = ArchiveNames()
+    stats = Counter()
+    entries = []
+    t0 = time.perf_counter()
+
+    with zipfile.ZipFile(out_path, "w", zipfile.ZIP_STORED,
+                         allowZip64=True) as zf, \
+            open(manifest_path, "w", newline="", encoding="utf-8") as mf, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        manifest = csv.writer(mf)
+        manifest.writerow(MANIFEST_FIELDS)
+
+        # Keep `workers` readers ahead of the writer, each with its own
+        # bounded chunk queue, so memory stays near workers * QUEUE_CHUNKS MB
+        pending = deque()
+        todo = iter(photos)
+        cancel = threading.Event()
+
+        def start_next():
+            for photo in todo:
+                chunks = queue.Queue(maxsize=QUEUE_CHUNKS)
+                pool.submit(read_blob, mirror / photo[0] / "original", chunks,
+                            cancel)
+                pending.append((photo, chunks))
+                return
+
+        for _ in range(workers):
+            start_next()
+
+        # If the writer fails (full disk, zipfile error, Ctrl-C), release
+        # the readers blocked on their queues, or the pool's shutdown
+        # would wait on them forever.
+        try:
+            while pending:
+                (photo_id, incident_id, file_name), chunks = pending.popleft()
+                first = chunks.get()
+                if isinstance(first, OSError):
+                    start_next()
+                    stats["missing"] += 1
+                    entry = [photo_id, "", incident_id, file_name, 0, "",
+                             "missing"]
+                    manifest.writerow(entry)
+                    entries.append(entry)
+                    continue
+
+                head = first if isinstance(first, bytes) else b""
+                arcname = names.name(photo_id, incident_id, file_name, head)
+                info = zipfile.ZipInfo(arcname,
+                                       date_time=time.localtime()[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                written = 0
+                with zf.open(info, "w", force_zip64=True) as dest:
+                    item = first
+                    while item is not _END and not isinstance(item, OSError):
+                        dest.write(item)
+                        written += len(item)
+                        item = chunks.get()
+                start_next()
+
+                if isinstance(item, OSError):
+                    # A ZIP entry cannot be withdrawn once streamed; leave the
+                    # partial file in place and flag it in the manifest.
+                    print(f"  [ERR] {photo_id}: read failed after "
+                          f"{written:,} bytes ({item})")
+                    stats["truncated"] += 1
+                    entry = [photo_id, arcname, incident_id, file_name,
+                             written, "", "truncated"]
+                    manifest.writerow(entry)
+                    entries.append(entry)
+                    continue
+                size, digest = chunks.get()
+
+                stats["photos"] += 1
+                stats["bytes"] += size
+                entry = [photo_id, arcname, incident_id, file_name, size,
+                         digest, "ok"]
+                manifest.writerow(entry)
+                entries.append(entry)
+                if stats["photos"] % 1000 == 0:
+                    elapsed = time.perf_counter() - t0
+                    rate = stats["bytes"] / 1048576 / elapsed
+                    print(f"  ... {stats['photos']:,} photos "
+                          f"({stats['bytes'] / 1073741824:,.2f} GB, "
+                          f"{rate:,.0f} MB/s)")
+        except BaseException:
+            cancel.set()
+            raise
+
+        mf.flush()
+        zf.write(manifest_path, MANIFEST_NAME)
+
+    stats["seconds"] = time.perf_counter() - t0
+    return entries, stats
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  INDEX DOCX
+# ══════════════════════════════════════════════════════════════════════
+
+def write_index(entries, stats, archive, out_path, selection):
+    by_incident = {}
+    for _, _, incident_id, _, size, _, status in entries:
+        counts = by_incident.setdefault(incident_id or "(no incident)",
+                                        [0, 0, 0])
+        if status == "ok":
+            counts[0] += 1
+            counts[1] += size
+        else:
+            counts[2] += 1
+
+    doc = setup_doc("Photo Archive Index",
+                    f"{Path(archive).name} — {stats['photos']:,} photos, "
+                    f"{stats['bytes'] / 1073741824:,.2f} GB")
+    add_heading_styled(doc, "1. Summary", level=2)
+    add_para(doc, f"Selection: {selection}", italic=True, size=Pt(9))
+    styled_table(doc, ["Incident", "Photos", "Size", "Missing/Truncated"], [
+        [incident, f"{n:,}", f"{size / 1048576:,.1f} MB", f"{missing:,}"]
+        for incident, (n, size, missing) in sorted(by_incident.items())
+    ], col_widths=[40, 20, 20, 20])
+
+    with StreamingDocx(doc, out_path) as out:
+        out.page_break()
+        out.heading("2. Archive Contents", level=2)
+        out.para("SHA-256 digests allow each file to be verified after "
+                 "transfer; the same list is in manifest.csv.")
+        with out.table(["Archive Path", "Photo ID", "Size", "SHA-256"],
+                       [32, 28, 10, 30]) as table:
+            for photo_id, arcname, _, _, size, digest, status in entries:
+                table.add([arcname or "(missing)", photo_id,
+                           f"{size / 1048576:,.2f} MB" if status == "ok"
+                           else status, digest[:16] + "…" if digest else "—"])
+    size_kb = os.path.getsize(out_path) / 1024
+    print(f"  [OK] {Path(out_path).name} ({size_kb:,.1f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Package photo originals into a ZIP archive")
+    parser.add_argument("mirror", help="local copy of the aspr-photos container")
+    parser.add_argument("archive", help="output .zip path")
+    parser.add_argument("--ids", help="text file of photo IDs, one per line")
+    parser.add_argument("--incident", action="append", default=[],
+                        help="incident ID to include (repeatable)")
+    parser.add_argument("--export", help="CSV/JSONL photos export "
+                                         "(id, incident_id, file_name)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="files read ahead in parallel")
+    args = parser.parse_args()
+
+    if not Path(args.mirror).is_dir():
+        parser.error(f"{args.mirror} is not a directory")
+    if not (args.ids or args.incident):
+        parser.error("give --ids and/or --incident")
+    if args.incident and not args.export:
+        parser.error("--incident needs --export to look up incident IDs")
+
+    archive = Path(args.archive)
+    manifest_path = archive.with_name(archive.stem + "_manifest.csv")
+    index_path = archive.with_name(archive.stem + "_index.docx")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Archive Packager")
+    print("=" * 60)
+    ids = read_id_list(args.ids) if args.ids else []
+    photos = select_photos(ids, args.incident, args.export)
+    print(f"  Selected {len(photos):,} photos")
+    if not photos:
+        parser.error("no photos matched the selection")
+
+    entries, stats = package(args.mirror, photos, archive, manifest_path,
+                             workers=args.workers)
+    rate = stats["bytes"] / 1048576 / stats["seconds"] if stats["seconds"] else 0
+    print(f"  [OK] {archive.name}: {stats['photos']:,} photos, "
+          f"{stats['bytes'] / 1073741824:,.2f} GB in {stats['seconds']:.1f} s "
+          f"({rate:,.0f} MB/s); {stats['missing']:,} missing, "
+          f"{stats['truncated']:,} truncated")
+    print(f"  [OK] {manifest_path.name}")
+
+    selection = "; ".join(filter(None, [
+        f"incidents {', '.join(args.incident)}" if args.incident else "",
+        f"{len(ids):,} IDs from {Path(args.ids).name}" if args.ids else "",
+    ]))
+    write_index(entries, stats, archive, index_path, selection)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+"""
+Find near-duplicate photos with perceptual hashes.
+
+Hashes the 400x300 preview of every photo in a local blob-storage mirror —
+`renditions/{id}/thumb_md.webp`, or the `{id}/thumbnail` blob written by
+PIN uploads, which has the same size — with a 64-bit dHash and a 64-bit
+DCT pHash, on a process pool. Hashes are kept in a compact NumPy index
+(`.npy`, 52 bytes per photo) that later runs extend incrementally.
+
+Near-duplicates are pairs within --max-distance bits of pHash Hamming
+distance (and within --max-dhash bits of dHash). They are found with a
+vectorized multi-index search: the pHash is split into four 16-bit
+chunks, and by the pigeonhole principle any pair within distance d agrees
+to within d // 4 bits on at least one chunk, so only pairs sharing a
+(nearly) equal chunk are ever compared. Pairs are joined into clusters and
+written, grouped by incident_id, as JSON and as a DOCX appendix.
+
+A photos export (id, incident_id) supplies incident IDs; it is read after
+clustering and only for photos that are in a cluster.
+
+Run:  python scripts/photo_dedupe_index.py BLOB_MIRROR --export photos.csv
+Requires: pip install numpy pillow python-docx
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from docx.shared import Pt
+
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_para, setup_doc, styled_table,
+)
+from generate_incident_report import normalize_rows, read_export
+
+OUT = DOCS / "ASPR_Photos_Duplicate_Appendix.docx"
+
+INDEX_DTYPE = np.dtype([("id", "S36"), ("dhash", "<u8"), ("phash", "<u8")])
+RENDITION_DIR = "renditions"
+PREVIEW_NAMES = ("thumb_md.webp",)       # under renditions/{id}/
+FALLBACK_BLOB = "thumbnail"              # {id}/thumbnail from PIN uploads
+
+CHUNKS = 4                               # 16-bit pHash chunks
+CHUNK_BITS = 64 // CHUNKS
+HASH_BATCH = 64                          # photos per worker task
+MAX_PAIRS_PER_BLOCK = 4_000_000          # candidate pairs held at once
+MAX_REPORT_ROWS = 5_000
+NO_INCIDENT = "(no incident)"
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  HASHING (worker process)
+# ══════════════════════════════════════════════════════════════════════
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    m = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+    m[0] /= np.sqrt(2)
+    return m * np.sqrt(2 / n)
+
+
+DCT32 = _dct_matrix(32)
+
+
+def pack_bits(bits):
+    return int(np.packbits(bits.astype(np.uint8)).view(">u8")[0])
+
+
+def image_hashes(path):
+    """``(dhash, phash)`` of an image as unsigned 64-bit ints."""
+    with Image.open(path) as img:
+        gray = img.convert("L")
+    # dHash: is each pixel brighter than its right neighbour (9x8 grid)
+    d = np.asarray(gray.resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    dhash = pack_bits(d[:, 1:] > d[:, :-1])
+    # pHash: low 8x8 DCT frequencies of a 32x32 image against their median
+    p = np.asarray(gray.resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    low = (DCT32 @ p @ DCT32.T)[:8, :8].ravel()
+    phash = pack_bits(low > np.median(low[1:]))
+    return dhash, phash
+
+
+def hash_batch(batch):
+    """Hash ``[(photo_id, path)]``; return ``(rows, errors)``."""
+    rows, errors = [], []
+    for photo_id, path in batch:
+        try:
+            rows.append((photo_id, *image_hashes(path)))
+        except (OSError, ValueError) as e:
+            errors.append((photo_id, str(e)))
+    return rows, errors
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  INDEX
+# ══════════════════════════════════════════════════════════════════════
+
+def iter_previews(mirror):
+    """Yield ``(photo_id, preview_path)`` for every photo in the mirror."""
+    mirror = Path(mirror)
+    seen = set()
+    renditions = mirror / RENDITION_DIR
+    if renditions.is_dir():
+        with os.scandir(renditions) as entries:
+            for entry in entries:
+                for name in PREVIEW_NAMES:
+                    path = Path(entry.path) / name
+                    if path.is_file():
+                        seen.add(entry.name.lower())
+                        yield entry.name.lower(), path
+                        break
+    with os.scandir(mirror) as entries:
+        for entry in entries:
+            if entry.name == RENDITION_DIR or entry.name.lower() in seen:
+                continue
+            path = Path(entry.path) / FALLBACK_BLOB
+            if entry.is_dir() and path.is_file():
+                yield entry.name.lower(), path
+
+
+def load_index(path):
+    path = Path(path)
+    if path.exists():
+        return np.load(path)
+    return np.empty(0, dtype=INDEX_DTYPE)
+
+
+def save_index(index, path):
+    path = Path(path)
+    tmp = path.with_name(path.name + ".partial")
+    with open(tmp, "wb") as f:
+        np.save(f, index)
+    os.replace(tmp, path)
+
+
+def update_index(mirror, index_path, workers=None):
+    """Hash previews not yet in the index; return ``(index, new, errors)``."""
+    index = load_index(index_path)
+    known = set(index["id"].astype(str))
+    todo = [(pid, p) for pid, p in iter_previews(mirror) if pid not in known]
+    print(f"  Index: {len(index):,} photos; {len(todo):,} new to hash")
+    if not todo:
+        return index, 0, []
+
+    workers = workers or os.cpu_count() or 1
+    batches = [todo[n:n + HASH_BATCH] for n in range(0, len(todo), HASH_BATCH)]
+    new = np.empty(len(todo), dtype=INDEX_DTYPE)
+    errors = []
+    count = 0
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rows, errs in pool.map(hash_batch, batches):
+            for photo_id, dhash, phash in rows:
+                new[count] = (photo_id.encode(), dhash, phash)
+                count += 1
+            errors.extend(errs)
+            if count and count % 50_000 < HASH_BATCH:
+                rate = count / (time.perf_counter() - t0)
+                print(f"  ... {count:,} hashed ({rate:,.0f}/s)")
+
+    index = np.concatenate([index, new[:count]])
+    save_index(index, index_path)
+    return index, count, errors
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  MULTI-INDEX HAMMING SEARCH
+# ══════════════════════════════════════════════════════════════════════
+
+def hamming(a, b):
+    return np.bitwise_count(a ^ b).astype(np.int64)
+
+
+def flip_masks(radius):
+    """Every 16-bit mask with at most ``radius`` bits set."""
+    masks = np.arange(1 << CHUNK_BITS, dtype=np.int64)
+    return masks[np.bitwise_count(masks) <= radius]
+
+
+def candidate_blocks(keys, order, starts, mask):
+    """Yield ``(query, candidate)`` index arrays for one chunk and mask.
+
+    Candidates share the query's chunk value XOR ``mask``. For a non-zero
+    mask only the query with the smaller chunk value expands a pair, so
+    each pair is produced once. Queries are cut into blocks holding at most
+    MAX_PAIRS_PER_BLOCK candidates, so a huge bucket (e.g. thousands of
+    black frames) cannot exhaust memory.
+    """
+    target = keys ^ mask
+    lo = starts[target]
+    cnt = starts[target + 1] - lo
+    if mask:
+        cnt[target < keys] = 0
+    cum = np.cumsum(cnt)
+    cuts = np.searchsorted(cum, np.arange(MAX_PAIRS_PER_BLOCK, cum[-1],
+                                          MAX_PAIRS_PER_BLOCK))
+    bounds = np.unique(np.concatenate([[0], cuts + 1, [len(keys)]]))
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        c = cnt[a:b]
+        total = int(c.sum())
+        if not total:
+            continue
+        q = np.repeat(np.arange(a, b), c)
+        offsets = np.arange(total) - np.repeat(np.cumsum(c) - c, c)
+        yield q, order[np.repeat(lo[a:b], c) + offsets]
+
+
+def near_duplicate_pairs(index, max_distance, max_dhash):
+    """Index pairs ``(i, j)``, i < j, within the distance thresholds."""
+    if len(index) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    phash = index["phash"]
+    dhash = index["dhash"]
+    masks = flip_masks(max_distance // CHUNKS)
+    found = []
+    for chunk in range(CHUNKS):
+        keys = ((phash >> np.uint64(chunk * CHUNK_BITS))
+                & np.uint64(0xFFFF)).astype(np.int64)
+        order = np.argsort(keys, kind="stable")
+        starts = np.searchsorted(keys[order], np.arange((1 << CHUNK_BITS) + 1))
+        for mask in masks:
+            for q, c in candidate_blocks(keys, order, starts, mask):
+                if not mask:
+                    keep = q < c
+                    q, c = q[keep], c[keep]
+                keep = ((hamming(phash[q], phash[c]) <= max_distance)
+                        & (hamming(dhash[q], dhash[c]) <= max_dhash))
+                if keep.any():
+                    q, c = q[keep], c[keep]
+                    found.append(np.minimum(q, c) * len(index)
+                                 + np.maximum(q, c))
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.unique(np.concatenate(found))
+    return np.stack(np.divmod(pairs, len(index)), axis=1)
+
+
+def cluster_pairs(pairs):
+    """Union-find over index pairs; return clusters as sorted index lists."""
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:
+            parent[x], x = root, parent.get(x, x)
+        return root
+
+    for i, j in pairs.tolist():
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    groups = defaultdict(list)
+    for node in parent:
+        groups[find(node)].append(node)
+    for root in list(groups):
+        groups[root].append(root)
+    return [sorted(set(members)) for members in groups.values()]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  OUTPUT
+# ══════════════════════════════════════════════════════════════════════
+
+def incident_lookup(export_path, ids):
+    """incident_id for each of ``ids`` from a photos export."""
+    if not export_path:
+        return {}
+    lookup = {}
+    for photo_id, incident_id in normalize_rows(
+            read_export(export_path), ("id", "incident_id"),
+            {"photo_id": "id"}):
+        photo_id = photo_id.lower()
+        if photo_id in ids:
+            lookup[photo_id] = incident_id
+    return lookup
+
+
+def build_clusters(index, clusters, export_path):
+    """Duplicate clusters grouped by incident, largest first."""
+    ids = index["id"].astype(str)
+    needed = {ids[i] for members in clusters for i in members}
+    incidents = incident_lookup(export_path, needed)
+
+    by_incident = defaultdict(list)
+    for members in clusters:
+        rep = members[0]
+        photos = [{
+            "id": ids[i],
+            "incident_id": incidents.get(ids[i], ""),
+            "phash_distance": int(hamming(index["phash"][rep],
+                                          index["phash"][i])),
+            "dhash_distance": int(hamming(index["dhash"][rep],
+                                          index["dhash"][i])),
+        } for i in members]
+        # A cluster belongs to its members' most common incident
+        incident = Counter(p["incident_id"] for p in photos).most_common(1)[0][0]
+        by_incident[incident or NO_INCIDENT].append({"photos": photos})
+
+    for groups in by_incident.values():
+        groups.sort(key=lambda g: (-len(g["photos"]), g["photos"][0]["id"]))
+    return dict(sorted(by_incident.items(),
+                       key=lambda kv: (kv[0] == NO_INCIDENT, kv[0])))
+
+
+def write_appendix(by_incident, summary, out_path=OUT):
+    doc = setup_doc("Duplicate Photo Appendix",
+                    f"{summary['clusters']:,} near-duplicate clusters in "
+                    f"{summary['photos']:,} photos")
+
+    add_heading_styled(doc, "A.1 Summary", level=2)
+    add_para(doc, f"Near-duplicates: pHash distance ≤ "
+                  f"{summary['max_distance']} and dHash distance ≤ "
+                  f"{summary['max_dhash']} of 64 bits, on the 400x300 preview. "
+                  f"Generated {summary['generated']}.",
+             italic=True, size=Pt(9))
+    styled_table(doc, ["Incident", "Clusters", "Photos in Clusters",
+                       "Redundant Copies"], [
+        [incident, f"{len(groups):,}",
+         f"{sum(len(g['photos']) for g in groups):,}",
+         f"{sum(len(g['photos']) - 1 for g in groups):,}"]
+        for incident, groups in by_incident.items()
+    ], col_widths=[34, 18, 24, 24])
+
+    add_heading_styled(doc, "A.2 Clusters by Incident", level=2)
+    rows_left = MAX_REPORT_ROWS
+    for n, (incident, groups) in enumerate(by_incident.items(), start=1):
+        if rows_left <= 0:
+            add_para(doc, "Remaining incidents omitted; see the JSON output "
+                          "for every cluster.", italic=True, size=Pt(9))
+            break
+        add_heading_styled(doc, f"A.2.{n} {incident}", level=3)
+        rows = []
+        for c, group in enumerate(groups, start=1):
+            rep, *dups = group["photos"]
+            for photo in dups:
+                rows.append([str(c), rep["id"], photo["id"],
+                             str(photo["phash_distance"]),
+                             photo["incident_id"] or "—"])
+            if len(rows) >= rows_left:
+                break
+        rows_left -= len(rows)
+        styled_table(doc, ["#", "Keep", "Duplicate", "Dist.", "Incident"],
+                     rows, col_widths=[6, 34, 34, 8, 18])
+
+    out_path = Path(out_path)
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate photos with perceptual hashes")
+    parser.add_argument("mirror", help="local copy of the aspr-photos container")
+    parser.add_argument("--index", default="phash_index.npy",
+                        help="hash index (created or extended)")
+    parser.add_argument("--export", help="CSV/JSONL photos export "
+                                         "(id, incident_id)")
+    parser.add_argument("--max-distance", type=int, default=6,
+                        help="max pHash Hamming distance (bits)")
+    parser.add_argument("--max-dhash", type=int, default=10,
+                        help="max dHash Hamming distance (bits)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="hashing processes (default: CPU count)")
+    parser.add_argument("--json", default="duplicate_clusters.json")
+    parser.add_argument("--out", default=str(OUT), help="appendix DOCX path")
+    args = parser.parse_args()
+
+    if not Path(args.mirror).is_dir():
+        parser.error(f"{args.mirror} is not a directory")
+    if not 0 <= args.max_distance < 3 * CHUNKS:
+        parser.error(f"--max-distance must be 0-{3 * CHUNKS - 1}")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Duplicate Index")
+    print("=" * 60)
+    index, hashed, errors = update_index(args.mirror, args.index, args.workers)
+    for photo_id, error in errors[:20]:
+        print(f"  [ERR] {photo_id}: {error}")
+    if len(errors) > 20:
+        print(f"  [ERR] ... {len(errors) - 20:,} more unreadable previews")
+
+    t0 = time.perf_counter()
+    pairs = near_duplicate_pairs(index, args.max_distance, args.max_dhash)
+    clusters = cluster_pairs(pairs)
+    print(f"  Search: {len(pairs):,} pairs, {len(clusters):,} clusters "
+          f"({time.perf_counter() - t0:.1f} s)")
+
+    by_incident = build_clusters(index, clusters, args.export)
+    summary = {
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "photos": len(index),
+        "clusters": len(clusters),
+        "max_distance": args.max_distance,
+        "max_dhash": args.max_dhash,
+    }
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump({**summary, "incidents": by_incident}, f, indent=1)
+    print(f"  [OK] {Path(args.json).name}")
+    write_appendix(by_incident, summary, args.out)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
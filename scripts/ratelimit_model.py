@@ -0,0 +1,100 @@
+"""
+Python model of the in-memory rate limiter in lib/rateLimit.ts.
+
+Reproduces `rateLimit()` exactly — fixed window started by the first hit,
+counter incremented before the check, lockout set on the first hit over the
+limit, `||` defaults (so every caller without `lockoutMs` still gets the
+15-minute lockout) and the 5-minute cleanup sweep — so scripts can stand in
+for, or simulate, the app's limiter. Time is passed in explicitly (ms).
+
+Used by loadtest_upload.py (local stub server) and ratelimit_sim.py.
+"""
+
+import math
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_WINDOW_MS = 60 * 1000
+DEFAULT_LOCKOUT_MS = 15 * 60 * 1000
+CLEANUP_INTERVAL_MS = 5 * 60 * 1000
+CLEANUP_GRACE_MS = 60 * 60 * 1000
+
+# Limits passed by the route handlers (docs/06 §7.1). None = option omitted,
+# which falls back to the default exactly as `options.x || default` does.
+LIMITS = {
+    "pin-attempt": {"max_attempts": 5, "window_ms": 60 * 1000,
+                    "lockout_ms": 15 * 60 * 1000},
+    "admin-auth-fail": {"max_attempts": 3, "window_ms": 60 * 1000,
+                        "lockout_ms": 30 * 60 * 1000},
+    "pin-creation": {"max_attempts": 20, "window_ms": 60 * 1000,
+                     "lockout_ms": None},
+    "upload": {"max_attempts": 50, "window_ms": 60 * 60 * 1000,
+               "lockout_ms": None},
+    "bulk": {"max_attempts": 10, "window_ms": 60 * 1000,
+             "lockout_ms": None},
+}
+
+
+class RateLimitResult:
+    __slots__ = ("allowed", "remaining", "retry_after")
+
+    def __init__(self, allowed, remaining, retry_after=None):
+        self.allowed = allowed
+        self.remaining = remaining
+        self.retry_after = retry_after  # seconds, as in the Retry-After header
+
+
+class RateLimiter:
+    """One process's limiter store (one App Service instance)."""
+
+    def __init__(self):
+        # key -> [count, reset_time, lockout_until or None]
+        self.store = {}
+        self._next_cleanup = None
+
+    def hit(self, key, now_ms, max_attempts=None, window_ms=None,
+            lockout_ms=None):
+        """Count one attempt for ``key`` at ``now_ms``, like rateLimit()."""
+        max_attempts = max_attempts or DEFAULT_MAX_ATTEMPTS
+        window_ms = window_ms or DEFAULT_WINDOW_MS
+        lockout_ms = lockout_ms or DEFAULT_LOCKOUT_MS
+
+        self._maybe_cleanup(now_ms)
+        entry = self.store.get(key)
+
+        # Reset if window expired
+        if entry is None or now_ms > entry[1]:
+            entry = [0, now_ms + window_ms, None]
+            self.store[key] = entry
+
+        # Check if locked out
+        if entry[2] is not None and now_ms < entry[2]:
+            return RateLimitResult(False, 0,
+                                   math.ceil((entry[2] - now_ms) / 1000))
+
+        entry[0] += 1
+        entry[2] = None
+
+        if entry[0] > max_attempts:
+            entry[2] = now_ms + lockout_ms
+            return RateLimitResult(False, 0, math.ceil(lockout_ms / 1000))
+
+        return RateLimitResult(True, max(0, max_attempts - entry[0]))
+
+    def hit_limit(self, kind, ident, now_ms):
+        """``hit`` using the route's options for key ``{kind}:{ident}``."""
+        return self.hit(f"{kind}:{ident}", now_ms, **LIMITS[kind])
+
+    def clear(self, key):
+        self.store.pop(key, None)
+
+    def _maybe_cleanup(self, now_ms):
+        # setInterval(..., 5 min): drop entries an hour past their window
+        if self._next_cleanup is None:
+            self._next_cleanup = now_ms + CLEANUP_INTERVAL_MS
+            return
+        while now_ms >= self._next_cleanup:
+            tick = self._next_cleanup
+            for key in [k for k, e in self.store.items()
+                        if tick > e[1] + CLEANUP_GRACE_MS]:
+                del self.store[key]
+            self._next_cleanup += CLEANUP_INTERVAL_MS
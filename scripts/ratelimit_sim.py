@@ -0,0 +1,482 @@
+"""
+Discrete-event simulation of the in-memory rate limiter when scaled out.
+
+lib/rateLimit.ts keeps its counters in a per-process Map, so with N App
+Service instances each request only counts against the instance the load
+balancer sends it to. This replays a workload through N copies of
+ratelimit_model.RateLimiter (the limiter's exact window, lockout and
+cleanup semantics) under each routing policy:
+
+  round-robin   requests spread evenly, no stickiness
+  random        uniformly random instance per request
+  arr-affinity  App Service's ARR cookie: each device sticks to an instance
+  ip-hash       client IP hashed to an instance
+  shared-store  one store for all instances (what Redis would give)
+
+Two kinds of harm are counted. A *false lockout* is a 429 that a device
+would not have received had the limit been applied to its own traffic
+(a per-device limiter runs alongside as the oracle) — the shared-NAT
+field team problem. *Leakage* is the extra PIN guesses an attacker gets
+from one IP because each instance keeps its own budget.
+
+The workload is either a synthetic surge — field teams arriving as a
+Poisson process, several teams behind each NAT address, each validating
+its PIN and then uploading photos one at a time; on a 429 the upload page
+stops the batch and the team retries later — optionally with a PIN
+brute-force client, or a --trace JSONL written by loadtest_upload.py,
+replayed open loop at its recorded times. Results go into a DOCX with
+tables and charts.
+
+Run:  python scripts/ratelimit_sim.py [--teams 300] [--nat-size 10] [--instances 1,2,3,5,8]
+      python scripts/ratelimit_sim.py --trace loadtest_trace.jsonl
+Requires: pip install numpy pillow python-docx
+"""
+
+import argparse
+import heapq
+import json
+import random
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from docx.shared import Pt
+
+from charts import line_chart_png
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_image, add_para, setup_doc, styled_table,
+)
+from ratelimit_model import LIMITS, RateLimiter
+
+OUT = DOCS / "ASPR_Photos_Rate_Limit_Simulation.docx"
+
+POLICIES = ["round-robin", "random", "arr-affinity", "ip-hash",
+            "shared-store"]
+DEFAULT_INSTANCES = [1, 2, 3, 5, 8]
+# loadtest_upload.py endpoint names → limiter key prefix
+ENDPOINT_KINDS = {"validate-pin": "pin-attempt", "upload": "upload"}
+
+MINUTE_MS = 60 * 1000
+PIN_MS = 400                   # validate-pin round trip from the field
+PIN_RETRY_MS = 20 * 1000       # user re-enters the PIN when no Retry-After
+ATTACKER_IP = "203.0.113.66"
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  CLUSTER
+# ══════════════════════════════════════════════════════════════════════
+
+class Cluster:
+    """N limiter stores behind a load-balancer routing policy."""
+
+    def __init__(self, instances, policy, seed=0):
+        self.policy = policy
+        self.n = 1 if policy == "shared-store" else instances
+        self.limiters = [RateLimiter() for _ in range(self.n)]
+        self.rng = random.Random(seed)
+        self.next = 0
+        self.per_instance = Counter()
+
+    def route(self, device, ip):
+        if self.n == 1:
+            return 0
+        if self.policy == "round-robin":
+            self.next = (self.next + 1) % self.n
+            return self.next
+        if self.policy == "random":
+            return self.rng.randrange(self.n)
+        if self.policy == "arr-affinity" and device is None:
+            # A client that drops the ARRAffinity cookie is not pinned
+            self.next = (self.next + 1) % self.n
+            return self.next
+        key = device if self.policy == "arr-affinity" else ip
+        return zlib.crc32(str(key).encode()) % self.n
+
+    def hit(self, kind, device, ip, now_ms):
+        instance = self.route(device, ip)
+        self.per_instance[instance] += 1
+        # The routes key on X-Forwarded-For, or 'unknown' without one
+        return self.limiters[instance].hit_limit(kind, ip or "unknown", now_ms)
+
+
+class Tally:
+    """Counters for one (policy, instances) run."""
+
+    def __init__(self):
+        self.requests = Counter()        # kind -> requests
+        self.allowed = Counter()
+        self.limited = Counter()
+        self.false_limited = Counter()
+        self.devices_hit = set()
+        self.attacker_allowed = 0
+        self.attacker_requests = 0
+        self.photos = 0
+        self.first_ms = None
+        self.last_upload_ms = 0
+        self.completion_ms = []
+        self.teams_done = 0
+        self.teams_gave_up = 0
+        self.last_seen = {}              # device -> last request time
+        self.instance_load = Counter()
+
+    def record(self, kind, device, allowed, oracle_allowed, now_ms):
+        if self.first_ms is None:
+            self.first_ms = now_ms
+        self.requests[kind] += 1
+        if allowed:
+            self.allowed[kind] += 1
+            return
+        self.limited[kind] += 1
+        if oracle_allowed:
+            self.false_limited[kind] += 1
+            self.devices_hit.add(device)
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  WORKLOADS
+# ══════════════════════════════════════════════════════════════════════
+
+def synthetic_teams(args, rng):
+    """``[(device, ip, start_ms, photos)]`` for a surge of field teams."""
+    teams = []
+    t = 0.0
+    for device in range(args.teams):
+        t += rng.exponential(MINUTE_MS / args.arrivals_per_min)
+        ip = f"10.20.{device // args.nat_size >> 8 & 255}." \
+             f"{device // args.nat_size & 255}"
+        photos = max(1, int(rng.poisson(args.photos_per_team)))
+        teams.append((device, ip, t, photos))
+    return teams
+
+
+def field_team(device, ip, start_ms, photos, args, rng):
+    """One device's requests as a generator.
+
+    Yields ``(at_ms, kind)``; is sent back ``(allowed, retry_after_s)``.
+    Mirrors app/page.tsx: PIN first, then photos one by one, stopping the
+    batch at the first failure; the user retries the rest after a pause.
+    """
+    t = start_ms
+    for _ in range(args.max_retries + 1):
+        allowed, retry_after = yield t, "pin-attempt"
+        t += PIN_MS
+        if allowed:
+            break
+        t += retry_after * 1000 if retry_after else PIN_RETRY_MS
+    else:
+        return "gave up"
+
+    sent = 0
+    retries = 0
+    while sent < photos:
+        allowed, _ = yield t, "upload"
+        t += rng.lognormal(np.log(args.upload_s * 1000), 0.4)
+        if allowed:
+            sent += 1
+            continue
+        retries += 1
+        if retries > args.max_retries:
+            return "gave up"
+        t += args.retry_min * MINUTE_MS
+    return "done"
+
+
+def brute_force(args):
+    """PIN guesses from one address at a fixed rate, ignoring 429s."""
+    interval = 1000 / args.attacker_rps
+    t = args.attacker_start_min * MINUTE_MS
+    end = t + args.attacker_minutes * MINUTE_MS
+    while t < end:
+        yield t, "pin-attempt"
+        t += interval
+
+
+def simulate_synthetic(teams, args, instances, policy, seed):
+    cluster = Cluster(instances, policy, seed)
+    oracle = RateLimiter()
+    tally = Tally()
+    queue, seq = [], 0
+
+    def advance(gen, reply, device, ip, start):
+        nonlocal seq
+        try:
+            at, kind = gen.send(reply) if reply is not None else next(gen)
+        except StopIteration as stop:
+            if device != ATTACKER_IP:
+                if stop.value == "done":
+                    tally.teams_done += 1
+                    tally.completion_ms.append(tally.last_seen[device] - start)
+                else:
+                    tally.teams_gave_up += 1
+            return
+        seq += 1
+        heapq.heappush(queue, (at, seq, gen, kind, device, ip, start))
+
+    for device, ip, start, photos in teams:
+        # Per-device streams keep runs comparable across policies
+        rng = np.random.default_rng([seed, device])
+        advance(field_team(device, ip, start, photos, args, rng), None,
+                device, ip, start)
+    if args.attacker_rps:
+        advance(brute_force(args), None, ATTACKER_IP, ATTACKER_IP, 0)
+
+    while queue:
+        at, _, gen, kind, device, ip, start = heapq.heappop(queue)
+        if device == ATTACKER_IP:
+            result = cluster.hit(kind, None, ip, at)
+            tally.attacker_requests += 1
+            tally.attacker_allowed += result.allowed
+            advance(gen, (result.allowed, result.retry_after), device, ip,
+                    start)
+            continue
+        result = cluster.hit(kind, device, ip, at)
+        truth = oracle.hit_limit(kind, f"device-{device}", at)
+        tally.record(kind, device, result.allowed, truth.allowed, at)
+        if result.allowed and kind == "upload":
+            tally.photos += 1
+            tally.last_upload_ms = max(tally.last_upload_ms, at)
+        tally.last_seen[device] = at
+        advance(gen, (result.allowed, result.retry_after), device, ip, start)
+    tally.instance_load = cluster.per_instance
+    return tally
+
+
+def read_trace(path):
+    """``[(t_ms, device, kind, ip)]`` from a loadtest_upload.py --trace."""
+    requests = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                r = json.loads(line)
+                kind = ENDPOINT_KINDS.get(r["endpoint"])
+                if kind:
+                    requests.append((float(r["t_ms"]), r["team"], kind,
+                                     r.get("ip")))
+    return sorted(requests)
+
+
+def simulate_trace(requests, instances, policy, seed):
+    """Open-loop replay: every traced request is sent at its time."""
+    cluster = Cluster(instances, policy, seed)
+    oracle = RateLimiter()
+    tally = Tally()
+    for at, device, kind, ip in requests:
+        result = cluster.hit(kind, device, ip, at)
+        truth = oracle.hit_limit(kind, f"device-{device}", at)
+        tally.record(kind, device, result.allowed, truth.allowed, at)
+        if result.allowed and kind == "upload":
+            tally.photos += 1
+            tally.last_upload_ms = max(tally.last_upload_ms, at)
+    tally.instance_load = cluster.per_instance
+    return tally
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  RESULTS
+# ══════════════════════════════════════════════════════════════════════
+
+def summarize(tally, devices, attacker_minutes=0):
+    span_min = max((tally.last_upload_ms - (tally.first_ms or 0)) / MINUTE_MS,
+                   1e-9)
+    completion = np.asarray(tally.completion_ms) / MINUTE_MS
+    total = sum(tally.requests.values())
+    return {
+        "requests": total,
+        "limited": sum(tally.limited.values()),
+        "false_limited": sum(tally.false_limited.values()),
+        "false_pin": tally.false_limited["pin-attempt"],
+        "false_upload": tally.false_limited["upload"],
+        "devices_hit": len(tally.devices_hit),
+        "devices_hit_pct": 100 * len(tally.devices_hit) / max(devices, 1),
+        "photos": tally.photos,
+        "photos_per_min": tally.photos / span_min if tally.photos else 0.0,
+        "teams_done": tally.teams_done,
+        "teams_gave_up": tally.teams_gave_up,
+        "p95_completion_min": float(np.percentile(completion, 95))
+        if len(completion) else 0.0,
+        "attacker_allowed": tally.attacker_allowed,
+        "attacker_per_hour": tally.attacker_allowed * 60 / attacker_minutes
+        if attacker_minutes else 0.0,
+        "max_instance_share": 100 * max(tally.instance_load.values())
+        / max(sum(tally.instance_load.values()), 1),
+    }
+
+
+def sweep(args):
+    """``{(policy, instances): summary}`` over the whole grid."""
+    results = {}
+    if args.trace:
+        requests = read_trace(args.trace)
+        devices = len({r[1] for r in requests})
+        print(f"  Trace: {len(requests):,} requests from {devices:,} devices")
+    else:
+        teams = synthetic_teams(args, np.random.default_rng(args.seed))
+        devices = len(teams)
+        print(f"  Synthetic surge: {devices:,} teams, "
+              f"{len({t[1] for t in teams}):,} NAT addresses, "
+              f"{sum(t[3] for t in teams):,} photos")
+    for policy in args.policies:
+        for n in args.instances:
+            if policy == "shared-store" and n != args.instances[0]:
+                # One store regardless of N; reuse the first run
+                results[policy, n] = results[policy, args.instances[0]]
+                continue
+            if args.trace:
+                tally = simulate_trace(requests, n, policy, args.seed)
+                results[policy, n] = summarize(tally, devices)
+            else:
+                tally = simulate_synthetic(teams, args, n, policy, args.seed)
+                results[policy, n] = summarize(
+                    tally, devices,
+                    args.attacker_minutes if args.attacker_rps else 0)
+            r = results[policy, n]
+            print(f"  {policy:<13} N={n:<2} false 429s {r['false_limited']:>6,}"
+                  f"  devices hit {r['devices_hit_pct']:5.1f}%"
+                  f"  photos/min {r['photos_per_min']:7.1f}"
+                  + (f"  attacker {r['attacker_per_hour']:6.0f}/h"
+                     if args.attacker_rps else ""))
+    return results
+
+
+def intended_attacker_rate():
+    """PIN guesses per hour the 15-minute lockout is meant to allow."""
+    limit = LIMITS["pin-attempt"]
+    return limit["max_attempts"] * 60 * MINUTE_MS / limit["lockout_ms"]
+
+
+def write_report(results, args, out_path=OUT):
+    source = (f"trace {Path(args.trace).name}" if args.trace else
+              f"{args.teams:,} teams, {args.nat_size} per NAT address")
+    doc = setup_doc("Rate Limiter Scale-Out Simulation", source)
+
+    add_heading_styled(doc, "1. Scenario", level=2)
+    add_para(doc, "Each App Service instance keeps its own lib/rateLimit.ts "
+                  "store. A false 429 is one the device would not have got "
+                  "if the limit applied to its own traffic only; leakage is "
+                  "how many PIN guesses one address gets per hour.",
+             size=Pt(9))
+    config = [["Limits", "; ".join(
+        f"{kind}: {LIMITS[kind]['max_attempts']} per "
+        f"{LIMITS[kind]['window_ms'] // MINUTE_MS} min"
+        for kind in ENDPOINT_KINDS.values())]]
+    if args.trace:
+        config.append(["Workload", f"open-loop replay of {args.trace}"])
+    else:
+        config += [
+            ["Field teams", f"{args.teams:,} arriving at "
+                            f"{args.arrivals_per_min:g}/min"],
+            ["NAT sharing", f"{args.nat_size} teams per public IP"],
+            ["Photos per team", f"Poisson, mean {args.photos_per_team:g}; "
+                                f"{args.upload_s:g} s per upload"],
+            ["After a 429", f"retry after {args.retry_min:g} min, "
+                            f"at most {args.max_retries} times"],
+        ]
+        if args.attacker_rps:
+            config.append(["PIN brute force", f"{args.attacker_rps:g} req/s "
+                                              f"for {args.attacker_minutes:g}"
+                                              f" min from one IP"])
+    styled_table(doc, ["Setting", "Value"], config, col_widths=[30, 70])
+
+    add_heading_styled(doc, "2. Results", level=2)
+    headers = ["Policy", "N", "False 429s", "Devices Hit", "Photos/min"]
+    widths = [20, 8, 16, 16, 16]
+    if not args.trace:
+        headers += ["Gave Up"]
+        widths += [12]
+    if args.attacker_rps:
+        headers += ["PIN Guesses/h"]
+        widths += [14]
+    rows = []
+    for policy in args.policies:
+        for n in args.instances:
+            r = results[policy, n]
+            row = [policy, f"{n}", f"{r['false_limited']:,} "
+                   f"({r['false_pin']:,} PIN)",
+                   f"{r['devices_hit']:,} ({r['devices_hit_pct']:.1f}%)",
+                   f"{r['photos_per_min']:,.1f}"]
+            if not args.trace:
+                row.append(f"{r['teams_gave_up']:,}")
+            if args.attacker_rps:
+                row.append(f"{r['attacker_per_hour']:,.0f}")
+            rows.append(row)
+    styled_table(doc, headers, rows, col_widths=widths)
+    if args.attacker_rps:
+        single = results[args.policies[0], min(args.instances)]
+        if single["attacker_per_hour"] > 2 * intended_attacker_rate():
+            add_para(doc, "Even with one store an address gets "
+                          f"{single['attacker_per_hour']:,.0f} guesses per "
+                          f"hour, not the {intended_attacker_rate():,.0f} the "
+                          "15-minute lockout implies: once the 1-minute window "
+                          "expires, rateLimit() replaces the entry and its "
+                          "lockoutUntil with a fresh one.", size=Pt(9))
+
+    add_heading_styled(doc, "3. Charts", level=2)
+    charts = [("false_limited", "False 429s by instance count", "False 429s"),
+              ("photos_per_min", "Effective upload throughput",
+               "Photos per minute")]
+    if args.attacker_rps:
+        charts.append(("attacker_per_hour", "PIN guesses per hour from one IP",
+                       "Allowed guesses / hour"))
+    for key, title, y_label in charts:
+        series = [(policy, args.instances,
+                   [results[policy, n][key] for n in args.instances])
+                  for policy in args.policies]
+        add_image(doc, line_chart_png(series, title, "Instances", y_label,
+                                      y_min=0), alt=title)
+
+    out_path = Path(out_path)
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate the in-memory rate limiter across instances")
+    parser.add_argument("--trace", help="loadtest_upload.py --trace JSONL to "
+                                        "replay instead of a synthetic surge")
+    parser.add_argument("--instances", default=",".join(
+        map(str, DEFAULT_INSTANCES)), help="comma-separated instance counts")
+    parser.add_argument("--policies", default=",".join(POLICIES),
+                        help="comma-separated routing policies")
+    parser.add_argument("--teams", type=int, default=300)
+    parser.add_argument("--arrivals-per-min", type=float, default=10.0)
+    parser.add_argument("--nat-size", type=int, default=10,
+                        help="teams sharing one public IP")
+    parser.add_argument("--photos-per-team", type=float, default=12.0)
+    parser.add_argument("--upload-s", type=float, default=8.0,
+                        help="median seconds per photo upload")
+    parser.add_argument("--retry-min", type=float, default=5.0,
+                        help="minutes before a team retries after a 429")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--attacker-rps", type=float, default=0.0,
+                        help="add a PIN brute-force client at this rate")
+    parser.add_argument("--attacker-start-min", type=float, default=0.0)
+    parser.add_argument("--attacker-minutes", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the results here")
+    parser.add_argument("--out", default=str(OUT), help="output DOCX path")
+    args = parser.parse_args()
+
+    args.instances = sorted({int(n) for n in args.instances.split(",")})
+    args.policies = [p.strip() for p in args.policies.split(",")]
+    unknown = set(args.policies) - set(POLICIES)
+    if unknown:
+        parser.error(f"unknown policies: {', '.join(sorted(unknown))}")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Rate Limiter Simulation")
+    print("=" * 60)
+    results = sweep(args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({f"{p}/{n}": r for (p, n), r in results.items()}, f,
+                      indent=2)
+        print(f"  [OK] {args.json}")
+    write_report(results, args, args.out)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+"""
+Local render service for on-demand branded DOCX reports.
+
+Every `generate_all_docx.py --report ...` run pays interpreter start-up,
+the python-docx/NumPy imports and `setup_doc` before it writes a line.
+This keeps that work warm in a long-running process so an "Export
+report" click can be answered in well under a second:
+
+  workers   a process pool whose initializer imports every REPORTS module
+            once; `setup_doc` is swapped for a cache of the saved branded
+            cover/header/TOC package per (title, subtitle), reloaded per
+            job instead of rebuilt
+  markdown  docs/*.md (DOCUMENTS) are parsed once per file version and
+            their down-sampled images are kept for the worker's lifetime
+  queue     jobs go through a bounded queue; when it is full the request
+            gets 503 with Retry-After instead of piling up
+  results   identical requests (same report, same input file contents by
+            path/size/mtime) are served from an in-memory LRU, and a
+            request for a render already in flight waits for that render;
+            reports without an input (schema, coverage, capacity) are
+            keyed on the route sources and docs they read instead, plus
+            the date for capacity, whose horizon starts next month
+
+HTTP, bound to 127.0.0.1:
+
+  GET  /health                     queue depth, workers, cache stats
+  GET  /reports                    available reports and documents
+  POST /render {"report": "audit", "input": "exports/audit.csv"}
+  POST /render {"document": "05_User_Guide.md"}
+
+`/render` answers with the DOCX itself; X-Render-Cache says whether it
+was a hit, a new render or joined one in flight. Inputs must be inside
+--data-dir.
+
+Run:  python scripts/render_service.py [--port 8765] [--workers 2] [--data-dir .]
+Requires: pip install aiohttp numpy pillow python-docx
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from aiohttp import web
+
+import generate_all_docx
+from generate_all_docx import (
+    DOCS, DOCUMENTS, REPORTS, ROOT, ImagePrefetcher, md_content_lines,
+    parse_md_blocks, render_block,
+)
+
+DEFAULT_PORT = 8765
+QUEUE_SIZE = 16
+TEMPLATE_CACHE = 32                # branded templates kept per worker
+RESULT_CACHE_BYTES = 256 * 1024 * 1024
+RENDER_TIMEOUT_S = 300
+RETRY_AFTER_S = 5
+POOL_ATTEMPTS = 2                  # a job caught in a worker crash is rerun once
+DOCX_TYPE = ("application/vnd.openxmlformats-officedocument."
+             "wordprocessingml.document")
+# Read by the input-less reports: route handlers and lib/ (schema,
+# coverage), the migrate route, and the markdown references in docs/
+SOURCE_DIRS = [ROOT / "app", ROOT / "lib"]
+SOURCE_SUFFIXES = {".ts", ".tsx"}
+DATED_REPORTS = {"capacity"}       # output depends on today's date
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  WARM WORKER (worker process)
+# ══════════════════════════════════════════════════════════════════════
+
+_setup_doc = generate_all_docx.setup_doc
+_templates = OrderedDict()
+_markdown = {}
+_images = None
+
+
+def cached_setup_doc(doc_title, doc_subtitle, version="1.0",
+                     date="February 7, 2026", status="Draft"):
+    """`setup_doc` from a saved copy of the same branded template."""
+    from docx import Document
+
+    key = (doc_title, doc_subtitle, version, date, status)
+    data = _templates.get(key)
+    if data is None:
+        out = io.BytesIO()
+        _setup_doc(*key).save(out)
+        data = _templates[key] = out.getvalue()
+        if len(_templates) > TEMPLATE_CACHE:
+            _templates.popitem(last=False)
+    else:
+        _templates.move_to_end(key)
+    return Document(io.BytesIO(data))
+
+
+def warm_worker():
+    """Import every report module and install the template cache."""
+    global _images
+    for module_name, _ in REPORTS.values():
+        importlib.import_module(module_name)
+    for module in list(sys.modules.values()):
+        if getattr(module, "setup_doc", None) is _setup_doc:
+            module.setup_doc = cached_setup_doc
+    _images = ImagePrefetcher()
+    cached_setup_doc("ASPR Photo Repository", "")
+
+
+def markdown_blocks(md_path):
+    """Parsed blocks of a docs/ markdown file, re-parsed when it changes."""
+    mtime = md_path.stat().st_mtime_ns
+    cached = _markdown.get(md_path)
+    if cached is None or cached[0] != mtime:
+        lines = md_content_lines(md_path.read_text(encoding="utf-8"))
+        cached = _markdown[md_path] = (mtime, list(parse_md_blocks(lines)))
+    return cached[1]
+
+
+def render_job(job):
+    """Render one job; returns ``(filename, docx_bytes, render_ms)``."""
+    t0 = time.perf_counter()
+    if job["kind"] == "document":
+        doc_def = next(d for d in DOCUMENTS if d["md"] == job["name"])
+        doc = generate_all_docx.setup_doc(doc_def["title"],
+                                          doc_def["subtitle"])
+        for block in markdown_blocks(DOCS / doc_def["md"]):
+            render_block(doc, block, _images)
+        out = io.BytesIO()
+        doc.save(out)
+        return doc_def["out"], out.getvalue(), (time.perf_counter() - t0) * 1e3
+
+    module_name, builder = REPORTS[job["name"]]
+    module = sys.modules[module_name]
+    with tempfile.TemporaryDirectory(prefix="aspr_render_") as tmp:
+        out_path = Path(tmp) / module.OUT.name
+        getattr(module, builder)(job["input"], out_path)
+        data = out_path.read_bytes()
+    return module.OUT.name, data, (time.perf_counter() - t0) * 1e3
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SERVICE
+# ══════════════════════════════════════════════════════════════════════
+
+def sources_version():
+    """Size/mtime fingerprint of the files the input-less reports read."""
+    h = hashlib.sha256()
+    paths = [p for base in SOURCE_DIRS for p in base.rglob("*")
+             if p.suffix in SOURCE_SUFFIXES]
+    paths += DOCS.glob("*.md")
+    for path in sorted(paths):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        h.update(f"{path.relative_to(ROOT)}\0{st.st_size}\0"
+                 f"{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RenderService:
+    """Bounded job queue in front of the warm worker pool."""
+
+    def __init__(self, workers, data_dir, queue_size=QUEUE_SIZE,
+                 cache_bytes=RESULT_CACHE_BYTES):
+        self.workers = workers
+        self.data_dir = Path(data_dir).resolve()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.cache_bytes = cache_bytes
+        self.cache = OrderedDict()       # key -> (filename, data)
+        self.cached_bytes = 0
+        self.in_flight = {}              # key -> asyncio.Future
+        self.stats = {"renders": 0, "hits": 0, "joined": 0, "rejected": 0,
+                      "errors": 0}
+        self.pool = None
+        self.dispatchers = []
+        self._pool_lock = asyncio.Lock()
+
+    async def start_pool(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        initializer=warm_worker)
+        loop = asyncio.get_running_loop()
+        # Spin every worker up now, so the first request is already warm
+        await asyncio.gather(*(loop.run_in_executor(self.pool, time.sleep, 0)
+                               for _ in range(self.workers)))
+
+    async def replace_pool(self, broken):
+        """Swap out ``broken`` once, however many dispatchers saw it fail."""
+        async with self._pool_lock:
+            if self.pool is not broken:
+                return                   # another dispatcher already did it
+            print("  [!] Render worker died; restarting the worker pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            await self.start_pool()
+
+    async def start(self):
+        await self.start_pool()
+        self.dispatchers = [asyncio.create_task(self.dispatch())
+                            for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self.dispatchers:
+            task.cancel()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def make_job(self, body):
+        """Validate a /render body into a job and its cache key."""
+        if not isinstance(body, dict):
+            raise RequestError(400, "body must be a JSON object")
+        if "document" in body:
+            name = str(body["document"])
+            if not any(d["md"] == name for d in DOCUMENTS):
+                raise RequestError(404, f"unknown document: {name}")
+            version = (DOCS / name).stat().st_mtime_ns
+            job = {"kind": "document", "name": name, "input": None}
+        else:
+            name = str(body.get("report", ""))
+            if name not in REPORTS:
+                raise RequestError(404, f"unknown report: {name or '(none)'}")
+            job = {"kind": "report", "name": name, "input": None}
+            version = sources_version()
+            if body.get("input"):
+                path = (self.data_dir / str(body["input"])).resolve()
+                if not path.is_relative_to(self.data_dir):
+                    raise RequestError(403, "input must be inside the data "
+                                            "directory")
+                if not path.is_file():
+                    raise RequestError(404, f"input not found: {body['input']}")
+                st = path.stat()
+                job["input"] = str(path)
+                version = (st.st_size, st.st_mtime_ns)
+            if name in DATED_REPORTS:
+                version = [version, date.today().isoformat()]
+        key = hashlib.sha256(json.dumps(
+            [job["kind"], job["name"], job["input"], version]).encode()
+        ).hexdigest()
+        return job, key
+
+    def remember(self, key, result):
+        filename, data = result
+        if len(data) > self.cache_bytes:
+            return
+        self.cache[key] = result
+        self.cached_bytes += len(data)
+        while self.cached_bytes > self.cache_bytes:
+            _, (_, old) = self.cache.popitem(last=False)
+            self.cached_bytes -= len(old)
+
+    async def render(self, job, key):
+        """``(filename, data, how)``; ``how`` is hit, miss or joined."""
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return (*self.cache[key], "hit")
+        if key in self.in_flight:
+            self.stats["joined"] += 1
+            filename, data = await asyncio.shield(self.in_flight[key])
+            return filename, data, "joined"
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((job, key, future))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise RequestError(503, "render queue is full") from None
+        self.in_flight[key] = future
+        try:
+            filename, data = await asyncio.wait_for(asyncio.shield(future),
+                                                    RENDER_TIMEOUT_S)
+        finally:
+            if future.done():
+                self.in_flight.pop(key, None)
+        return filename, data, "miss"
+
+    async def dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job, key, future = await self.queue.get()
+            try:
+                # A crash fails every job on the pool, not just the one
+                # that caused it, so each is rerun once on the new pool
+                for attempt in range(1, POOL_ATTEMPTS + 1):
+                    async with self._pool_lock:
+                        pool = self.pool
+                    try:
+                        filename, data, ms = await loop.run_in_executor(
+                            pool, render_job, job)
+                        break
+                    except BrokenProcessPool:
+                        await self.replace_pool(pool)
+                        if attempt == POOL_ATTEMPTS:
+                            raise
+            except BrokenProcessPool:
+                self.stats["errors"] += 1
+                future.set_exception(RequestError(500, "render worker died"))
+            except Exception as e:        # report builders raise anything
+                self.stats["errors"] += 1
+                future.set_exception(RequestError(
+                    500, f"{job['name']}: {type(e).__name__}: {e}"))
+            else:
+                self.stats["renders"] += 1
+                self.remember(key, (filename, data))
+                future.set_result((filename, data))
+                print(f"  [OK] {job['name']} rendered in {ms:,.0f} ms "
+                      f"({len(data) / 1024:,.1f} KB)")
+            finally:
+                self.in_flight.pop(key, None)
+                self.queue.task_done()
+
+
+def make_app(service):
+    async def health(request):
+        return web.json_response({
+            "status": "ok", "workers": service.workers,
+            "queued": service.queue.qsize(),
+            "queue_size": service.queue.maxsize,
+            "in_flight": len(service.in_flight),
+            "cached": len(service.cache),
+            "cached_mb": round(service.cached_bytes / 1048576, 1),
+            **service.stats,
+        })
+
+    async def reports(request):
+        return web.json_response({
+            "reports": sorted(REPORTS),
+            "documents": [d["md"] for d in DOCUMENTS
+                          if (DOCS / d["md"]).exists()],
+        })
+
+    async def render(request):
+        t0 = time.perf_counter()
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"error": "invalid JSON"}, status=400)
+        try:
+            job, key = service.make_job(body)
+            filename, data, how = await service.render(job, key)
+        except RequestError as e:
+            headers = {"Retry-After": str(RETRY_AFTER_S)} \
+                if e.status == 503 else None
+            return web.json_response({"error": str(e)}, status=e.status,
+                                     headers=headers)
+        except asyncio.TimeoutError:
+            return web.json_response({"error": "render timed out"},
+                                     status=504)
+        return web.Response(body=data, content_type=DOCX_TYPE, headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Render-Cache": how,
+            "X-Render-Ms": f"{(time.perf_counter() - t0) * 1000:.0f}",
+        })
+
+    async def on_startup(app):
+        await service.start()
+
+    async def on_cleanup(app):
+        await service.stop()
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_get("/reports", reports)
+    app.router.add_post("/render", render)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve branded DOCX reports from warm workers")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int,
+                        default=min(2, os.cpu_count() or 1),
+                        help="render worker processes")
+    parser.add_argument("--queue", type=int, default=QUEUE_SIZE,
+                        help="jobs that may wait for a worker")
+    parser.add_argument("--cache-mb", type=int,
+                        default=RESULT_CACHE_BYTES // 1048576,
+                        help="memory for cached results")
+    parser.add_argument("--data-dir", default=str(ROOT),
+                        help="inputs must be inside this directory")
+    args = parser.parse_args()
+
+    if not Path(args.data_dir).is_dir():
+        parser.error(f"{args.data_dir} is not a directory")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Render Service")
+    print("=" * 60)
+    print(f"  http://127.0.0.1:{args.port}  ({args.workers} workers, "
+          f"queue {args.queue}, data dir {Path(args.data_dir).resolve()})")
+    service = RenderService(args.workers, args.data_dir, args.queue,
+                            args.cache_mb * 1048576)
+    web.run_app(make_app(service), host="127.0.0.1", port=args.port,
+                print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Bytes-versus-quality sweep for the rendition encodings.
+
+Renditions are encoded as WebP at the qualities in RENDITIONS (75/80/85
+for thumb_sm, thumb_md and web) with sharp's default lanczos3 resize;
+those bytes are most of what the gallery and the CDN move. This takes a
+sample of originals and, for every rendition size, re-encodes it across
+formats (WebP, and AVIF when Pillow has it), quality levels and resize
+filters, on a process pool.
+
+Each encode is decoded again and scored against a lanczos resize of the
+full-resolution original: PSNR and SSIM (11x11 Gaussian window, on luma)
+are computed with vectorized NumPy. Settings are averaged over the
+sample, and the report lists the Pareto-optimal ones per rendition —
+those no other setting beats on both mean bytes and mean SSIM — next to
+the current setting and the smallest setting that is at least as good.
+
+Sources are `{photo_id}/original` blobs in a local blob mirror or
+JPEG/TIFF files directly under the directory (see exif_extract.py).
+
+Run:  python scripts/rendition_quality_sweep.py SAMPLE_DIR [--sample 200]
+Requires: pip install numpy pillow python-docx
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, features
+from docx.shared import Pt
+
+from backfill_renditions import RENDITIONS, encode_webp, resize_like_sharp
+from charts import line_chart_png
+from exif_extract import iter_sources
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_image, add_para, setup_doc, styled_table,
+)
+
+OUT = DOCS / "ASPR_Photos_Rendition_Encoding_Sweep.docx"
+
+QUALITIES = [40, 50, 60, 70, 75, 80, 85, 90, 95]
+FILTERS = {
+    "lanczos": Image.LANCZOS,        # sharp default (lanczos3)
+    "bicubic": Image.BICUBIC,
+    "bilinear": Image.BILINEAR,
+}
+CURRENT_FORMAT = "webp"
+CURRENT_FILTER = "lanczos"
+AVIF_SPEED = 6                       # libavif default; 0 slowest/best
+SSIM_WINDOW = 11
+SSIM_SIGMA = 1.5
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+PSNR_CAP = 100.0
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  METRICS
+# ══════════════════════════════════════════════════════════════════════
+
+def gaussian_window(size=SSIM_WINDOW, sigma=SSIM_SIGMA):
+    x = np.arange(size) - (size - 1) / 2
+    w = np.exp(-x ** 2 / (2 * sigma ** 2))
+    return w / w.sum()
+
+
+def blur(x, w):
+    """Separable 'valid' convolution of a 2-D array with the 1-D kernel."""
+    n = len(w)
+    rows = sum(w[k] * x[k:x.shape[0] - n + 1 + k] for k in range(n))
+    return sum(w[k] * rows[:, k:rows.shape[1] - n + 1 + k] for k in range(n))
+
+
+def luma(img):
+    return np.asarray(img.convert("L"), dtype=np.float32)
+
+
+def ssim(a, b, w=None):
+    """Mean SSIM of two equally sized luma arrays."""
+    if min(a.shape) < SSIM_WINDOW:
+        return 1.0 if np.array_equal(a, b) else float("nan")
+    w = gaussian_window() if w is None else w
+    mu_a, mu_b = blur(a, w), blur(b, w)
+    var_a = blur(a * a, w) - mu_a ** 2
+    var_b = blur(b * b, w) - mu_b ** 2
+    cov = blur(a * b, w) - mu_a * mu_b
+    num = (2 * mu_a * mu_b + SSIM_C1) * (2 * cov + SSIM_C2)
+    den = (mu_a ** 2 + mu_b ** 2 + SSIM_C1) * (var_a + var_b + SSIM_C2)
+    return float(np.mean(num / den))
+
+
+def psnr(a, b):
+    mse = float(np.mean((a - b) ** 2))
+    if mse == 0:
+        return PSNR_CAP
+    return min(PSNR_CAP, 10 * np.log10(255 ** 2 / mse))
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  ENCODING (worker process)
+# ══════════════════════════════════════════════════════════════════════
+
+def encode_avif(img, quality):
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGB")
+    out = io.BytesIO()
+    img.save(out, "AVIF", quality=quality, speed=AVIF_SPEED)
+    return out.getvalue(), img.width, img.height
+
+
+ENCODERS = {"webp": encode_webp, "avif": encode_avif}
+
+
+def sweep_image(task):
+    """Score every setting on one original.
+
+    Returns ``(photo_id, records, error)``; a record is
+    ``(variant, format, quality, filter, bytes, ssim, psnr, encode_ms)``.
+    A photo that fails part-way returns no records, so every setting is
+    averaged over the same sample.
+    """
+    photo_id, path, formats, qualities, filters = task
+    records = []
+    window = gaussian_window()
+    try:
+        with Image.open(path) as img:
+            img.load()
+            img = img.convert("RGB")
+        for variant, width, height, fit, _ in RENDITIONS:
+            reference = luma(resize_like_sharp(img, width, height, fit))
+            for name in filters:
+                resized = resize_like_sharp(img, width, height, fit,
+                                            FILTERS[name])
+                for fmt in formats:
+                    for quality in qualities:
+                        t0 = time.perf_counter()
+                        data, _, _ = ENCODERS[fmt](resized, quality)
+                        ms = (time.perf_counter() - t0) * 1000
+                        with Image.open(io.BytesIO(data)) as decoded:
+                            got = luma(decoded)
+                        records.append((variant, fmt, quality, name,
+                                        len(data), ssim(reference, got, window),
+                                        psnr(reference, got), ms))
+    except (OSError, ValueError) as e:
+        return photo_id, [], str(e)
+    return photo_id, records, None
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  AGGREGATION
+# ══════════════════════════════════════════════════════════════════════
+
+def aggregate(records):
+    """``{(variant, format, quality, filter): summary}`` over the sample."""
+    groups = defaultdict(list)
+    for variant, fmt, quality, name, size, s, p, ms in records:
+        groups[variant, fmt, quality, name].append((size, s, p, ms))
+    out = {}
+    for key, values in groups.items():
+        arr = np.asarray(values, dtype=np.float64)
+        out[key] = {
+            "n": len(arr),
+            "kb": float(arr[:, 0].mean() / 1024),
+            "ssim": float(np.nanmean(arr[:, 1])),
+            "ssim_p10": float(np.nanpercentile(arr[:, 1], 10)),
+            "psnr": float(arr[:, 2].mean()),
+            "encode_ms": float(arr[:, 3].mean()),
+        }
+    return out
+
+
+def pareto(settings):
+    """Keys not dominated on (smaller kb, larger ssim), by ascending kb."""
+    front = []
+    best = -np.inf
+    for key, s in sorted(settings.items(), key=lambda kv: (kv[1]["kb"],
+                                                          -kv[1]["ssim"])):
+        if s["ssim"] > best:
+            front.append(key)
+            best = s["ssim"]
+    return front
+
+
+def analyse(summary):
+    """Per-variant current setting, Pareto front and recommendation."""
+    result = {}
+    for variant, _, _, _, quality in RENDITIONS:
+        settings = {k: v for k, v in summary.items() if k[0] == variant}
+        if not settings:
+            continue
+        current_key = (variant, CURRENT_FORMAT, quality, CURRENT_FILTER)
+        current = settings.get(current_key)
+        front = pareto(settings)
+        pick = None
+        if current:
+            good = [k for k in front if settings[k]["ssim"] >= current["ssim"]]
+            pick = min(good, key=lambda k: settings[k]["kb"]) if good else None
+        result[variant] = {"settings": settings, "current_key": current_key,
+                           "current": current, "front": front, "pick": pick}
+    return result
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  REPORT
+# ══════════════════════════════════════════════════════════════════════
+
+def setting_label(key):
+    _, fmt, quality, name = key
+    return f"{fmt.upper()} q{quality}, {name}"
+
+
+def add_variant_section(doc, n, variant, data, formats):
+    spec = next(r for r in RENDITIONS if r[0] == variant)
+    size = f"{spec[1]}x{spec[2]}" if spec[2] else f"{spec[1]}px wide"
+    add_heading_styled(doc, f"{n}. {variant} ({size}, {spec[3]})", level=2)
+    settings, current = data["settings"], data["current"]
+    if current:
+        add_para(doc, f"Current: {setting_label(data['current_key'])} — "
+                      f"{current['kb']:.1f} KB, SSIM {current['ssim']:.4f}, "
+                      f"PSNR {current['psnr']:.1f} dB.", size=Pt(9))
+    rows = []
+    for key in data["front"]:
+        s = settings[key]
+        delta = f"{100 * (s['kb'] / current['kb'] - 1):+.0f}%" if current else "—"
+        mark = " (current)" if key == data["current_key"] else \
+            " (pick)" if key == data["pick"] else ""
+        rows.append([setting_label(key) + mark, f"{s['kb']:.1f}", delta,
+                     f"{s['ssim']:.4f}", f"{s['ssim_p10']:.4f}",
+                     f"{s['psnr']:.1f}", f"{s['encode_ms']:.0f}"])
+    styled_table(doc, ["Pareto Setting", "Mean KB", "vs Current", "SSIM",
+                       "SSIM p10", "PSNR dB", "Encode ms"], rows,
+                 col_widths=[30, 11, 12, 11, 12, 11, 13])
+
+    series = []
+    for fmt in formats:
+        points = sorted((s["kb"], s["ssim"]) for k, s in settings.items()
+                        if k[1] == fmt and k[3] == CURRENT_FILTER)
+        if points:
+            series.append((f"{fmt.upper()} ({CURRENT_FILTER})",
+                           [p[0] for p in points], [p[1] for p in points]))
+    if current:
+        series.append(("current", [current["kb"]], [current["ssim"]]))
+    add_image(doc, line_chart_png(series, f"{variant}: size vs SSIM",
+                                  "Mean size (KB)", "Mean SSIM"),
+              alt=f"{variant} size versus SSIM by format")
+
+
+def write_report(analysis, meta, out_path=OUT):
+    doc = setup_doc("Rendition Encoding Sweep",
+                    f"{meta['photos']:,} sample photos")
+
+    add_heading_styled(doc, "1. Method", level=2)
+    styled_table(doc, ["Item", "Value"], [
+        ["Sample", f"{meta['photos']:,} originals from {meta['source']}"],
+        ["Formats", ", ".join(f.upper() for f in meta["formats"])],
+        ["Qualities", ", ".join(map(str, meta["qualities"]))],
+        ["Resize filters", ", ".join(meta["filters"])],
+        ["Reference", "lanczos resize of the full-resolution original"],
+        ["Metrics", f"SSIM ({SSIM_WINDOW}x{SSIM_WINDOW} Gaussian, "
+                    f"sigma {SSIM_SIGMA}) and PSNR on luma"],
+        ["Errors", f"{meta['errors']:,}"],
+    ], col_widths=[25, 75])
+    add_para(doc, "SSIM p10 is the tenth-percentile photo, i.e. how the "
+                  "setting does on the harder images. Pick is the smallest "
+                  "Pareto setting whose mean SSIM is at least the current "
+                  "one's. Encode times are single-core Pillow and only "
+                  "comparable with each other, not with sharp.",
+             italic=True, size=Pt(9))
+
+    add_heading_styled(doc, "2. Summary", level=2)
+    rows = []
+    for variant, data in analysis.items():
+        current, pick = data["current"], data["pick"]
+        if not current:
+            continue
+        if pick and pick != data["current_key"]:
+            s = data["settings"][pick]
+            rows.append([variant, f"{current['kb']:.1f} KB",
+                         setting_label(pick), f"{s['kb']:.1f} KB",
+                         f"{100 * (1 - s['kb'] / current['kb']):.0f}%"])
+        else:
+            rows.append([variant, f"{current['kb']:.1f} KB",
+                         "current is on the front", "—", "—"])
+    styled_table(doc, ["Rendition", "Current", "Pick", "Pick Size",
+                       "Saving"], rows, col_widths=[15, 15, 35, 17, 18])
+
+    for n, (variant, data) in enumerate(analysis.items(), start=3):
+        add_variant_section(doc, n, variant, data, meta["formats"])
+
+    out_path = Path(out_path)
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  DRIVER
+# ══════════════════════════════════════════════════════════════════════
+
+def run_sweep(sources, formats, qualities, filters, workers=None):
+    workers = workers or os.cpu_count() or 1
+    tasks = [(pid, path, formats, qualities, filters) for pid, path in sources]
+    records, errors = [], 0
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for done, (photo_id, recs, error) in enumerate(
+                pool.map(sweep_image, tasks), start=1):
+            records.extend(recs)
+            if error:
+                errors += 1
+                print(f"  [ERR] {photo_id}: {error}")
+            if done % 25 == 0 or done == len(tasks):
+                print(f"  ... {done:,}/{len(tasks):,} photos "
+                      f"({time.perf_counter() - t0:,.0f} s)")
+    return records, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sweep rendition formats, qualities and resize filters")
+    parser.add_argument("source", help="blob mirror or directory of originals")
+    parser.add_argument("--sample", type=int, default=200,
+                        help="originals to sample (0 = all)")
+    parser.add_argument("--formats", default="webp,avif")
+    parser.add_argument("--qualities", default=",".join(map(str, QUALITIES)))
+    parser.add_argument("--filters", default=",".join(FILTERS))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write per-setting summaries here")
+    parser.add_argument("--out", default=str(OUT), help="output DOCX path")
+    args = parser.parse_args()
+
+    if not Path(args.source).is_dir():
+        parser.error(f"{args.source} is not a directory")
+    formats = [f.strip().lower() for f in args.formats.split(",")]
+    unknown = set(formats) - set(ENCODERS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+    filters = [f.strip().lower() for f in args.filters.split(",")]
+    unknown = set(filters) - set(FILTERS)
+    if unknown:
+        parser.error(f"unknown filters: {', '.join(sorted(unknown))}")
+    qualities = sorted({int(q) for q in args.qualities.split(",")})
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Rendition Encoding Sweep")
+    print("=" * 60)
+    for fmt in list(formats):
+        if not features.check(fmt):
+            print(f"  [SKIP] {fmt}: not supported by this Pillow build")
+            formats.remove(fmt)
+    if not formats:
+        raise SystemExit("no usable formats")
+
+    sources = sorted(iter_sources(args.source))
+    if args.sample and len(sources) > args.sample:
+        sources = random.Random(args.seed).sample(sources, args.sample)
+    if not sources:
+        raise SystemExit(f"no originals found in {args.source}")
+    print(f"  {len(sources):,} photos x {len(RENDITIONS)} renditions x "
+          f"{len(formats) * len(qualities) * len(filters)} settings")
+
+    records, errors = run_sweep(sources, formats, qualities, filters,
+                                args.workers)
+    summary = aggregate(records)
+    analysis = analyse(summary)
+    for variant, data in analysis.items():
+        current, pick = data["current"], data["pick"]
+        if current and pick:
+            s = data["settings"][pick]
+            print(f"  {variant:<9} current {current['kb']:6.1f} KB "
+                  f"SSIM {current['ssim']:.4f}  ->  {setting_label(pick)}: "
+                  f"{s['kb']:6.1f} KB SSIM {s['ssim']:.4f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([dict(zip(("variant", "format", "quality", "filter"), k),
+                            **v) for k, v in sorted(summary.items())],
+                      f, indent=2)
+        print(f"  [OK] {args.json}")
+    write_report(analysis, {
+        "photos": len(sources), "source": Path(args.source).name,
+        "formats": formats, "qualities": qualities, "filters": filters,
+        "errors": errors,
+    }, args.out)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Audit and repair photo blobs in a local blob-storage mirror.
+
+Command-line counterpart of `POST /api/photos/fix-blobs` for whole
+containers. For every row of a photos export it checks, on a bounded
+thread pool, that `{id}/original` and `{id}/thumbnail` exist, that the
+original's size matches `photos.file_size`, and that each blob's content
+type (and its leading magic bytes) match `photos.mime_type` / image/webp.
+
+A local mirror has no HTTP headers, so blob properties live in a sidecar
+`<blob>.properties.json` ({"contentType": ...}) next to each blob — the
+local stand-in for `setHTTPHeaders`. Content-type mismatches are fixed by
+rewriting sidecars in batches; missing blobs and size mismatches are
+reported only. Results go to a summary DOCX built with `styled_table` and
+an optional CSV listing every problem.
+
+Run:  python scripts/repair_blobs.py BLOB_MIRROR photos_export.csv [--dry-run]
+Requires: pip install python-docx
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from docx.shared import Pt
+
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_para, setup_doc, styled_table,
+)
+from generate_incident_report import normalize_rows, read_export
+
+OUT = DOCS / "ASPR_Photos_Blob_Audit.docx"
+
+PROPERTIES_SUFFIX = ".properties.json"
+DEFAULT_MIME = "image/jpeg"       # fix-blobs default when mime_type is NULL
+THUMBNAIL_MIME = "image/webp"
+
+EXPORT_FIELDS = ("id", "mime_type", "file_size", "incident_id")
+EXPORT_ALIASES = {"photo_id": "id"}
+
+FIX_BATCH_SIZE = 500
+MAX_REPORT_ROWS = 5_000
+
+MAGIC = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  CHECKS
+# ══════════════════════════════════════════════════════════════════════
+
+def sniff_mime(path):
+    """Content type implied by a file's magic bytes, or None."""
+    with open(path, "rb") as f:
+        head = f.read(12)
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, mime in MAGIC:
+        if head.startswith(magic):
+            return mime
+    return None
+
+
+def read_content_type(blob):
+    try:
+        with open(str(blob) + PROPERTIES_SUFFIX, encoding="utf-8") as f:
+            return json.load(f).get("contentType")
+    except (OSError, ValueError):
+        return None
+
+
+def write_content_type(blob, content_type):
+    """Set a blob's content type by rewriting its properties sidecar."""
+    sidecar = Path(str(blob) + PROPERTIES_SUFFIX)
+    try:
+        props = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        props = {}
+    props["contentType"] = content_type
+    tmp = sidecar.with_name(sidecar.name + ".partial")
+    tmp.write_text(json.dumps(props), encoding="utf-8")
+    os.replace(tmp, sidecar)
+
+
+def parse_size(value):
+    """DB file_size as an int ("2048", "2048.0", 2048); None if unreadable.
+
+    An unreadable value never equals a real size, so it is reported as a
+    size issue rather than aborting the check.
+    """
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def check_photo(mirror, row):
+    """Check one photo's blobs.
+
+    Returns a list of issues ``(photo_id, blob_path, kind, expected,
+    actual)``; kind "content_type" issues are the fixable ones.
+    """
+    photo_id, mime_type, file_size, _ = row
+    blob_id = photo_id.lower()
+    issues = []
+    for name, expected_mime in (("original", mime_type or DEFAULT_MIME),
+                                ("thumbnail", THUMBNAIL_MIME)):
+        blob_path = f"{blob_id}/{name}"
+        blob = mirror / blob_path
+        try:
+            size = blob.stat().st_size
+        except FileNotFoundError:
+            issues.append((photo_id, blob_path, "missing", "", ""))
+            continue
+
+        if name == "original" and file_size and parse_size(file_size) != size:
+            issues.append((photo_id, blob_path, "size", file_size, str(size)))
+
+        sniffed = sniff_mime(blob)
+        if sniffed and sniffed != expected_mime:
+            issues.append((photo_id, blob_path, "content", expected_mime,
+                           sniffed))
+
+        current = read_content_type(blob)
+        if current != expected_mime:
+            issues.append((photo_id, blob_path, "content_type",
+                           expected_mime, current or "(none)"))
+    return issues
+
+
+def apply_fixes(mirror, batch):
+    """Rewrite the content type for a batch of content_type issues."""
+    fixed = 0
+    for _, blob_path, _, expected, _ in batch:
+        try:
+            write_content_type(mirror / blob_path, expected)
+            fixed += 1
+        except OSError as e:
+            print(f"  [ERR] {blob_path}: {e}")
+    return fixed
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  DRIVER
+# ══════════════════════════════════════════════════════════════════════
+
+ISSUE_LABELS = {
+    "missing": "Blob missing",
+    "size": "Size differs from photos.file_size",
+    "content": "Bytes do not match expected type",
+    "content_type": "Content type mismatch",
+}
+
+
+def audit(mirror, export_path, workers=32, dry_run=False, problems_csv=None):
+    """Audit every exported photo; return ``(stats, issue_counts, sample)``."""
+    mirror = Path(mirror)
+    rows = normalize_rows(read_export(export_path), EXPORT_FIELDS,
+                          EXPORT_ALIASES)
+    stats = Counter()
+    counts = Counter()
+    sample = []
+    batch = []
+    t0 = time.perf_counter()
+
+    csv_file = open(problems_csv, "w", newline="", encoding="utf-8") \
+        if problems_csv else None
+    writer = csv.writer(csv_file) if csv_file else None
+    if writer:
+        writer.writerow(["photo_id", "blob_path", "issue", "expected", "actual"])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        checks = set()
+        fixes = set()
+
+        def collect(done):
+            for future in done:
+                checks.discard(future)
+                issues = future.result()
+                stats["photos"] += 1
+                if issues:
+                    stats["photos_with_issues"] += 1
+                for issue in issues:
+                    counts[issue[2]] += 1
+                    if len(sample) < MAX_REPORT_ROWS:
+                        sample.append(issue)
+                    if writer:
+                        writer.writerow(issue)
+                    if issue[2] == "content_type" and not dry_run:
+                        batch.append(issue)
+                if len(batch) >= FIX_BATCH_SIZE:
+                    fixes.add(pool.submit(apply_fixes, mirror, batch[:]))
+                    batch.clear()
+                if stats["photos"] % 100_000 == 0:
+                    rate = stats["photos"] / (time.perf_counter() - t0)
+                    print(f"  ... {stats['photos']:,} photos ({rate:,.0f}/s)")
+
+        for row in rows:
+            if not row[0]:
+                continue
+            checks.add(pool.submit(check_photo, mirror, row))
+            if len(checks) >= workers * 4:
+                collect(wait(checks, return_when=FIRST_COMPLETED)[0])
+        collect(wait(checks)[0])
+
+        if batch:
+            fixes.add(pool.submit(apply_fixes, mirror, batch[:]))
+        stats["fixed"] = sum(f.result() for f in fixes)
+
+    if csv_file:
+        csv_file.close()
+    stats["seconds"] = time.perf_counter() - t0
+    return stats, counts, sample
+
+
+def write_report(stats, counts, sample, mirror, export_path, dry_run,
+                 out_path=OUT):
+    doc = setup_doc("Blob Storage Audit",
+                    f"{stats['photos']:,} photos checked")
+
+    add_heading_styled(doc, "1. Summary", level=2)
+    add_para(doc, f"Mirror: {mirror}    Export: {Path(export_path).name}    "
+                  f"Mode: {'dry run' if dry_run else 'repair'}",
+             italic=True, size=Pt(9))
+    rate = stats["photos"] / stats["seconds"] if stats["seconds"] else 0
+    styled_table(doc, ["Measure", "Value"], [
+        ["Photos checked", f"{stats['photos']:,}"],
+        ["Photos with issues", f"{stats['photos_with_issues']:,}"],
+        ["Content types fixed", f"{stats['fixed']:,}"],
+        ["Elapsed", f"{stats['seconds']:.1f} s ({rate:,.0f} photos/s)"],
+    ], col_widths=[50, 50])
+
+    add_heading_styled(doc, "2. Issues by Type", level=2)
+    styled_table(doc, ["Issue", "Count", "Action"], [
+        [ISSUE_LABELS[kind], f"{counts[kind]:,}",
+         ("Fixed" if not dry_run else "Fixable")
+         if kind == "content_type" else "Manual review"]
+        for kind in ISSUE_LABELS
+    ], col_widths=[50, 20, 30])
+
+    if sample:
+        add_heading_styled(doc, "3. Problem Blobs", level=2)
+        total = sum(counts.values())
+        if total > len(sample):
+            add_para(doc, f"First {len(sample):,} of {total:,} issues; use "
+                          f"--problems-csv for the full list.",
+                     italic=True, size=Pt(9))
+        styled_table(doc, ["Blob", "Issue", "Expected", "Actual"],
+                     [[blob, ISSUE_LABELS[kind], expected, actual]
+                      for _, blob, kind, expected, actual in sample],
+                     col_widths=[40, 26, 17, 17])
+
+    out_path = Path(out_path)
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Audit and repair photo blobs in a local blob mirror")
+    parser.add_argument("mirror", help="local copy of the aspr-photos container")
+    parser.add_argument("export", help="CSV/JSONL export of photos "
+                                       "(id, mime_type, file_size)")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report problems without fixing content types")
+    parser.add_argument("--problems-csv", help="write every issue to this CSV")
+    parser.add_argument("--out", default=str(OUT), help="summary DOCX path")
+    args = parser.parse_args()
+
+    if not Path(args.mirror).is_dir():
+        parser.error(f"{args.mirror} is not a directory")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Blob Audit")
+    print("=" * 60)
+    stats, counts, sample = audit(args.mirror, args.export,
+                                  workers=args.workers, dry_run=args.dry_run,
+                                  problems_csv=args.problems_csv)
+    print(f"  Checked {stats['photos']:,} photos in {stats['seconds']:.1f} s; "
+          f"{stats['photos_with_issues']:,} with issues, "
+          f"{stats['fixed']:,} content types fixed")
+    for kind, label in ISSUE_LABELS.items():
+        print(f"    {label + ':':<38} {counts[kind]:,}")
+    write_report(stats, counts, sample, args.mirror, args.export,
+                 args.dry_run, args.out)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
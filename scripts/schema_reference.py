@@ -0,0 +1,564 @@
+"""
+Schema and index reference generated from the migration SQL.
+
+Parses the `MIGRATIONS` list in app/api/admin/migrate/route.ts and the
+CREATE TABLE / ALTER TABLE ... ADD / CREATE INDEX / CREATE VIEW statements
+inside it (including the view body passed through `EXEC('...')`), then
+renders per-table column tables, the index list, the view columns and an
+index-coverage matrix (which columns each index keys or includes) through
+`styled_table`. A drift table compares the result with the hand-copied
+§5 tables in docs/06_API_Data_Reference.md.
+
+`photos` and `upload_sessions` predate the migration route, so only the
+columns it adds or alters are known for them; the base DDL is not in the
+repository.
+
+The parsed schema is cached by the migration file's content hash (same
+cache format as api_reference.py) and is also the index source for
+sql_index_coverage.py.
+
+Run:  python scripts/schema_reference.py [--out docs/ASPR_Photos_Schema_Reference.docx] [--check]
+      python scripts/generate_all_docx.py --report schema --input app/api/admin/migrate/route.ts
+Requires: pip install python-docx
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from api_reference import (
+    PARSER_KEY as SCANNER_KEY, REFERENCE_MD, ROOT, TsSource, load_cache,
+    object_entries, save_cache,
+)
+
+MIGRATE_ROUTE = ROOT / "app" / "api" / "admin" / "migrate" / "route.ts"
+DOCS = ROOT / "docs"
+OUT = DOCS / "ASPR_Photos_Schema_Reference.docx"
+CACHE = Path(__file__).resolve().parent / ".schema_reference_cache.json"
+PARSER_KEY = hashlib.sha256(
+    SCANNER_KEY.encode() + Path(__file__).read_bytes()).hexdigest()[:16]
+
+CREATE_TABLE = re.compile(r"\bCREATE\s+TABLE\s+(\w+)\s*\(", re.I)
+ALTER_ADD = re.compile(
+    r"\bALTER\s+TABLE\s+(\w+)\s+ADD\s+(\w+)\s+(.+?)\s*$", re.I | re.S)
+ALTER_COLUMN = re.compile(
+    r"\bALTER\s+TABLE\s+(\w+)\s+ALTER\s+COLUMN\s+(\w+)\s+(.+?)\s*$",
+    re.I | re.S)
+CREATE_INDEX = re.compile(
+    r"\bCREATE\s+(UNIQUE\s+)?(?:(?:NON)?CLUSTERED\s+)?INDEX\s+(\w+)\s+"
+    r"ON\s+(\w+)\s*\(", re.I)
+CREATE_VIEW = re.compile(r"\bCREATE\s+VIEW\s+(\w+)\s+AS\s+SELECT\s+", re.I)
+EXEC_STRING = re.compile(r"\bEXEC\s*\(\s*'((?:[^']|'')*)'\s*\)", re.I)
+COLUMN_DEF = re.compile(r"^(\w+)\s+(\w+(?:\s*\([^)]*\))?)\s*(.*)$", re.S)
+TABLE_CONSTRAINT = re.compile(
+    r"^CONSTRAINT\s+(\w+)\s+(PRIMARY\s+KEY|UNIQUE|FOREIGN\s+KEY)\s*"
+    r"\(([^)]*)\)\s*(.*)$", re.I | re.S)
+REFERENCES = re.compile(
+    r"REFERENCES\s+(\w+)\s*\((\w+)\)(\s+ON\s+DELETE\s+CASCADE)?", re.I)
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SQL DDL PARSING
+# ══════════════════════════════════════════════════════════════════════
+
+def close_paren(sql, i):
+    """Offset of the ')' matching the '(' at ``i``, skipping 'strings'."""
+    depth, n = 0, len(sql)
+    while i < n:
+        c = sql[i]
+        if c == "'":
+            i = sql.find("'", i + 1)
+            if i < 0:
+                break
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError("unbalanced parentheses in SQL")
+
+
+def split_top(text):
+    """Split on commas outside parentheses and 'strings'."""
+    parts, depth, start, quoted = [], 0, 0, False
+    for k, c in enumerate(text):
+        if c == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "," and depth == 0:
+            parts.append(text[start:k].strip())
+            start = k + 1
+    if text[start:].strip():
+        parts.append(text[start:].strip())
+    return parts
+
+
+def squash(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def column_constraints(rest):
+    """Display constraints from the tail of a column definition."""
+    rest = squash(rest)
+    out = []
+    if re.search(r"\bPRIMARY\s+KEY\b", rest, re.I):
+        out.append("PK")
+    if re.search(r"\bIDENTITY\b", rest, re.I):
+        out.append("IDENTITY")
+    if re.search(r"\bNOT\s+NULL\b", rest, re.I):
+        out.append("NOT NULL")
+    elif re.search(r"\bNULL\b", rest, re.I):
+        out.append("NULL")
+    if re.search(r"\bUNIQUE\b", rest, re.I):
+        out.append("UNIQUE")
+    default = re.search(r"\bDEFAULT\s+(\S+?(?:\([^)]*\))?)(?=\s|$)", rest, re.I)
+    if default:
+        out.append(f"DEFAULT {default.group(1)}")
+    ref = REFERENCES.search(rest)
+    if ref:
+        out.append(f"FK → {ref.group(1)}.{ref.group(2)}"
+                   + (" (cascade)" if ref.group(3) else ""))
+    return out
+
+
+def new_table(name, created):
+    return {"name": name, "created": created, "columns": [],
+            "constraints": []}
+
+
+def find_column(table, name):
+    return next((c for c in table["columns"]
+                 if c["name"].lower() == name.lower()), None)
+
+
+def parse_create_table(schema, m, sql, source):
+    name = m.group(1)
+    body_end = close_paren(sql, m.end() - 1)
+    table = schema["tables"].setdefault(name, new_table(name, True))
+    table["created"] = True
+    table["source"] = source
+    for part in split_top(sql[m.end():body_end]):
+        con = TABLE_CONSTRAINT.match(part)
+        if con:
+            cname, kind, cols, tail = con.groups()
+            cols = [c.strip() for c in cols.split(",")]
+            kind = squash(kind).upper()
+            table["constraints"].append({"name": cname, "kind": kind,
+                                         "columns": cols})
+            for col_name in cols:
+                col = find_column(table, col_name)
+                if not col:
+                    continue
+                if kind == "PRIMARY KEY":
+                    col["constraints"].insert(0, "PK")
+                elif kind == "UNIQUE":
+                    col["constraints"].append(f"UNIQUE({', '.join(cols)})")
+                else:
+                    ref = REFERENCES.search(tail)
+                    if ref:
+                        col["constraints"].append(
+                            f"FK → {ref.group(1)}.{ref.group(2)}"
+                            + (" (cascade)" if ref.group(3) else ""))
+            continue
+        col = COLUMN_DEF.match(part)
+        if col:
+            rest = col.group(3)
+            table["columns"].append({
+                "name": col.group(1), "type": squash(col.group(2)).upper(),
+                "constraints": column_constraints(rest), "source": source})
+            if re.search(r"\bPRIMARY\s+KEY\b", rest, re.I):
+                table["constraints"].append({
+                    "name": f"PK_{name}", "kind": "PRIMARY KEY",
+                    "columns": [col.group(1)]})
+
+
+def parse_alter(schema, sql, source):
+    m = ALTER_ADD.search(sql)
+    if m and not re.match(r"CONSTRAINT\b", m.group(2), re.I):
+        table = schema["tables"].setdefault(m.group(1),
+                                            new_table(m.group(1), False))
+        col = COLUMN_DEF.match(f"{m.group(2)} {m.group(3)}")
+        table["columns"].append({
+            "name": col.group(1), "type": squash(col.group(2)).upper(),
+            "constraints": column_constraints(col.group(3)),
+            "source": source})
+    m = ALTER_COLUMN.search(sql)
+    if m:
+        table = schema["tables"].setdefault(m.group(1),
+                                            new_table(m.group(1), False))
+        col = COLUMN_DEF.match(f"{m.group(2)} {m.group(3)}")
+        existing = find_column(table, col.group(1))
+        entry = {"name": col.group(1), "type": squash(col.group(2)).upper(),
+                 "constraints": column_constraints(col.group(3)),
+                 "source": source}
+        if existing:
+            existing.update(entry)
+        else:
+            table["columns"].append(entry)
+
+
+def parse_index_columns(text):
+    columns = []
+    for part in split_top(text):
+        words = part.split()
+        order = words[1].upper() if len(words) > 1 else "ASC"
+        columns.append([words[0], order])
+    return columns
+
+
+def parse_create_index(schema, m, sql, source):
+    keys_end = close_paren(sql, m.end() - 1)
+    index = {"name": m.group(2), "table": m.group(3),
+             "unique": bool(m.group(1)),
+             "keys": parse_index_columns(sql[m.end():keys_end]),
+             "include": [], "filter": "", "source": source}
+    tail = sql[keys_end + 1:]
+    inc = re.match(r"\s*INCLUDE\s*\(", tail, re.I)
+    if inc:
+        inc_end = close_paren(tail, inc.end() - 1)
+        index["include"] = [c.strip() for c in
+                            tail[inc.end():inc_end].split(",")]
+        tail = tail[inc_end + 1:]
+    where = re.match(r"\s*WHERE\s+(.+)", tail, re.I | re.S)
+    if where:
+        index["filter"] = squash(where.group(1))
+    schema["indexes"].append(index)
+
+
+def parse_create_view(schema, sql, source):
+    m = CREATE_VIEW.search(sql)
+    if not m:
+        return
+    body = sql[m.end():]
+    from_kw = None
+    depth = 0
+    for k in range(len(body)):
+        c = body[k]
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif depth == 0 and re.match(r"\bFROM\b", body[k:k + 5], re.I) \
+                and (k == 0 or not body[k - 1].isalnum()):
+            from_kw = k
+            break
+    select = body[:from_kw] if from_kw is not None else body
+    columns = []
+    for part in split_top(select):
+        alias = re.search(r"\s+AS\s+(\w+)\s*$", part, re.I)
+        if alias:
+            columns.append({"name": alias.group(1),
+                            "expr": squash(part[:alias.start()])})
+        else:
+            columns.append({"name": part.split(".")[-1], "expr": squash(part)})
+    tables = re.findall(r"\b(?:FROM|JOIN)\s+(\w+)",
+                        body[from_kw or 0:], re.I)
+    schema["views"].append({"name": m.group(1), "columns": columns,
+                            "tables": tables, "source": source})
+
+
+def parse_statement(schema, sql, source):
+    for exec_m in EXEC_STRING.finditer(sql):
+        parse_statement(schema, exec_m.group(1).replace("''", "'"), source)
+    sql = EXEC_STRING.sub("", sql)
+    for m in CREATE_TABLE.finditer(sql):
+        parse_create_table(schema, m, sql, source)
+    if not CREATE_TABLE.search(sql):
+        parse_alter(schema, sql, source)
+    for m in CREATE_INDEX.finditer(sql):
+        parse_create_index(schema, m, sql, source)
+    parse_create_view(schema, sql, source)
+
+
+def migration_steps(text):
+    """``[(name, sql, line)]`` from the ``MIGRATIONS`` array literal."""
+    src = TsSource(text)
+    m = re.search(r"\bconst\s+MIGRATIONS\b[^=]*=\s*\[", src.code)
+    if not m:
+        raise ValueError("no `const MIGRATIONS = [...]` in migration route")
+    bracket = m.end() - 1
+    steps = []
+    for a, b in src.split_args(bracket + 1, src.match(bracket)):
+        brace = src.code.index("{", a)
+        fields = {key: src.literal(*span)
+                  for key, span in object_entries(src, brace, src.match(brace))
+                  if span}
+        if fields.get("sql"):
+            steps.append((fields.get("name") or f"step {len(steps) + 1}",
+                          fields["sql"], src.line_of(brace)))
+    return steps
+
+
+def parse_schema(text):
+    schema = {"tables": {}, "indexes": [], "views": [], "steps": 0}
+    for name, sql, line in migration_steps(text):
+        schema["steps"] += 1
+        parse_statement(schema, sql, name)
+    return schema
+
+
+def load_schema(path=MIGRATE_ROUTE, cache_path=CACHE):
+    """Parsed schema for the migration route, cached by content hash."""
+    path = Path(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    key = path.resolve().as_posix()
+    cached = load_cache(cache_path, PARSER_KEY) if cache_path else {}
+    hit = cached.get(key)
+    if hit and hit["sha256"] == digest:
+        return hit["schema"]
+    schema = parse_schema(data.decode("utf-8"))
+    if cache_path:
+        cached[key] = {"sha256": digest, "schema": schema}
+        save_cache(cache_path, cached, PARSER_KEY)
+    return schema
+
+
+def table_indexes(schema, table_name):
+    """Indexes on a table including PK/UNIQUE constraints, PK first."""
+    table = schema["tables"].get(table_name)
+    implied = []
+    for con in (table or {}).get("constraints", []):
+        if con["kind"] in ("PRIMARY KEY", "UNIQUE"):
+            implied.append({"name": con["name"], "table": table_name,
+                            "unique": True, "primary": con["kind"] == "PRIMARY KEY",
+                            "keys": [[c, "ASC"] for c in con["columns"]],
+                            "include": [], "filter": "",
+                            "source": table.get("source", "")})
+    return implied + [ix for ix in schema["indexes"]
+                      if ix["table"] == table_name]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  DRIFT AGAINST THE HAND-WRITTEN REFERENCE
+# ══════════════════════════════════════════════════════════════════════
+
+def documented_schema(md_path=REFERENCE_MD):
+    """``({table: [columns]}, {index: table})`` from §5 of the reference."""
+    tables, indexes = {}, {}
+    current = None
+    in_indexes = False
+    for line in md_path.read_text(encoding="utf-8").splitlines():
+        heading = re.match(r"^###\s+5\.\d+\s+(\w+)", line)
+        if heading:
+            name = heading.group(1)
+            in_indexes = name == "Indexes"
+            current = None if in_indexes or name == "Relationships" else name
+            if current:
+                tables[current] = []
+            continue
+        if line.startswith("## "):
+            current, in_indexes = None, False
+            continue
+        if not line.startswith("|"):
+            # Only the first table under a heading lists columns
+            if current and tables[current]:
+                current = None
+            continue
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        if set(cells[0]) <= set("-: "):
+            continue
+        if in_indexes and cells[0].startswith("IX_"):
+            indexes[cells[0]] = cells[1]
+        elif current and cells[0] != "Column":
+            if re.fullmatch(r"\w+", cells[0]):
+                tables[current].append(cells[0])
+    return tables, indexes
+
+
+def schema_drift(schema, md_path=REFERENCE_MD):
+    """``[(kind, name, in_migration, in_doc)]`` differences."""
+    doc_tables, doc_indexes = documented_schema(md_path)
+    drift = []
+    code_indexes = {ix["name"]: ix["table"] for ix in schema["indexes"]}
+    for name in sorted(set(code_indexes) | set(doc_indexes)):
+        if name not in doc_indexes:
+            drift.append(("Index", f"{name} ({code_indexes[name]})",
+                          "Yes", "No"))
+        elif name not in code_indexes:
+            drift.append(("Index", f"{name} ({doc_indexes[name]})",
+                          "No", "Yes"))
+    for name, table in sorted(schema["tables"].items()):
+        code_cols = {c["name"] for c in table["columns"]}
+        doc_cols = set(doc_tables.get(name, ()))
+        for col in sorted(code_cols - doc_cols):
+            drift.append(("Column", f"{name}.{col}", "Yes", "No"))
+        if table["created"]:
+            for col in sorted(doc_cols - code_cols):
+                drift.append(("Column", f"{name}.{col}", "No", "Yes"))
+    for view in schema["views"]:
+        doc_cols = set(doc_tables.get(view["name"], ()))
+        for col in view["columns"]:
+            if col["name"] not in doc_cols:
+                drift.append(("View column", f"{view['name']}.{col['name']}",
+                              "Yes", "No"))
+        for col in sorted(doc_cols - {c["name"] for c in view["columns"]}):
+            drift.append(("View column", f"{view['name']}.{col}", "No", "Yes"))
+    return drift
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  DOCX
+# ══════════════════════════════════════════════════════════════════════
+
+def coverage_rows(schema, table_name, indexes):
+    """Column × index matrix: key position (↓ = DESC), 'inc' or blank."""
+    table = schema["tables"].get(table_name)
+    columns = [c["name"] for c in (table or {}).get("columns", [])]
+    for ix in indexes:
+        for col in [k for k, _ in ix["keys"]] + ix["include"]:
+            if col not in columns:
+                columns.append(col)
+    rows = []
+    for col in columns:
+        cells, best = [], "—"
+        for ix in indexes:
+            pos = next((i for i, (k, _) in enumerate(ix["keys"]) if k == col),
+                       None)
+            if pos is not None:
+                desc = "↓" if ix["keys"][pos][1] == "DESC" else ""
+                cells.append(f"{pos + 1}{desc}")
+                best = "Leading key" if pos == 0 else (
+                    "Key" if best != "Leading key" else best)
+            elif col in ix["include"]:
+                cells.append("inc")
+                if best == "—":
+                    best = "Include only"
+            else:
+                cells.append("")
+        rows.append([col] + cells + [best])
+    return rows
+
+
+def build_schema_report(input_path=None, out_path=None):
+    """Write the schema reference DOCX; return its path."""
+    from docx.shared import Pt
+    from generate_all_docx import (
+        add_heading_styled, add_para, setup_doc, styled_table,
+    )
+
+    input_path = Path(input_path) if input_path else MIGRATE_ROUTE
+    out_path = Path(out_path) if out_path else OUT
+    schema = load_schema(input_path)
+    drift = schema_drift(schema)
+    tables = schema["tables"]
+    print(f"  Schema: {len(tables)} tables, {len(schema['indexes'])} indexes, "
+          f"{len(schema['views'])} views from {schema['steps']} migration steps")
+
+    doc = setup_doc("Schema & Index Reference",
+                    f"Generated from {input_path.name} "
+                    f"({schema['steps']} migration steps)")
+    add_heading_styled(doc, "1. Tables", level=2)
+    source = input_path.resolve()
+    if source.is_relative_to(ROOT):
+        source = source.relative_to(ROOT).as_posix()
+    add_para(doc, f"Source: {source}", italic=True, size=Pt(9))
+    for n, (name, table) in enumerate(sorted(tables.items()), 1):
+        add_heading_styled(doc, f"1.{n} {name}", level=3)
+        if not table["created"]:
+            add_para(doc, "Base table predates the migration route; only the "
+                          "columns it adds or alters are listed.",
+                     italic=True, size=Pt(9))
+        styled_table(doc, ["Column", "Type", "Constraints", "Migration step"], [
+            [c["name"], c["type"], ", ".join(c["constraints"]) or "—",
+             c["source"]] for c in table["columns"]
+        ], col_widths=[22, 20, 34, 24])
+
+    add_heading_styled(doc, "2. Indexes", level=2)
+    all_indexes = [ix for name in sorted(tables)
+                   for ix in table_indexes(schema, name)]
+    all_indexes += [ix for ix in schema["indexes"] if ix["table"] not in tables]
+    styled_table(doc, ["Index", "Table", "Key Columns", "Include / Filter"], [
+        [ix["name"] + (" (PK)" if ix.get("primary") else
+                       " (unique)" if ix["unique"] else ""),
+         ix["table"],
+         ", ".join(k + (" DESC" if o == "DESC" else "") for k, o in ix["keys"]),
+         "; ".join(filter(None, [
+             ", ".join(ix["include"]) and f"INCLUDE {', '.join(ix['include'])}",
+             ix["filter"] and f"WHERE {ix['filter']}"])) or "—"]
+        for ix in all_indexes
+    ], col_widths=[26, 16, 26, 32])
+
+    add_heading_styled(doc, "3. Index Coverage", level=2)
+    add_para(doc, "Numbers give a column's position in the index key "
+                  "(↓ = descending); 'inc' marks an INCLUDE column. A filter "
+                  "or sort on a column that is never a leading key cannot "
+                  "seek and scans the table or a wider index.", size=Pt(9))
+    for name in sorted({ix["table"] for ix in schema["indexes"]}):
+        indexes = table_indexes(schema, name)
+        add_heading_styled(doc, name, level=3)
+        width = 60 // (len(indexes) + 1)
+        styled_table(doc, ["Column"] + [ix["name"] for ix in indexes]
+                     + ["Best Access"],
+                     coverage_rows(schema, name, indexes),
+                     col_widths=[22] + [width] * len(indexes) + [18])
+
+    if schema["views"]:
+        add_heading_styled(doc, "4. Views", level=2)
+        for view in schema["views"]:
+            add_heading_styled(doc, view["name"], level=3)
+            add_para(doc, f"Reads {', '.join(dict.fromkeys(view['tables']))}; "
+                          f"created by '{view['source']}'.", size=Pt(9))
+            styled_table(doc, ["Column", "Expression"], [
+                [c["name"], c["expr"]] for c in view["columns"]
+            ], col_widths=[30, 70])
+
+    add_heading_styled(doc, "5. Drift vs. API & Data Reference", level=2)
+    if drift:
+        add_para(doc, f"{len(drift)} differences between the migration and "
+                      f"{REFERENCE_MD.name} §5.", size=Pt(9))
+        styled_table(doc, ["Kind", "Name", "In Migration", "In Document"],
+                     [list(d) for d in drift], col_widths=[18, 50, 16, 16])
+    else:
+        add_para(doc, f"{REFERENCE_MD.name} §5 matches the migration.")
+
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Schema and index reference from the migration route")
+    parser.add_argument("--input", default=str(MIGRATE_ROUTE),
+                        help="migration route.ts")
+    parser.add_argument("--out", default=str(OUT), help="output DOCX path")
+    parser.add_argument("--json", help="also write the parsed schema as JSON")
+    parser.add_argument("--check", action="store_true",
+                        help=f"only report drift against {REFERENCE_MD.name}")
+    args = parser.parse_args()
+
+    if args.check:
+        drift = schema_drift(load_schema(args.input))
+        for kind, name, in_code, in_doc in drift:
+            where = "migration only" if in_code == "Yes" else "document only"
+            print(f"  [DRIFT] {kind} {name}: {where}")
+        if drift:
+            sys.exit(1)
+        print(f"  [OK] {REFERENCE_MD.name} §5 matches the migration")
+        return
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Schema Reference")
+    print("=" * 60)
+    build_schema_report(args.input, args.out)
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(load_schema(args.input), indent=2), encoding="utf-8")
+        print(f"  [OK] {Path(args.json).name}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,794 @@
+"""
+Static index-coverage check for the SQL issued by the route handlers.
+
+Extracts every SQL literal from `app/api/**/route.ts` and the other
+modules that import `@/lib/db`, resolves the dynamically composed parts
+(`${whereClause}` built from `conditions.push(...)`, `${x.join(',')}`
+placeholder lists, ternary ORDER BY clauses), and parses each statement's
+tables, WHERE / JOIN ON / ORDER BY / GROUP BY columns and select list.
+Those are matched against the indexes parsed from the migration route
+(schema_reference.load_schema) plus the clustered primary keys, to
+classify each table access as a covering seek, a seek with key lookups
+or a sort, or a scan — and to suggest the missing covering index.
+
+Each optional filter of a dynamic WHERE is checked as its own scenario
+(no filter, then each filter alone), since that is how the admin list is
+used. The results are a DOCX appendix and, with --md, the same tables as
+markdown. `--check` exits non-zero when a high-severity scan is found.
+
+This is a heuristic, not SQL Server's optimizer: statistics, parameter
+sniffing and index intersection are ignored, and base tables created
+before the migration route are assumed to have only their primary key.
+
+Run:  python scripts/sql_index_coverage.py [--out docs/ASPR_Photos_Index_Coverage.docx] [--md FILE] [--check]
+Requires: pip install python-docx
+"""
+
+import argparse
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from api_reference import ROOT, TsSource, is_sql, iter_handlers
+from schema_reference import load_schema, split_top, squash, table_indexes
+
+DOCS = ROOT / "docs"
+OUT = DOCS / "ASPR_Photos_Index_Coverage.docx"
+SOURCE_DIRS = [ROOT / "app", ROOT / "lib"]
+DB_IMPORT = re.compile(r"""from\s+['"](?:@/lib/db|\./db|\.\./lib/db)['"]""")
+# One-off DDL and backfills; not part of the request path
+EXCLUDE = {"app/api/admin/migrate/route.ts"}
+
+# Tables whose DDL predates the migration route: clustered PK assumed
+BASE_PRIMARY_KEYS = {"photos": ["id"], "upload_sessions": ["id"]}
+# Tables that grow with photo volume; a scan of these is high severity
+LARGE_TABLES = {"photos", "photo_tags", "photo_exif", "photo_renditions",
+                "photo_edits", "admin_audit_log"}
+MAX_INCLUDE = 12
+
+SEVERITY_ORDER = {"High": 0, "Medium": 1, "Low": 2, "OK": 3}
+
+SQL_KEYWORDS = set("""
+    select from where and or not null is in as on join left right inner
+    outer full cross apply group by order having top distinct asc desc case
+    when then else end like between exists set values into insert update
+    delete output inserted deleted count sum min max avg isnull coalesce
+    cast convert date day month year dateadd datediff getdate getutcdate
+    newid if rowcount union all with nolock offset fetch next rows only
+    percent ties over partition row_number len lower upper trim
+""".split())
+
+CLAUSE_END = r"(?=\bWHERE\b|\bGROUP\s+BY\b|\bORDER\s+BY\b|\bHAVING\b|" \
+             r"\bOPTION\b|\bOFFSET\b|$)"
+JOIN_SPLIT = re.compile(
+    r"\b(?:(?:LEFT|RIGHT|FULL)\s+(?:OUTER\s+)?|INNER\s+|CROSS\s+)?JOIN\b|"
+    r"\b(?:CROSS|OUTER)\s+APPLY\b|,", re.I)
+COLUMN_REF = re.compile(r"(?<![@\w.])(?:([a-z_]\w*)\.)?([a-z_]\w*\b|\*)(?!\s*\()",
+                        re.I)
+PREDICATE = re.compile(
+    r"^(?:(\w+)\.)?(\w+)\s*(=|<>|!=|<=|>=|<|>|\bLIKE\b|\bNOT\s+LIKE\b|"
+    r"\bIN\b|\bNOT\s+IN\b|\bIS\s+NOT\b|\bIS\b|\bBETWEEN\b)\s*(.*)$",
+    re.I | re.S)
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SQL EXTRACTION FROM TYPESCRIPT
+# ══════════════════════════════════════════════════════════════════════
+
+def source_files():
+    """Route handlers plus any other module that imports lib/db."""
+    files = []
+    for base in SOURCE_DIRS:
+        for path in sorted(base.rglob("*.ts")):
+            rel = path.relative_to(ROOT).as_posix()
+            if rel in EXCLUDE or "node_modules" in path.parts:
+                continue
+            text = path.read_text(encoding="utf-8")
+            if path.name == "route.ts" or DB_IMPORT.search(text):
+                files.append((rel, text))
+    return files
+
+
+def endpoint_name(rel, method):
+    if rel.endswith("/route.ts") and rel.startswith("app/"):
+        return f"{method} /{rel[len('app/'):-len('/route.ts')]}"
+    return f"{rel} ({method})"
+
+
+def _assignment(src, name, start, end):
+    """Span of the expression in the last ``const name = ...`` before end."""
+    found = None
+    for m in re.finditer(rf"\b(?:const|let)\s+{re.escape(name)}\b[^=]*=\s*",
+                         src.code[start:end]):
+        a = start + m.end()
+        b = a
+        depth = 0
+        while b < len(src.code):
+            c = src.code[b]
+            if c in "([{":
+                depth += 1
+            elif c in ")]}":
+                if depth == 0:
+                    break
+                depth -= 1
+            elif depth == 0 and (c in ";\n") and src.code[a:b].strip():
+                # Expressions continue onto lines starting with ? or :
+                rest = src.code[b:].lstrip()
+                if c == ";" or not rest[:1] in ("?", ":", ".", "+"):
+                    break
+            b += 1
+        found = (a, b)
+    return found
+
+
+def _array_fragments(src, array, start, end):
+    """Initial literal elements and pushed literal fragments of an array."""
+    initial, pushed = [], []
+    span = _assignment(src, array, start, end)
+    if span:
+        initial = [lit[2] for _, lit in sorted(src.literals_in(*span))]
+    for m in re.finditer(rf"\b{re.escape(array)}\.push\s*\(",
+                         src.code[start:end]):
+        for a, b in src.call_args(start + m.end() - 1):
+            value = src.literal(a, b)
+            if value:
+                pushed.append(value)
+    return initial, pushed
+
+
+def resolve_sql(src, value, start, end):
+    """Expand ``${...}`` in a SQL template into concrete scenarios.
+
+    Returns ``[(label, sql)]``: one entry, or one per optional WHERE
+    fragment when the template embeds a pushed condition list.
+    """
+    where_array = None
+    replacements = {}
+    for m in re.finditer(r"\$\{\s*([^}]*?)\s*\}", value):
+        expr = m.group(1)
+        join = re.match(r"(\w+)\.join\(\s*['\"]\s*AND\s*['\"]\s*\)$", expr, re.I)
+        name = expr if re.fullmatch(r"\w+", expr) else None
+        if name:
+            span = _assignment(src, name, start, end)
+            if span:
+                inner = src.code[span[0]:span[1]]
+                inner_join = re.search(r"(\w+)\.join\(", inner)
+                if inner_join and re.search(r"AND", src.text[span[0]:span[1]],
+                                            re.I):
+                    join = inner_join
+                else:
+                    lits = [lit[2] for _, lit in sorted(src.literals_in(*span))]
+                    # Ternaries list the special case first, the default last
+                    replacements[m.group(0)] = lits[-1] if lits else "@expr"
+                    continue
+        if join:
+            where_array = join.group(1)
+            replacements[m.group(0)] = "{where}"
+        elif ".join(" in expr:
+            replacements[m.group(0)] = "@list"
+        else:
+            replacements[m.group(0)] = "@expr"
+
+    sql = value
+    for token, text in replacements.items():
+        sql = sql.replace(token, text)
+    if not where_array:
+        return [("", sql)]
+    initial, pushed = _array_fragments(src, where_array, start, end)
+    base = initial or ["1=1"]
+    scenarios = [("no filter", sql.replace("{where}", " AND ".join(base)))]
+    for fragment in pushed:
+        params = dict.fromkeys(re.findall(r"@(\w+)", fragment))
+        label = "filter " + (", ".join(params) if params else fragment[:30])
+        scenarios.append((label, sql.replace(
+            "{where}", " AND ".join(base + [fragment]))))
+    return scenarios
+
+
+def leading_wildcard_params(src, start, end):
+    """Params assigned a value that starts with '%' (e.g. `%${search}%`)."""
+    names = set()
+    for m in re.finditer(r"\b(?:params\.)?(\w+)\s*[:=]\s*", src.code[start:end]):
+        lit = src.literals.get(start + m.end())
+        if lit and lit[2].startswith("%"):
+            names.add(m.group(1))
+    return names
+
+
+def extract_queries():
+    """``[(endpoint, file, line, label, sql, wildcard_params)]``."""
+    queries = []
+    for rel, text in source_files():
+        src = TsSource(text)
+        spans = [(method, body_start, body_end)
+                 for method, _, body_start, body_end in iter_handlers(src)]
+        covered = [(a, b) for _, a, b in spans]
+        spans.append(("module", 0, len(text)))
+        for method, start, end in spans:
+            wildcards = leading_wildcard_params(src, start, end)
+            for pos, (_, _, value) in sorted(src.literals_in(start, end)):
+                if not is_sql(value):
+                    continue
+                if method == "module" and any(a <= pos < b for a, b in covered):
+                    continue
+                for label, sql in resolve_sql(src, value, start, end):
+                    queries.append((endpoint_name(rel, method), rel,
+                                    src.line_of(pos), label, sql, wildcards))
+    return queries
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SQL ANALYSIS
+# ══════════════════════════════════════════════════════════════════════
+
+def strip_strings(sql):
+    return re.sub(r"'(?:[^']|'')*'", "'?'", sql)
+
+
+def extract_subqueries(sql):
+    """Replace ``(SELECT ...)`` groups with @subquery; return both."""
+    subqueries = []
+    while True:
+        m = re.search(r"\(\s*SELECT\b", sql, re.I)
+        if not m:
+            return sql, subqueries
+        depth, k = 0, m.start()
+        while k < len(sql):
+            if sql[k] == "(":
+                depth += 1
+            elif sql[k] == ")":
+                depth -= 1
+                if depth == 0:
+                    break
+            k += 1
+        inner = sql[m.start() + 1:k]
+        inner, nested = extract_subqueries(inner)
+        subqueries.append(inner)
+        subqueries.extend(nested)
+        sql = sql[:m.start()] + "@subquery" + sql[k + 1:]
+
+
+def split_statements(sql):
+    sql = re.sub(r"\bIF\s+(?:NOT\s+)?EXISTS\s+@subquery", " ", sql, flags=re.I)
+    sql = re.sub(r"\bIF\s+@@ROWCOUNT\s*=\s*0\b", ";", sql, flags=re.I)
+    return [s.strip() for s in sql.split(";") if s.strip()]
+
+
+def _clause(sql, keyword):
+    m = re.search(rf"\b{keyword}\b(.*?){CLAUSE_END}", sql, re.I | re.S)
+    return m.group(1).strip() if m else ""
+
+
+def split_and(where):
+    parts, depth, start = [], 0, 0
+    tokens = list(re.finditer(r"\(|\)|\bAND\b|\bBETWEEN\b", where, re.I))
+    between = False
+    for t in tokens:
+        tok = t.group(0).upper()
+        if tok == "(":
+            depth += 1
+        elif tok == ")":
+            depth -= 1
+        elif tok == "BETWEEN" and depth == 0:
+            between = True
+        elif tok == "AND" and depth == 0:
+            if between:
+                between = False
+                continue
+            parts.append(where[start:t.start()].strip())
+            start = t.end()
+    parts.append(where[start:].strip())
+    return [p for p in parts if p]
+
+
+def column_refs(expr):
+    """``[(alias or None, column)]`` identifiers in an expression."""
+    expr = re.sub(r"@\w+|\(\s*\*\s*\)", " ", strip_strings(expr))
+    expr = re.sub(r"\bAS\s+\w+", " ", expr, flags=re.I)
+    refs = []
+    for m in COLUMN_REF.finditer(expr):
+        alias, col = m.group(1), m.group(2)
+        if alias is None and col.lower() in SQL_KEYWORDS:
+            continue
+        if alias and alias.lower() in SQL_KEYWORDS:
+            continue
+        refs.append((alias, col))
+    return refs
+
+
+def parse_predicate(text, wildcards):
+    """``(alias, column, kind, rhs_ref)`` or None for one conjunct.
+
+    kind: eq, range, nonsarg, join; rhs_ref is (alias, column) for joins.
+    """
+    text = text.strip()
+    while text.startswith("(") and text.endswith(")"):
+        text = text[1:-1].strip()
+    if re.fullmatch(r"1\s*=\s*1", text):
+        return None
+    if re.search(r"\bOR\b", strip_strings(text), re.I):
+        cols = dict.fromkeys(c for _, c in column_refs(text))
+        return ("", "OR of " + ", ".join(cols), "nonsarg", None)
+    m = PREDICATE.match(text)
+    if not m:
+        refs = column_refs(text)
+        alias, col = refs[0] if refs else ("", "")
+        return (alias, col, "nonsarg", None)
+    alias, col, op, rhs = m.groups()
+    op = squash(op).upper()
+    rhs = rhs.strip()
+    rhs_ref = re.fullmatch(r"(\w+)\.(\w+)", rhs)
+    if op == "=" and rhs_ref:
+        return (alias, col, "join", rhs_ref.groups())
+    if op in ("=", "IN", "IS"):
+        return (alias, col, "eq", None)
+    if op in ("<", ">", "<=", ">=", "BETWEEN", "IS NOT"):
+        return (alias, col, "range", None)
+    if op == "LIKE":
+        param = re.fullmatch(r"@(\w+)", rhs)
+        if rhs.startswith("'%") or (param and param.group(1) in wildcards):
+            return (alias, col, "nonsarg", None)
+        return (alias, col, "range", None)
+    return (alias, col, "nonsarg", None)
+
+
+def parse_select(sql, wildcards):
+    """Tables, predicates, order/group and referenced columns of a query."""
+    kind = sql.split(None, 1)[0].upper()
+    tables = []                 # [(alias, table, on_text)]
+    if kind == "SELECT":
+        select_list = re.match(
+            r"SELECT\s+(?:TOP\s*\(?[@\w]+\)?\s+)?(?:DISTINCT\s+)?(.*?)\bFROM\b",
+            sql, re.I | re.S)
+        select_list = select_list.group(1) if select_list else ""
+        from_clause = _clause(sql, "FROM")
+    elif kind == "UPDATE":
+        target = re.match(r"UPDATE\s+(\w+)", sql, re.I).group(1)
+        select_list = ""
+        from_clause = _clause(sql, "FROM") or target
+    elif kind == "DELETE":
+        select_list = ""
+        from_clause = _clause(sql, "FROM")
+    else:
+        return None
+
+    pieces = JOIN_SPLIT.split(from_clause)
+    for piece in pieces:
+        m = re.match(r"\s*(\w+|@subquery)(?:\s+(?:AS\s+)?(?!ON\b)(\w+))?"
+                     r"(?:\s+ON\s+(.*))?\s*$", piece, re.I | re.S)
+        if not m or m.group(1) == "@subquery":
+            continue
+        table = m.group(1)
+        tables.append((m.group(2) or table, table, m.group(3) or ""))
+    if not tables:
+        return None
+    alias_map = {alias.lower(): table for alias, table, _ in tables}
+    alias_map.update({table.lower(): table for _, table, _ in tables})
+
+    where = _clause(sql, "WHERE")
+    predicates = [p for p in (parse_predicate(c, wildcards)
+                              for c in split_and(where)) if p]
+    for _, _, on in tables:
+        predicates += [p for p in (parse_predicate(c, wildcards)
+                                   for c in split_and(on)) if p]
+
+    select_aliases = {n.lower() for n in
+                      re.findall(r"\bAS\s+(\w+)", select_list, re.I)}
+
+    def order_items(text):
+        items = []
+        for part in split_top(text):
+            dm = re.search(r"\s+(ASC|DESC)\s*$", part, re.I)
+            direction = dm.group(1).upper() if dm else "ASC"
+            expr = part[:dm.start()] if dm else part
+            ref = re.fullmatch(r"\s*(?:(\w+)\.)?(\w+)\s*", expr)
+            if ref and not ref.group(1) \
+                    and ref.group(2).lower() in select_aliases:
+                ref = None          # ordering by a computed column
+            items.append((ref.group(1), ref.group(2), direction) if ref
+                         else (None, None, direction))
+        return items
+
+    order = order_items(_clause(sql, r"ORDER\s+BY"))
+    group = order_items(_clause(sql, r"GROUP\s+BY"))
+    referenced = column_refs(select_list) + column_refs(where)
+    for _, _, on in tables:
+        referenced += column_refs(on)
+    referenced += [(a, c) for a, c, _ in order + group if c]
+    return {"kind": kind, "tables": tables, "aliases": alias_map,
+            "predicates": predicates, "order": order, "group": group,
+            "referenced": referenced,
+            "top": bool(re.search(r"\bTOP\b", sql, re.I)),
+            "aggregate": bool(re.search(r"\b(COUNT|SUM|MIN|MAX|AVG)\s*\(",
+                                        select_list, re.I))}
+
+
+def owner(alias, parsed, default):
+    if alias:
+        return parsed["aliases"].get(alias.lower())
+    return default
+
+
+def index_catalog(schema):
+    """``{table: [index dicts]}`` incl. clustered PKs (assumed for base)."""
+    catalog = {}
+    tables = set(schema["tables"]) | set(BASE_PRIMARY_KEYS)
+    for table in tables:
+        indexes = table_indexes(schema, table)
+        if not any(ix.get("primary") for ix in indexes) \
+                and table in BASE_PRIMARY_KEYS:
+            indexes.insert(0, {
+                "name": f"PK_{table} (assumed)", "table": table,
+                "unique": True, "primary": True,
+                "keys": [[c, "ASC"] for c in BASE_PRIMARY_KEYS[table]],
+                "include": [], "filter": ""})
+        catalog[table] = indexes
+    return catalog
+
+
+def evaluate_index(ix, eq, rng, order, needed, clustered_keys):
+    """(seek_columns, order_ok, covering) for one index."""
+    keys = [k.lower() for k, _ in ix["keys"]]
+    seek = 0
+    eq_prefix = 0
+    for k in keys:
+        if k in eq:
+            seek += 1
+            eq_prefix += 1
+        elif k in rng:
+            seek += 1
+            break
+        else:
+            break
+    order_ok = True
+    if order:
+        rest = ix["keys"][eq_prefix:]
+        wanted = [(c.lower(), d) for c, d in order]
+        if len(rest) < len(wanted):
+            order_ok = False
+        else:
+            same = all(rest[i][0].lower() == c and rest[i][1] == d
+                       for i, (c, d) in enumerate(wanted))
+            flipped = all(rest[i][0].lower() == c and rest[i][1] != d
+                          for i, (c, d) in enumerate(wanted))
+            order_ok = same or flipped
+    if needed is None:
+        covering = bool(ix.get("primary"))
+    else:
+        available = set(keys) | {c.lower() for c in ix["include"]} \
+            | {c.lower() for c in clustered_keys}
+        covering = bool(ix.get("primary")) or needed <= available
+    return seek, order_ok, covering
+
+
+def format_index(ix):
+    cols = ", ".join(k + (" DESC" if d == "DESC" else "") for k, d in ix["keys"])
+    return f"{ix['name']} ({cols})"
+
+
+def suggest_index(table, eq, rng, order, needed, clustered_keys, existing):
+    """CREATE INDEX text for the access, or "" if nothing new is gained."""
+    keys = [[c, "ASC"] for c in sorted(eq)]
+    if order:
+        keys += [[c, d] for c, d in order if c not in eq]
+    elif rng:
+        keys.append([sorted(rng)[0], "ASC"])
+    if not keys:
+        return ""
+    key_names = {k for k, _ in keys}
+    cols = ", ".join(k + (" DESC" if d == "DESC" else "") for k, d in keys)
+    name = f"IX_{table}_" + "_".join(k for k, _ in keys)
+    text = f"CREATE INDEX {name} ON {table}({cols})"
+    if needed:
+        include = sorted(needed - key_names - {c.lower() for c in clustered_keys})
+        if include and len(include) <= MAX_INCLUDE:
+            text += f" INCLUDE ({', '.join(include)})"
+            return text
+    # Without INCLUDE columns the index only helps if its keys are new
+    wanted = [k.lower() for k, _ in keys]
+    for ix in existing:
+        if [k.lower() for k, _ in ix["keys"]][:len(wanted)] == wanted:
+            return ""
+    return text
+
+
+def analyze_statement(sql, catalog, wildcards):
+    """One finding dict per table access in ``sql``."""
+    parsed = parse_select(sql, wildcards)
+    if not parsed:
+        return []
+    findings = []
+    driving = parsed["tables"][0][0]
+    single = parsed["tables"][0][1] if len(parsed["tables"]) == 1 else None
+    star_aliases = {a for a, c in parsed["referenced"] if c == "*"}
+
+    for position, (alias, table, _) in enumerate(parsed["tables"]):
+        key = table.lower()
+        indexes = catalog.get(key) or catalog.get(table)
+        if indexes is None:
+            continue
+
+        def mine(a):
+            return owner(a, parsed, single) == table or (
+                a and a.lower() == alias.lower())
+
+        def outer(a):
+            return a and a.lower() not in parsed["aliases"]
+
+        eq, rng, nonsarg = set(), set(), []
+        for a, col, kind, rhs in parsed["predicates"]:
+            if kind == "join":
+                # The inner side of a nested-loop join (or a correlated
+                # subquery) seeks on its own column
+                inner = position > 0 or outer(rhs[0]) or outer(a)
+                if inner and mine(a):
+                    eq.add(col.lower())
+                elif inner and mine(rhs[0]):
+                    eq.add(rhs[1].lower())
+                continue
+            if kind == "nonsarg":
+                if not a or mine(a):
+                    nonsarg.append(col)
+            elif mine(a):
+                (eq if kind == "eq" else rng).add(col.lower())
+
+        order = []
+        if position == 0:
+            items = parsed["order"] or (parsed["group"] if parsed["aggregate"]
+                                        else [])
+            if all(c and mine(a) for a, c, _ in items):
+                order = [(c.lower(), d) for _, c, d in items]
+            elif items:
+                order = None            # expression or other table: sort
+        if alias in star_aliases or (None in star_aliases and single):
+            needed = None
+        else:
+            needed = {c.lower() for a, c in parsed["referenced"]
+                      if c != "*" and mine(a)}
+            for a, col, kind, rhs in parsed["predicates"]:
+                if kind == "join" and rhs and mine(rhs[0]):
+                    needed.add(rhs[1].lower())
+
+        primary = next((ix for ix in indexes if ix.get("primary")), None)
+        clustered_keys = [k for k, _ in primary["keys"]] if primary else []
+        best = None
+        for ix in indexes:
+            seek, order_ok, covering = evaluate_index(
+                ix, eq, rng, order or [], needed, clustered_keys)
+            # Prefer any seek, then no sort, then more seek columns
+            score = (seek > 0, order_ok, seek, covering, -len(ix["keys"]))
+            if best is None or score > best[0]:
+                best = (score, ix, seek, order_ok, covering)
+        _, ix, seek, order_ok, covering = best
+        if order is None:
+            order_ok = False
+
+        access, severity, issue = classify(
+            key, seek, order_ok, covering, bool(order) or order is None,
+            parsed, eq, rng, nonsarg, position, ix)
+        suggestion = ""
+        if severity in ("High", "Medium") or (severity == "Low" and not covering):
+            if eq or rng or order:
+                suggestion = suggest_index(key, eq, rng, order or [], needed,
+                                           clustered_keys, indexes)
+            elif nonsarg:
+                suggestion = "Predicate cannot seek; needs a rewrite " \
+                             "or a full-text index"
+        if seek or (order and order_ok) or (covering and not ix.get("primary")):
+            used = format_index(ix)
+        else:
+            used = f"clustered {primary['name']}" if primary else "heap"
+        findings.append({
+            "table": key, "alias": alias, "access": access,
+            "severity": severity, "index": used,
+            "issue": issue, "suggestion": suggestion,
+            "predicates": ", ".join(sorted(eq) + [f"{c} (range)"
+                                                  for c in sorted(rng)]
+                                    + [f"{c} (non-sargable)" for c in nonsarg]),
+        })
+    return findings
+
+
+def classify(table, seek, order_ok, covering, has_order, parsed, eq, rng,
+             nonsarg, position, ix):
+    """``(access, severity, issue)`` for one table access."""
+    large = table in LARGE_TABLES
+    if seek:
+        unique_seek = ix.get("unique") and seek >= len(ix["keys"])
+        if covering and (order_ok or not has_order):
+            return "Index seek (covering)", "OK", ""
+        if unique_seek:
+            return "Single-row seek", "OK", ""
+        parts, severity = [], "Low"
+        if not covering:
+            parts.append("key lookups for columns not in the index")
+        if has_order and not order_ok:
+            parts.append("sorts the matches before "
+                         + ("TOP" if parsed["top"] else "returning"))
+            if parsed["top"] and large:
+                severity = "Medium"
+        access = "Index seek" + (" + lookup" if not covering else "") \
+            + (" + sort" if has_order and not order_ok else "")
+        return access, severity, "; ".join(parts)
+    if position > 0:
+        return ("Scan per outer row", "High" if large else "Medium",
+                "no index on the join column")
+    if not (eq or rng or nonsarg):
+        if has_order and order_ok and parsed["top"]:
+            return ("Ordered index scan (TOP)", "OK" if covering else "Low",
+                    "" if covering else "key lookups for the TOP rows")
+        if parsed["aggregate"] and covering and not ix.get("primary"):
+            return "Full index scan", "Low", "aggregates every row"
+        return ("Full scan", "Medium" if large else "Low",
+                "no WHERE clause; reads every row"
+                + (" and sorts" if has_order and not order_ok else ""))
+    why = []
+    if eq or rng:
+        why.append("no index leads with "
+                   + ", ".join(sorted(eq | rng)))
+    if nonsarg:
+        why.append("non-sargable predicate on "
+                   + ", ".join(dict.fromkeys(nonsarg)))
+    if has_order and not order_ok:
+        why.append("sorts the result")
+    return ("Scan", "High" if large else "Medium", "; ".join(why))
+
+
+def analyze(schema):
+    catalog = index_catalog(schema)
+    rows = []
+    for endpoint, rel, line, label, sql, wildcards in extract_queries():
+        sql_clean, subqueries = extract_subqueries(squash(sql))
+        for part_no, text in enumerate([sql_clean] + subqueries):
+            for statement in split_statements(text):
+                for finding in analyze_statement(statement, catalog, wildcards):
+                    rows.append({
+                        "endpoint": endpoint, "file": rel, "line": line,
+                        "scenario": label + (" (subquery)" if part_no else ""),
+                        "sql": statement, **finding})
+    rows.sort(key=lambda r: (SEVERITY_ORDER[r["severity"]], r["endpoint"],
+                             r["line"]))
+    return rows
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  OUTPUT
+# ══════════════════════════════════════════════════════════════════════
+
+def short_sql(sql, width=70):
+    sql = squash(sql)
+    return sql if len(sql) <= width else sql[:width - 1] + "…"
+
+
+def suggestions(rows):
+    """Distinct suggested indexes with the accesses they would fix."""
+    counts = Counter(r["suggestion"] for r in rows
+                     if r["suggestion"].startswith("CREATE INDEX"))
+    return counts.most_common()
+
+
+def write_markdown(rows, path):
+    counts = Counter(r["severity"] for r in rows)
+    lines = ["# Index Coverage Appendix", "",
+             f"{len(rows)} table accesses checked: " + ", ".join(
+                 f"{counts[s]} {s}" for s in SEVERITY_ORDER), "",
+             "| Severity | Endpoint | Line | Scenario | Table | Access | "
+             "Index | Issue |", "|---|---|---|---|---|---|---|---|"]
+    for r in rows:
+        if r["severity"] == "OK":
+            continue
+        cells = [r["severity"], r["endpoint"], r["line"], r["scenario"] or "—",
+                 r["table"], r["access"], r["index"], r["issue"] or "—"]
+        lines.append("| " + " | ".join(str(c).replace("|", "\\|")
+                                        for c in cells) + " |")
+    lines += ["", "## Suggested indexes", ""]
+    for text, n in suggestions(rows):
+        lines += [f"- `{text}` ({n} accesses)"]
+    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"  [OK] {Path(path).name}")
+
+
+def build_coverage_report(input_path=None, out_path=None, rows=None):
+    """Write the index-coverage DOCX appendix; return its path.
+
+    ``input_path`` is the migration route to take indexes from.
+    """
+    from docx.shared import Pt
+    from generate_all_docx import (
+        add_heading_styled, add_para, setup_doc, styled_table,
+    )
+
+    out_path = Path(out_path) if out_path else OUT
+    if rows is None:
+        rows = analyze(load_schema(input_path) if input_path
+                       else load_schema())
+    counts = Counter(r["severity"] for r in rows)
+    print(f"  Index coverage: {len(rows)} table accesses, "
+          f"{counts['High']} high, {counts['Medium']} medium, "
+          f"{counts['Low']} low")
+
+    doc = setup_doc("Index Coverage Appendix",
+                    "Route SQL checked against the migration indexes")
+    add_heading_styled(doc, "1. Summary", level=2)
+    add_para(doc, "Static analysis of the SQL literals in app/api and "
+                  "lib/db callers against the indexes created by "
+                  "app/api/admin/migrate/route.ts. Dynamic WHERE clauses are "
+                  "checked once with no filter and once per optional filter.",
+             size=Pt(9))
+    styled_table(doc, ["Severity", "Accesses", "Meaning"], [
+        ["High", f"{counts['High']:,}", "Scan of a table that grows with "
+                                        "photo volume"],
+        ["Medium", f"{counts['Medium']:,}", "Scan of a small table, full "
+                                            "scan, or sort before TOP"],
+        ["Low", f"{counts['Low']:,}", "Seek with key lookups or a small sort"],
+        ["OK", f"{counts['OK']:,}", "Covering seek or single-row lookup"],
+    ], col_widths=[16, 14, 70])
+
+    add_heading_styled(doc, "2. Findings", level=2)
+    styled_table(doc, ["Severity", "Endpoint", "Scenario", "Table",
+                       "Access", "Issue"], [
+        [r["severity"], f"{r['endpoint']} (line {r['line']})",
+         r["scenario"] or "—", r["table"], r["access"], r["issue"] or "—"]
+        for r in rows if r["severity"] != "OK"
+    ], col_widths=[10, 26, 14, 12, 16, 22])
+
+    add_heading_styled(doc, "3. Suggested Indexes", level=2)
+    suggested = suggestions(rows)
+    if suggested:
+        styled_table(doc, ["Index", "Accesses Fixed"], [
+            [text, f"{n}"] for text, n in suggested
+        ], col_widths=[82, 18])
+    else:
+        add_para(doc, "No missing indexes found.")
+
+    add_heading_styled(doc, "4. All Accesses", level=2)
+    styled_table(doc, ["Endpoint", "Query", "Table", "Predicates", "Index",
+                       "Severity"], [
+        [r["endpoint"] + (f" [{r['scenario']}]" if r["scenario"] else ""),
+         short_sql(r["sql"]), r["table"], r["predicates"] or "—",
+         r["index"], r["severity"]]
+        for r in rows
+    ], col_widths=[20, 30, 10, 14, 18, 8])
+
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check route SQL against the migration indexes")
+    parser.add_argument("--out", default=str(OUT), help="output DOCX path")
+    parser.add_argument("--md", help="also write the findings as markdown")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if any high-severity scan is found "
+                             "(no DOCX)")
+    args = parser.parse_args()
+
+    if args.check:
+        rows = analyze(load_schema())
+        high = [r for r in rows if r["severity"] == "High"]
+        for r in high:
+            print(f"  [SCAN] {r['endpoint']} line {r['line']} "
+                  f"{r['scenario']}: {r['table']} — {r['issue']}")
+        if args.md:
+            write_markdown(rows, args.md)
+        if high:
+            sys.exit(1)
+        print(f"  [OK] {len(rows)} table accesses, no high-severity scans")
+        return
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Index Coverage")
+    print("=" * 60)
+    rows = analyze(load_schema())
+    build_coverage_report(out_path=args.out, rows=rows)
+    if args.md:
+        write_markdown(rows, args.md)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
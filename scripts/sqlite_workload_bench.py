@@ -0,0 +1,737 @@
+"""
+Replay the admin photo queries against a synthetic 1M-photo database.
+
+Builds a local SQLite stand-in for the Azure SQL database: the photos and
+upload_sessions base tables from the Deployment Guide (§5.1) plus the
+tables, columns and indexes of the migration route, parsed with
+schema_reference. Tables are WITHOUT ROWID so the primary key is the
+clustered key, as in SQL Server. SQLite has no INCLUDE, so included
+columns are appended to the index key: the same indexes cover the same
+queries, though SQLite may also seek on those trailing columns.
+
+The synthetic data follows the shape of real deployments: photos arrive
+in upload sessions, sessions belong to incidents with a skewed (Zipf)
+share of the traffic, most photos carry 1-3 tags and EXIF. It is
+generated with NumPy and bulk-loaded once; the database file is reused
+while --photos and --seed stay the same.
+
+The replay issues the SQL of `GET /api/admin/photos` (list + count, with
+the route's filter mix and page sizes up to 200), the photo detail
+queries and `GET /api/admin/photos/stats`, translated from T-SQL by
+`to_sqlite`. Pagination is walked page by page both with the route's
+cursor (keyset on created_at) and with OFFSET, to show how each degrades
+with depth. Per-query latency percentiles and the SQLite query plans go
+into a branded DOCX.
+
+SQLite is not SQL Server: absolute times are optimistic (in-process, no
+network), but index choice, scans vs seeks and the keyset/OFFSET gap
+carry over.
+
+Run:  python scripts/sqlite_workload_bench.py [--photos 1000000] [--requests 2000] [--out FILE]
+Requires: pip install numpy python-docx
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+from docx.shared import Pt
+
+from generate_all_docx import (
+    DOCS, add_heading_styled, add_para, setup_doc, styled_table,
+)
+from schema_reference import (
+    PARSER_KEY, load_schema, parse_statement, table_indexes,
+)
+
+OUT = DOCS / "ASPR_Photos_Query_Benchmark.docx"
+BASE_DDL = DOCS / "04_Deployment_Operations_Guide.md"
+BASE_TABLES = ("upload_sessions", "photos")
+BENCH_TABLES = ("upload_sessions", "photos", "tags", "photo_tags",
+                "photo_exif")
+
+DATA_START = np.datetime64("2024-10-01T00:00:00")
+DATA_END = np.datetime64("2026-10-01T00:00:00")
+PHOTOS_PER_SESSION = 60
+INCIDENTS = 150
+INCIDENT_ZIPF = 1.2
+NO_INCIDENT_SHARE = 0.12
+TAGS = 300
+TAGS_PER_PHOTO = 1.6
+EXIF_SHARE = 0.8
+GPS_SHARE = 0.7
+LOAD_CHUNK = 100_000
+
+STATUSES = [("active", 0.70), ("reviewed", 0.18), ("flagged", 0.04),
+            ("archived", 0.08)]
+TAG_CATEGORIES = ["damage", "infrastructure", "medical", "shelter",
+                  "logistics", "custom"]
+CAMERAS = [("Apple", "iPhone 15"), ("Apple", "iPhone 13"),
+           ("Samsung", "SM-S918U"), ("Google", "Pixel 8"),
+           ("Canon", "EOS R6"), ("Sony", "ILCE-7M4")]
+LOCATIONS = ["Shelter", "Hospital", "Bridge", "Main St", "Fire Station",
+             "School", "Water Plant", "Clinic", "Staging Area", "Levee"]
+
+# ── Workload mix (per GET /api/admin/photos request) ────────────────
+SCENARIOS = [
+    # (name, share, route filters)
+    ("no filter", 0.30, ()),
+    ("incident", 0.28, ("incident",)),
+    ("incident + status", 0.10, ("incident", "status")),
+    ("status", 0.08, ("status",)),
+    ("date range", 0.10, ("dateFrom", "dateTo")),
+    ("session", 0.06, ("sessionId",)),
+    ("search", 0.04, ("search",)),
+    ("incident + search", 0.04, ("incident", "search")),
+]
+PAGE_SIZES = [(50, 0.6), (100, 0.3), (200, 0.1)]
+OLDEST_SHARE = 0.1
+FILTER_STATUSES = [("flagged", 0.5), ("reviewed", 0.3), ("active", 0.2)]
+PAGE_DEPTHS = [1, 10, 50]
+PAGINATION_SCENARIOS = ["no filter", "incident"]
+PERCENTILES = [50, 90, 95, 99]
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  ROUTE SQL (T-SQL, as in app/api/admin/photos/...)
+# ══════════════════════════════════════════════════════════════════════
+
+# app/api/admin/photos/route.ts — conditions pushed per query parameter
+ROUTE_FILTERS = {
+    "cursor": "p.created_at < (SELECT created_at FROM photos WHERE id = @cursor)",
+    "incident": "p.incident_id = @incident",
+    "status": "p.status = @status",
+    "dateFrom": "p.created_at >= @dateFrom",
+    "dateTo": "p.created_at <= @dateTo",
+    "sessionId": "p.session_id = @sessionId",
+    "search": "(p.file_name LIKE @search OR p.location_name LIKE @search "
+              "OR p.notes LIKE @search OR p.incident_id LIKE @search)",
+}
+
+LIST_SQL = """
+SELECT TOP (@limit)
+  p.id, p.session_id, p.file_name, p.file_size, p.width, p.height,
+  p.mime_type, p.latitude, p.longitude, p.location_name, p.notes,
+  p.incident_id, p.status, p.storage_tier, p.date_taken, p.camera_info,
+  p.created_at, p.updated_at, p.updated_by,
+  s.team_name
+FROM photos p
+LEFT JOIN upload_sessions s ON p.session_id = s.id
+WHERE {where}
+ORDER BY {order}"""
+
+COUNT_SQL = "SELECT COUNT(*) as total FROM photos p WHERE {where}"
+
+# app/api/admin/photos/[id]/route.ts
+DETAIL_SQL = {
+    "detail: photo + exif": """
+SELECT p.*, s.team_name,
+       e.camera_make, e.camera_model, e.lens_model,
+       e.focal_length, e.aperture, e.shutter_speed,
+       e.iso_speed, e.flash_used, e.orientation,
+       e.gps_altitude, e.date_taken_exif, e.software, e.raw_json
+FROM photos p
+LEFT JOIN upload_sessions s ON p.session_id = s.id
+LEFT JOIN photo_exif e ON p.id = e.photo_id
+WHERE p.id = @id""",
+    "detail: tags": """
+SELECT t.id, t.name, t.category, t.color, pt.added_by, pt.added_at
+FROM photo_tags pt
+JOIN tags t ON pt.tag_id = t.id
+WHERE pt.photo_id = @id""",
+}
+
+# app/api/admin/photos/stats/route.ts
+STATS_SQL = {
+    "stats: totals": """
+SELECT
+  COUNT(*) AS total_photos,
+  ISNULL(SUM(file_size), 0) AS total_size_bytes,
+  COUNT(DISTINCT session_id) AS total_teams,
+  COUNT(DISTINCT incident_id) AS total_incidents,
+  SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) AS active_count,
+  SUM(CASE WHEN status = 'reviewed' THEN 1 ELSE 0 END) AS reviewed_count,
+  SUM(CASE WHEN status = 'flagged' THEN 1 ELSE 0 END) AS flagged_count,
+  SUM(CASE WHEN status = 'archived' THEN 1 ELSE 0 END) AS archived_count,
+  MIN(created_at) AS earliest_upload,
+  MAX(created_at) AS latest_upload
+FROM photos""",
+    "stats: per incident": """
+SELECT
+  ISNULL(incident_id, '(No Incident)') AS incident_id,
+  COUNT(*) AS photo_count,
+  SUM(file_size) AS total_size_bytes,
+  COUNT(DISTINCT session_id) AS team_count,
+  MIN(created_at) AS first_upload,
+  MAX(created_at) AS last_upload
+FROM photos
+GROUP BY ISNULL(incident_id, '(No Incident)')
+ORDER BY MAX(created_at) DESC""",
+    "stats: daily": """
+SELECT
+  CAST(created_at AS DATE) AS upload_date,
+  COUNT(*) AS photo_count,
+  SUM(file_size) AS total_size
+FROM photos
+WHERE created_at >= DATEADD(DAY, -30, GETDATE())
+GROUP BY CAST(created_at AS DATE)
+ORDER BY upload_date DESC""",
+    "stats: top teams": """
+SELECT TOP 10
+  s.team_name,
+  COUNT(p.id) AS photo_count,
+  SUM(p.file_size) AS total_size
+FROM photos p
+JOIN upload_sessions s ON p.session_id = s.id
+GROUP BY s.team_name
+ORDER BY COUNT(p.id) DESC""",
+}
+
+
+def to_sqlite(sql):
+    """Translate the T-SQL used by the routes into SQLite.
+
+    Named @params work in SQLite as-is; GETDATE() becomes @now so the
+    replay is anchored to the end of the synthetic data.
+    """
+    top = re.search(r"\bTOP\s*\(?\s*(@\w+|\d+)\s*\)?\s*", sql, re.I)
+    if top:
+        sql = sql[:top.start()] + sql[top.end():] + f"\nLIMIT {top.group(1)}"
+    sql = re.sub(r"\bISNULL\s*\(", "IFNULL(", sql, flags=re.I)
+    sql = re.sub(r"\bCAST\s*\(\s*([\w.]+)\s+AS\s+DATE\s*\)", r"date(\1)", sql,
+                 flags=re.I)
+    sql = re.sub(r"\bDATEADD\s*\(\s*DAY\s*,\s*(-?\d+)\s*,\s*GETDATE\(\)\s*\)",
+                 r"strftime('%Y-%m-%dT%H:%M:%S', @now, '\1 days')", sql,
+                 flags=re.I)
+    return re.sub(r"\bGETDATE\(\)", "@now", sql, flags=re.I)
+
+
+def list_sql(filters, oldest=False, offset=False):
+    where = " AND ".join(["1=1"] + [ROUTE_FILTERS[f] for f in filters])
+    order = "p.created_at ASC" if oldest else "p.created_at DESC"
+    sql = to_sqlite(LIST_SQL.format(where=where, order=order))
+    return sql + " OFFSET @offset" if offset else sql
+
+
+def count_sql(filters):
+    where = " AND ".join(["1=1"] + [ROUTE_FILTERS[f] for f in filters])
+    return to_sqlite(COUNT_SQL.format(where=where))
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SCHEMA
+# ══════════════════════════════════════════════════════════════════════
+
+def bench_schema():
+    """Base tables from the Deployment Guide merged with the migration."""
+    schema = {"tables": {}, "indexes": [], "views": [], "steps": 0}
+    text = BASE_DDL.read_text(encoding="utf-8")
+    for m in re.finditer(r"CREATE TABLE (\w+) \(.*?\n\);", text, re.S):
+        if m.group(1) in BASE_TABLES:
+            parse_statement(schema, m.group(0), BASE_DDL.name)
+    migrated = load_schema()
+    for name, table in migrated["tables"].items():
+        base = schema["tables"].setdefault(name, table)
+        if base is not table:
+            known = {c["name"] for c in base["columns"]}
+            base["columns"] += [c for c in table["columns"]
+                                if c["name"] not in known]
+            base["constraints"] += [c for c in table["constraints"]
+                                    if c["kind"] != "PRIMARY KEY"]
+    schema["indexes"] = migrated["indexes"]
+    return schema
+
+
+def sqlite_type(sql_type):
+    t = sql_type.upper()
+    if t.startswith(("INT", "BIGINT", "BIT", "SMALLINT", "TINYINT")):
+        return "INTEGER"
+    if t.startswith(("FLOAT", "REAL", "DECIMAL", "NUMERIC")):
+        return "REAL"
+    return "TEXT"
+
+
+def sqlite_ddl(schema):
+    """``(tables, indexes)`` CREATE statements for BENCH_TABLES."""
+    tables, indexes = [], []
+    for name in BENCH_TABLES:
+        table = schema["tables"][name]
+        cols = [f"{c['name']} {sqlite_type(c['type'])}"
+                for c in table["columns"]]
+        pk = next(c for c in table["constraints"] if c["kind"] == "PRIMARY KEY")
+        cols.append(f"PRIMARY KEY ({', '.join(pk['columns'])})")
+        tables.append(f"CREATE TABLE {name} ({', '.join(cols)}) WITHOUT ROWID")
+        for ix in table_indexes(schema, name):
+            if ix.get("primary"):
+                continue
+            keys = [f"{k} {d}" for k, d in ix["keys"]]
+            keys += [c for c in ix["include"]
+                     if c not in {k for k, _ in ix["keys"]}]
+            unique = "UNIQUE " if ix["unique"] and not ix["include"] else ""
+            where = f" WHERE {ix['filter']}" if ix["filter"] else ""
+            indexes.append(f"CREATE {unique}INDEX {ix['name']} ON "
+                           f"{name}({', '.join(keys)}){where}")
+    return tables, indexes
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  SYNTHETIC DATA
+# ══════════════════════════════════════════════════════════════════════
+
+def uuids(rng, n):
+    raw = rng.bytes(16 * n)
+    return [str(uuid.UUID(bytes=raw[i:i + 16])) for i in range(0, 16 * n, 16)]
+
+
+def timestamps(seconds):
+    """ISO-8601 text for offsets (in seconds) from DATA_START."""
+    values = DATA_START + seconds.astype("timedelta64[s]")
+    return np.datetime_as_string(np.minimum(values, DATA_END), unit="s")
+
+
+def pick(rng, choices, n):
+    values, weights = zip(*choices)
+    return np.asarray(values)[rng.choice(len(values), n, p=weights)]
+
+
+def generate(n_photos, seed):
+    """Column dicts (lists of Python values) for every bench table."""
+    rng = np.random.default_rng(seed)
+    span = int((DATA_END - DATA_START) / np.timedelta64(1, "s"))
+    n_sessions = max(1, n_photos // PHOTOS_PER_SESSION)
+
+    # Incidents: start time, duration and a Zipf-like share of sessions
+    inc_start = rng.uniform(0, span * 0.95, INCIDENTS)
+    inc_days = rng.exponential(14, INCIDENTS) + 2
+    inc_weight = 1 / np.arange(1, INCIDENTS + 1) ** INCIDENT_ZIPF
+    inc_weight = inc_weight / inc_weight.sum() * (1 - NO_INCIDENT_SHARE)
+    inc_ids = np.array([f"HU-{2024 + int(s // 31_536_000)}-{k + 1:03d}"
+                        for k, s in enumerate(inc_start)] + [None], dtype=object)
+    inc_lat = rng.uniform(25, 45, INCIDENTS + 1)
+    inc_lon = rng.uniform(-120, -75, INCIDENTS + 1)
+
+    sess_inc = rng.choice(INCIDENTS + 1, n_sessions,
+                          p=np.append(inc_weight, NO_INCIDENT_SHARE))
+    sess_start = np.where(
+        sess_inc < INCIDENTS,
+        inc_start[np.minimum(sess_inc, INCIDENTS - 1)]
+        + rng.exponential(1, n_sessions)
+        * inc_days[np.minimum(sess_inc, INCIDENTS - 1)] * 86400,
+        rng.uniform(0, span, n_sessions))
+    sess_start = np.minimum(sess_start, span - 86400)
+    sessions = {
+        "id": uuids(rng, n_sessions),
+        "pin": ["$2a$10$" + "x" * 53] * n_sessions,
+        "team_name": [f"Team {k:05d}" for k in range(n_sessions)],
+        "is_active": (rng.random(n_sessions) < 0.1).astype(int).tolist(),
+        "created_at": timestamps(sess_start).tolist(),
+        "expires_at": timestamps(sess_start + 7 * 86400).tolist(),
+    }
+
+    # Photos: a lognormal share per session, spread over a few hours
+    share = rng.lognormal(0, 1, n_sessions)
+    per_session = rng.multinomial(n_photos, share / share.sum())
+    sess_of = np.repeat(np.arange(n_sessions), per_session)
+    incident = sess_inc[sess_of]
+    created = sess_start[sess_of] + rng.exponential(3 * 3600, n_photos)
+    created_text = timestamps(created)
+    has_gps = rng.random(n_photos) < GPS_SHARE
+    lat = np.where(has_gps, inc_lat[incident] + rng.normal(0, 0.05, n_photos),
+                   np.nan)
+    lon = np.where(has_gps, inc_lon[incident] + rng.normal(0, 0.05, n_photos),
+                   np.nan)
+    status = pick(rng, STATUSES, n_photos)
+    width = pick(rng, [(4032, 0.6), (3024, 0.3), (1920, 0.1)], n_photos)
+    photo_ids = uuids(rng, n_photos)
+    session_ids = np.asarray(sessions["id"], dtype=object)[sess_of]
+    location = np.asarray(LOCATIONS, dtype=object)[
+        rng.integers(0, len(LOCATIONS), n_photos)]
+    camera = rng.integers(0, len(CAMERAS), n_photos)
+    photos = {
+        "id": photo_ids,
+        "session_id": session_ids.tolist(),
+        "file_name": [f"IMG_{k:05d}.jpg"
+                      for k in rng.integers(0, 99999, n_photos)],
+        "blob_url": [f"{p}/original" for p in photo_ids],
+        "file_size": rng.lognormal(15, 0.5, n_photos).astype(int).tolist(),
+        "width": width.tolist(),
+        "height": (width * 3 // 4).tolist(),
+        "mime_type": ["image/jpeg"] * n_photos,
+        "latitude": [None if np.isnan(v) else round(v, 6) for v in lat],
+        "longitude": [None if np.isnan(v) else round(v, 6) for v in lon],
+        "location_name": [f"{name} {k % 40}" for k, name in
+                          zip(rng.integers(0, 1000, n_photos), location)],
+        "notes": [None if r > 0.15 else "Water damage to structure"
+                  for r in rng.random(n_photos)],
+        "incident_id": inc_ids[incident].tolist(),
+        "status": status.tolist(),
+        "storage_tier": np.where(created < span - 90 * 86400, "cool",
+                                 "hot").tolist(),
+        "date_taken": created_text.tolist(),
+        "camera_info": [f"{CAMERAS[c][0]} {CAMERAS[c][1]}" for c in camera],
+        "created_at": created_text.tolist(),
+    }
+
+    tag_ids = uuids(rng, TAGS)
+    tags = {
+        "id": tag_ids,
+        "name": [f"tag-{k:03d}" for k in range(TAGS)],
+        "category": [TAG_CATEGORIES[k % len(TAG_CATEGORIES)]
+                     for k in range(TAGS)],
+        "color": ["#155197"] * TAGS,
+        "created_at": ["2024-10-01T00:00:00"] * TAGS,
+    }
+
+    # photo_tags: Poisson count per photo, tag popularity Zipf-like
+    n_tags = rng.poisson(TAGS_PER_PHOTO, n_photos)
+    tag_photo = np.repeat(np.arange(n_photos), n_tags)
+    tag_weight = 1 / np.arange(1, TAGS + 1)
+    tag_pick = rng.choice(TAGS, len(tag_photo), p=tag_weight / tag_weight.sum())
+    pairs = np.unique(tag_photo.astype(np.int64) * TAGS + tag_pick)
+    pair_photo, pair_tag = pairs // TAGS, pairs % TAGS
+    photo_tags = {
+        "photo_id": [photo_ids[k] for k in pair_photo],
+        "tag_id": [tag_ids[k] for k in pair_tag],
+        "added_by": ["admin@aspr.hhs.gov"] * len(pairs),
+        "added_at": created_text[pair_photo].tolist(),
+    }
+
+    exif_rows = np.flatnonzero(rng.random(n_photos) < EXIF_SHARE)
+    photo_exif = {
+        "photo_id": [photo_ids[k] for k in exif_rows],
+        "camera_make": [CAMERAS[c][0] for c in camera[exif_rows]],
+        "camera_model": [CAMERAS[c][1] for c in camera[exif_rows]],
+        "focal_length": rng.choice([4.2, 6.9, 24.0, 50.0],
+                                   len(exif_rows)).tolist(),
+        "aperture": rng.choice([1.8, 2.2, 4.0], len(exif_rows)).tolist(),
+        "iso_speed": rng.choice([50, 100, 400, 1600], len(exif_rows)).tolist(),
+        "orientation": [1] * len(exif_rows),
+        "date_taken_exif": created_text[exif_rows].tolist(),
+    }
+    return {"upload_sessions": sessions, "photos": photos, "tags": tags,
+            "photo_tags": photo_tags, "photo_exif": photo_exif}
+
+
+def load_database(db_path, n_photos, seed, schema):
+    """Create and fill the database unless a matching one exists."""
+    tables, indexes = sqlite_ddl(schema)
+    key = json.dumps({"photos": n_photos, "seed": seed, "parser": PARSER_KEY,
+                      "ddl": tables + indexes})
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            if conn.execute("SELECT value FROM bench_meta").fetchone()[0] == key:
+                print(f"  Reusing {db_path}")
+                return conn, None
+        except sqlite3.Error:
+            pass
+        conn.close()
+        os.remove(db_path)
+
+    t0 = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    for ddl in tables:
+        conn.execute(ddl)
+    print(f"  Generating {n_photos:,} photos (seed {seed})")
+    data = generate(n_photos, seed)
+    for name in BENCH_TABLES:
+        columns = data[name]
+        names = list(columns)
+        rows = list(zip(*columns.values()))
+        sql = (f"INSERT INTO {name} ({', '.join(names)}) VALUES "
+               f"({', '.join('?' * len(names))})")
+        for start in range(0, len(rows), LOAD_CHUNK):
+            conn.executemany(sql, rows[start:start + LOAD_CHUNK])
+        print(f"  [OK] {name}: {len(rows):,} rows")
+    del data
+    for ddl in indexes:
+        conn.execute(ddl)
+    conn.execute("ANALYZE")
+    conn.execute("CREATE TABLE bench_meta (value TEXT)")
+    conn.execute("INSERT INTO bench_meta VALUES (?)", (key,))
+    conn.commit()
+    seconds = time.perf_counter() - t0
+    print(f"  [OK] Loaded and indexed in {seconds:.1f} s")
+    return conn, seconds
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  REPLAY
+# ══════════════════════════════════════════════════════════════════════
+
+class Bench:
+    """Timed query execution, grouped by query class."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.samples = defaultdict(list)
+        self.plans = {}
+        self.rows = defaultdict(int)
+
+    def run(self, label, sql, params):
+        if label not in self.plans:
+            plan = self.conn.execute("EXPLAIN QUERY PLAN " + sql,
+                                     params).fetchall()
+            self.plans[label] = "; ".join(row[-1] for row in plan)
+        t0 = time.perf_counter()
+        rows = self.conn.execute(sql, params).fetchall()
+        self.samples[label].append((time.perf_counter() - t0) * 1000)
+        self.rows[label] += len(rows)
+        return rows
+
+    def summary(self, label):
+        ms = np.asarray(self.samples[label])
+        return {"runs": len(ms), "mean": float(ms.mean()),
+                "max": float(ms.max()),
+                **{f"p{p}": float(np.percentile(ms, p)) for p in PERCENTILES}}
+
+
+class ParamSampler:
+    """Request parameters drawn from the data, weighted like real use."""
+
+    def __init__(self, conn, rng):
+        self.rng = rng
+        incidents = conn.execute(
+            "SELECT incident_id, COUNT(*) FROM photos "
+            "WHERE incident_id IS NOT NULL GROUP BY incident_id").fetchall()
+        self.incidents = [i for i, _ in incidents]
+        counts = np.array([n for _, n in incidents], dtype=float)
+        self.incident_p = counts / counts.sum()
+        self.sessions = [r[0] for r in conn.execute(
+            "SELECT id FROM upload_sessions")]
+        self.now = str(DATA_END)
+
+    def incident(self):
+        return self.incidents[self.rng.choice(len(self.incidents),
+                                              p=self.incident_p)]
+
+    def photo_id(self, conn):
+        """A uniformly random photo: the first ID after a random UUID."""
+        probe = str(uuid.UUID(bytes=self.rng.bytes(16)))
+        row = conn.execute("SELECT id FROM photos WHERE id >= ? ORDER BY id "
+                           "LIMIT 1", (probe,)).fetchone()
+        return row[0] if row else probe
+
+    def params(self, filters):
+        params = {"now": self.now}
+        if "incident" in filters:
+            params["incident"] = self.incident()
+        if "status" in filters:
+            params["status"] = str(pick(self.rng, FILTER_STATUSES, 1)[0])
+        if "dateFrom" in filters:
+            span = int((DATA_END - DATA_START) / np.timedelta64(1, "D"))
+            start = DATA_START + np.timedelta64(
+                int(self.rng.integers(0, span - 7)), "D")
+            params["dateFrom"] = str(start)
+            params["dateTo"] = str(start + np.timedelta64(7, "D"))
+        if "sessionId" in filters:
+            params["sessionId"] = self.sessions[
+                int(self.rng.integers(0, len(self.sessions)))]
+        if "search" in filters:
+            params["search"] = f"%{LOCATIONS[self.rng.integers(0, len(LOCATIONS))]}%"
+        return params
+
+
+def replay_requests(bench, sampler, n_requests, rng):
+    """The route's list + count (+ one detail view) per request."""
+    names, shares, filters = zip(*SCENARIOS)
+    picks = rng.choice(len(SCENARIOS), n_requests, p=shares)
+    limits = pick(rng, PAGE_SIZES, n_requests)
+    oldest = rng.random(n_requests) < OLDEST_SHARE
+    for k, scenario in enumerate(picks):
+        params = sampler.params(filters[scenario])
+        params["limit"] = int(limits[k])
+        bench.run(f"list: {names[scenario]}",
+                  list_sql(filters[scenario], oldest=oldest[k]), params)
+        params.pop("limit")
+        bench.run(f"count: {names[scenario]}", count_sql(filters[scenario]),
+                  params)
+        photo = {"id": sampler.photo_id(bench.conn)}
+        for label, sql in DETAIL_SQL.items():
+            bench.run(label, to_sqlite(sql), photo)
+        if (k + 1) % 500 == 0:
+            print(f"  ... {k + 1:,} requests")
+
+
+def replay_pagination(bench, sampler, walks, limit=50):
+    """Walk PAGE_DEPTHS pages with the route's cursor and with OFFSET."""
+    filters = dict((name, f) for name, _, f in SCENARIOS)
+    max_depth = max(PAGE_DEPTHS)
+    for scenario in PAGINATION_SCENARIOS:
+        for _ in range(walks):
+            params = sampler.params(filters[scenario])
+            params["limit"] = limit
+            cursor = None
+            for page in range(1, max_depth + 1):
+                keyset = dict(params)
+                keyset_filters = filters[scenario]
+                if cursor:
+                    keyset["cursor"] = cursor
+                    keyset_filters = ("cursor",) + keyset_filters
+                rows = bench.run(f"keyset {scenario} @{page}",
+                                 list_sql(keyset_filters), keyset)
+                if page in PAGE_DEPTHS:
+                    bench.run(f"offset {scenario} @{page}",
+                              list_sql(filters[scenario], offset=True),
+                              {**params, "offset": (page - 1) * limit})
+                if len(rows) < limit:
+                    break
+                cursor = rows[-1][0]
+
+
+def replay_stats(bench, runs, now):
+    for _ in range(runs):
+        for label, sql in STATS_SQL.items():
+            bench.run(label, to_sqlite(sql), {"now": now})
+
+
+# ══════════════════════════════════════════════════════════════════════
+#  REPORT
+# ══════════════════════════════════════════════════════════════════════
+
+def fmt_ms(ms):
+    return f"{ms:,.2f}" if ms < 10 else f"{ms:,.0f}"
+
+
+def latency_row(bench, label):
+    s = bench.summary(label)
+    return [label, f"{s['runs']:,}", *(fmt_ms(s[f"p{p}"]) for p in
+                                      (50, 95, 99)), fmt_ms(s["max"])]
+
+
+def write_report(bench, dataset, out_path=OUT):
+    doc = setup_doc("Admin Query Benchmark",
+                    f"SQLite replay — {dataset['photos']:,} photos")
+    add_heading_styled(doc, "1. Dataset", level=2)
+    add_para(doc, "Synthetic data bulk-loaded into a SQLite stand-in with the "
+                  "migration indexes (INCLUDE columns appended to the key). "
+                  "Times are in-process milliseconds; compare them with each "
+                  "other rather than with Azure SQL.", size=Pt(9))
+    styled_table(doc, ["Table", "Rows"], [
+        [name, f"{n:,}"] for name, n in dataset["rows"].items()
+    ] + [["Database file", f"{dataset['db_mb']:,.0f} MB"],
+         ["Load + index build", f"{dataset['load_s']:.1f} s"
+          if dataset["load_s"] else "reused"]], col_widths=[60, 40])
+
+    headers = ["Query", "Runs", "p50 ms", "p95 ms", "p99 ms", "Max ms"]
+    widths = [40, 12, 12, 12, 12, 12]
+    add_heading_styled(doc, "2. GET /api/admin/photos", level=2)
+    add_para(doc, "List and count queries as the route builds them, for the "
+                  "filter mix " + ", ".join(
+                      f"{name} {share:.0%}" for name, share, _ in SCENARIOS)
+             + "; page sizes " + ", ".join(
+                 f"{n} ({share:.0%})" for n, share in PAGE_SIZES) + ".",
+             size=Pt(9))
+    styled_table(doc, headers, [
+        latency_row(bench, f"{kind}: {name}")
+        for kind in ("list", "count") for name, _, _ in SCENARIOS
+        if f"{kind}: {name}" in bench.samples
+    ], col_widths=widths)
+
+    add_heading_styled(doc, "3. Pagination Depth", level=2)
+    add_para(doc, "Pages of 50 walked with the route's cursor (keyset on "
+                  "created_at) and with OFFSET. Keyset cost stays flat with "
+                  "depth; OFFSET reads and discards every earlier row.",
+             size=Pt(9))
+    rows = []
+    for scenario in PAGINATION_SCENARIOS:
+        for depth in PAGE_DEPTHS:
+            k, o = f"keyset {scenario} @{depth}", f"offset {scenario} @{depth}"
+            if k not in bench.samples or o not in bench.samples:
+                continue
+            ks, os_ = bench.summary(k), bench.summary(o)
+            rows.append([scenario, f"{depth:,}", f"{(depth - 1) * 50:,}",
+                         fmt_ms(ks["p50"]), fmt_ms(ks["p95"]),
+                         fmt_ms(os_["p50"]), fmt_ms(os_["p95"])])
+    styled_table(doc, ["Filter", "Page", "Rows Skipped", "Keyset p50",
+                       "Keyset p95", "OFFSET p50", "OFFSET p95"], rows,
+                 col_widths=[16, 10, 16, 14, 14, 15, 15])
+
+    add_heading_styled(doc, "4. Detail and Stats Endpoints", level=2)
+    styled_table(doc, headers, [
+        latency_row(bench, label) for label in [*DETAIL_SQL, *STATS_SQL]
+    ], col_widths=widths)
+
+    add_heading_styled(doc, "5. Query Plans", level=2)
+    styled_table(doc, ["Query", "SQLite Plan"], [
+        [label, plan] for label, plan in bench.plans.items()
+        if not label.startswith(("keyset", "offset")) or label.endswith(" @1")
+        or label.endswith(f" @{max(PAGE_DEPTHS)}")
+    ], col_widths=[30, 70])
+
+    out_path = Path(out_path)
+    doc.save(str(out_path))
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  [OK] {out_path.name} ({size_kb:.1f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay admin photo queries against synthetic SQLite data")
+    parser.add_argument("--photos", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="GET /api/admin/photos requests to replay")
+    parser.add_argument("--walks", type=int, default=3,
+                        help="pagination walks per filter")
+    parser.add_argument("--stats-runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", help="SQLite file (default: temp dir, "
+                                     "reused across runs)")
+    parser.add_argument("--out", default=str(OUT), help="output DOCX path")
+    parser.add_argument("--json", help="also write the latency summary here")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(
+        tempfile.gettempdir(), f"aspr_photos_bench_{args.photos}_{args.seed}.db")
+
+    print("=" * 60)
+    print("  ASPR Photo Repository — Admin Query Benchmark")
+    print("=" * 60)
+    conn, load_s = load_database(db_path, args.photos, args.seed,
+                                 bench_schema())
+    rng = np.random.default_rng(args.seed + 1)
+    sampler = ParamSampler(conn, rng)
+    bench = Bench(conn)
+
+    t0 = time.perf_counter()
+    replay_requests(bench, sampler, args.requests, rng)
+    replay_pagination(bench, sampler, args.walks)
+    replay_stats(bench, args.stats_runs, sampler.now)
+    print(f"  [OK] Replayed {sum(map(len, bench.samples.values())):,} queries "
+          f"in {time.perf_counter() - t0:.1f} s")
+
+    dataset = {
+        "photos": args.photos, "load_s": load_s,
+        "db_mb": os.path.getsize(db_path) / 1048576,
+        "rows": {name: conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+                 for name in BENCH_TABLES},
+    }
+    for label in sorted(bench.samples):
+        if label.startswith(("list", "count", "stats", "detail")):
+            s = bench.summary(label)
+            print(f"  {label:<32} p50 {fmt_ms(s['p50']):>8} ms  "
+                  f"p95 {fmt_ms(s['p95']):>8} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"dataset": dataset, "plans": bench.plans,
+                       "latency_ms": {label: bench.summary(label)
+                                      for label in sorted(bench.samples)}},
+                      f, indent=2)
+        print(f"  [OK] {args.json}")
+    write_report(bench, dataset, args.out)
+    conn.close()
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()